@@ -10,6 +10,7 @@ from datetime import datetime, timedelta
 from functools import wraps
 import alpaca_trade_api as tradeapi
 from alpaca_trade_api.rest import TimeFrame
+from core.live.metrics_registry import instrument_api, record_cache
 import pandas as pd
 
 logger = logging.getLogger(__name__)
@@ -76,7 +77,8 @@ def retry_with_backoff(
 class AlpacaClient:
     """Wrapper for Alpaca Trading API with robust error handling"""
     
-    def __init__(self, api_key: str = None, secret_key: str = None, base_url: str = None, paper: bool = True):
+    def __init__(self, api_key: str = None, secret_key: str = None, base_url: str = None, paper: bool = True,
+                 verify_connection: bool = True):
         """
         Initialize Alpaca client
         
@@ -85,6 +87,7 @@ class AlpacaClient:
             secret_key: Alpaca secret key (or load from env)
             base_url: Alpaca API base URL (or load from env)
             paper: Use paper trading (default True)
+            verify_connection: Check connectivity (get_clock) on init; skip for fast start
         """
         import os
         from dotenv import load_dotenv
@@ -112,6 +115,9 @@ class AlpacaClient:
         self._connection_verified = False
         
         # Verify connection on init
+        if not verify_connection:
+            logger.info(f"Alpaca client initialized (base URL: {base_url}, connection check deferred)")
+            return
         try:
             self._verify_connection()
             logger.info(f"Alpaca client initialized (base URL: {base_url})")
@@ -127,6 +133,7 @@ class AlpacaClient:
             self._connection_verified = False
             raise ConnectionError(f"Failed to connect to Alpaca API: {e}")
     
+    @instrument_api('alpaca.get_account')
     @retry_with_backoff(max_retries=3, base_delay=1.0)
     def get_account(self) -> Dict:
         """Get account information with retry"""
@@ -147,6 +154,7 @@ class AlpacaClient:
             logger.error(f"Error getting account: {e}")
             raise
     
+    @instrument_api('alpaca.get_positions')
     @retry_with_backoff(max_retries=3, base_delay=1.0)
     def get_positions(self) -> List[Dict]:
         """Get all open positions with retry"""
@@ -194,9 +202,21 @@ class AlpacaClient:
                 logger.debug(f"No position found for {symbol}: {e}")
             return None
     
+    @instrument_api('alpaca.get_latest_price')
     @retry_with_backoff(max_retries=3, base_delay=1.0)
     def get_latest_price(self, symbol: str) -> Optional[float]:
-        """Get latest price for a symbol with retry"""
+        """Get latest price for a symbol with retry (streamed quote first, if fresh)"""
+        try:
+            from services.market_data_stream import market_data
+            if market_data.is_streaming:
+                from config import Config
+                cached = market_data.get_price(symbol, Config.STREAM_QUOTE_MAX_AGE_SECONDS)
+                record_cache('quote_stream', bool(cached))
+                if cached:
+                    return cached
+        except ImportError:
+            pass
+        
         try:
             # Try getting latest bar first
             try:
@@ -215,6 +235,7 @@ class AlpacaClient:
             logger.error(f"Error getting latest price for {symbol}: {e}")
             return None
     
+    @instrument_api('alpaca.get_historical_bars')
     @retry_with_backoff(max_retries=3, base_delay=2.0)
     def get_historical_bars(self, symbol: str, timeframe: TimeFrame, 
                            start: datetime, end: datetime) -> pd.DataFrame:
@@ -235,6 +256,7 @@ class AlpacaClient:
             logger.error(f"Error getting historical bars for {symbol}: {e}")
             return pd.DataFrame()
     
+    @instrument_api('alpaca.place_order')
     @retry_with_backoff(max_retries=3, base_delay=1.0)
     def place_order(self, symbol: str, qty: float, side: str, 
                    order_type: str = 'market', time_in_force: str = 'day',
@@ -297,28 +319,57 @@ class AlpacaClient:
             logger.error(f"Error cancelling order {order_id}: {e}")
             return False
     
+    @instrument_api('alpaca.get_orders')
     @retry_with_backoff(max_retries=2, base_delay=1.0)
-    def get_orders(self, status: str = 'all', limit: int = 50) -> List[Dict]:
-        """Get orders with retry"""
+    def get_orders(self, status: str = 'all', limit: int = 50, after: Optional[str] = None,
+                   direction: Optional[str] = None) -> List[Dict]:
+        """
+        Get orders with retry
+        
+        Args:
+            status: 'open', 'closed' or 'all'
+            limit: Max orders per request (Alpaca max 500)
+            after: Only orders submitted after this ISO timestamp (pagination cursor)
+            direction: 'asc' or 'desc' by submission time (Alpaca default: desc)
+        """
         try:
-            orders = self.api.list_orders(status=status, limit=limit)
-            return [
-                {
-                    'id': order.id,
-                    'symbol': order.symbol,
-                    'qty': float(order.qty),
-                    'side': order.side,
-                    'type': order.type,
-                    'status': order.status,
-                    'filled_qty': float(order.filled_qty) if order.filled_qty else 0,
-                    'filled_avg_price': float(order.filled_avg_price) if order.filled_avg_price else None
-                }
-                for order in orders
-            ]
+            params = {'status': status, 'limit': limit}
+            if after:
+                params['after'] = after
+            if direction:
+                params['direction'] = direction
+            orders = self.api.list_orders(**params)
+            return [self._order_dict(order) for order in orders]
         except Exception as e:
             logger.error(f"Error getting orders: {e}")
             return []
     
+    @instrument_api('alpaca.get_order')
+    @retry_with_backoff(max_retries=2, base_delay=1.0)
+    def get_order(self, order_id: str) -> Optional[Dict]:
+        """Get one order by id with retry (None if it cannot be fetched)"""
+        try:
+            return self._order_dict(self.api.get_order(order_id))
+        except Exception as e:
+            logger.error(f"Error getting order {order_id}: {e}")
+            return None
+    
+    @staticmethod
+    def _order_dict(order) -> Dict:
+        return {
+            'id': order.id,
+            'symbol': order.symbol,
+            'qty': float(order.qty) if order.qty else 0,
+            'side': order.side,
+            'type': order.type,
+            'status': order.status,
+            'filled_qty': float(order.filled_qty) if order.filled_qty else 0,
+            'filled_avg_price': float(order.filled_avg_price) if order.filled_avg_price else None,
+            'submitted_at': order.submitted_at.isoformat() if getattr(order, 'submitted_at', None) else None,
+            'filled_at': order.filled_at.isoformat() if getattr(order, 'filled_at', None) else None
+        }
+    
+    @instrument_api('alpaca.is_market_open')
     @retry_with_backoff(max_retries=3, base_delay=1.0)
     def is_market_open(self) -> bool:
         """Check if market is open with retry"""
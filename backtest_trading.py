@@ -9,7 +9,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 import logging
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
 import pandas as pd
 from alpaca_trade_api.rest import TimeFrame
 import json
@@ -257,8 +257,14 @@ class BacktestEngine:
         logger.info(f"📈 Opened {symbol}: {side} {qty} @ ${current_price:.2f} | Balance: ${self.current_balance:,.2f}")
         return True
     
-    def run_backtest(self):
-        """Run the backtest"""
+    def run_backtest(self, progress_callback: Optional[Callable[[int, int], None]] = None):
+        """
+        Run the backtest
+        
+        Args:
+            progress_callback: Called as (steps_done, total_steps) whenever an equity
+                point is recorded; may raise to abort the run (e.g. job cancellation)
+        """
         logger.info("\n" + "="*70)
         logger.info("STARTING BACKTEST")
         logger.info("="*70)
@@ -406,6 +412,9 @@ class BacktestEngine:
                     'balance': self.current_balance,
                     'positions': len(self.positions)
                 })
+                
+                if progress_callback:
+                    progress_callback(i + 1, len(all_times))
         
         # Close all remaining positions at end
         logger.info("\nClosing all remaining positions at end of backtest...")
@@ -142,6 +142,48 @@ class Config:
     OPTIMAL_TRADING_START = "10:00"  # Best liquidity starts at 10 AM ET
     OPTIMAL_TRADING_END = "15:45"    # Best liquidity ends at 3:45 PM ET
     
+    # UVaR: full revaluation reprices options per scenario (captures gamma/vega)
+    UVAR_FULL_REVALUATION = bool(os.getenv('UVAR_FULL_REVALUATION', 'False').lower() == 'true')
+    UVAR_IV_SPOT_BETA = float(os.getenv('UVAR_IV_SPOT_BETA', '0.0'))  # e.g. -2.0: IV up 10% on a 5% drop
+    
+    # Signal mode: 'daily' (1-min bars aggregated to daily) or 'intraday' (rolling 1-min buffer)
+    SIGNAL_MODE = os.getenv('SIGNAL_MODE', 'daily').lower()
+    INTRADAY_BUFFER_BARS = int(os.getenv('INTRADAY_BUFFER_BARS', '390'))  # One regular session
+    INTRADAY_MAX_BAR_AGE_SECONDS = int(os.getenv('INTRADAY_MAX_BAR_AGE_SECONDS', '300'))
+    
+    # Startup: defer network warmups / RL model load (faster watchdog restarts)
+    FAST_START = bool(os.getenv('FAST_START', 'False').lower() == 'true')
+    
+    # Streaming market data: websocket quotes into a last-value cache (REST is the fallback)
+    MARKET_DATA_STREAMING = bool(os.getenv('MARKET_DATA_STREAMING', 'False').lower() == 'true')
+    STREAM_QUOTE_MAX_AGE_SECONDS = float(os.getenv('STREAM_QUOTE_MAX_AGE_SECONDS', '5'))
+    MARKET_DATA_REPLAY_FILE = os.getenv('MARKET_DATA_REPLAY_FILE', '')  # JSONL ticks (replaces live streams)
+    MARKET_DATA_REPLAY_SPEED = float(os.getenv('MARKET_DATA_REPLAY_SPEED', '1.0'))
+    
+    # Cycle tracing: per-cycle span trees (JSONL, rotating) and on-demand cProfile
+    CYCLE_TRACING = bool(os.getenv('CYCLE_TRACING', 'True').lower() == 'true')
+    CYCLE_TRACE_FILE = os.getenv('CYCLE_TRACE_FILE', 'logs/cycle_trace.jsonl')
+    CYCLE_TRACE_MAX_BYTES = int(os.getenv('CYCLE_TRACE_MAX_BYTES', str(10 * 1024 * 1024)))
+    CYCLE_TRACE_BACKUPS = int(os.getenv('CYCLE_TRACE_BACKUPS', '5'))
+    CYCLE_PROFILE_EVERY = int(os.getenv('CYCLE_PROFILE_EVERY', '0'))  # 0 = only on demand
+    CYCLE_PROFILE_TRIGGER = os.getenv('CYCLE_PROFILE_TRIGGER', 'logs/profile_next_cycle')  # touch to profile next cycle
+    
+    # Metrics export: local HTTP /metrics + /health and a shared-memory heartbeat (read by the watchdog)
+    METRICS_ENABLED = bool(os.getenv('METRICS_ENABLED', 'True').lower() == 'true')
+    METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')
+    METRICS_PORT = int(os.getenv('METRICS_PORT', '9108'))  # 0 = heartbeat only
+    HEARTBEAT_PATH = os.getenv('HEARTBEAT_PATH', '')  # Default: /dev/shm/tradenova_heartbeat (or temp dir)
+    HEARTBEAT_INTERVAL_SECONDS = float(os.getenv('HEARTBEAT_INTERVAL_SECONDS', '5'))
+    
+    # Market data daemon: one process owns upstream connections/caches; clients use its Unix socket
+    MARKET_DATA_DAEMON = bool(os.getenv('MARKET_DATA_DAEMON', 'False').lower() == 'true')
+    MARKET_DATA_SOCKET = os.getenv('MARKET_DATA_SOCKET', '')  # Default: <tempdir>/tradenova_market_data.sock
+    MARKET_DATA_DAEMON_ALPACA_RPM = float(os.getenv('MARKET_DATA_DAEMON_ALPACA_RPM', '180'))  # Shared budget (0 = unlimited)
+    MARKET_DATA_DAEMON_MASSIVE_RPM = float(os.getenv('MARKET_DATA_DAEMON_MASSIVE_RPM', '0'))
+    
+    # Platform backtests: background worker threads draining the backtest_jobs queue
+    BACKTEST_WORKERS = int(os.getenv('BACKTEST_WORKERS', '2'))
+    
     # Logging
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
     
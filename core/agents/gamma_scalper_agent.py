@@ -61,7 +61,7 @@ class GammaScalperAgent(BaseAgent):
                 return None
             
             # Calculate GEX
-            gex_data = self.gex_calculator.calculate_gex_proxy(options_chain, current_price)
+            gex_data = self.gex_calculator.calculate_gex_proxy(options_chain, current_price, symbol=symbol)
             
             # Check for negative GEX (volatility expansion likely)
             if gex_data['total_gex'] > -100_000_000:  # Not negative enough
@@ -61,7 +61,7 @@ class ThetaHarvesterAgent(BaseAgent):
                 return None
             
             # Calculate GEX
-            gex_data = self.gex_calculator.calculate_gex_proxy(options_chain, current_price)
+            gex_data = self.gex_calculator.calculate_gex_proxy(options_chain, current_price, symbol=symbol)
             
             # Check GEX (avoid high negative GEX - volatility expansion risk)
             if gex_data['total_gex'] < -500_000_000:  # Very negative GEX
@@ -5,7 +5,8 @@ Provides multi-channel alerting for trading system events
 
 from .alert_manager import AlertManager, AlertLevel
 from .alert_config import AlertConfig
+from .dispatcher import Alert, AlertDispatcher, StubChannel
 
-__all__ = ['AlertManager', 'AlertLevel', 'AlertConfig']
+__all__ = ['AlertManager', 'AlertLevel', 'AlertConfig', 'Alert', 'AlertDispatcher', 'StubChannel']
 
 
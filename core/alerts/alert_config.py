@@ -35,7 +35,15 @@ class AlertConfig:
     enable_email_alerts: bool = os.getenv('ENABLE_EMAIL_ALERTS', 'true').lower() == 'true'
     enable_slack_alerts: bool = os.getenv('ENABLE_SLACK_ALERTS', 'false').lower() == 'true'
     enable_telegram_alerts: bool = os.getenv('ENABLE_TELEGRAM_ALERTS', 'false').lower() == 'true'
-    
+
+    # Dispatch (background queue)
+    async_dispatch: bool = os.getenv('ALERT_ASYNC_DISPATCH', 'true').lower() == 'true'
+    alert_queue_size: int = int(os.getenv('ALERT_QUEUE_SIZE', '1000'))
+    alert_digest_window_seconds: float = float(os.getenv('ALERT_DIGEST_WINDOW_SECONDS', '2.0'))
+    alert_channel_concurrency: int = int(os.getenv('ALERT_CHANNEL_CONCURRENCY', '2'))
+    alert_max_retries: int = int(os.getenv('ALERT_MAX_RETRIES', '5'))
+    alert_retry_base_seconds: float = float(os.getenv('ALERT_RETRY_BASE_SECONDS', '30'))
+
     # Alert Thresholds
     error_threshold_per_hour: int = int(os.getenv('ERROR_THRESHOLD_PER_HOUR', '100'))
     stale_log_threshold_minutes: int = int(os.getenv('STALE_LOG_THRESHOLD_MINUTES', '10'))
@@ -7,15 +7,17 @@ import json
 import logging
 import subprocess
 import smtplib
+import threading
 from datetime import datetime, timedelta
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from enum import Enum
 from pathlib import Path
-from typing import Optional, Dict, List
+from typing import Callable, Optional, Dict, List
 import requests
 
 from .alert_config import AlertConfig
+from .dispatcher import Alert, AlertDispatcher
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +25,7 @@ logger = logging.getLogger(__name__)
 STATE_DIR = Path(__file__).parent.parent.parent / 'logs'
 ALERT_STATE_FILE = STATE_DIR / 'alert_state.json'
 ALERT_LOG_FILE = STATE_DIR / 'alerts.log'
+ALERT_RETRY_FILE = STATE_DIR / 'alert_retries.json'
 
 
 class AlertLevel(Enum):
@@ -48,12 +51,53 @@ class AlertManager:
     - Cooldown to prevent alert spam
     - Alert state persistence
     - Multiple severity levels
+    - Non-blocking delivery (background queue, digests, persisted retry)
     """
     
-    def __init__(self, config: Optional[AlertConfig] = None):
-        """Initialize alert manager with optional custom config"""
+    def __init__(
+        self,
+        config: Optional[AlertConfig] = None,
+        channels: Optional[Dict[str, Callable[[Alert], bool]]] = None
+    ):
+        """
+        Initialize alert manager
+        
+        Args:
+            config: Custom config (defaults to environment)
+            channels: Channel name -> delivery callable, replacing the configured
+                channels (e.g. StubChannel for offline testing)
+        """
         self.config = config or AlertConfig()
         self.alert_state = self._load_state()
+        self._state_lock = threading.Lock()
+        self.channels = channels if channels is not None else self._configured_channels()
+        
+        self.dispatcher: Optional[AlertDispatcher] = None
+        if self.config.async_dispatch:
+            self.dispatcher = AlertDispatcher(
+                self.channels,
+                queue_size=self.config.alert_queue_size,
+                digest_window_seconds=self.config.alert_digest_window_seconds,
+                channel_concurrency=self.config.alert_channel_concurrency,
+                max_retries=self.config.alert_max_retries,
+                retry_base_seconds=self.config.alert_retry_base_seconds,
+                retry_file=ALERT_RETRY_FILE if channels is None else None,
+                on_batch=self._record_batch
+            )
+            self.dispatcher.start()
+    
+    def _configured_channels(self) -> Dict[str, Callable[[Alert], bool]]:
+        """Delivery callables for the enabled, configured channels"""
+        channels = {}
+        if self.config.enable_macos_notifications:
+            channels['macos'] = lambda a: self._send_macos_notification(a.title, a.message, AlertLevel(a.level))
+        if self.config.enable_email_alerts and self.config.email_configured:
+            channels['email'] = lambda a: self._send_email(a.title, a.message, AlertLevel(a.level), a.data)
+        if self.config.enable_slack_alerts and self.config.slack_configured:
+            channels['slack'] = lambda a: self._send_slack(a.title, a.message, AlertLevel(a.level), a.data)
+        if self.config.enable_telegram_alerts and self.config.telegram_configured:
+            channels['telegram'] = lambda a: self._send_telegram(a.title, a.message, AlertLevel(a.level), a.data)
+        return channels
     
     def _load_state(self) -> Dict:
         """Load alert state from file"""
@@ -69,8 +113,10 @@ class AlertManager:
         """Save alert state to file"""
         try:
             STATE_DIR.mkdir(parents=True, exist_ok=True)
+            with self._state_lock:
+                snapshot = json.dumps(self.alert_state, indent=2, default=str)
             with open(ALERT_STATE_FILE, 'w') as f:
-                json.dump(self.alert_state, f, indent=2, default=str)
+                f.write(snapshot)
         except Exception as e:
             logger.error(f"Failed to save alert state: {e}")
     
@@ -111,55 +157,51 @@ class AlertManager:
             data: Optional additional data to include
             
         Returns:
-            True if alert was sent, False if blocked by cooldown
+            True if alert was queued (or, without async dispatch, sent);
+            False if blocked by cooldown or the queue is full
         """
         if not force and not self._can_alert(alert_type):
             logger.debug(f"Alert {alert_type} blocked by cooldown")
             return False
         
-        # Update state
+        # Update state (persisted by the dispatcher, off the trading path)
         now = datetime.now()
-        self.alert_state['last_alerts'][alert_type] = now.isoformat()
-        self.alert_state['alert_count'] += 1
-        
-        # Track daily counts
-        today = now.strftime('%Y-%m-%d')
-        if today not in self.alert_state['daily_counts']:
-            self.alert_state['daily_counts'] = {today: 0}
-        self.alert_state['daily_counts'][today] = \
-            self.alert_state['daily_counts'].get(today, 0) + 1
-        
-        self._save_state()
-        
-        # Log the alert
-        self._log_alert(alert_type, title, message, level)
-        
-        # Send through channels
-        sent_to = []
-        
-        # macOS Notification
-        if self.config.enable_macos_notifications:
-            if self._send_macos_notification(title, message, level):
-                sent_to.append('macos')
-        
-        # Email
-        if self.config.enable_email_alerts and self.config.email_configured:
-            if self._send_email(title, message, level, data):
-                sent_to.append('email')
-        
-        # Slack
-        if self.config.enable_slack_alerts and self.config.slack_configured:
-            if self._send_slack(title, message, level, data):
-                sent_to.append('slack')
+        with self._state_lock:
+            self.alert_state['last_alerts'][alert_type] = now.isoformat()
+            self.alert_state['alert_count'] += 1
+            
+            # Track daily counts
+            today = now.strftime('%Y-%m-%d')
+            if today not in self.alert_state['daily_counts']:
+                self.alert_state['daily_counts'] = {today: 0}
+            self.alert_state['daily_counts'][today] = \
+                self.alert_state['daily_counts'].get(today, 0) + 1
         
-        # Telegram
-        if self.config.enable_telegram_alerts and self.config.telegram_configured:
-            if self._send_telegram(title, message, level, data):
-                sent_to.append('telegram')
+        alert = Alert(alert_type, title, message, level.value, data, now.isoformat())
+        if self.dispatcher:
+            return self.dispatcher.submit(alert)
         
+        # Synchronous delivery
+        self._record_batch([alert])
+        sent_to = [name for name, channel in self.channels.items() if channel(alert)]
         logger.info(f"Alert sent [{level.value}]: {title} (channels: {sent_to})")
         return bool(sent_to)
     
+    def _record_batch(self, alerts: List[Alert]):
+        """Persist state and log a batch of alerts (dispatcher worker)"""
+        self._save_state()
+        for alert in alerts:
+            self._log_alert(alert.alert_type, alert.title, alert.message, AlertLevel(alert.level))
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait for queued alerts to be delivered (True if drained)"""
+        return self.dispatcher.flush(timeout) if self.dispatcher else True
+    
+    def close(self, timeout: float = 5.0):
+        """Deliver queued alerts and stop the dispatcher"""
+        if self.dispatcher:
+            self.dispatcher.stop(timeout)
+    
     def _log_alert(self, alert_type: str, title: str, message: str, level: AlertLevel):
         """Write alert to log file and logging system"""
         # Log to Python logger
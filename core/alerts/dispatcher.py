@@ -0,0 +1,316 @@
+"""
+Alert Dispatcher
+Background delivery of alerts off the trading path
+
+Alerts are put on a bounded queue and returned from immediately. A worker
+thread drains the queue in short windows, coalesces bursts of the same alert
+type into a single digest and hands each digest to every channel on that
+channel's own thread pool, so a slow SMTP server cannot hold up Slack or the
+next batch. Failed deliveries are retried with exponential backoff and
+persisted, so pending retries survive a restart.
+"""
+import atexit
+import json
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+LEVEL_ORDER = ['debug', 'info', 'warning', 'error', 'critical']
+
+@dataclass
+class Alert:
+    """Queued alert (level is an AlertLevel value)"""
+    alert_type: str
+    title: str
+    message: str
+    level: str = 'warning'
+    data: Optional[Dict] = None
+    timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
+    count: int = 1
+
+Channel = Callable[[Alert], bool]
+
+class StubChannel:
+    """
+    Local channel that records deliveries (for offline testing)
+
+    Args:
+        fail_times: Number of initial deliveries that fail
+        delay_seconds: Simulated send latency
+    """
+
+    def __init__(self, fail_times: int = 0, delay_seconds: float = 0.0):
+        self.fail_times = fail_times
+        self.delay_seconds = delay_seconds
+        self.sent: List[Alert] = []
+        self.attempts = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, alert: Alert) -> bool:
+        if self.delay_seconds:
+            time.sleep(self.delay_seconds)
+        with self._lock:
+            self.attempts += 1
+            if self.attempts <= self.fail_times:
+                return False
+            self.sent.append(alert)
+            return True
+
+class AlertDispatcher:
+    """Bounded-queue alert dispatcher with digests and persisted retry"""
+
+    def __init__(
+        self,
+        channels: Dict[str, Channel],
+        queue_size: int = 1000,
+        digest_window_seconds: float = 2.0,
+        channel_concurrency: int = 2,
+        max_retries: int = 5,
+        retry_base_seconds: float = 30.0,
+        retry_file: Optional[Path] = None,
+        on_batch: Optional[Callable[[List[Alert]], None]] = None
+    ):
+        """
+        Initialize dispatcher
+
+        Args:
+            channels: Channel name -> delivery callable (returns True on success)
+            queue_size: Max queued alerts (new alerts are dropped when full)
+            digest_window_seconds: Window over which same-type alerts are coalesced
+            channel_concurrency: Concurrent deliveries per channel
+            max_retries: Delivery attempts per channel before giving up
+            retry_base_seconds: First retry delay (doubles per attempt)
+            retry_file: JSON file for pending retries (None = in memory only)
+            on_batch: Called on the worker with each batch of digests before delivery
+        """
+        self.channels = channels
+        self.digest_window_seconds = digest_window_seconds
+        self.max_retries = max_retries
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_file = retry_file
+        self.on_batch = on_batch
+
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._executors = {
+            name: ThreadPoolExecutor(max_workers=channel_concurrency, thread_name_prefix=f"alert-{name}")
+            for name in channels
+        }
+        self._retries: List[Dict] = self._load_retries()
+        self._retry_lock = threading.Lock()
+
+        self._inflight = 0
+        self._idle = threading.Condition()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.dropped = 0
+        self.delivered = 0
+        self.failed = 0
+
+    # ========== LIFECYCLE ==========
+
+    def start(self):
+        """Start the worker thread (idempotent)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="alert-dispatcher", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def stop(self, timeout: float = 5.0):
+        """Deliver what is queued (up to timeout) and stop the worker"""
+        if not self._thread:
+            return
+        self.flush(timeout)
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+        for executor in self._executors.values():
+            executor.shutdown(wait=False)
+
+    def submit(self, alert: Alert) -> bool:
+        """
+        Enqueue an alert without blocking
+
+        Returns:
+            True if queued, False if the queue is full
+        """
+        with self._idle:
+            self._inflight += 1
+        try:
+            self._queue.put_nowait(alert)
+            return True
+        except queue.Full:
+            self._done(1)
+            self.dropped += 1
+            logger.warning(f"Alert queue full, dropped {alert.alert_type}: {alert.title}")
+            return False
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until queued alerts have been delivered or failed (retries excluded)"""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._inflight == 0, timeout)
+
+    def pending_retries(self) -> int:
+        with self._retry_lock:
+            return len(self._retries)
+
+    # ========== WORKER ==========
+
+    def _run(self):
+        while not self._stop.is_set():
+            batch = self._collect_batch()
+            if batch:
+                try:
+                    digests = self.coalesce(batch)
+                    if self.on_batch:
+                        self.on_batch(digests)
+                    for digest in digests:
+                        for name in self.channels:
+                            self._deliver(name, digest, attempt=1)
+                except Exception as e:
+                    logger.error(f"Error dispatching alerts: {e}")
+                finally:
+                    self._done(len(batch))
+            self._process_retries()
+
+    def _collect_batch(self) -> List[Alert]:
+        """First queued alert plus whatever arrives within the digest window"""
+        try:
+            first = self._queue.get(timeout=1.0)
+        except queue.Empty:
+            return []
+
+        batch = [first]
+        deadline = time.monotonic() + self.digest_window_seconds
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    @staticmethod
+    def coalesce(alerts: List[Alert]) -> List[Alert]:
+        """Merge alerts of the same type into one digest each (first-seen order)"""
+        groups: Dict[str, List[Alert]] = {}
+        for alert in alerts:
+            groups.setdefault(alert.alert_type, []).append(alert)
+
+        digests = []
+        for alert_type, group in groups.items():
+            if len(group) == 1:
+                digests.append(group[0])
+                continue
+            first = group[0]
+            level = max((a.level for a in group), key=lambda l: LEVEL_ORDER.index(l) if l in LEVEL_ORDER else 0)
+            lines = [f"- {a.timestamp[11:19]} {a.title}: {a.message}" for a in group]
+            digests.append(Alert(
+                alert_type=alert_type,
+                title=f"{first.title} (+{len(group) - 1} more)",
+                message="\n".join(lines),
+                level=level,
+                data=first.data,
+                timestamp=first.timestamp,
+                count=sum(a.count for a in group)
+            ))
+        return digests
+
+    def _deliver(self, channel: str, alert: Alert, attempt: int):
+        """Send on the channel's pool; failures are scheduled for retry"""
+        executor = self._executors.get(channel)
+        if executor is None:
+            return
+        with self._idle:
+            self._inflight += 1
+
+        def _send():
+            try:
+                ok = self.channels[channel](alert)
+            except Exception as e:
+                logger.error(f"Alert channel {channel} raised: {e}")
+                ok = False
+            try:
+                if ok:
+                    self.delivered += 1
+                else:
+                    self._schedule_retry(channel, alert, attempt)
+            finally:
+                self._done(1)
+
+        executor.submit(_send)
+
+    def _done(self, n: int):
+        with self._idle:
+            self._inflight -= n
+            if self._inflight <= 0:
+                self._inflight = 0
+                self._idle.notify_all()
+
+    # ========== RETRY ==========
+
+    def _schedule_retry(self, channel: str, alert: Alert, attempt: int):
+        if attempt >= self.max_retries:
+            self.failed += 1
+            logger.error(f"Giving up on {alert.alert_type} via {channel} after {attempt} attempts")
+            return
+        delay = self.retry_base_seconds * (2 ** (attempt - 1))
+        with self._retry_lock:
+            self._retries.append({
+                'channel': channel,
+                'attempt': attempt + 1,
+                'next_attempt': time.time() + delay,
+                'alert': asdict(alert)
+            })
+            self._save_retries()
+        logger.warning(f"Alert {alert.alert_type} via {channel} failed, retry {attempt + 1} in {delay:.0f}s")
+
+    def _process_retries(self):
+        now = time.time()
+        with self._retry_lock:
+            due = [r for r in self._retries if r['next_attempt'] <= now]
+            if not due:
+                return
+            self._retries = [r for r in self._retries if r['next_attempt'] > now]
+            self._save_retries()
+        for retry in due:
+            try:
+                self._deliver(retry['channel'], Alert(**retry['alert']), retry['attempt'])
+            except Exception as e:
+                logger.error(f"Error retrying alert: {e}")
+
+    def _load_retries(self) -> List[Dict]:
+        if not self.retry_file or not self.retry_file.exists():
+            return []
+        try:
+            with open(self.retry_file) as f:
+                retries = json.load(f)
+            return [r for r in retries if r.get('channel') in self.channels]
+        except Exception as e:
+            logger.warning(f"Failed to load alert retries: {e}")
+            return []
+
+    def _save_retries(self):
+        """Persist pending retries (caller holds the retry lock)"""
+        if not self.retry_file:
+            return
+        try:
+            self.retry_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.retry_file.with_suffix('.tmp')
+            with open(tmp, 'w') as f:
+                json.dump(self._retries, f, default=str)
+            tmp.replace(self.retry_file)
+        except Exception as e:
+            logger.error(f"Failed to save alert retries: {e}")
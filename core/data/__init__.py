@@ -2,6 +2,7 @@
 Data module for TradeNova
 """
 from core.data.data_validator import DataValidator, data_validator, validate_bar_age
+from core.data.intraday_bar_buffer import MinuteBarBuffer, IntradayBarStore
 
-__all__ = ['DataValidator', 'data_validator', 'validate_bar_age']
+__all__ = ['DataValidator', 'data_validator', 'validate_bar_age', 'MinuteBarBuffer', 'IntradayBarStore']
 
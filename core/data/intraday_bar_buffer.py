@@ -0,0 +1,148 @@
+"""
+Intraday Bar Buffer
+Fixed-size in-memory ring buffer of recent 1-minute bars per ticker, synced
+append-only from MassivePriceFeed (only bars newer than the last one held are fetched)
+"""
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+BAR_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+class MinuteBarBuffer:
+    """Ring buffer of OHLCV minute bars (oldest bars are overwritten when full)"""
+
+    def __init__(self, capacity: int = 390):
+        """
+        Initialize buffer
+
+        Args:
+            capacity: Number of bars kept (390 = one regular session)
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._timestamps = np.zeros(capacity, dtype=np.int64)  # UTC epoch nanoseconds
+        self._values = np.zeros((capacity, len(BAR_COLUMNS)), dtype=np.float64)
+        self._next = 0  # Next write position
+        self._size = 0
+        self.revision = 0  # Incremented on every change (appends and last-bar updates)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def last_timestamp(self) -> Optional[pd.Timestamp]:
+        """Timestamp of the newest bar (UTC) or None if empty"""
+        if self._size == 0:
+            return None
+        return pd.Timestamp(int(self._timestamps[(self._next - 1) % self.capacity]), tz='UTC')
+
+    def append(self, bars: pd.DataFrame) -> int:
+        """
+        Append bars newer than the newest bar held
+
+        A bar with the same timestamp as the newest bar replaces it (the
+        still-forming minute is revised by later fetches). Older bars are ignored.
+
+        Args:
+            bars: DataFrame with timestamp, open, high, low, close, volume
+
+        Returns:
+            Number of new bars appended
+        """
+        if bars is None or bars.empty:
+            return 0
+
+        timestamps = pd.to_datetime(bars['timestamp'], utc=True).to_numpy(dtype='datetime64[ns]').astype(np.int64)
+        values = bars[list(BAR_COLUMNS)].to_numpy(dtype=np.float64)
+
+        appended = 0
+        for ts, row in zip(timestamps, values):
+            last = self._timestamps[(self._next - 1) % self.capacity] if self._size else None
+            if last is not None and ts < last:
+                continue
+            if last is not None and ts == last:
+                self._values[(self._next - 1) % self.capacity] = row
+            else:
+                self._timestamps[self._next] = ts
+                self._values[self._next] = row
+                self._next = (self._next + 1) % self.capacity
+                self._size = min(self._size + 1, self.capacity)
+                appended += 1
+            self.revision += 1
+
+        return appended
+
+    def arrays(self) -> tuple:
+        """Chronological (timestamps_ns, values) copies"""
+        if self._size < self.capacity:
+            return self._timestamps[:self._size].copy(), self._values[:self._size].copy()
+        order = np.r_[self._next:self.capacity, 0:self._next]
+        return self._timestamps[order], self._values[order]
+
+    def to_frame(self) -> pd.DataFrame:
+        """Chronological DataFrame in MassivePriceFeed format"""
+        timestamps, values = self.arrays()
+        df = pd.DataFrame(values, columns=list(BAR_COLUMNS))
+        df.insert(0, 'timestamp', pd.to_datetime(timestamps, utc=True))
+        return df
+
+class IntradayBarStore:
+    """Per-ticker minute bar buffers kept current from MassivePriceFeed"""
+
+    def __init__(self, price_feed, capacity: int = 390, backfill_days: int = 3):
+        """
+        Initialize bar store
+
+        Args:
+            price_feed: MassivePriceFeed (or any feed with get_1minute_bars)
+            capacity: Bars kept per ticker
+            backfill_days: History fetched on first sync (covers weekends/holidays)
+        """
+        self.price_feed = price_feed
+        self.capacity = capacity
+        self.backfill_days = backfill_days
+        self.buffers: Dict[str, MinuteBarBuffer] = {}
+
+    def get_buffer(self, symbol: str) -> MinuteBarBuffer:
+        """Get (or create) the buffer for a ticker"""
+        if symbol not in self.buffers:
+            self.buffers[symbol] = MinuteBarBuffer(self.capacity)
+        return self.buffers[symbol]
+
+    def sync(self, symbol: str, now: Optional[datetime] = None) -> int:
+        """
+        Fetch and append bars since the newest bar held
+
+        Args:
+            symbol: Ticker
+            now: End of fetch window (default: now)
+
+        Returns:
+            Number of new bars appended
+        """
+        buffer = self.get_buffer(symbol)
+        end = now or datetime.now()
+        last = buffer.last_timestamp
+
+        if last is None:
+            start = end - timedelta(days=self.backfill_days)
+        else:
+            # Re-fetch the newest bar too - it may still have been forming
+            start = datetime.fromtimestamp(last.timestamp())
+
+        bars = self.price_feed.get_1minute_bars(symbol, start, end, use_cache=False)
+        appended = buffer.append(bars)
+        if appended:
+            logger.debug(f"[{symbol}] Appended {appended} 1-minute bars ({len(buffer)}/{self.capacity} buffered)")
+        return appended
+
+    def get_bars(self, symbol: str) -> pd.DataFrame:
+        """Buffered bars for a ticker (chronological)"""
+        return self.get_buffer(symbol).to_frame()
@@ -5,8 +5,6 @@ Calculates technical indicators, statistical features, and pattern detection
 import pandas as pd
 import numpy as np
 from typing import Dict, Optional
-from scipy import stats
-from statsmodels.tsa.stattools import adfuller
 import logging
 
 logger = logging.getLogger(__name__)
@@ -237,6 +235,7 @@ class FeatureEngine:
         x = np.arange(len(prices))
         y = prices.values
         
+        from scipy import stats
         slope, intercept, r_value, p_value, std_err = stats.linregress(x, y)
         r_squared = r_value ** 2
         
@@ -0,0 +1,145 @@
+"""
+Streaming Feature Engine
+Intraday features over a MinuteBarBuffer, updated as new 1-minute bars arrive
+
+EMAs and session VWAP are carried forward bar by bar (O(1) per new bar); windowed
+indicators (RSI, ATR, ADX, Hurst, regression, FVG) reuse FeatureEngine over the
+fixed-size buffer, so per-cycle cost is bounded by the buffer capacity rather than
+by a re-fetch and re-aggregation of history. Output keys match FeatureEngine, so
+agents and RegimeClassifier consume the features unchanged.
+"""
+import logging
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from core.data.intraday_bar_buffer import MinuteBarBuffer
+from core.features.indicators import FeatureEngine
+
+logger = logging.getLogger(__name__)
+
+# Regular session minutes per year (for annualizing 1-minute return volatility)
+MINUTES_PER_YEAR = 252 * 390
+
+@dataclass
+class _StreamState:
+    """Carried-forward state for one ticker (through the last *closed* bar)"""
+    last_committed_ts: int = -1
+    ema_9: Optional[float] = None
+    ema_21: Optional[float] = None
+    session_date: Optional[object] = None
+    session_pv: float = 0.0
+    session_volume: float = 0.0
+    revision: int = -1
+    features: Optional[Dict] = None
+
+def _ema_step(prev: Optional[float], value: float, span: int) -> float:
+    """One adjust=False EMA step (same recurrence as pandas ewm)"""
+    if prev is None:
+        return value
+    alpha = 2.0 / (span + 1)
+    return alpha * value + (1 - alpha) * prev
+
+class StreamingFeatureEngine:
+    """Incremental intraday feature engine (one state per ticker)"""
+
+    def __init__(self, min_bars: int = 30, session_tz: str = 'America/New_York'):
+        """
+        Initialize streaming feature engine
+
+        Args:
+            min_bars: Bars required before features are produced
+            session_tz: Timezone used to split sessions for VWAP
+        """
+        self.min_bars = min_bars
+        self.session_tz = session_tz
+        self.feature_engine = FeatureEngine()
+        self._states: Dict[str, _StreamState] = {}
+
+    def reset(self, symbol: Optional[str] = None):
+        """Drop carried state for one ticker (or all)"""
+        if symbol is None:
+            self._states.clear()
+        else:
+            self._states.pop(symbol, None)
+
+    def _session_date(self, ts_ns: int):
+        return pd.Timestamp(int(ts_ns), tz='UTC').tz_convert(self.session_tz).date()
+
+    def _commit(self, state: _StreamState, ts_ns: int, bar: np.ndarray):
+        """Fold a closed bar into the carried EMA / VWAP state"""
+        _, high, low, close, volume = bar
+        state.ema_9 = _ema_step(state.ema_9, close, 9)
+        state.ema_21 = _ema_step(state.ema_21, close, 21)
+
+        session_date = self._session_date(ts_ns)
+        if session_date != state.session_date:
+            state.session_date = session_date
+            state.session_pv = 0.0
+            state.session_volume = 0.0
+        state.session_pv += (high + low + close) / 3 * volume
+        state.session_volume += volume
+        state.last_committed_ts = int(ts_ns)
+
+    def update(self, symbol: str, buffer: MinuteBarBuffer) -> Dict:
+        """
+        Compute features for the buffer's latest bar
+
+        Bars older than the newest are committed to the carried state once; the
+        newest bar (possibly still forming) is applied on top without committing.
+
+        Args:
+            symbol: Ticker
+            buffer: Ticker's minute bar buffer
+
+        Returns:
+            Feature dict (FeatureEngine keys + current_price, bar_count,
+            last_bar_time, timeframe) or {} if not enough bars
+        """
+        if len(buffer) < self.min_bars:
+            logger.debug(f"[{symbol}] Insufficient intraday bars: {len(buffer)} (need {self.min_bars}+)")
+            return {}
+
+        state = self._states.setdefault(symbol, _StreamState())
+        if state.revision == buffer.revision and state.features is not None:
+            return state.features
+
+        timestamps, values = buffer.arrays()
+
+        # Commit closed bars not yet folded in (all but the newest)
+        pending = np.nonzero(timestamps[:-1] > state.last_committed_ts)[0]
+        for i in pending:
+            self._commit(state, timestamps[i], values[i])
+
+        # Apply the newest bar without committing it
+        _, high, low, close, volume = values[-1]
+        ema_9 = _ema_step(state.ema_9, close, 9)
+        ema_21 = _ema_step(state.ema_21, close, 21)
+        if self._session_date(timestamps[-1]) == state.session_date:
+            session_pv, session_volume = state.session_pv, state.session_volume
+        else:
+            session_pv, session_volume = 0.0, 0.0
+        session_pv += (high + low + close) / 3 * volume
+        session_volume += volume
+        vwap = session_pv / session_volume if session_volume > 0 else close
+
+        df = pd.DataFrame(values, columns=['open', 'high', 'low', 'close', 'volume'])
+        features = self.feature_engine.calculate_all_features(df)
+        if not features:
+            return {}
+
+        features['ema_9'] = float(ema_9)
+        features['ema_21'] = float(ema_21)
+        features['vwap'] = float(vwap)
+        features['vwap_deviation'] = (close - vwap) / vwap * 100 if vwap else 0.0
+        features['volatility'] = float(df['close'].pct_change().dropna().std() * np.sqrt(MINUTES_PER_YEAR))
+        features['current_price'] = float(close)
+        features['bar_count'] = len(buffer)
+        features['last_bar_time'] = buffer.last_timestamp
+        features['timeframe'] = '1min'
+
+        state.revision = buffer.revision
+        state.features = features
+        return features
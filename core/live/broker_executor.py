@@ -4,13 +4,16 @@ Handles all order types and execution logic with robust retry and error handling
 """
 import logging
 import time
-from typing import Dict, Optional, List
+from collections import deque
+from typing import Callable, Deque, Dict, Optional, List
 from datetime import datetime, timedelta
 from enum import Enum
 from functools import wraps
 
 from alpaca_client import AlpacaClient
 from core.live.options_broker_client import OptionsBrokerClient
+from core.live.order_manager import OrderHandle, OrderManager
+from core.live.cycle_tracer import traced
 
 logger = logging.getLogger(__name__)
 
@@ -93,11 +96,61 @@ class BrokerExecutor:
         self.client = alpaca_client
         self.options_client = OptionsBrokerClient(alpaca_client)
         self.pending_orders: Dict[str, Dict] = {}
-        self.order_history: List[Dict] = []
+        self.order_history: Deque[Dict] = deque(maxlen=1000)
         self.max_retries = 3
         self.base_retry_delay = 1.0
         self.max_retry_delay = 30.0
         
+        # Asynchronous submission + fill tracking (poller starts with the first order)
+        self.order_manager = OrderManager(self)
+    
+    def submit_market_order(
+        self,
+        symbol: str,
+        qty: float,
+        side: str,
+        is_option: bool = False,
+        on_fill: Optional[Callable] = None,
+        on_partial_fill: Optional[Callable] = None,
+        on_cancel: Optional[Callable] = None,
+        retry: bool = True
+    ) -> OrderHandle:
+        """
+        Submit market order asynchronously (retries run off the calling thread)
+        
+        Args:
+            retry: Retry failed submissions. Pass False for orders that must not be
+                duplicated: a timeout can fail locally after the broker accepted it
+        
+        Returns:
+            OrderHandle with `submitted` / `done` futures and fill callbacks
+        """
+        return self.order_manager.submit(
+            'market', symbol, qty, side, is_option,
+            on_fill=on_fill, on_partial_fill=on_partial_fill, on_cancel=on_cancel,
+            retry=retry
+        )
+    
+    def submit_limit_order(
+        self,
+        symbol: str,
+        qty: float,
+        side: str,
+        limit_price: float,
+        is_option: bool = False,
+        time_in_force: str = 'day',
+        on_fill: Optional[Callable] = None,
+        on_partial_fill: Optional[Callable] = None,
+        on_cancel: Optional[Callable] = None
+    ) -> OrderHandle:
+        """Submit limit order asynchronously (see submit_market_order)"""
+        return self.order_manager.submit(
+            'limit', symbol, qty, side, is_option,
+            on_fill=on_fill, on_partial_fill=on_partial_fill, on_cancel=on_cancel,
+            limit_price=limit_price, time_in_force=time_in_force
+        )
+        
+    @traced('executor.execute_market_order')
     def execute_market_order(
         self,
         symbol: str,
@@ -125,6 +178,7 @@ class BrokerExecutor:
             is_option=is_option
         )
     
+    @traced('executor.execute_limit_order')
     def execute_limit_order(
         self,
         symbol: str,
@@ -165,6 +219,7 @@ class BrokerExecutor:
         qty: float,
         side: str,
         is_option: bool,
+        retry: bool = True,
         **kwargs
     ) -> Optional[Dict]:
         """
@@ -176,14 +231,16 @@ class BrokerExecutor:
             qty: Quantity
             side: 'buy' or 'sell'
             is_option: Whether this is an options order
+            retry: If False, make a single attempt (non-idempotent orders such as exits)
             **kwargs: Additional order parameters (limit_price, time_in_force, etc.)
             
         Returns:
             Order result dictionary or None on failure
         """
         last_exception = None
+        max_retries = self.max_retries if retry else 0
         
-        for attempt in range(self.max_retries + 1):
+        for attempt in range(max_retries + 1):
             try:
                 if order_type == 'market':
                     order = self._place_market_order(symbol, qty, side, is_option)
@@ -227,7 +284,7 @@ class BrokerExecutor:
                     logger.error(f"Non-retryable error for {symbol}: {e}")
                     break
                 
-                if attempt < self.max_retries:
+                if attempt < max_retries:
                     # Calculate exponential backoff delay
                     delay = min(
                         self.base_retry_delay * (2 ** attempt),
@@ -238,12 +295,12 @@ class BrokerExecutor:
                     delay = delay * (0.8 + random.random() * 0.4)
                     
                     logger.warning(
-                        f"Attempt {attempt + 1}/{self.max_retries + 1} failed for {symbol}: {e}. "
+                        f"Attempt {attempt + 1}/{max_retries + 1} failed for {symbol}: {e}. "
                         f"Retrying in {delay:.1f}s..."
                     )
                     time.sleep(delay)
                 else:
-                    logger.error(f"All {self.max_retries + 1} attempts failed for {symbol}: {e}")
+                    logger.error(f"All {max_retries + 1} attempts failed for {symbol}: {e}")
         
         return None
     
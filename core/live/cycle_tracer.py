@@ -0,0 +1,267 @@
+"""
+Cycle Tracer
+Nested timing spans for trading cycles
+
+`tracer.cycle()` opens a root span around one trading cycle; `tracer.span(name)`
+and the `@traced(name)` decorator open child spans anywhere below it (feeds,
+orchestrator, risk managers). Spans opened outside a cycle, or on other
+threads, cost one attribute lookup and are not recorded.
+
+Each completed cycle:
+- appends its timing tree as one JSON line to a rotating trace file
+- feeds per-span durations (keyed by path, e.g. "cycle/scan/features") into
+  rolling windows for p50/p95/p99
+- optionally runs under cProfile (every N cycles, or once on demand via
+  `profile_next_cycle()` / touching the trigger file)
+"""
+import cProfile
+import functools
+import io
+import json
+import logging
+import pstats
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+class Span:
+    """One timed span and its children"""
+    __slots__ = ('name', 'start', 'duration', 'children')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.start = time.perf_counter()
+        self.duration = 0.0
+        self.children: List['Span'] = []
+
+    def to_dict(self) -> Dict:
+        node = {'name': self.name, 'ms': round(self.duration * 1000, 3)}
+        if self.children:
+            node['children'] = [child.to_dict() for child in self.children]
+        return node
+
+class CycleTracer:
+    """Per-cycle span trees, rolling percentiles and on-demand cProfile"""
+
+    def __init__(
+        self,
+        trace_file: Optional[Path] = None,
+        max_bytes: int = 10 * 1024 * 1024,
+        backup_count: int = 5,
+        window: int = 500,
+        profile_every: int = 0,
+        profile_dir: Optional[Path] = None,
+        profile_trigger: Optional[Path] = None,
+        enabled: bool = True
+    ):
+        """
+        Initialize tracer
+
+        Args:
+            trace_file: JSONL file for cycle trees (None = no file)
+            max_bytes / backup_count: Trace file rotation
+            window: Samples per span kept for percentiles
+            profile_every: Profile every Nth cycle with cProfile (0 = only on demand)
+            profile_dir: Where .prof dumps go (default: logs/profiles)
+            profile_trigger: File whose existence requests profiling of the next cycle
+            enabled: Record spans at all
+        """
+        self.enabled = enabled
+        self.window = window
+        self.profile_every = profile_every
+        self.profile_dir = Path(profile_dir or 'logs/profiles')
+        self.profile_trigger = Path(profile_trigger) if profile_trigger else None
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._samples: Dict[str, deque] = {}
+        self._profile_requested = False
+        self.cycles = 0
+        self.last_cycle: Optional[Dict] = None
+        self.last_profile: Optional[Path] = None
+
+        self._trace_logger: Optional[logging.Logger] = None
+        if trace_file:
+            self._trace_logger = self._make_trace_logger(Path(trace_file), max_bytes, backup_count)
+
+    @staticmethod
+    def _make_trace_logger(path: Path, max_bytes: int, backup_count: int) -> Optional[logging.Logger]:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            trace_logger = logging.getLogger(f"{__name__}.trace.{path}")
+            trace_logger.propagate = False
+            trace_logger.setLevel(logging.INFO)
+            if not trace_logger.handlers:
+                handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, delay=True)
+                handler.setFormatter(logging.Formatter('%(message)s'))
+                trace_logger.addHandler(handler)
+            return trace_logger
+        except Exception as e:
+            logger.warning(f"Cycle trace file unavailable ({path}): {e}")
+            return None
+
+    # ========== SPANS ==========
+
+    @contextmanager
+    def span(self, name: str):
+        """Time a child span of the current span (no-op outside a cycle)"""
+        parent = getattr(self._local, 'current', None)
+        if parent is None:
+            yield
+            return
+        node = Span(name)
+        parent.children.append(node)
+        self._local.current = node
+        try:
+            yield
+        finally:
+            node.duration = time.perf_counter() - node.start
+            self._local.current = parent
+
+    def traced(self, name: Optional[str] = None) -> Callable:
+        """Decorator: run the function inside a span (default name: qualified name)"""
+        def decorator(fn):
+            span_name = name or fn.__qualname__
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if getattr(self._local, 'current', None) is None:
+                    return fn(*args, **kwargs)
+                with self.span(span_name):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    @contextmanager
+    def cycle(self, name: str = 'cycle'):
+        """Root span for one trading cycle (nested calls act as plain spans)"""
+        if not self.enabled or getattr(self._local, 'current', None) is not None:
+            with self.span(name):
+                yield
+            return
+
+        profiler = cProfile.Profile() if self._should_profile() else None
+        root = Span(name)
+        self._local.current = root
+        if profiler:
+            profiler.enable()
+        try:
+            yield
+        finally:
+            if profiler:
+                profiler.disable()
+            root.duration = time.perf_counter() - root.start
+            self._local.current = None
+            self._finish(root, profiler)
+
+    def _should_profile(self) -> bool:
+        if self._profile_requested:
+            return True
+        if self.profile_every and (self.cycles + 1) % self.profile_every == 0:
+            return True
+        if self.profile_trigger and self.profile_trigger.exists():
+            try:
+                self.profile_trigger.unlink()
+            except OSError:
+                pass
+            return True
+        return False
+
+    def profile_next_cycle(self):
+        """Run the next cycle under cProfile"""
+        self._profile_requested = True
+
+    # ========== RESULTS ==========
+
+    def _finish(self, root: Span, profiler: Optional[cProfile.Profile]):
+        try:
+            with self._lock:
+                self.cycles += 1
+                self._collect(root, '')
+            tree = root.to_dict()
+            tree['at'] = datetime.now().isoformat(timespec='seconds')
+            self.last_cycle = tree
+            if self._trace_logger:
+                self._trace_logger.info(json.dumps(tree))
+            if profiler:
+                self._profile_requested = False
+                self._dump_profile(profiler)
+        except Exception as e:
+            logger.warning(f"Error recording cycle trace: {e}")
+
+    def _collect(self, node: Span, prefix: str):
+        path = f"{prefix}/{node.name}" if prefix else node.name
+        samples = self._samples.get(path)
+        if samples is None:
+            samples = self._samples[path] = deque(maxlen=self.window)
+        samples.append(node.duration)
+        for child in node.children:
+            self._collect(child, path)
+
+    def _dump_profile(self, profiler: cProfile.Profile, top_n: int = 25):
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        path = self.profile_dir / f"cycle_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.prof"
+        profiler.dump_stats(str(path))
+        self.last_profile = path
+
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats('cumulative').print_stats(top_n)
+        logger.info(f"Cycle profile saved to {path} (view with: python -m pstats {path})\n{out.getvalue()}")
+
+    def percentiles(self) -> Dict[str, Dict]:
+        """
+        Rolling duration statistics per span path
+
+        Returns:
+            {path: {'count', 'p50_ms', 'p95_ms', 'p99_ms', 'mean_ms'}}
+        """
+        with self._lock:
+            snapshot = {path: np.fromiter(samples, dtype=float) for path, samples in self._samples.items()}
+        stats = {}
+        for path, values in snapshot.items():
+            p50, p95, p99 = np.percentile(values, [50, 95, 99]) * 1000
+            stats[path] = {
+                'count': len(values),
+                'p50_ms': float(p50),
+                'p95_ms': float(p95),
+                'p99_ms': float(p99),
+                'mean_ms': float(values.mean() * 1000),
+            }
+        return stats
+
+    def report(self, top_n: int = 15) -> str:
+        """Slowest span paths by p95"""
+        stats = sorted(self.percentiles().items(), key=lambda item: item[1]['p95_ms'], reverse=True)
+        lines = [f"Cycle timing ({self.cycles} cycles) - {'span':<48} {'p50':>9} {'p95':>9} {'p99':>9}"]
+        for path, s in stats[:top_n]:
+            lines.append(f"  {path:<70} {s['p50_ms']:>8.1f}ms {s['p95_ms']:>8.1f}ms {s['p99_ms']:>8.1f}ms")
+        return "\n".join(lines)
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self.cycles = 0
+
+def _build_tracer() -> CycleTracer:
+    from config import Config
+    return CycleTracer(
+        trace_file=Path(Config.CYCLE_TRACE_FILE) if Config.CYCLE_TRACE_FILE else None,
+        max_bytes=Config.CYCLE_TRACE_MAX_BYTES,
+        backup_count=Config.CYCLE_TRACE_BACKUPS,
+        profile_every=Config.CYCLE_PROFILE_EVERY,
+        profile_trigger=Path(Config.CYCLE_PROFILE_TRIGGER) if Config.CYCLE_PROFILE_TRIGGER else None,
+        enabled=Config.CYCLE_TRACING
+    )
+
+# Global instance
+tracer = _build_tracer()
+traced = tracer.traced
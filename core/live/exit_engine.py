@@ -0,0 +1,214 @@
+"""
+Exit Engine
+Single-pass exit rule evaluation for open positions
+
+One positions snapshot is turned into columns (P&L %, qty, DTE, peak P&L) and
+every exit rule is evaluated as a vectorized mask over all positions at once:
+
+1. 0DTE time exit (near the close, under +10%)
+2. Playbook time exit (scalp / swing mandatory exits)
+3. DTE exit rules (Config.DTE_EXIT_RULES)
+4. Stop-loss
+5. Trailing stop (tiered pullback from peak P&L)
+6. Profit-target ladder (partial exits)
+
+Each position gets at most one exit order: the first full exit rule that
+fires, otherwise the highest take-profit level reached.
+"""
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+import pytz
+
+from config import Config
+from core.risk.options_var import parse_option_symbol
+from core.risk.trading_playbook import playbook_manager
+
+logger = logging.getLogger(__name__)
+
+ET = pytz.timezone('America/New_York')
+
+@lru_cache(maxsize=4096)
+def option_expiration(symbol: str) -> Optional[date]:
+    """Expiration date of an OCC option symbol (None for stocks)"""
+    if len(symbol) <= 10:  # Options symbols are longer
+        return None
+    contract = parse_option_symbol(symbol)
+    return contract['expiration'] if contract else None
+
+@dataclass
+class ExitOrder:
+    """Exit decided for one position"""
+    symbol: str
+    qty: int
+    rule: str
+    reason: str
+    full_exit: bool
+    pnl_pct: float
+
+class ExitEngine:
+    """Vectorized exit rules with peak P&L tracking for trailing stops"""
+
+    def __init__(
+        self,
+        stop_loss_pct: Optional[float] = None,
+        tp_levels: Optional[Sequence[Tuple[float, float]]] = None,
+        trailing_tiers: Optional[Sequence[Tuple[float, float]]] = None,
+        trailing_activation_pct: Optional[float] = None,
+        dte_exit_rules: Optional[Sequence[Tuple[int, float]]] = None,
+        zero_dte_exit_minutes: int = 120
+    ):
+        """
+        Initialize exit engine (defaults from Config)
+
+        Args:
+            stop_loss_pct: Full exit at or below -stop_loss_pct
+            tp_levels: (profit_pct, exit_fraction) ascending
+            trailing_tiers: (peak_pct, allowed_pullback) descending by peak
+            trailing_activation_pct: Peak P&L that arms the trailing stop
+            dte_exit_rules: (max_dte, min_profit_to_hold), first match applies
+            zero_dte_exit_minutes: 0DTE exit window before the close
+        """
+        self.stop_loss_pct = stop_loss_pct if stop_loss_pct is not None else getattr(Config, 'STOP_LOSS_PCT', 0.20)
+        self.tp_levels = list(tp_levels or [
+            (getattr(Config, 'TP1_PCT', 0.40), getattr(Config, 'TP1_EXIT_PCT', 0.50)),
+            (getattr(Config, 'TP2_PCT', 0.60), getattr(Config, 'TP2_EXIT_PCT', 0.20)),
+            (getattr(Config, 'TP3_PCT', 1.00), getattr(Config, 'TP3_EXIT_PCT', 0.10)),
+        ])
+        self.trailing_tiers = list(trailing_tiers or getattr(Config, 'TRAILING_STOP_TIERS', [
+            (1.00, 0.10), (0.80, 0.12), (0.60, 0.15), (0.40, 0.18)
+        ]))
+        self.trailing_activation_pct = (trailing_activation_pct if trailing_activation_pct is not None
+                                        else getattr(Config, 'TRAILING_STOP_ACTIVATION_PCT', 0.40))
+        self.dte_exit_rules = list(dte_exit_rules if dte_exit_rules is not None else Config.DTE_EXIT_RULES)
+        self.zero_dte_exit_minutes = zero_dte_exit_minutes
+
+        # Peak P&L per symbol (for trailing stops)
+        self.peak_pnl: Dict[str, float] = {}
+
+    def evaluate(
+        self,
+        positions: List[Dict],
+        now: Optional[datetime] = None,
+        skip: Optional[Set[str]] = None
+    ) -> List[ExitOrder]:
+        """
+        Decide exits for a positions snapshot (one pass over all rules)
+
+        Args:
+            positions: Alpaca position dicts (symbol, qty, unrealized_plpc)
+            now: Evaluation time (default: now, ET)
+            skip: Symbols already handled this cycle
+
+        Returns:
+            At most one ExitOrder per position
+        """
+        now = now or datetime.now(ET)
+        if now.tzinfo is None:
+            now = ET.localize(now)
+        now_et = now.astimezone(ET)
+        today = now_et.date()
+        minutes_to_close = (16 - now_et.hour) * 60 - now_et.minute
+
+        rows = [p for p in positions
+                if int(float(p.get('qty', 0))) > 0 and p.get('symbol') and p.get('symbol') not in (skip or ())]
+        if not rows:
+            return []
+
+        symbols = [p['symbol'] for p in rows]
+        qty = np.array([int(float(p['qty'])) for p in rows])
+        pnl = np.array([float(p.get('unrealized_plpc', 0)) for p in rows])
+        expirations = [option_expiration(s) for s in symbols]
+        is_option = np.array([e is not None for e in expirations])
+        dte = np.array([(e - today).days if e is not None else 10 ** 6 for e in expirations])
+
+        # Peak P&L (updated before the trailing check, as the stop trails the new high)
+        peak = np.array([self.peak_pnl.get(s, 0.0) for s in symbols])
+        peak = np.maximum(peak, pnl)
+        for symbol, value in zip(symbols, peak):
+            if value > 0:
+                self.peak_pnl[symbol] = float(value)
+
+        # 1. 0DTE time exit
+        zero_dte = is_option & (dte == 0) & (minutes_to_close <= self.zero_dte_exit_minutes) & (pnl < 0.10)
+
+        # 2. Playbook time exits (scalp up to scalp.max_dte, swing beyond; 0DTE is always scalp)
+        scalp, swing = playbook_manager.scalp, playbook_manager.swing
+        scalp_exit = (dte == 0) & (minutes_to_close <= scalp.mandatory_exit_minutes_before_close)
+        swing_exit = (dte > scalp.max_dte) & (dte <= swing.mandatory_exit_dte)
+        playbook_exit = is_option & (scalp_exit | swing_exit) & (pnl < 0.10)
+
+        # 3. DTE rules: first rule with dte <= max_dte sets the profit needed to hold
+        dte_exit = np.zeros(len(rows), dtype=bool)
+        if self.dte_exit_rules:
+            conditions = [dte <= max_dte for max_dte, _ in self.dte_exit_rules]
+            min_profit = np.select(conditions, [p for _, p in self.dte_exit_rules], default=-np.inf)
+            dte_exit = is_option & (pnl < min_profit)
+
+        # 4. Stop-loss
+        stop_loss = pnl <= -self.stop_loss_pct
+
+        # 5. Trailing stop
+        allowed_pullback = np.full(len(rows), 0.18)
+        for tier_pct, pullback in reversed(self.trailing_tiers):  # Highest matching tier wins
+            allowed_pullback = np.where(peak >= tier_pct, pullback, allowed_pullback)
+        trail_level = peak - allowed_pullback
+        trailing = (peak >= self.trailing_activation_pct) & (pnl < trail_level)
+
+        # 6. Take-profit ladder (highest level reached)
+        tp_index = np.full(len(rows), -1)
+        for i, (level_pct, _) in enumerate(self.tp_levels):
+            tp_index = np.where((pnl > 0) & (pnl >= level_pct), i, tp_index)
+
+        full_rules = [
+            ('0dte_time', zero_dte),
+            ('playbook_time', playbook_exit),
+            ('dte', dte_exit),
+            ('stop_loss', stop_loss),
+            ('trailing_stop', trailing),
+        ]
+
+        orders = []
+        for i, symbol in enumerate(symbols):
+            rule = next((name for name, mask in full_rules if mask[i]), None)
+            if rule:
+                reason = self._reason(rule, symbol, pnl[i], dte[i], peak[i], trail_level[i], minutes_to_close)
+                orders.append(ExitOrder(symbol, int(qty[i]), rule, reason, True, float(pnl[i])))
+            elif tp_index[i] >= 0:
+                level_pct, fraction = self.tp_levels[tp_index[i]]
+                exit_qty = max(1, int(qty[i] * fraction))
+                reason = f"TP{tp_index[i] + 1} ({level_pct:.0%}+) at {pnl[i]:.1%}"
+                orders.append(ExitOrder(symbol, exit_qty, f"tp{tp_index[i] + 1}", reason,
+                                        exit_qty >= qty[i], float(pnl[i])))
+            else:
+                self._log_approaching(symbol, pnl[i], peak[i], trail_level[i])
+        return orders
+
+    def position_closed(self, symbol: str):
+        """Forget the peak P&L of a position once its full exit has been submitted"""
+        self.peak_pnl.pop(symbol, None)
+
+    def _reason(self, rule: str, symbol: str, pnl: float, dte: int, peak: float,
+                trail_level: float, minutes_to_close: int) -> str:
+        if rule == '0dte_time':
+            return f"0DTE time exit ({minutes_to_close} min to close, P&L {pnl:.1%} < 10%)"
+        if rule == 'playbook_time':
+            return f"Playbook time exit: {dte} DTE with {pnl:.1%} profit"
+        if rule == 'dte':
+            return f"DTE exit: {symbol} has {dte} DTE with {pnl:.1%} profit"
+        if rule == 'stop_loss':
+            return f"Stop-loss: {pnl:.1%} (trigger at -{self.stop_loss_pct:.0%})"
+        return f"Trailing stop: {pnl:.1%} < {trail_level:.1%} (peak {peak:.1%})"
+
+    def _log_approaching(self, symbol: str, pnl: float, peak: float, trail_level: float):
+        if pnl <= -(self.stop_loss_pct * 0.75):
+            logger.warning(f"⚠️  {symbol} approaching stop-loss: {pnl*100:.1f}% (trigger at -{self.stop_loss_pct*100:.0f}%)")
+        elif self.tp_levels and pnl >= self.tp_levels[0][0] * 0.80:
+            logger.info(f"📈 {symbol} approaching TP1: {pnl*100:.1f}% (trigger at {self.tp_levels[0][0]*100:.0f}%)")
+        if peak >= self.trailing_activation_pct and pnl < trail_level + 0.05:
+            logger.info(f"⚠️  {symbol} approaching trailing stop: current {pnl*100:.1f}%, "
+                        f"peak {peak*100:.1f}%, trail {trail_level*100:.1f}%")
@@ -25,14 +25,22 @@ from core.risk.ticker_config import TickerConfigManager, ticker_config_manager,
 from core.risk.trading_playbook import PlaybookManager, playbook_manager, PlaybookMode
 from core.data.data_validator import DataValidator, data_validator, validate_bar_age
 from core.agents.base_agent import TradeIntent, TradeDirection
-from alpaca_trade_api.rest import TimeFrame
 from logs.metrics_tracker import MetricsTracker
 from core.live.model_degrade_detector import ModelDegradeDetector
 from core.live.ensemble_predictor import EnsemblePredictor
 from core.live.news_filter import NewsFilter
+from core.live.startup_profiler import startup_profiler
+from core.live.cycle_tracer import traced, tracer
+from core.live.metrics_registry import Heartbeat, MetricsServer, record_cycle
+from core.live.exit_engine import ExitEngine, ExitOrder
+from services.market_data_stream import market_data
 import os
+import threading
+import time
+from collections import deque
 
-# RL is optional (requires PyTorch which is too large for Fly.io)
+# RL is optional. Exported .npz policies run on NumPy alone; SB3 .zip checkpoints
+# additionally require PyTorch (too large for Fly.io)
 try:
     from rl.predict import RLPredictor
     RL_AVAILABLE = True
@@ -50,7 +58,10 @@ class IntegratedTrader:
         rl_model_path: Optional[str] = None,
         use_rl: bool = True,
         dry_run: bool = False,
-        paper_trading: bool = False
+        paper_trading: bool = False,
+        lazy_init: bool = False,
+        signal_mode: Optional[str] = None,
+        market: Optional['IntegratedTrader'] = None
     ):
         """
         Initialize integrated trader
@@ -60,48 +71,107 @@ class IntegratedTrader:
             use_rl: Whether to use RL predictions
             dry_run: If True, simulate trading without executing orders
             paper_trading: If True, use paper trading account
+            lazy_init: Fast start - defer network warmups (connection check, account
+                balance, calendars) and RL model loading until first needed
+            signal_mode: 'daily' or 'intraday' (default: Config.SIGNAL_MODE)
+            market: Shared market trader (multi-tenant engine) whose price feeds, agents
+                and RL model are reused; this trader then keeps only account state
         """
         self.dry_run = dry_run
         self.paper_trading = paper_trading
+        self.lazy_init = lazy_init
+        self.market = market
+        self.metrics_labels: Dict[str, str] = {}  # e.g. {'user': '42'} under the multi-tenant engine
         # Initialize clients
         base_url = Config.ALPACA_BASE_URL
         if paper_trading:
             base_url = "https://paper-api.alpaca.markets"
             logger.info("Using PAPER trading account")
         
-        self.client = AlpacaClient(
-            Config.ALPACA_API_KEY,
-            Config.ALPACA_SECRET_KEY,
-            base_url
-        )
+        with startup_profiler.phase("trader: alpaca client"):
+            self.client = AlpacaClient(
+                Config.ALPACA_API_KEY,
+                Config.ALPACA_SECRET_KEY,
+                base_url,
+                verify_connection=not lazy_init
+            )
+        
+        # Shared market data daemon: reads (quotes, bars, account, positions) go through its socket
+        if Config.MARKET_DATA_DAEMON:
+            from services.market_data_daemon import via_daemon
+            self.client = via_daemon(self.client, 'alpaca')
         
         if dry_run:
             logger.warning("DRY RUN MODE: No orders will be executed")
         
-        # Initialize Massive price feed (if available)
+        # Streaming quotes (last-value cache read by get_latest_price; REST stays the fallback)
+        if market is None and (Config.MARKET_DATA_STREAMING or Config.MARKET_DATA_REPLAY_FILE):
+            self._start_market_data_stream()
+        
+        # Metrics export (local HTTP endpoint + shared-memory heartbeat read by the watchdog)
+        self.metrics_server = None
+        self.heartbeat = None
+        if market is None and Config.METRICS_ENABLED:
+            self._start_metrics_export()
+        
+        # Initialize Massive price feed (live bars and historical bars for signals)
         self.massive_price_feed = None
-        try:
-            from services.massive_price_feed import MassivePriceFeed
-            self.massive_price_feed = MassivePriceFeed()
-            if self.massive_price_feed.is_available():
-                logger.info("Massive price feed initialized and available")
+        if market is not None:
+            self.massive_price_feed = market.massive_price_feed
+        else:
+            try:
+                from services.massive_price_feed import MassivePriceFeed
+                self.massive_price_feed = MassivePriceFeed()
+                if Config.MARKET_DATA_DAEMON:
+                    from services.market_data_daemon import via_daemon
+                    self.massive_price_feed = via_daemon(self.massive_price_feed, 'massive_price')
+                if self.massive_price_feed.is_available():
+                    logger.info("Massive price feed initialized - will use for historical bars")
+                else:
+                    logger.warning("Massive price feed not available - will fallback to Alpaca")
+            except Exception as e:
+                logger.warning(f"Could not initialize Massive price feed: {e} - will use Alpaca")
+        self._massive_options_feed = market._massive_options_feed if market is not None else None
+        
+        # Intraday signal mode: rolling 1-minute bar buffers + streaming features
+        self.signal_mode = (signal_mode or Config.SIGNAL_MODE).lower()
+        self.intraday_bars = None
+        self.streaming_features = None
+        if market is not None:
+            self.signal_mode = market.signal_mode
+            self.intraday_bars = market.intraday_bars
+            self.streaming_features = market.streaming_features
+        elif self.signal_mode == 'intraday':
+            if self.massive_price_feed and self.massive_price_feed.is_available():
+                from core.data.intraday_bar_buffer import IntradayBarStore
+                from core.features.streaming import StreamingFeatureEngine
+                self.intraday_bars = IntradayBarStore(self.massive_price_feed, capacity=Config.INTRADAY_BUFFER_BARS)
+                self.streaming_features = StreamingFeatureEngine()
+                logger.info(f"Intraday signal mode: {Config.INTRADAY_BUFFER_BARS}-bar 1-minute buffers (RL uses daily bars only - skipped)")
             else:
-                logger.warning("Massive price feed initialized but API key not configured")
-        except Exception as e:
-            logger.warning(f"Could not initialize Massive price feed: {e}, will use Alpaca")
+                logger.warning("Intraday signal mode requires Massive price feed - falling back to daily")
+                self.signal_mode = 'daily'
         
         # Initialize components
-        self.orchestrator = MultiAgentOrchestrator(self.client)
-        self.executor = BrokerExecutor(self.client)
+        with startup_profiler.phase("trader: orchestrator + executor"):
+            self.orchestrator = market.orchestrator if market else MultiAgentOrchestrator(self.client)
+            self.executor = BrokerExecutor(self.client)
         
         # Initialize risk manager with ACTUAL account balance (not config default)
-        try:
-            account = self.client.get_account()
-            actual_balance = float(account['equity'])
-            logger.info(f"Initializing risk manager with actual balance: ${actual_balance:,.2f}")
-        except Exception as e:
-            logger.warning(f"Could not get account balance, using config default: {e}")
+        # Fast start: placeholder balance, re-based on the first cycle's account fetch
+        self._balance_pending = lazy_init
+        if lazy_init:
             actual_balance = Config.INITIAL_BALANCE
+            startup_profiler.mark_deferred("account balance (first trading cycle)")
+        else:
+            with startup_profiler.phase("trader: account balance"):
+                try:
+                    account = self.client.get_account()
+                    actual_balance = float(account['equity'])
+                    logger.info(f"Initializing risk manager with actual balance: ${actual_balance:,.2f}")
+                except Exception as e:
+                    logger.warning(f"Could not get account balance, using config default: {e}")
+                    actual_balance = Config.INITIAL_BALANCE
         
         self.risk_manager = AdvancedRiskManager(
             initial_balance=actual_balance,  # ✅ Use actual balance
@@ -112,29 +182,45 @@ class IntegratedTrader:
         )
         
         # Enable UVaR checking
-        self.risk_manager.enable_uvar(self.client, max_uvar_pct=5.0)
+        self.risk_manager.enable_uvar(
+            self.client,
+            max_uvar_pct=5.0,
+            full_revaluation=Config.UVAR_FULL_REVALUATION,
+            iv_spot_beta=Config.UVAR_IV_SPOT_BETA
+        )
         
         # Update calendars for Gap Risk Monitor
-        self._update_calendars()
+        if lazy_init:
+            threading.Thread(target=self._update_calendars, name="calendar-refresh", daemon=True).start()
+            startup_profiler.mark_deferred("earnings/macro calendars (background thread)")
+        else:
+            with startup_profiler.phase("trader: calendars"):
+                self._update_calendars()
         self.profit_manager = ProfitManager()
         self.metrics_tracker = MetricsTracker()
         
-        # Track peak P&L for trailing stops (symbol -> peak_pnl_pct)
-        self.peak_pnl_tracker: Dict[str, float] = {}
+        # Exit rules (time/DTE, stop-loss, trailing, TP ladder) evaluated in one pass;
+        # peak P&L for trailing stops (symbol -> peak_pnl_pct) lives on the engine
+        self.exit_engine = ExitEngine()
+        self.peak_pnl_tracker: Dict[str, float] = self.exit_engine.peak_pnl
+        # Exit submissions completed on the order pool; applied to position state on the trading thread
+        self._exit_results: deque = deque()
+        # Entry orders in flight (option symbol -> entry) and their completions, applied the same way
+        self._pending_entries: Dict[str, Dict] = {}
+        self._entry_results: deque = deque()
         
         # RL predictor (optional - requires PyTorch which may not be available)
         self.rl_predictor = None
         self.use_rl = use_rl and RL_AVAILABLE
         if not RL_AVAILABLE and use_rl:
             logger.info("RL not available (PyTorch not installed) - using multi-agent ensemble only")
-        if self.use_rl and rl_model_path and os.path.exists(rl_model_path):
-            try:
-                self.rl_predictor = RLPredictor(rl_model_path, agent_type='grpo')
-                self.rl_predictor.load_model()
-                logger.info("RL predictor loaded")
-            except Exception as e:
-                logger.warning(f"Failed to load RL model: {e}")
-                self.use_rl = False
+        self._rl_model_path = rl_model_path if self.use_rl and rl_model_path and os.path.exists(rl_model_path) else None
+        if self._rl_model_path:
+            if lazy_init:
+                startup_profiler.mark_deferred("RL model (first scan)")
+            else:
+                with startup_profiler.phase("trader: RL model"):
+                    self._ensure_rl_loaded()
         
         # Model degrade detector
         self.degrade_detector = ModelDegradeDetector() if self.use_rl else None
@@ -162,18 +248,49 @@ class IntegratedTrader:
         logger.info("Options Risk Manager initialized (Phases B-E enabled)")
         
         # Daily trade budget removed - no limit on trades per day
+    
+    def _start_market_data_stream(self):
+        """Start quote streams (or a replay file) for the configured tickers"""
+        try:
+            if market_data.is_streaming:
+                return
+            if Config.MARKET_DATA_REPLAY_FILE:
+                market_data.start_replay(Config.MARKET_DATA_REPLAY_FILE, speed=Config.MARKET_DATA_REPLAY_SPEED)
+                logger.info(f"Market data replay: {Config.MARKET_DATA_REPLAY_FILE} at {Config.MARKET_DATA_REPLAY_SPEED}x")
+                return
+            market_data.start_alpaca(Config.TICKERS, Config.ALPACA_API_KEY, Config.ALPACA_SECRET_KEY)
+            if Config.MASSIVE_API_KEY:
+                held = [p['symbol'] for p in self.client.get_positions() if len(p.get('symbol', '')) > 10]
+                market_data.start_massive_options(held, Config.MASSIVE_API_KEY)
+        except Exception as e:
+            logger.warning(f"Could not start market data stream (REST polling only): {e}")
+    
+    def _start_metrics_export(self):
+        """Start the metrics HTTP endpoint and heartbeat writer"""
+        try:
+            if Config.METRICS_PORT:
+                self.metrics_server = MetricsServer(host=Config.METRICS_HOST, port=Config.METRICS_PORT)
+                self.metrics_server.start()
+            self.heartbeat = Heartbeat(Config.HEARTBEAT_PATH or None, Config.HEARTBEAT_INTERVAL_SECONDS)
+            self.heartbeat.start()
+        except Exception as e:
+            logger.warning(f"Could not start metrics export: {e}")
+    
+    def _ensure_rl_loaded(self):
+        """Load the RL predictor on first use (no-op once loaded or if RL is off)"""
+        if self.rl_predictor is not None or not self._rl_model_path:
+            return
         
-        # Massive price feed (for historical bars)
-        self.massive_price_feed = None
+        model_path = self._rl_model_path
+        self._rl_model_path = None  # Only attempt once
         try:
-            from services.massive_price_feed import MassivePriceFeed
-            self.massive_price_feed = MassivePriceFeed()
-            if self.massive_price_feed.is_available():
-                logger.info("Massive price feed initialized - will use for historical bars")
-            else:
-                logger.warning("Massive price feed not available - will fallback to Alpaca")
+            self.rl_predictor = RLPredictor(model_path, agent_type='grpo')
+            self.rl_predictor.load_model()
+            logger.info("RL predictor loaded")
         except Exception as e:
-            logger.warning(f"Could not initialize Massive price feed: {e} - will use Alpaca")
+            logger.warning(f"Failed to load RL model: {e}")
+            self.rl_predictor = None
+            self.use_rl = False
     
     def _update_calendars(self):
         """Update earnings and macro event calendars"""
@@ -203,46 +320,66 @@ class IntegratedTrader:
         except Exception as e:
             logger.warning(f"Could not update calendars: {e}")
         
-    def run_trading_cycle(self):
-        """Run one complete trading cycle"""
+    def run_trading_cycle(self, signals: Optional[Dict[str, Dict]] = None):
+        """
+        Run one complete trading cycle (traced as one span tree)
+        
+        Args:
+            signals: Precomputed market signals (multi-tenant engine); scanned here if None
+        """
+        start = time.perf_counter()
+        with tracer.cycle():
+            self._run_trading_cycle(signals)
+        record_cycle(time.perf_counter() - start, len(self.positions), **self.metrics_labels)
+    
+    def _run_trading_cycle(self, signals: Optional[Dict[str, Dict]] = None):
         try:
             logger.info("="*60)
             logger.info("TRADING CYCLE STARTED")
             logger.info("="*60)
             
+            # Exits accepted after last cycle's wait timed out, and entries filled since
+            self._apply_exit_results()
+            self._apply_entry_results()
+            
             # Update account balance
             account = self.client.get_account()
+            if self._balance_pending:
+                # Fast start: re-base risk tracking on the real balance (not the config placeholder)
+                equity = float(account['equity'])
+                self.risk_manager.initial_balance = equity
+                self.risk_manager.peak_balance = equity
+                self._balance_pending = False
+                logger.info(f"Risk manager balance initialized: ${equity:,.2f}")
             self.risk_manager.update_balance(float(account['equity']))
             logger.info(f"Account balance updated: ${float(account['equity']):,.2f}")
             
+            # One positions snapshot per cycle (monitoring, exits and heat)
+            broker_positions = self.client.get_positions()
+            
             # Monitor existing positions
-            self._monitor_positions()
+            handled = self._monitor_positions(broker_positions)
             logger.info(f"Current positions: {len(self.positions)}")
             
-            # PHASE B: CHECK DTE-BASED EXITS (time decay protection)
-            self._check_dte_exits()
-            
-            # CHECK STOP-LOSSES (CRITICAL RISK MANAGEMENT)
-            self._check_stop_losses()
+            # PHASE C: REPRICE PORTFOLIO GREEKS FROM CURRENT UNDERLYING PRICES
+            self._reprice_portfolio_greeks()
             
-            # CHECK PROFIT TARGETS (queries Alpaca directly)
-            self._check_profit_targets()
-            
-            # CHECK TRAILING STOPS (dynamic pullback based on peak P&L)
-            self._check_trailing_stops()
+            # EXIT RULES: DTE/0DTE time exits, stop-loss, trailing stops and TP ladder (single pass)
+            self._check_exits(broker_positions, skip=handled)
             
             # Log portfolio heat status
-            options_exposure = self._get_total_options_exposure()
+            options_exposure = self._get_total_options_exposure(broker_positions)
             heat_pct = options_exposure / float(account['equity']) * 100 if float(account['equity']) > 0 else 0
             max_heat = getattr(Config, 'MAX_PORTFOLIO_HEAT', 0.35) * 100
             logger.info(f"Portfolio Heat: ${options_exposure:,.2f} ({heat_pct:.1f}% / {max_heat:.0f}% max)")
             
-            # Scan for new opportunities
-            if len(self.positions) < Config.MAX_ACTIVE_TRADES:
-                logger.info(f"Position limit check: {len(self.positions)} < {Config.MAX_ACTIVE_TRADES} - Calling _scan_and_trade()")
-                self._scan_and_trade()
+            # Scan for new opportunities (entries in flight count against the limit)
+            open_count = len(set(self.positions) | set(self._pending_entries))
+            if open_count < Config.MAX_ACTIVE_TRADES:
+                logger.info(f"Position limit check: {open_count} < {Config.MAX_ACTIVE_TRADES} - Calling _scan_and_trade()")
+                self._scan_and_trade(signals)
             else:
-                logger.info(f"Position limit reached: {len(self.positions)} >= {Config.MAX_ACTIVE_TRADES} - Skipping scan")
+                logger.info(f"Position limit reached: {open_count} >= {Config.MAX_ACTIVE_TRADES} - Skipping scan")
             
             # Log status
             self._log_status()
@@ -253,12 +390,24 @@ class IntegratedTrader:
         except Exception as e:
             logger.error(f"Error in trading cycle: {e}", exc_info=True)
     
-    def _monitor_positions(self):
-        """Monitor all open positions"""
+    @traced('monitor_positions')
+    def _monitor_positions(self, broker_positions: Optional[List[Dict]] = None) -> set:
+        """
+        Monitor all open positions
+        
+        Args:
+            broker_positions: Positions snapshot (prices are taken from it; symbols
+                missing from it fall back to a latest-price request)
+            
+        Returns:
+            Symbols exited by the profit manager this cycle
+        """
+        prices = {p['symbol']: p.get('current_price') for p in (broker_positions or []) if p.get('symbol')}
+        exited = set()
         for symbol, position_info in list(self.positions.items()):
             try:
                 # Get current price
-                current_price = self.client.get_latest_price(symbol)
+                current_price = prices.get(symbol) or self.client.get_latest_price(symbol)
                 if current_price is None:
                     continue
                 
@@ -294,7 +443,11 @@ class IntegratedTrader:
                         if position_info['current_qty'] <= 0.01:
                             del self.positions[symbol]
                             self.profit_manager.remove_position(symbol)
+                            self.options_risk_manager.remove_position_greeks(symbol)
+                        elif is_option:
+                            self.options_risk_manager.update_position_qty(symbol, int(position_info['current_qty']))
                         
+                        exited.add(symbol)
                         logger.info(f"Exit executed: {symbol} - {exit_action['reason']}")
                 
                 # Update trailing stop
@@ -302,14 +455,39 @@ class IntegratedTrader:
                 
             except Exception as e:
                 logger.error(f"Error monitoring position {symbol}: {e}")
+        return exited
     
-    def _scan_and_trade(self):
-        """Scan for trading opportunities"""
-        logger.info("_scan_and_trade() called - Starting scan")
-        
+    @traced('reprice_greeks')
+    def _reprice_portfolio_greeks(self):
+        """Bulk-reprice tracked option Greeks from current underlying prices"""
+        tracked = self.options_risk_manager.position_greeks
+        if not tracked:
+            return
+        try:
+            from core.risk.options_var import parse_option_symbol
+            underlyings = set()
+            for symbol in tracked:
+                contract = parse_option_symbol(symbol)
+                if contract:
+                    underlyings.add(contract['underlying'])
+            spot_prices = {}
+            for underlying in underlyings:
+                price = self.client.get_latest_price(underlying)
+                if price:
+                    spot_prices[underlying] = float(price)
+            
+            repriced = self.options_risk_manager.reprice_greeks(spot_prices)
+            summary = self.options_risk_manager.portfolio_greeks
+            logger.debug(f"Repriced Greeks for {repriced}/{len(tracked)} positions: "
+                         f"Δ={summary.total_delta:.0f}, Θ={summary.total_theta:.0f}")
+        except Exception as e:
+            logger.warning(f"Could not reprice portfolio Greeks: {e}")
+    
+    def _market_gates_open(self) -> bool:
+        """Market-wide scan gates (market hours, news filter)"""
         if not self.client.is_market_open():
             logger.info("Market is closed - Exiting scan")
-            return
+            return False
         
         logger.info("Market is open - Proceeding with scan")
         
@@ -317,9 +495,70 @@ class IntegratedTrader:
         is_blocked, reason = self.news_filter.is_blocked()
         if is_blocked:
             logger.warning(f"Trading blocked by news filter: {reason}")
-            return
+            return False
         
         logger.info("News filter check passed")
+        return True
+    
+    def _check_model_degradation(self):
+        """Disable RL predictions if the model has degraded"""
+        if self.degrade_detector:
+            is_degraded, reason = self.degrade_detector.check_degradation()
+            if is_degraded:
+                logger.warning(f"RL model degraded: {reason} - Disabling RL predictions")
+                self.use_rl = False
+    
+    def _get_massive_options_feed(self):
+        """Massive options feed (created on first use, shared with the market trader)"""
+        if self._massive_options_feed is None:
+            from services.polygon_options_feed import MassiveOptionsFeed
+            feed = MassiveOptionsFeed()
+            if Config.MARKET_DATA_DAEMON:
+                from services.market_data_daemon import via_daemon
+                feed = via_daemon(feed, 'massive_options')
+            self._massive_options_feed = feed
+            if self.market is not None and self.market._massive_options_feed is None:
+                self.market._massive_options_feed = feed
+        return self._massive_options_feed
+    
+    def _has_position(self, symbol: str) -> bool:
+        """Whether we already hold a position (stock or option) or an entry in flight on this underlying"""
+        for pos_symbol, pos in self.positions.items():
+            if pos.get('underlying') == symbol or pos_symbol == symbol:
+                return True
+        return any(entry['underlying'] == symbol for entry in self._pending_entries.values())
+    
+    @traced('scan_market')
+    def scan_market(self) -> Dict[str, Dict]:
+        """
+        Market-wide part of a scan, computed once and shared by many accounts
+        
+        Returns:
+            Signals for every configured ticker (see generate_signals); empty if the
+            market is closed or trading is blocked by the news filter
+        """
+        if not self._market_gates_open():
+            return {}
+        self._check_model_degradation()
+        return self.generate_signals(Config.TICKERS)
+    
+    @traced('scan')
+    def _scan_and_trade(self, signals: Optional[Dict[str, Dict]] = None):
+        """
+        Scan for trading opportunities
+        
+        Args:
+            signals: Precomputed market signals (multi-tenant engine); generated here if None
+        """
+        logger.info("_scan_and_trade() called - Starting scan")
+        
+        if signals is None:
+            if not self._market_gates_open():
+                return
+        elif not signals:
+            # Market gates were checked once by the market trader (closed / blocked, or nothing actionable)
+            logger.info("No shared market signals this cycle")
+            return
         
         # Get risk status
         risk_status = self.risk_manager.get_risk_status()
@@ -352,27 +591,42 @@ class IntegratedTrader:
             logger.warning(f"Trading blocked: {risk_status['risk_level']}")
             return
         
-        # Check model degradation
-        if self.degrade_detector:
-            is_degraded, reason = self.degrade_detector.check_degradation()
-            if is_degraded:
-                logger.warning(f"RL model degraded: {reason} - Disabling RL predictions")
-                self.use_rl = False
+        if signals is None:
+            # Check model degradation
+            self._check_model_degradation()
+            
+            # Analyze each ticker we do not already hold
+            logger.info(f"Scanning {len(Config.TICKERS)} tickers: {', '.join(Config.TICKERS)}")
+            signals_checked = len(Config.TICKERS)
+            signals = self.generate_signals([symbol for symbol in Config.TICKERS if not self._has_position(symbol)])
+        else:
+            signals_checked = len(signals)
+            signals = {symbol: signal for symbol, signal in signals.items() if not self._has_position(symbol)}
         
-        # Analyze each ticker
-        logger.info(f"Scanning {len(Config.TICKERS)} tickers: {', '.join(Config.TICKERS)}")
-        signals_found = 0
-        signals_checked = 0
+        signals_found = self._trade_signals(signals)
+        logger.info(f"Scan complete: {signals_found} signals found out of {signals_checked} tickers checked")
+    
+    def generate_signals(self, symbols: List[str]) -> Dict[str, Dict]:
+        """
+        Load bars, run the agents / RL model and pick the best signal per ticker
         
+        Uses only market data (no account state), so one call can serve many accounts.
+        
+        Args:
+            symbols: Tickers to analyze
+            
+        Returns:
+            {symbol: {'bars', 'current_price', 'signal'}} for tickers with an actionable signal
+        """
         end_date = datetime.now()
         start_date = end_date - timedelta(days=60)
         
         # Reset data validator for this cycle
         data_validator.reset_cycle()
         
-        for symbol in Config.TICKERS:
-            signals_checked += 1
-            
+        # Pass 1: load and validate bars for every eligible ticker
+        scan_inputs: Dict[str, Dict] = {}
+        for symbol in symbols:
             # ============================================================
             # ARCHITECT 3 & 4: TICKER TIER VALIDATION
             # ============================================================
@@ -383,18 +637,13 @@ class IntegratedTrader:
             
             logger.debug(f"[{symbol}] Tier: {ticker_config.tier.value} | Scalp allowed: {ticker_config.scalp_allowed}")
             
-            # Check if we already have an option position for this underlying
-            has_position = False
-            for pos_symbol in self.positions.keys():
-                pos = self.positions[pos_symbol]
-                if pos.get('underlying') == symbol or pos_symbol == symbol:
-                    has_position = True
-                    break
-            if has_position:
-                logger.debug(f"Skipping {symbol} - already have position")
-                continue
-            
             try:
+                if self.signal_mode == 'intraday':
+                    inputs = self._load_intraday_inputs(symbol)
+                    if inputs:
+                        scan_inputs[symbol] = inputs
+                    continue
+                
                 # ============================================================
                 # ARCHITECT 3 & 4: STRICT DATA SOURCE VALIDATION
                 # Massive REQUIRED for signals - NO Alpaca fallback for paper mode
@@ -424,6 +673,7 @@ class IntegratedTrader:
                         continue
                     else:
                         # Live mode: Alpaca data is real-time, fallback OK
+                        from alpaca_trade_api.rest import TimeFrame
                         bars = self.client.get_historical_bars(
                             symbol, TimeFrame.Day, start_date, end_date
                         )
@@ -447,12 +697,40 @@ class IntegratedTrader:
                 if current_price is None:
                     continue
                 
+                scan_inputs[symbol] = {'bars': bars, 'current_price': current_price}
+                
+            except Exception as e:
+                logger.error(f"Error scanning {symbol}: {e}", exc_info=True)
+        
+        # Batched RL inference: one forward pass for every ticker that has data
+        rl_predictions: Dict[str, Dict] = {}
+        if self.use_rl and scan_inputs and self.signal_mode == 'daily':
+            self._ensure_rl_loaded()
+        if self.use_rl and self.rl_predictor and scan_inputs and self.signal_mode == 'daily':
+            try:
+                with tracer.span('rl_batch'):
+                    rl_predictions = self.rl_predictor.predict_batch(
+                        {symbol: inputs['bars'] for symbol, inputs in scan_inputs.items()},
+                        {symbol: inputs['current_price'] for symbol, inputs in scan_inputs.items()}
+                    )
+            except Exception as e:
+                logger.error(f"Error in batched RL prediction: {e}")
+        
+        # Pass 2: combine agent / RL signals per ticker
+        results: Dict[str, Dict] = {}
+        for symbol, inputs in scan_inputs.items():
+            bars = inputs['bars']
+            
+            try:
                 # Get signals from multiple sources
                 signals = []
                 
                 # 1. Multi-agent system
                 logger.debug(f"Analyzing {symbol}...")
-                intent = self.orchestrator.analyze_symbol(symbol, bars)
+                if 'features' in inputs:
+                    intent = self.orchestrator.analyze_features(symbol, inputs['features'])
+                else:
+                    intent = self.orchestrator.analyze_symbol(symbol, bars)
                 if intent and intent.direction != TradeDirection.FLAT:
                     signals.append({
                         'source': 'multi_agent',
@@ -465,9 +743,9 @@ class IntegratedTrader:
                 # 2. RL predictor (if available)
                 rl_pred = None
                 if self.use_rl and self.rl_predictor:
-                    rl_pred = self.rl_predictor.predict(symbol, bars, current_price)
+                    rl_pred = rl_predictions.get(symbol)
                     # Phase-0: Raise confidence threshold to 0.7 (70%)
-                    if rl_pred['direction'] != 'FLAT' and rl_pred['confidence'] >= 0.7:
+                    if rl_pred and rl_pred['direction'] != 'FLAT' and rl_pred['confidence'] >= 0.7:
                         signals.append({
                             'source': 'rl',
                             'direction': rl_pred['direction'],
@@ -500,8 +778,32 @@ class IntegratedTrader:
                 else:
                     continue
                 
+                results[symbol] = {'bars': bars, 'current_price': inputs['current_price'], 'signal': best_signal}
+                
+            except Exception as e:
+                logger.error(f"Error scanning {symbol}: {e}", exc_info=True)
+        
+        return results
+    
+    def _trade_signals(self, signals: Dict[str, Dict]) -> int:
+        """
+        Risk-check, size and execute signals for this account
+        
+        Args:
+            signals: Output of generate_signals
+            
+        Returns:
+            Number of signals considered
+        """
+        signals_found = 0
+        for symbol, scan in signals.items():
+            bars = scan['bars']
+            current_price = scan['current_price']
+            best_signal = scan['signal']
+            
+            try:
                 # Check risk (only if we have a signal)
-                if 'best_signal' in locals() and best_signal:
+                if best_signal:
                     signals_found += 1
                     logger.info(f"Signal found for {symbol}: {best_signal['direction']} @ {best_signal['confidence']:.2%} ({best_signal.get('agent', 'Unknown')})")
                     
@@ -571,8 +873,36 @@ class IntegratedTrader:
             except Exception as e:
                 logger.error(f"Error scanning {symbol}: {e}", exc_info=True)
         
-        logger.info(f"Scan complete: {signals_found} signals found out of {signals_checked} tickers checked")
+        return signals_found
+    
+    @traced('intraday_inputs')
+    def _load_intraday_inputs(self, symbol: str) -> Optional[Dict]:
+        """
+        Append new 1-minute bars to the ticker's buffer and compute streaming features
+        
+        Returns:
+            Scan inputs ({'bars', 'current_price', 'features'}) or None to skip the ticker
+        """
+        self.intraday_bars.sync(symbol)
+        bars = self.intraday_bars.get_bars(symbol)
+        
+        is_fresh, age_seconds = validate_bar_age(bars, symbol, max_age_seconds=Config.INTRADAY_MAX_BAR_AGE_SECONDS)
+        if not is_fresh:
+            logger.warning(f"[{symbol}] SKIPPED: Stale intraday data ({age_seconds}s old)")
+            return None
+        
+        features = self.streaming_features.update(symbol, self.intraday_bars.get_buffer(symbol))
+        if not features:
+            logger.warning(f"Insufficient intraday data for {symbol}: {len(bars)} bars")
+            return None
+        
+        current_price = self.client.get_latest_price(symbol)
+        if current_price is None:
+            return None
+        
+        return {'bars': bars, 'current_price': current_price, 'features': features}
     
+    @traced('execute_trade')
     def _execute_trade(
         self,
         symbol: str,
@@ -728,8 +1058,7 @@ class IntegratedTrader:
             
             # Method 1: Use Massive for quotes (data provider)
             try:
-                from services.polygon_options_feed import MassiveOptionsFeed
-                massive_feed = MassiveOptionsFeed()
+                massive_feed = self._get_massive_options_feed()
                 if massive_feed.is_available():
                     # Get options chain which includes prices
                     exp_date_str = target_expiration.strftime('%Y-%m-%d') if isinstance(target_expiration, datetime) else str(target_expiration)
@@ -963,8 +1292,7 @@ class IntegratedTrader:
                         # Get price for OTM option from Massive
                         otm_price = None
                         try:
-                            from services.polygon_options_feed import MassiveOptionsFeed
-                            massive_feed = MassiveOptionsFeed()
+                            massive_feed = self._get_massive_options_feed()
                             if massive_feed.is_available():
                                 massive_chain = massive_feed.get_options_chain(
                                     symbol, 
@@ -1061,84 +1389,153 @@ class IntegratedTrader:
             except Exception as e:
                 logger.debug(f"Could not calculate limit price, using market order: {e}")
             
+            entry = {
+                'option_symbol': option_symbol,
+                'underlying': symbol,
+                'signal': signal,
+                'expiration': target_expiration,
+                'option_type': option_type,
+                'greeks': greeks,
+                'dte': dte
+            }
+            
             # Execute order (or simulate in dry-run)
             if self.dry_run:
                 logger.info(f"[DRY RUN] Would execute: {option_symbol} BUY {contracts} contracts @ ${option_price:.2f}")
-                order = {
-                    'status': 'filled',
-                    'filled_avg_price': option_price,
-                    'filled_qty': contracts,
-                    'symbol': option_symbol
-                }
+                self._on_entry_filled(entry, contracts, option_price)
             else:
-                # Execute options order via executor
-                if use_market or limit_price is None:
-                    order = self.executor.execute_market_order(
-                        symbol=option_symbol,
-                        qty=contracts,
-                        side='buy',
-                        is_option=True
-                    )
-                else:
-                    # Use limit order
-                    order = self.executor.execute_limit_order(
-                        symbol=option_symbol,
-                        qty=contracts,
-                        side='buy',
-                        limit_price=limit_price,
-                        is_option=True,
-                        time_in_force='day'
-                    )
-                    
-                    # If limit order not filled immediately, fallback to market
-                    if order and order.get('status') not in ['filled', 'partially_filled']:
-                        logger.info(f"Limit order not filled, falling back to market order")
-                        order = self.executor.execute_market_order(
-                            symbol=option_symbol,
-                            qty=contracts,
-                            side='buy',
-                            is_option=True
-                        )
+                # Submitted on the order pool; fills are applied at the start of a later cycle
+                self._submit_entry(entry, contracts, None if use_market else limit_price)
             
-            if order and order.get('status') == 'filled':
-                filled_price = order.get('filled_avg_price', option_price)
-                filled_qty = order.get('filled_qty', contracts)
-                
-                # Add to position tracking (use option symbol)
-                self.positions[option_symbol] = {
-                    'qty': filled_qty,
-                    'entry_price': filled_price,
-                    'side': 'long',  # Always 'long' because we're buying options
-                    'agent_name': signal.get('agent', 'Unknown'),
-                    'entry_time': datetime.now(),
-                    'current_qty': filled_qty,
-                    'underlying': symbol,
-                    'expiration': target_expiration,
-                    'option_type': option_type,  # 'call' for LONG, 'put' for SHORT
-                    'instrument_type': 'option',
-                    'signal_direction': signal['direction']  # Track original signal direction
-                }
-                
-                # Add to profit manager
-                self.profit_manager.add_position(
-                    option_symbol, filled_qty, filled_price, 'long'
-                )
-                
-                logger.info(f"✅ OPTIONS TRADE EXECUTED: {option_symbol} BUY {filled_qty} contracts @ ${filled_price:.2f}")
-                logger.info(f"   Underlying: {symbol}")
-                logger.info(f"   Option Type: {option_type.upper()} ({'CALL' if option_type == 'call' else 'PUT'})")
-                logger.info(f"   Signal Direction: {signal['direction']}")
-                logger.info(f"   Expiration: {target_expiration} (DTE: {(target_expiration - today).days})")
-                logger.info(f"   Signal: {signal['source']} ({signal['agent']})")
-                logger.info(f"   Confidence: {signal['confidence']:.2%}")
-                
         except Exception as e:
             logger.error(f"Error executing options trade for {symbol}: {e}", exc_info=True)
     
-    def _get_total_options_exposure(self) -> float:
+    def _submit_entry(self, entry: Dict, contracts: int, limit_price: Optional[float] = None):
+        """
+        Submit an entry without blocking the cycle
+        
+        A limit entry that the broker does not fill on acceptance is cancelled and,
+        once the cancel is confirmed, replaced by a market order for the unfilled rest
+        (waiting for the cancel means the limit and the market order never both fill).
+        """
+        option_symbol = entry['option_symbol']
+        self._pending_entries[option_symbol] = entry
+        
+        def on_fill(handle):
+            self._entry_results.append((entry, handle.filled_qty, handle.filled_avg_price))
+        
+        def on_market_done(future):
+            if future.result() is None:
+                self._entry_results.append((entry, 0, None))
+        
+        def submit_market(qty):
+            handle = self.executor.submit_market_order(
+                option_symbol, qty, 'buy', is_option=True, on_fill=on_fill,
+                on_cancel=lambda h: self._entry_results.append((entry, h.filled_qty, h.filled_avg_price))
+            )
+            handle.submitted.add_done_callback(on_market_done)
+        
+        if limit_price is None:
+            submit_market(contracts)
+            return
+        
+        def on_limit_cancel(handle):
+            remaining = contracts - int(handle.filled_qty)
+            if remaining > 0:
+                logger.info(f"Limit order not filled, falling back to market order for {remaining} {option_symbol}")
+                submit_market(remaining)  # Before recording the partial fill, so the entry stays pending
+            if handle.filled_qty:
+                self._entry_results.append((entry, handle.filled_qty, handle.filled_avg_price))
+        
+        def on_limit_accepted(future):
+            order = future.result()
+            if order is None:
+                self._entry_results.append((entry, 0, None))
+            elif order.get('status') not in ['filled', 'partially_filled']:
+                self.executor.order_manager.cancel(handle.id)
+        
+        handle = self.executor.submit_limit_order(
+            option_symbol, contracts, 'buy', limit_price,
+            is_option=True, time_in_force='day', on_fill=on_fill, on_cancel=on_limit_cancel
+        )
+        handle.submitted.add_done_callback(on_limit_accepted)
+    
+    def _apply_entry_results(self):
+        """Apply completed entry orders to position tracking (trading thread only)"""
+        while self._entry_results:
+            entry, filled_qty, filled_price = self._entry_results.popleft()
+            if filled_qty:
+                self._on_entry_filled(entry, filled_qty, filled_price)
+            elif entry['option_symbol'] not in self.positions:
+                logger.error(f"❌ Entry order for {entry['option_symbol']} failed or was cancelled unfilled")
+            if not self.executor.order_manager.orders_for(entry['option_symbol'], open_only=True):
+                self._pending_entries.pop(entry['option_symbol'], None)
+    
+    def _on_entry_filled(self, entry: Dict, filled_qty: float, filled_price: float):
+        """Track a filled entry (position, profit manager, Greeks, quote stream)"""
+        option_symbol = entry['option_symbol']
+        symbol = entry['underlying']
+        signal = entry['signal']
+        option_type = entry['option_type']
+        greeks = entry['greeks']
+        
+        if option_symbol in self.positions:
+            # Remainder of a partially filled entry: add to the position at the average price
+            position = self.positions[option_symbol]
+            total_qty = position['qty'] + filled_qty
+            filled_price = (position['entry_price'] * position['qty'] + filled_price * filled_qty) / total_qty
+            filled_qty = total_qty
+        
+        # Add to position tracking (use option symbol)
+        self.positions[option_symbol] = {
+            'qty': filled_qty,
+            'entry_price': filled_price,
+            'side': 'long',  # Always 'long' because we're buying options
+            'agent_name': signal.get('agent', 'Unknown'),
+            'entry_time': datetime.now(),
+            'current_qty': filled_qty,
+            'underlying': symbol,
+            'expiration': entry['expiration'],
+            'option_type': option_type,  # 'call' for LONG, 'put' for SHORT
+            'instrument_type': 'option',
+            'signal_direction': signal['direction']  # Track original signal direction
+        }
+        
+        # Add to profit manager
+        self.profit_manager.add_position(
+            option_symbol, filled_qty, filled_price, 'long'
+        )
+        
+        # Add to portfolio Greeks tracking (Phase C)
+        if greeks:
+            self.options_risk_manager.update_position_greeks(PositionGreeks(
+                symbol=option_symbol,
+                delta=greeks['delta'],
+                gamma=greeks['gamma'],
+                theta=greeks['theta'],
+                vega=greeks['vega'],
+                qty=int(filled_qty),
+                dte=entry['dte'],
+                iv=greeks['iv'],
+                underlying_price=greeks['underlying_price']
+            ))
+        
+        # Stream the contract's quotes (no-op without an options stream)
+        market_data.subscribe_options([option_symbol])
+        
+        logger.info(f"✅ OPTIONS TRADE EXECUTED: {option_symbol} BUY {filled_qty} contracts @ ${filled_price:.2f}")
+        logger.info(f"   Underlying: {symbol}")
+        logger.info(f"   Option Type: {option_type.upper()} ({'CALL' if option_type == 'call' else 'PUT'})")
+        logger.info(f"   Signal Direction: {signal['direction']}")
+        logger.info(f"   Expiration: {entry['expiration']} (DTE: {entry['dte']})")
+        logger.info(f"   Signal: {signal['source']} ({signal['agent']})")
+        logger.info(f"   Confidence: {signal['confidence']:.2%}")
+    
+    def _get_total_options_exposure(self, positions: Optional[List[Dict]] = None) -> float:
         """Calculate total options exposure (cost basis of all option positions)"""
         try:
-            positions = self.client.get_positions()
+            if positions is None:
+                positions = self.client.get_positions()
             total_exposure = 0.0
             
             for pos in positions:
@@ -1152,330 +1549,80 @@ class IntegratedTrader:
             logger.error(f"Error calculating options exposure: {e}")
             return 0.0
     
-    def _check_dte_exits(self):
+    @traced('exits')
+    def _check_exits(self, broker_positions: List[Dict], skip: Optional[set] = None):
         """
-        Phase B: Check all positions for DTE-based forced exits
+        Evaluate all exit rules over one positions snapshot and submit the exits
         
-        ARCHITECT 4 RULES:
-        - 0DTE: Exit 2 hours before close if P&L < 10%
-        - 1-3 DTE: Apply DTE exit rules from OptionsRiskManager
+        Args:
+            broker_positions: Alpaca positions snapshot
+            skip: Symbols already exited this cycle
         """
+        # Exits still in flight (awaiting acceptance or fill) from earlier cycles: the
+        # snapshot still shows the position, so evaluating it again would sell twice
+        in_flight = {h.symbol for h in self.executor.order_manager.open_orders() if h.side == 'sell'}
+        skip = set(skip or ()) | in_flight
         try:
-            import pytz
-            ET = pytz.timezone('America/New_York')
-            
-            positions = self.client.get_positions()
-            today = datetime.now().date()
-            now_et = datetime.now(ET)
-            current_time = now_et.time()
-            
-            # Calculate minutes until market close (4 PM ET)
-            market_close_hour = 16
-            market_close_minute = 0
-            minutes_to_close = (market_close_hour - current_time.hour) * 60 + (market_close_minute - current_time.minute)
-            
-            for pos in positions:
-                symbol = pos.get('symbol', '')
-                unrealized_plpc = float(pos.get('unrealized_plpc', 0))
-                qty = int(float(pos.get('qty', 0)))
-                
-                # Skip non-options or empty positions
-                if len(symbol) <= 10 or qty <= 0:
-                    continue
-                
-                # Parse DTE from option symbol (format: SYMBOL YYMMDD C/P STRIKE)
-                try:
-                    # Extract expiration from option symbol (e.g., NVDA250117P00140000)
-                    # Find the date portion (6 digits after the underlying)
-                    import re
-                    match = re.search(r'(\d{6})[CP]', symbol)
-                    if match:
-                        exp_str = match.group(1)
-                        exp_date = datetime.strptime(exp_str, '%y%m%d').date()
-                        dte = (exp_date - today).days
-                        
-                        # ============================================================
-                        # ARCHITECT 4: STRICT 0DTE TIME-BASED EXIT
-                        # Exit 2 hours (120 min) before close if profit < 10%
-                        # ============================================================
-                        if dte == 0 and minutes_to_close <= 120:
-                            if unrealized_plpc < 0.10:  # Less than 10% profit
-                                logger.warning(f"⏰ 0DTE TIME EXIT: {symbol} | {minutes_to_close} min to close | P&L={unrealized_plpc:.1%} < 10%")
-                                self._execute_forced_exit(symbol, qty, f"0DTE time exit ({minutes_to_close} min to close)")
-                                continue
-                        
-                        # Check playbook time-based exits
-                        should_exit_time, time_reason = playbook_manager.check_time_exit(dte, unrealized_plpc)
-                        if should_exit_time:
-                            logger.warning(f"⏰ PLAYBOOK TIME EXIT: {symbol} | {time_reason}")
-                            self._execute_forced_exit(symbol, qty, time_reason)
-                            continue
-                        
-                        # Check DTE exit rules
-                        should_exit, reason = self.options_risk_manager.check_dte_exit(
-                            symbol, dte, unrealized_plpc
-                        )
-                        
-                        if should_exit:
-                            logger.warning(f"🕐 DTE EXIT: {symbol} (DTE={dte}, P&L={unrealized_plpc:.1%})")
-                            try:
-                                from core.live.options_broker_client import OptionsBrokerClient
-                                options_client = OptionsBrokerClient(self.client)
-                                result = options_client.place_option_order(
-                                    option_symbol=symbol,
-                                    qty=qty,
-                                    side='sell',
-                                    order_type='market'
-                                )
-                                if result:
-                                    logger.info(f"✅ DTE EXIT EXECUTED: Sold {qty} {symbol}")
-                                    if symbol in self.positions:
-                                        del self.positions[symbol]
-                                    # Remove from Greeks tracking
-                                    self.options_risk_manager.remove_position_greeks(symbol)
-                            except Exception as e:
-                                logger.error(f"Error executing DTE exit for {symbol}: {e}")
-                except Exception as e:
-                    logger.debug(f"Could not parse DTE from {symbol}: {e}")
-        
+            orders = self.exit_engine.evaluate(broker_positions, skip=skip)
+            if orders:
+                self._submit_exits(orders)
         except Exception as e:
-            logger.error(f"Error in DTE exit check: {e}")
+            logger.error(f"Error checking exits: {e}", exc_info=True)
     
-    def _execute_forced_exit(self, symbol: str, qty: int, reason: str):
+    def _submit_exits(self, orders: List[ExitOrder], wait_seconds: float = 10.0):
         """
-        Execute a forced exit for a position
+        Submit exit orders through the async order manager and update tracking
+        as each one is accepted (waits at most `wait_seconds` for acceptance, so a
+        slow order cannot stall the cycle; later acceptances are applied at the
+        start of the next cycle, always on the trading thread)
         
-        Args:
-            symbol: Option symbol
-            qty: Number of contracts to sell
-            reason: Reason for the exit
+        Exits are sent once, without retry: a submission that times out may still
+        have reached the broker, and a retried market sell could close twice.
         """
-        try:
-            from core.live.options_broker_client import OptionsBrokerClient
-            options_client = OptionsBrokerClient(self.client)
-            
-            result = options_client.place_option_order(
-                option_symbol=symbol,
-                qty=qty,
-                side='sell',
-                order_type='market'
+        from concurrent.futures import wait
+        
+        handles = []
+        for order in orders:
+            level = logging.INFO if order.rule.startswith('tp') else logging.WARNING
+            logger.log(level, f"🚪 EXIT {order.rule.upper()}: {order.symbol} | {order.reason} | "
+                              f"selling {order.qty} contracts")
+            handle = self.executor.submit_market_order(
+                order.symbol, order.qty, 'sell', is_option=True,
+                on_fill=lambda h: logger.info(f"Exit filled: {h.symbol} {h.filled_qty:.0f} @ {h.filled_avg_price}"),
+                retry=False
             )
-            
-            if result:
-                logger.info(f"✅ FORCED EXIT EXECUTED: Sold {qty} {symbol} | Reason: {reason}")
-                if symbol in self.positions:
-                    del self.positions[symbol]
-                # Remove from Greeks tracking
-                self.options_risk_manager.remove_position_greeks(symbol)
-            else:
-                logger.error(f"❌ Failed to execute forced exit for {symbol}")
-                
-        except Exception as e:
-            logger.error(f"Error executing forced exit for {symbol}: {e}")
-    
-    def _check_stop_losses(self):
-        """Check all positions for stop-loss triggers and close if needed"""
-        try:
-            positions = self.client.get_positions()
-            stop_loss_pct = getattr(Config, 'STOP_LOSS_PCT', 0.20)  # 20% default
-            
-            for pos in positions:
-                symbol = pos.get('symbol', '')
-                unrealized_plpc = float(pos.get('unrealized_plpc', 0))
-                unrealized_pl = float(pos.get('unrealized_pl', 0))
-                
-                # Check if loss exceeds stop-loss threshold
-                if unrealized_plpc <= -stop_loss_pct:
-                    logger.warning(f"🔴 STOP-LOSS TRIGGERED for {symbol}:")
-                    logger.warning(f"   Loss: ${unrealized_pl:.2f} ({unrealized_plpc*100:.1f}%)")
-                    logger.warning(f"   Threshold: -{stop_loss_pct*100:.0f}%")
-                    
-                    # Close the position
-                    try:
-                        qty = int(float(pos.get('qty', 0)))
-                        if qty > 0:
-                            # Place sell order using existing client
-                            from core.live.options_broker_client import OptionsBrokerClient
-                            options_client = OptionsBrokerClient(self.client)  # FIXED: Pass AlpacaClient instance
-                            result = options_client.place_option_order(
-                                option_symbol=symbol,
-                                qty=qty,
-                                side='sell',
-                                order_type='market'
-                            )
-                            if result:
-                                logger.info(f"✅ STOP-LOSS EXECUTED: Sold {qty} {symbol}")
-                                # Remove from positions tracking
-                                if symbol in self.positions:
-                                    del self.positions[symbol]
-                            else:
-                                logger.error(f"❌ Failed to execute stop-loss for {symbol}")
-                    except Exception as e:
-                        logger.error(f"Error executing stop-loss for {symbol}: {e}", exc_info=True)
-                
-                # Also warn about positions approaching stop-loss
-                elif unrealized_plpc <= -(stop_loss_pct * 0.75):  # Warn at 75% of stop-loss
-                    logger.warning(f"⚠️  {symbol} approaching stop-loss: {unrealized_plpc*100:.1f}% (trigger at -{stop_loss_pct*100:.0f}%)")
+            handle.submitted.add_done_callback(lambda f, order=order: self._exit_results.append((order, f.result())))
+            handles.append(handle)
         
-        except Exception as e:
-            logger.error(f"Error checking stop-losses: {e}")
+        _, pending = wait([h.submitted for h in handles], timeout=wait_seconds)
+        if pending:
+            logger.warning(f"{len(pending)} exit orders still awaiting broker acceptance")
+        self._apply_exit_results()
     
-    def _check_profit_targets(self):
-        """Check all positions for profit-taking opportunities (queries Alpaca directly)"""
-        try:
-            positions = self.client.get_positions()
-            
-            # Profit target levels from config
-            tp1_pct = getattr(Config, 'TP1_PCT', 0.40)  # 40%
-            tp2_pct = getattr(Config, 'TP2_PCT', 0.60)  # 60%
-            tp3_pct = getattr(Config, 'TP3_PCT', 1.00)  # 100%
-            
-            # Exit percentages
-            tp1_exit = getattr(Config, 'TP1_EXIT_PCT', 0.50)  # 50%
-            tp2_exit = getattr(Config, 'TP2_EXIT_PCT', 0.20)  # 20%
-            tp3_exit = getattr(Config, 'TP3_EXIT_PCT', 0.10)  # 10%
-            
-            for pos in positions:
-                symbol = pos.get('symbol', '')
-                unrealized_plpc = float(pos.get('unrealized_plpc', 0))
-                unrealized_pl = float(pos.get('unrealized_pl', 0))
-                qty = int(float(pos.get('qty', 0)))
-                
-                # Skip if not in profit or qty too low
-                if unrealized_plpc <= 0 or qty <= 0:
-                    continue
-                
-                # Determine which TP level and exit qty
-                exit_qty = 0
-                tp_level = ""
-                
-                if unrealized_plpc >= tp3_pct:  # 100%+
-                    exit_qty = max(1, int(qty * tp3_exit))
-                    tp_level = "TP3 (100%+)"
-                elif unrealized_plpc >= tp2_pct:  # 60%+
-                    exit_qty = max(1, int(qty * tp2_exit))
-                    tp_level = "TP2 (60%+)"
-                elif unrealized_plpc >= tp1_pct:  # 40%+
-                    exit_qty = max(1, int(qty * tp1_exit))
-                    tp_level = "TP1 (40%+)"
-                
-                if exit_qty > 0:
-                    logger.info(f"🎯 PROFIT TARGET HIT for {symbol}:")
-                    logger.info(f"   Profit: ${unrealized_pl:.2f} ({unrealized_plpc*100:.1f}%)")
-                    logger.info(f"   Level: {tp_level}")
-                    logger.info(f"   Exiting: {exit_qty} of {qty} contracts")
-                    
-                    try:
-                        from core.live.options_broker_client import OptionsBrokerClient
-                        options_client = OptionsBrokerClient(self.client)
-                        result = options_client.place_option_order(
-                            option_symbol=symbol,
-                            qty=exit_qty,
-                            side='sell',
-                            order_type='market'
-                        )
-                        if result:
-                            logger.info(f"✅ PROFIT TAKEN: Sold {exit_qty} {symbol} @ {tp_level}")
-                        else:
-                            logger.error(f"❌ Failed to take profit for {symbol}")
-                    except Exception as e:
-                        logger.error(f"Error taking profit for {symbol}: {e}", exc_info=True)
-                
-                # Log positions approaching profit targets
-                elif unrealized_plpc >= (tp1_pct * 0.80):  # 80% of TP1
-                    logger.info(f"📈 {symbol} approaching TP1: {unrealized_plpc*100:.1f}% (trigger at {tp1_pct*100:.0f}%)")
-        
-        except Exception as e:
-            logger.error(f"Error checking profit targets: {e}")
+    def _apply_exit_results(self):
+        """Apply completed exit submissions to position tracking (trading thread only)"""
+        while self._exit_results:
+            order, result = self._exit_results.popleft()
+            self._on_exit_submitted(order, result)
     
-    def _check_trailing_stops(self):
-        """
-        Check dynamic trailing stops based on peak P&L.
-        Tiered pullback allowances:
-        - Peak P&L > 100% → Allow 10% pullback
-        - Peak P&L > 80%  → Allow 12% pullback
-        - Peak P&L > 60%  → Allow 15% pullback
-        - Peak P&L > 40%  → Allow 18% pullback
-        """
-        try:
-            positions = self.client.get_positions()
-            
-            # Get trailing stop tiers from config
-            trailing_tiers = getattr(Config, 'TRAILING_STOP_TIERS', [
-                (1.00, 0.10),  # Peak > 100% → 10% pullback
-                (0.80, 0.12),  # Peak > 80% → 12% pullback
-                (0.60, 0.15),  # Peak > 60% → 15% pullback
-                (0.40, 0.18),  # Peak > 40% → 18% pullback
-            ])
-            activation_pct = getattr(Config, 'TRAILING_STOP_ACTIVATION_PCT', 0.40)
-            
-            for pos in positions:
-                symbol = pos.get('symbol', '')
-                unrealized_plpc = float(pos.get('unrealized_plpc', 0))
-                unrealized_pl = float(pos.get('unrealized_pl', 0))
-                qty = int(float(pos.get('qty', 0)))
-                
-                if qty <= 0:
-                    continue
-                
-                # Update peak P&L tracker
-                current_peak = self.peak_pnl_tracker.get(symbol, 0)
-                if unrealized_plpc > current_peak:
-                    self.peak_pnl_tracker[symbol] = unrealized_plpc
-                    current_peak = unrealized_plpc
-                    logger.debug(f"📊 {symbol} new peak P&L: {current_peak*100:.1f}%")
-                
-                # Skip if never reached activation threshold
-                if current_peak < activation_pct:
-                    continue
-                
-                # Determine allowed pullback based on peak
-                allowed_pullback = 0.18  # Default 18%
-                for tier_pct, pullback_pct in trailing_tiers:
-                    if current_peak >= tier_pct:
-                        allowed_pullback = pullback_pct
-                        break
-                
-                # Calculate trailing stop level
-                trailing_stop_level = current_peak - allowed_pullback
-                
-                # Check if current P&L fell below trailing stop
-                if unrealized_plpc < trailing_stop_level:
-                    logger.warning(f"🔔 TRAILING STOP TRIGGERED for {symbol}:")
-                    logger.warning(f"   Peak P&L: {current_peak*100:.1f}%")
-                    logger.warning(f"   Current P&L: {unrealized_plpc*100:.1f}%")
-                    logger.warning(f"   Allowed pullback: {allowed_pullback*100:.0f}%")
-                    logger.warning(f"   Trailing stop: {trailing_stop_level*100:.1f}%")
-                    
-                    # Close the position
-                    try:
-                        from core.live.options_broker_client import OptionsBrokerClient
-                        options_client = OptionsBrokerClient(self.client)
-                        result = options_client.place_option_order(
-                            option_symbol=symbol,
-                            qty=qty,
-                            side='sell',
-                            order_type='market'
-                        )
-                        if result:
-                            logger.info(f"✅ TRAILING STOP EXECUTED: Sold {qty} {symbol}")
-                            logger.info(f"   Locked in: {unrealized_plpc*100:.1f}% profit (was {current_peak*100:.1f}% peak)")
-                            # Remove from peak tracker
-                            if symbol in self.peak_pnl_tracker:
-                                del self.peak_pnl_tracker[symbol]
-                        else:
-                            logger.error(f"❌ Failed to execute trailing stop for {symbol}")
-                    except Exception as e:
-                        logger.error(f"Error executing trailing stop for {symbol}: {e}", exc_info=True)
-                
-                # Log positions approaching trailing stop
-                elif unrealized_plpc < (trailing_stop_level + 0.05) and current_peak >= activation_pct:
-                    logger.info(f"⚠️  {symbol} approaching trailing stop:")
-                    logger.info(f"   Current: {unrealized_plpc*100:.1f}%, Peak: {current_peak*100:.1f}%, Trail: {trailing_stop_level*100:.1f}%")
-        
-        except Exception as e:
-            logger.error(f"Error checking trailing stops: {e}")
+    def _on_exit_submitted(self, order: ExitOrder, result: Optional[Dict]):
+        """Update position tracking once an exit order is accepted"""
+        if not result:
+            logger.error(f"❌ Failed to execute {order.rule} exit for {order.symbol}")
+            return
+        logger.info(f"✅ EXIT EXECUTED: Sold {order.qty} {order.symbol} ({order.rule})")
+        if order.full_exit:
+            self.positions.pop(order.symbol, None)
+            self.exit_engine.position_closed(order.symbol)
+            self.options_risk_manager.remove_position_greeks(order.symbol)
+            return
+        if order.symbol in self.positions:
+            self.positions[order.symbol]['current_qty'] = self.positions[order.symbol].get('current_qty', 0) - order.qty
+        if order.symbol in self.options_risk_manager.position_greeks:
+            remaining = self.options_risk_manager.position_greeks[order.symbol].qty - order.qty
+            self.options_risk_manager.update_position_qty(order.symbol, max(0, remaining))
     
+    @traced('status')
     def _log_status(self):
         """Log current status"""
         account = self.client.get_account()
@@ -1486,6 +1633,16 @@ class IntegratedTrader:
                    f"Positions={len(self.positions)}, "
                    f"Risk={risk_status['risk_level']}, "
                    f"Daily P&L=${risk_status['daily_pnl']:.2f}")
+        
+        if market_data.is_streaming:
+            stream = market_data.stats()
+            max_age = stream['max_quote_age']
+            logger.info(f"Market data: {stream['symbols']} symbols, {stream['messages_per_second']:.1f} msg/s, "
+                        f"max quote age {max_age:.1f}s" if max_age is not None else
+                        f"Market data: no quotes yet ({', '.join(stream['sources'])})")
+        
+        if tracer.cycles and tracer.cycles % 10 == 0:
+            logger.info(tracer.report())
     
     def get_status_report(self) -> Dict:
         """Get comprehensive status report"""
@@ -0,0 +1,408 @@
+"""
+Metrics Registry
+In-process counters, gauges and histograms for trader internals
+
+Exported two ways:
+- MetricsServer: local HTTP endpoint, /metrics (Prometheus text format) and
+  /health (heartbeat JSON)
+- Heartbeat: a small memory-mapped file (under /dev/shm where available) that a
+  background thread rewrites every few seconds with pid, last cycle time and key
+  metrics. Readers (watchdog, dashboards) map the same file and read it without
+  HTTP, log parsing or spawning ps. Writes use a sequence counter so a reader
+  never sees a half-written record.
+"""
+import functools
+import json
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+def _label_key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    items = list(key) + ([extra] if extra else [])
+    if not items:
+        return ''
+    return '{' + ','.join(f'{k}="{v}"' for k, v in items) + '}'
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self._lock = threading.Lock()
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"] + self._samples()
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+class Counter(_Metric):
+    """Monotonic count per label set"""
+    kind = 'counter'
+
+    def __init__(self, name: str, help_text: str):
+        super().__init__(name, help_text)
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(_label_key(labels), 0.0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(key)} {value:g}" for key, value in items]
+
+class Gauge(_Metric):
+    """Last value per label set"""
+    kind = 'gauge'
+
+    def __init__(self, name: str, help_text: str):
+        super().__init__(name, help_text)
+        self._values: Dict[LabelKey, float] = {}
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[_label_key(labels)] = float(value)
+
+    def value(self, **labels) -> Optional[float]:
+        return self._values.get(_label_key(labels))
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(key)} {value:g}" for key, value in items]
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram (seconds) per label set"""
+    kind = 'histogram'
+
+    def __init__(self, name: str, help_text: str, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text)
+        self.buckets = tuple(sorted(buckets))
+        self._values: Dict[LabelKey, List] = {}  # key -> [bucket counts..., sum, count]
+
+    def observe(self, value: float, **labels):
+        key = _label_key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+            if index < len(self.buckets):
+                entry[index] += 1
+            entry[-2] += value
+            entry[-1] += 1
+
+    def count(self, **labels) -> int:
+        entry = self._values.get(_label_key(labels))
+        return entry[-1] if entry else 0
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = [(key, list(entry)) for key, entry in self._values.items()]
+        lines = []
+        for key, entry in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets, entry):
+                cumulative += n
+                lines.append(f"{self.name}_bucket{_format_labels(key, ('le', f'{bound:g}'))} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels(key, ('le', '+Inf'))} {entry[-1]}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {entry[-2]:g}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {entry[-1]}")
+        return lines
+
+class MetricsRegistry:
+    """Named metrics plus collectors evaluated at export time"""
+
+    def __init__(self, prefix: str = 'tradenova_'):
+        self.prefix = prefix
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name: str, help_text: str, **kwargs):
+        full_name = self.prefix + name
+        with self._lock:
+            metric = self._metrics.get(full_name)
+            if metric is None:
+                metric = self._metrics[full_name] = cls(full_name, help_text, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {full_name} already registered as {metric.kind}")
+            return metric
+
+    def counter(self, name: str, help_text: str = '') -> Counter:
+        return self._get(Counter, name, help_text)
+
+    def gauge(self, name: str, help_text: str = '') -> Gauge:
+        return self._get(Gauge, name, help_text)
+
+    def histogram(self, name: str, help_text: str = '', buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get(Histogram, name, help_text, buckets=buckets)
+
+    def add_collector(self, collector: Callable[[], None]):
+        """Callback run before each export (e.g. to refresh gauges from a cache)"""
+        self._collectors.append(collector)
+
+    def collect(self):
+        for collector in self._collectors:
+            try:
+                collector()
+            except Exception as e:
+                logger.debug(f"Metrics collector failed: {e}")
+
+    def render_text(self) -> str:
+        """All metrics in Prometheus text exposition format"""
+        self.collect()
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+# ========== INSTRUMENTATION ==========
+
+# Global instance
+metrics = MetricsRegistry()
+
+CYCLE_SECONDS = metrics.histogram('cycle_duration_seconds', 'Trading cycle wall time')
+CYCLES = metrics.counter('cycles_total', 'Completed trading cycles')
+LAST_CYCLE = metrics.gauge('last_cycle_timestamp_seconds', 'Unix time the last cycle finished')
+API_CALLS = metrics.counter('api_calls_total', 'Broker / data API calls by endpoint')
+API_ERRORS = metrics.counter('api_errors_total', 'Broker / data API calls that raised, by endpoint')
+API_SECONDS = metrics.histogram('api_call_duration_seconds', 'Broker / data API call latency by endpoint')
+CACHE_REQUESTS = metrics.counter('cache_requests_total', 'Cache lookups by cache and result (hit / miss)')
+OPEN_POSITIONS = metrics.gauge('open_positions', 'Positions tracked by the trader')
+QUOTE_AGE = metrics.gauge('quote_age_seconds', 'Streamed quote age (max / median)')
+ORDER_SECONDS = metrics.histogram('order_latency_seconds', 'Order latency by stage (submit / fill)')
+
+def record_cycle(seconds: float, open_positions: int, **labels):
+    CYCLE_SECONDS.observe(seconds, **labels)
+    CYCLES.inc(**labels)
+    LAST_CYCLE.set(time.time(), **labels)
+    OPEN_POSITIONS.set(open_positions, **labels)
+
+def record_cache(cache: str, hit: bool):
+    CACHE_REQUESTS.inc(cache=cache, result='hit' if hit else 'miss')
+
+def cache_hit_ratios() -> Dict[str, float]:
+    """Hit ratio per cache"""
+    totals: Dict[str, List[float]] = {}
+    for key, value in list(CACHE_REQUESTS._values.items()):
+        labels = dict(key)
+        entry = totals.setdefault(labels['cache'], [0.0, 0.0])
+        entry[0 if labels['result'] == 'hit' else 1] += value
+    return {cache: hits / (hits + misses) for cache, (hits, misses) in totals.items() if hits + misses}
+
+def instrument_api(endpoint: str) -> Callable:
+    """Decorator: count calls / errors and time latency for an API endpoint (also traced as a span)"""
+    from core.live.cycle_tracer import traced
+
+    def decorator(fn):
+        traced_fn = traced(endpoint)(fn)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return traced_fn(*args, **kwargs)
+            except Exception:
+                API_ERRORS.inc(endpoint=endpoint)
+                raise
+            finally:
+                API_CALLS.inc(endpoint=endpoint)
+                API_SECONDS.observe(time.perf_counter() - start, endpoint=endpoint)
+        return wrapper
+    return decorator
+
+def _collect_quote_age():
+    from services.market_data_stream import market_data
+    if market_data.is_streaming:
+        stats = market_data.stats()
+        for stat in ('max', 'median'):
+            value = stats.get(f'{stat}_quote_age')
+            if value is not None:
+                QUOTE_AGE.set(value, stat=stat)
+
+metrics.add_collector(_collect_quote_age)
+
+def health_snapshot() -> Dict:
+    """Compact health summary (heartbeat payload)"""
+    metrics.collect()
+    last_cycle = LAST_CYCLE.value()
+    return {
+        'pid': os.getpid(),
+        'time': time.time(),
+        'last_cycle_at': last_cycle,
+        'cycles': CYCLES.value(),
+        'open_positions': OPEN_POSITIONS.value(),
+        'max_quote_age': QUOTE_AGE.value(stat='max'),
+        'api_calls': sum(API_CALLS._values.values()),
+        'api_errors': sum(API_ERRORS._values.values()),
+        'cache_hit_ratios': cache_hit_ratios(),
+    }
+
+# ========== HEARTBEAT ==========
+
+HEADER = struct.Struct('<4sQdI')  # magic, sequence, written at, payload length
+MAGIC = b'TNHB'
+HEARTBEAT_SIZE = 4096
+
+def default_heartbeat_path() -> Path:
+    shm = Path('/dev/shm')
+    return (shm if shm.is_dir() else Path(tempfile.gettempdir())) / 'tradenova_heartbeat'
+
+class Heartbeat:
+    """Periodically rewritten memory-mapped health record"""
+
+    def __init__(self, path: Optional[Path] = None, interval_seconds: float = 5.0,
+                 snapshot: Callable[[], Dict] = health_snapshot):
+        self.path = Path(path or default_heartbeat_path())
+        self.interval_seconds = interval_seconds
+        self.snapshot = snapshot
+        self._seq = 0
+        self._map: Optional[mmap.mmap] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _open(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            os.ftruncate(fd, HEARTBEAT_SIZE)
+            self._map = mmap.mmap(fd, HEARTBEAT_SIZE)
+        finally:
+            os.close(fd)
+
+    def beat(self, payload: Optional[Dict] = None):
+        """Write one heartbeat record"""
+        if self._map is None:
+            self._open()
+        data = json.dumps(payload if payload is not None else self.snapshot(), default=str).encode()
+        if len(data) > HEARTBEAT_SIZE - HEADER.size:
+            data = json.dumps({'pid': os.getpid(), 'time': time.time(), 'truncated': True}).encode()
+        # Odd sequence marks a write in progress; readers retry until it is even and unchanged
+        self._seq += 1
+        HEADER.pack_into(self._map, 0, MAGIC, self._seq, time.time(), 0)
+        self._map[HEADER.size:HEADER.size + len(data)] = data
+        self._seq += 1
+        HEADER.pack_into(self._map, 0, MAGIC, self._seq, time.time(), len(data))
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="heartbeat", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.beat()
+            except Exception as e:
+                logger.warning(f"Heartbeat write failed: {e}")
+            self._stop.wait(self.interval_seconds)
+
+    def stop(self):
+        self._stop.set()
+
+def read_heartbeat(path: Optional[Path] = None, retries: int = 5) -> Optional[Dict]:
+    """
+    Read the latest heartbeat record
+
+    Returns:
+        Payload dict plus 'age_seconds' (time since it was written), or None if
+        no heartbeat exists or it could not be read consistently
+    """
+    path = Path(path or default_heartbeat_path())
+    try:
+        with open(path, 'rb') as f:
+            view = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    try:
+        for _ in range(retries):
+            magic, seq, written_at, length = HEADER.unpack_from(view, 0)
+            if magic != MAGIC:
+                return None
+            if seq % 2 == 0:
+                data = bytes(view[HEADER.size:HEADER.size + length])
+                if HEADER.unpack_from(view, 0)[1] == seq:
+                    payload = json.loads(data)
+                    payload['age_seconds'] = time.time() - written_at
+                    return payload
+            time.sleep(0.001)
+        return None
+    finally:
+        view.close()
+
+# ========== HTTP ENDPOINT ==========
+
+class MetricsServer:
+    """Local HTTP exporter: /metrics (text) and /health (JSON)"""
+
+    def __init__(self, registry: MetricsRegistry = metrics, host: str = '127.0.0.1', port: int = 9108):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    def start(self) -> bool:
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.startswith('/metrics'):
+                    body, content_type = registry.render_text().encode(), 'text/plain; version=0.0.4'
+                elif self.path.startswith('/health'):
+                    body, content_type = json.dumps(health_snapshot(), default=str).encode(), 'application/json'
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        try:
+            self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        except OSError as e:
+            logger.warning(f"Metrics endpoint unavailable on {self.host}:{self.port}: {e}")
+            return False
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True).start()
+        logger.info(f"Metrics endpoint: http://{self.host}:{self.port}/metrics")
+        return True
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -0,0 +1,324 @@
+"""
+Order Manager
+Asynchronous order submission and fill tracking on top of BrokerExecutor
+
+Orders are submitted on a worker pool, so retry backoff never blocks the
+trading thread, and each one gets an OrderHandle with futures for acceptance
+and completion and callbacks for fill / partial fill / cancel. Open orders are
+tracked by a polling loop (one get_orders request per poll for all of them);
+`on_trade_update` accepts Alpaca trade_updates stream events in the same way,
+so a stream can replace polling. The in-memory order book is bounded and
+indexed by local id, broker id and symbol.
+"""
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Set
+
+from core.live.metrics_registry import ORDER_SECONDS
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = {'filled', 'canceled', 'cancelled', 'expired', 'rejected', 'replaced', 'failed'}
+CANCEL_STATUSES = {'canceled', 'cancelled', 'expired', 'rejected'}
+EVENTS = ('fill', 'partial_fill', 'cancel')
+
+class OrderHandle:
+    """Tracked order: futures for acceptance / completion plus event callbacks"""
+
+    def __init__(self, order_type: str, symbol: str, qty: float, side: str, is_option: bool, params: Dict):
+        self.id = uuid.uuid4().hex[:12]
+        self.order_type = order_type
+        self.symbol = symbol
+        self.qty = qty
+        self.side = side
+        self.is_option = is_option
+        self.params = params
+
+        self.broker_id: Optional[str] = None
+        self.status = 'pending'
+        self.filled_qty = 0.0
+        self.filled_avg_price: Optional[float] = None
+        self.created_at = datetime.now(timezone.utc)
+        self.updated_at = self.created_at
+
+        self.submitted: Future = Future()  # Broker order dict (None if submission failed)
+        self.done: Future = Future()       # Final order state once terminal
+        self._callbacks: Dict[str, List[Callable]] = {event: [] for event in EVENTS}
+
+    @property
+    def is_terminal(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+    def on(self, event: str, callback: Callable[['OrderHandle'], None]) -> 'OrderHandle':
+        """Register a callback for 'fill', 'partial_fill' or 'cancel'"""
+        if event not in self._callbacks:
+            raise ValueError(f"Unknown order event: {event}")
+        self._callbacks[event].append(callback)
+        return self
+
+    def _emit(self, event: str):
+        for callback in self._callbacks[event]:
+            try:
+                callback(self)
+            except Exception as e:
+                logger.error(f"Order {self.symbol} {event} callback failed: {e}")
+
+    def to_dict(self) -> Dict:
+        return {
+            'id': self.id,
+            'broker_id': self.broker_id,
+            'symbol': self.symbol,
+            'qty': self.qty,
+            'side': self.side,
+            'order_type': self.order_type,
+            'status': self.status,
+            'filled_qty': self.filled_qty,
+            'filled_avg_price': self.filled_avg_price,
+            'created_at': self.created_at.isoformat(),
+            'updated_at': self.updated_at.isoformat()
+        }
+
+class OrderManager:
+    """Asynchronous order submission with a bounded, indexed order book"""
+
+    def __init__(
+        self,
+        executor,
+        max_workers: int = 4,
+        poll_interval_seconds: float = 2.0,
+        max_orders: int = 1000
+    ):
+        """
+        Initialize order manager
+
+        Args:
+            executor: BrokerExecutor (submission with retry) whose client is polled
+            max_workers: Concurrent submissions
+            poll_interval_seconds: Seconds between order status polls
+            max_orders: Orders kept in the book (oldest finished orders are evicted first)
+        """
+        self.executor = executor
+        self.poll_interval_seconds = poll_interval_seconds
+        self.max_orders = max_orders
+
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="order-submit")
+        self._lock = threading.RLock()
+        self._orders: 'OrderedDict[str, OrderHandle]' = OrderedDict()
+        self._by_broker_id: Dict[str, str] = {}
+        self._by_symbol: Dict[str, Set[str]] = {}
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ========== SUBMISSION ==========
+
+    def submit(
+        self,
+        order_type: str,
+        symbol: str,
+        qty: float,
+        side: str,
+        is_option: bool = False,
+        on_fill: Optional[Callable] = None,
+        on_partial_fill: Optional[Callable] = None,
+        on_cancel: Optional[Callable] = None,
+        **kwargs
+    ) -> OrderHandle:
+        """
+        Submit an order without blocking
+
+        Args:
+            order_type: 'market' or 'limit'
+            symbol: Trading symbol (stock or option contract)
+            qty: Quantity
+            side: 'buy' or 'sell'
+            is_option: Whether this is an options order
+            on_fill / on_partial_fill / on_cancel: Event callbacks (receive the handle)
+            **kwargs: limit_price, time_in_force, retry
+
+        Returns:
+            OrderHandle (handle.submitted resolves once the broker accepts or rejects it)
+        """
+        handle = OrderHandle(order_type, symbol, qty, side, is_option, kwargs)
+        for event, callback in (('fill', on_fill), ('partial_fill', on_partial_fill), ('cancel', on_cancel)):
+            if callback:
+                handle.on(event, callback)
+
+        with self._lock:
+            self._add(handle)
+        self._pool.submit(self._submit, handle)
+        self.start()
+        return handle
+
+    def _submit(self, handle: OrderHandle):
+        try:
+            order = self.executor._execute_with_retry(
+                order_type=handle.order_type,
+                symbol=handle.symbol,
+                qty=handle.qty,
+                side=handle.side,
+                is_option=handle.is_option,
+                **handle.params
+            )
+        except Exception as e:
+            logger.error(f"Error submitting {handle.side} {handle.qty} {handle.symbol}: {e}")
+            order = None
+
+        if not order:
+            self._finish(handle, 'failed')
+            handle.submitted.set_result(None)
+            return
+
+        with self._lock:
+            handle.broker_id = order.get('id')
+            if handle.broker_id:
+                self._by_broker_id[handle.broker_id] = handle.id
+        ORDER_SECONDS.observe((datetime.now(timezone.utc) - handle.created_at).total_seconds(), stage='submit')
+        handle.submitted.set_result(order)
+        self.apply_update(order)
+
+    # ========== STATE UPDATES ==========
+
+    def apply_update(self, order: Dict):
+        """Apply a broker order snapshot (poll result or stream event order)"""
+        with self._lock:
+            local_id = self._by_broker_id.get(order.get('id'))
+            handle = self._orders.get(local_id) if local_id else None
+            if handle is None or handle.is_terminal:
+                return
+
+            status = str(order.get('status') or handle.status).lower().replace('orderstatus.', '')
+            filled_qty = float(order.get('filled_qty') or 0)
+            new_fill = filled_qty > handle.filled_qty + 1e-9
+            handle.filled_qty = max(handle.filled_qty, filled_qty)
+            if order.get('filled_avg_price'):
+                handle.filled_avg_price = float(order['filled_avg_price'])
+            handle.status = status
+            handle.updated_at = datetime.now(timezone.utc)
+
+        if status == 'filled':
+            ORDER_SECONDS.observe((handle.updated_at - handle.created_at).total_seconds(), stage='fill')
+            self._finish(handle, 'filled', emit='fill')
+        elif status in CANCEL_STATUSES:
+            self._finish(handle, status, emit='cancel')
+        elif new_fill:
+            handle._emit('partial_fill')
+
+    def on_trade_update(self, event: Dict):
+        """
+        Handle an Alpaca trade_updates stream event
+
+        Args:
+            event: {'event': 'fill'|'partial_fill'|'canceled'|..., 'order': {...}}
+        """
+        order = dict(event.get('order') or {})
+        if event.get('event') in ('fill', 'partial_fill', 'canceled', 'expired', 'rejected'):
+            order.setdefault('status', {'fill': 'filled', 'partial_fill': 'partially_filled'}.get(event['event'], event['event']))
+        self.apply_update(order)
+
+    def _finish(self, handle: OrderHandle, status: str, emit: Optional[str] = None):
+        with self._lock:
+            handle.status = status
+            handle.updated_at = datetime.now(timezone.utc)
+            self._evict()
+        if emit:
+            handle._emit(emit)
+        if not handle.done.done():
+            handle.done.set_result(handle.to_dict())
+
+    # ========== POLLING ==========
+
+    def start(self):
+        """Start the status polling loop (idempotent)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._poll_loop, name="order-poller", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _poll_loop(self):
+        while not self._stop.wait(self.poll_interval_seconds):
+            try:
+                self.poll()
+            except Exception as e:
+                logger.error(f"Error polling orders: {e}")
+
+    def poll(self) -> int:
+        """
+        Refresh all open orders with a single broker request
+
+        Returns:
+            Number of open orders checked
+        """
+        with self._lock:
+            open_orders = [h for h in self._orders.values() if h.broker_id and not h.is_terminal]
+        if not open_orders:
+            return 0
+
+        after = min(h.created_at for h in open_orders) - timedelta(minutes=1)
+        orders = self.executor.client.get_orders(status='all', limit=500, after=after.isoformat(), direction='asc')
+        for order in orders:
+            self.apply_update(order)
+        return len(open_orders)
+
+    def cancel(self, handle_id: str) -> bool:
+        """Request cancellation (the cancel event arrives with the next update)"""
+        handle = self.get(handle_id)
+        if handle is None or handle.is_terminal or not handle.broker_id:
+            return False
+        return self.executor.cancel_order(handle.broker_id)
+
+    # ========== ORDER BOOK ==========
+
+    def _add(self, handle: OrderHandle):
+        self._orders[handle.id] = handle
+        self._by_symbol.setdefault(handle.symbol, set()).add(handle.id)
+        self._evict()
+
+    def _evict(self):
+        """Drop the oldest finished orders beyond max_orders (caller holds the lock)"""
+        if len(self._orders) <= self.max_orders:
+            return
+        for local_id in list(self._orders):
+            if len(self._orders) <= self.max_orders:
+                break
+            handle = self._orders[local_id]
+            if not handle.is_terminal:
+                continue
+            del self._orders[local_id]
+            self._by_broker_id.pop(handle.broker_id, None)
+            ids = self._by_symbol.get(handle.symbol)
+            if ids:
+                ids.discard(local_id)
+                if not ids:
+                    del self._by_symbol[handle.symbol]
+
+    def get(self, handle_id: str) -> Optional[OrderHandle]:
+        with self._lock:
+            return self._orders.get(handle_id)
+
+    def get_by_broker_id(self, broker_id: str) -> Optional[OrderHandle]:
+        with self._lock:
+            local_id = self._by_broker_id.get(broker_id)
+            return self._orders.get(local_id) if local_id else None
+
+    def orders_for(self, symbol: str, open_only: bool = False) -> List[OrderHandle]:
+        with self._lock:
+            handles = [self._orders[i] for i in self._by_symbol.get(symbol, ()) if i in self._orders]
+        if open_only:
+            handles = [h for h in handles if not h.is_terminal]
+        return sorted(handles, key=lambda h: h.created_at)
+
+    def open_orders(self) -> List[OrderHandle]:
+        with self._lock:
+            return [h for h in self._orders.values() if not h.is_terminal]
+
+    def __len__(self) -> int:
+        return len(self._orders)
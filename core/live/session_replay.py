@@ -0,0 +1,326 @@
+"""
+Session Record / Replay
+Capture broker and market-data responses during a live session and serve them
+back offline, so full trading cycles can be profiled without network access
+
+While a SessionRecorder is active, every AlpacaClient, MassivePriceFeed and
+MassiveOptionsFeed constructed (in any module) is wrapped in a proxy that
+records each method call's result (or exception) and latency. Direct use of
+AlpacaClient.api is recorded the same way. The archive is a gzip-compressed
+pickle.
+
+While a SessionReplayer is active, the same constructors return fakes that
+answer from the archive. Calls are matched by service, method and arguments
+(date/time arguments are ignored, since they move with the clock) and served in
+recorded order; once a call's recordings are used up, the last one repeats.
+Latency is reproduced at `speed` (1.0 = recorded, 10 = 10x faster, 0 = instant).
+"""
+import gzip
+import logging
+import pickle
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_VERSION = 1
+
+# service name -> (module, class name)
+SERVICES = {
+    'alpaca': ('alpaca_client', 'AlpacaClient'),
+    'massive_price': ('services.massive_price_feed', 'MassivePriceFeed'),
+    'massive_options': ('services.polygon_options_feed', 'MassiveOptionsFeed'),
+}
+
+# Attributes that are themselves API objects (recorded as nested services)
+NESTED = {'alpaca': ('api',)}
+
+def call_key(args: tuple, kwargs: dict) -> str:
+    """Canonical argument key (times and frames are masked)"""
+    def canon(value):
+        if isinstance(value, (datetime, date, pd.Timestamp)):
+            return '<time>'
+        if isinstance(value, pd.DataFrame):
+            return '<frame>'
+        if isinstance(value, (list, tuple)):
+            return '[' + ','.join(canon(v) for v in value) + ']'
+        if isinstance(value, dict):
+            return '{' + ','.join(f"{k}:{canon(v)}" for k, v in sorted(value.items())) + '}'
+        return repr(value)
+    parts = [canon(a) for a in args] + [f"{k}={canon(v)}" for k, v in sorted(kwargs.items())]
+    return ','.join(parts)
+
+class SessionArchive:
+    """Recorded calls and attribute values"""
+
+    def __init__(self):
+        self.calls: List[Dict] = []
+        self.attributes: Dict[Tuple[str, str], Any] = {}
+        self.created_at = datetime.now().isoformat()
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+
+    def record(self, service: str, method: str, key: str, result: Any = None,
+               error: Optional[BaseException] = None, duration: float = 0.0):
+        entry = {
+            'service': service,
+            'method': method,
+            'key': key,
+            't': time.monotonic() - self._started,
+            'duration': duration,
+        }
+        if error is not None:
+            entry['error'] = self._picklable(error) or RuntimeError(f"{type(error).__name__}: {error}")
+        else:
+            entry['result'] = self._picklable(result)
+        with self._lock:
+            self.calls.append(entry)
+
+    def record_attribute(self, service: str, name: str, value: Any):
+        if (service, name) not in self.attributes:
+            self.attributes[(service, name)] = self._picklable(value)
+
+    @staticmethod
+    def _picklable(value: Any) -> Any:
+        try:
+            pickle.dumps(value)
+            return value
+        except Exception:
+            logger.debug(f"Unpicklable recorded value of type {type(value).__name__}")
+            return None
+
+    def save(self, path: Path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            payload = {
+                'version': ARCHIVE_VERSION,
+                'created_at': self.created_at,
+                'calls': self.calls,
+                'attributes': self.attributes,
+            }
+        with gzip.open(path, 'wb') as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        logger.info(f"Session archive saved: {path} ({len(self.calls)} calls)")
+
+    @classmethod
+    def load(cls, path: Path) -> 'SessionArchive':
+        with gzip.open(path, 'rb') as f:
+            payload = pickle.load(f)
+        if payload.get('version') != ARCHIVE_VERSION:
+            raise ValueError(f"Unsupported session archive version: {payload.get('version')}")
+        archive = cls()
+        archive.calls = payload['calls']
+        archive.attributes = payload['attributes']
+        archive.created_at = payload['created_at']
+        return archive
+
+class RecordingProxy:
+    """Wraps a real client and records every method call"""
+
+    def __init__(self, target: Any, service: str, archive: SessionArchive):
+        object.__setattr__(self, '_target', target)
+        object.__setattr__(self, '_service', service)
+        object.__setattr__(self, '_archive', archive)
+        object.__setattr__(self, '_nested', {})
+
+    def __getattr__(self, name: str):
+        target, service, archive = self._target, self._service, self._archive
+        if name in NESTED.get(service, ()):
+            if name not in self._nested:
+                self._nested[name] = RecordingProxy(getattr(target, name), f"{service}.{name}", archive)
+            return self._nested[name]
+
+        value = getattr(target, name)
+        if not callable(value):
+            archive.record_attribute(service, name, value)
+            return value
+
+        def recorded(*args, **kwargs):
+            key = call_key(args, kwargs)
+            start = time.perf_counter()
+            try:
+                result = value(*args, **kwargs)
+            except Exception as e:
+                archive.record(service, name, key, error=e, duration=time.perf_counter() - start)
+                raise
+            archive.record(service, name, key, result=result, duration=time.perf_counter() - start)
+            return result
+        return recorded
+
+    def __setattr__(self, name: str, value: Any):
+        setattr(self._target, name, value)
+
+class ReplayClient:
+    """Fake client answering from a SessionArchive"""
+
+    def __init__(self, service: str, player: 'SessionReplayer'):
+        object.__setattr__(self, '_service', service)
+        object.__setattr__(self, '_player', player)
+        object.__setattr__(self, '_nested', {})
+        object.__setattr__(self, '_local', {})
+
+    def __getattr__(self, name: str):
+        service, player = self._service, self._player
+        if name in self._local:
+            return self._local[name]
+        if name in NESTED.get(service, ()):
+            if name not in self._nested:
+                self._nested[name] = ReplayClient(f"{service}.{name}", player)
+            return self._nested[name]
+        if (service, name) in player.archive.attributes:
+            return player.archive.attributes[(service, name)]
+        if name.startswith('__'):
+            raise AttributeError(name)
+
+        def replayed(*args, **kwargs):
+            return player.answer(service, name, call_key(args, kwargs))
+        return replayed
+
+    def __setattr__(self, name: str, value: Any):
+        self._local[name] = value
+
+@contextmanager
+def _patched_constructors(factory: Callable[[str, type, tuple, dict], Any]):
+    """Route every module's reference to the service classes through factory"""
+    originals = {}
+    for service, (module_name, class_name) in SERVICES.items():
+        module = __import__(module_name, fromlist=[class_name])
+        originals[service] = getattr(module, class_name)
+
+    def make_constructor(service, cls):
+        def construct(*args, **kwargs):
+            return factory(service, cls, args, kwargs)
+        construct.__name__ = cls.__name__
+        return construct
+
+    patched = []
+    for module in list(sys.modules.values()):
+        for service, cls in originals.items():
+            class_name = SERVICES[service][1]
+            if getattr(module, class_name, None) is cls:
+                setattr(module, class_name, make_constructor(service, cls))
+                patched.append((module, class_name, cls))
+    try:
+        yield
+    finally:
+        for module, class_name, cls in patched:
+            setattr(module, class_name, cls)
+
+class SessionRecorder:
+    """Context manager that records all service traffic to an archive"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.archive = SessionArchive()
+        self._patch = None
+
+    def __enter__(self) -> 'SessionRecorder':
+        def factory(service, cls, args, kwargs):
+            return RecordingProxy(cls(*args, **kwargs), service, self.archive)
+        self._patch = _patched_constructors(factory)
+        self._patch.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        self._patch.__exit__(*exc)
+        self.archive.save(self.path)
+        return False
+
+class SessionReplayer:
+    """Context manager that serves recorded traffic through fake services"""
+
+    def __init__(self, path: Path, speed: float = 0.0):
+        """
+        Args:
+            path: Archive written by SessionRecorder
+            speed: Latency replay rate (0 = instant, 1 = recorded, N = N times faster)
+        """
+        self.archive = SessionArchive.load(path)
+        self.speed = speed
+        self.misses: Dict[str, int] = {}
+        self.served = 0
+        self._lock = threading.Lock()
+        self._index: Dict[Tuple[str, str, str], List[Dict]] = {}
+        self._cursor: Dict[Tuple[str, str, str], int] = {}
+        for entry in self.archive.calls:
+            self._index.setdefault((entry['service'], entry['method'], entry['key']), []).append(entry)
+        self._patch = None
+
+    def answer(self, service: str, method: str, key: str) -> Any:
+        slot = (service, method, key)
+        with self._lock:
+            entries = self._index.get(slot)
+            if not entries:
+                name = f"{service}.{method}"
+                self.misses[name] = self.misses.get(name, 0) + 1
+                logger.debug(f"Replay miss: {name}({key})")
+                return None
+            position = self._cursor.get(slot, 0)
+            entry = entries[min(position, len(entries) - 1)]
+            self._cursor[slot] = position + 1
+            self.served += 1
+
+        if self.speed > 0 and entry['duration'] > 0:
+            time.sleep(entry['duration'] / self.speed)
+        if 'error' in entry:
+            raise entry['error']
+        return entry['result']
+
+    def __enter__(self) -> 'SessionReplayer':
+        def factory(service, cls, args, kwargs):
+            return ReplayClient(service, self)
+        self._patch = _patched_constructors(factory)
+        self._patch.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        self._patch.__exit__(*exc)
+        return False
+
+def profile_cycles(trader, cycles: int = 1, memory_cycles: int = 1) -> Dict:
+    """
+    Run trading cycles and measure latency and Python heap usage
+
+    Latency is timed with tracemalloc off (tracing slows allocation-heavy code
+    several-fold); peak memory comes from a separate traced pass.
+
+    Args:
+        trader: IntegratedTrader to run
+        cycles: Timed cycles
+        memory_cycles: Extra cycles run under tracemalloc (0 skips the memory pass)
+
+    Returns:
+        Dict with per-cycle seconds, mean/max seconds and peak traced memory (MB)
+    """
+    timings = []
+    for _ in range(cycles):
+        start = time.perf_counter()
+        trader.run_trading_cycle()
+        timings.append(time.perf_counter() - start)
+
+    peak = 0
+    if memory_cycles:
+        tracemalloc.start()
+        try:
+            for _ in range(memory_cycles):
+                trader.run_trading_cycle()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return {
+        'cycles': cycles,
+        'cycle_seconds': timings,
+        'mean_seconds': sum(timings) / len(timings) if timings else 0.0,
+        'max_seconds': max(timings) if timings else 0.0,
+        'memory_cycles': memory_cycles,
+        'peak_memory_mb': peak / 1e6,
+    }
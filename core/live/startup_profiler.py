@@ -0,0 +1,125 @@
+"""
+Startup Profiler
+Times trader startup phases and attributes import time per module (-X importtime style)
+"""
+import builtins
+import logging
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class StartupProfiler:
+    """
+    Records wall time of named startup phases and, optionally, import time
+
+    Import tracking wraps builtins.__import__ on the tracking thread and records
+    self and cumulative time per top-level package for newly loaded modules,
+    like `python -X importtime` but without restarting the interpreter.
+    """
+
+    def __init__(self):
+        """Initialize startup profiler"""
+        self.start_time = time.perf_counter()
+        self.phases: List[Tuple[str, float]] = []
+        self.deferred: List[str] = []
+
+        # top-level package -> [self seconds, cumulative seconds]
+        self.import_times: Dict[str, List[float]] = defaultdict(lambda: [0.0, 0.0])
+        self._original_import = None
+        self._tracking_thread: Optional[int] = None
+        self._stack: List[List] = []  # [package, child seconds] per in-flight import
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a named startup phase"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - start))
+
+    def mark_deferred(self, name: str):
+        """Record work that was deferred out of startup (lazy init / background)"""
+        self.deferred.append(name)
+
+    def start_import_tracking(self):
+        """Start attributing import time to modules (current thread only)"""
+        if self._original_import is not None:
+            return
+
+        self._original_import = builtins.__import__
+        self._tracking_thread = threading.get_ident()
+        original_import = self._original_import
+
+        def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            # Fast path: already loaded, relative, or another thread
+            if (level != 0 or name in sys.modules or
+                    threading.get_ident() != self._tracking_thread):
+                return original_import(name, globals, locals, fromlist, level)
+
+            package = name.partition('.')[0]
+            # Cumulative time counts only the outermost import of each package
+            outermost = all(frame[0] != package for frame in self._stack)
+            self._stack.append([package, 0.0])
+            start = time.perf_counter()
+            try:
+                return original_import(name, globals, locals, fromlist, level)
+            finally:
+                elapsed = time.perf_counter() - start
+                _, child_time = self._stack.pop()
+                entry = self.import_times[package]
+                entry[0] += elapsed - child_time
+                if outermost:
+                    entry[1] += elapsed
+                if self._stack:
+                    self._stack[-1][1] += elapsed
+
+        builtins.__import__ = timed_import
+
+    def stop_import_tracking(self):
+        """Restore the original import function"""
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+            self._tracking_thread = None
+
+    def get_import_summary(self, top_n: int = 15) -> List[Dict]:
+        """Top imports by cumulative time, grouped by top-level package"""
+        ranked = sorted(self.import_times.items(), key=lambda item: item[1][1], reverse=True)
+        return [
+            {'package': package, 'self_ms': times[0] * 1000, 'cumulative_ms': times[1] * 1000}
+            for package, times in ranked[:top_n]
+        ]
+
+    def report(self, top_n: int = 15) -> str:
+        """Format startup timing breakdown"""
+        total = time.perf_counter() - self.start_time
+        lines = ["=" * 60, "STARTUP TIMING BREAKDOWN", "=" * 60]
+
+        for name, elapsed in self.phases:
+            lines.append(f"  {name:<40} {elapsed * 1000:>9.1f} ms")
+        lines.append(f"  {'TOTAL (since profiler start)':<40} {total * 1000:>9.1f} ms")
+
+        if self.deferred:
+            lines.append("")
+            lines.append("Deferred until first use / background:")
+            for name in self.deferred:
+                lines.append(f"  - {name}")
+
+        if self.import_times:
+            lines.append("")
+            lines.append(f"Import time by package (top {top_n}):")
+            lines.append(f"  {'package':<30} {'self ms':>10} {'cumulative ms':>14}")
+            for entry in self.get_import_summary(top_n):
+                lines.append(f"  {entry['package']:<30} {entry['self_ms']:>10.1f} {entry['cumulative_ms']:>14.1f}")
+
+        lines.append("=" * 60)
+        return "\n".join(lines)
+
+# Global instance
+startup_profiler = StartupProfiler()
@@ -18,6 +18,7 @@ from core.agents.base_agent import TradeIntent
 from services.options_data_feed import OptionsDataFeed
 from services.iv_calculator import IVCalculator
 from services.gex_calculator import GEXCalculator
+from core.live.cycle_tracer import traced, tracer
 
 logger = logging.getLogger(__name__)
 
@@ -53,6 +54,7 @@ class MultiAgentOrchestrator:
         
         logger.info(f"Initialized MultiAgentOrchestrator with {len(self.agents)} agents")
     
+    @traced('orchestrator.analyze_symbol')
     def analyze_symbol(self, symbol: str, bars: pd.DataFrame) -> Optional[TradeIntent]:
         """
         Analyze symbol and generate trade intent
@@ -64,15 +66,7 @@ class MultiAgentOrchestrator:
         Returns:
             TradeIntent or None
         """
-        # Explicitly exclude SPY (user requirement)
-        if symbol == "SPY":
-            logger.debug(f"{symbol}: SPY excluded from trading")
-            return None
-        
-        # Only analyze symbols in configured ticker list
-        from config import Config
-        if symbol not in Config.TICKERS:
-            logger.debug(f"{symbol}: Not in configured ticker list")
+        if not self._is_tradeable(symbol):
             return None
         
         if bars.empty or len(bars) < 30:  # Reduced from 50 to 30 (Massive provides sufficient data)
@@ -81,15 +75,39 @@ class MultiAgentOrchestrator:
         
         try:
             # Calculate features
-            features = self.feature_engine.calculate_all_features(bars)
+            with tracer.span('features'):
+                features = self.feature_engine.calculate_all_features(bars)
             if not features:
                 return None
             
             # Add current price
             features['current_price'] = bars['close'].iloc[-1]
+        except Exception as e:
+            logger.error(f"Error analyzing {symbol}: {e}")
+            return None
+        
+        return self.analyze_features(symbol, features)
+    
+    @traced('orchestrator.analyze_features')
+    def analyze_features(self, symbol: str, features: Dict) -> Optional[TradeIntent]:
+        """
+        Generate trade intent from precomputed features
+        (e.g. intraday features from StreamingFeatureEngine)
+        
+        Args:
+            symbol: Trading symbol
+            features: Feature dict with FeatureEngine keys and current_price
             
+        Returns:
+            TradeIntent or None
+        """
+        if not features or not self._is_tradeable(symbol):
+            return None
+        
+        try:
             # Classify regime
-            regime_signal = self.regime_classifier.classify(features)
+            with tracer.span('regime'):
+                regime_signal = self.regime_classifier.classify(features)
             
             if regime_signal.confidence < 0.30:  # Lowered from 0.4 to allow more trades (target: 2-5/day)
                 logger.debug(f"{symbol}: Low regime confidence ({regime_signal.confidence:.2f})")
@@ -99,7 +117,8 @@ class MultiAgentOrchestrator:
             intents = []
             for agent in self.agents:
                 try:
-                    intent = agent.evaluate(symbol, regime_signal, features)
+                    with tracer.span(f"agent.{agent.name}"):
+                        intent = agent.evaluate(symbol, regime_signal, features)
                     if intent:
                         intents.append(intent)
                         logger.debug(f"{symbol}: {agent.name} generated {intent.direction.value} signal (confidence: {intent.confidence:.2f})")
@@ -110,11 +129,12 @@ class MultiAgentOrchestrator:
                 return None
             
             # Meta-policy arbitration
-            final_intent = self.meta_policy.arbitrate(
-                intents,
-                regime_signal.regime_type.value,
-                regime_signal.volatility_level.value
-            )
+            with tracer.span('meta_policy'):
+                final_intent = self.meta_policy.arbitrate(
+                    intents,
+                    regime_signal.regime_type.value,
+                    regime_signal.volatility_level.value
+                )
             
             if final_intent:
                 logger.info(f"{symbol}: Final intent - {final_intent.direction.value} "
@@ -127,6 +147,21 @@ class MultiAgentOrchestrator:
             logger.error(f"Error analyzing {symbol}: {e}")
             return None
     
+    def _is_tradeable(self, symbol: str) -> bool:
+        """SPY is excluded and only configured tickers are analyzed"""
+        # Explicitly exclude SPY (user requirement)
+        if symbol == "SPY":
+            logger.debug(f"{symbol}: SPY excluded from trading")
+            return False
+        
+        # Only analyze symbols in configured ticker list
+        from config import Config
+        if symbol not in Config.TICKERS:
+            logger.debug(f"{symbol}: Not in configured ticker list")
+            return False
+        
+        return True
+    
     def update_agent_performance(self, agent_name: str, pnl: float):
         """Update agent performance"""
         for agent in self.agents:
@@ -7,8 +7,9 @@ Calculates:
 - Second-order Greeks: Vanna, Vomma, Charm, Speed
 """
 import numpy as np
+from scipy.special import ndtr
 from scipy.stats import norm
-from typing import Dict, Optional
+from typing import Dict, Optional, Union
 import logging
 
 logger = logging.getLogger(__name__)
@@ -166,6 +167,121 @@ class BlackScholes:
             'implied_volatility': volatility
         }
     
+    def price_vectorized(
+        self,
+        spot_price: Union[float, np.ndarray],
+        strike: Union[float, np.ndarray],
+        time_to_expiry: Union[float, np.ndarray],
+        volatility: Union[float, np.ndarray],
+        is_call: Union[bool, np.ndarray],
+        dividend_yield: float = 0.0
+    ) -> np.ndarray:
+        """
+        Option prices for broadcastable arrays (e.g. scenarios x positions grids)
+        
+        Same formula as calculate(), but options at or past expiry are valued
+        at intrinsic value (what a position is worth when it expires inside a
+        scenario horizon) rather than 0.
+        
+        Args:
+            spot_price: Underlying prices (S)
+            strike: Strikes (K)
+            time_to_expiry: Years to expiry (T)
+            volatility: Implied volatilities (σ)
+            is_call: True for calls, False for puts
+            dividend_yield: Dividend yield (default: 0.0)
+            
+        Returns:
+            Array of option prices with the broadcast shape of the inputs
+        """
+        S = np.asarray(spot_price, dtype=np.float64)
+        K = np.asarray(strike, dtype=np.float64)
+        T = np.asarray(time_to_expiry, dtype=np.float64)
+        sigma = np.maximum(np.asarray(volatility, dtype=np.float64), 0.01)
+        is_call = np.asarray(is_call, dtype=bool)
+        r = self.risk_free_rate
+        q = dividend_yield
+        
+        live = T > 0
+        T_safe = np.where(live, T, 1.0)
+        sqrt_T = np.sqrt(T_safe)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            d1 = (np.log(S / K) + (r - q + 0.5 * sigma ** 2) * T_safe) / (sigma * sqrt_T)
+        d2 = d1 - sigma * sqrt_T
+        
+        disc_S = S * np.exp(-q * T_safe)
+        disc_K = K * np.exp(-r * T_safe)
+        call = disc_S * ndtr(d1) - disc_K * ndtr(d2)
+        put = disc_K * ndtr(-d2) - disc_S * ndtr(-d1)
+        price = np.where(is_call, call, put)
+        
+        intrinsic = np.where(is_call, np.maximum(S - K, 0.0), np.maximum(K - S, 0.0))
+        return np.where(live, price, intrinsic)
+
+    def greeks_vectorized(
+        self,
+        spot_price: Union[float, np.ndarray],
+        strike: Union[float, np.ndarray],
+        time_to_expiry: Union[float, np.ndarray],
+        volatility: Union[float, np.ndarray],
+        is_call: Union[bool, np.ndarray],
+        dividend_yield: float = 0.0
+    ) -> Dict[str, np.ndarray]:
+        """
+        First-order Greeks for broadcastable arrays
+
+        Same units as calculate() (theta per day, vega per 1% IV); expired
+        options get zero Greeks.
+
+        Args:
+            spot_price: Underlying prices (S)
+            strike: Strikes (K)
+            time_to_expiry: Years to expiry (T)
+            volatility: Implied volatilities (σ)
+            is_call: True for calls, False for puts
+            dividend_yield: Dividend yield (default: 0.0)
+
+        Returns:
+            Dictionary with delta, gamma, theta, vega arrays
+        """
+        S = np.asarray(spot_price, dtype=np.float64)
+        K = np.asarray(strike, dtype=np.float64)
+        T = np.asarray(time_to_expiry, dtype=np.float64)
+        sigma = np.maximum(np.asarray(volatility, dtype=np.float64), 0.01)
+        is_call = np.asarray(is_call, dtype=bool)
+        r = self.risk_free_rate
+        q = dividend_yield
+
+        live = T > 0
+        T_safe = np.where(live, T, 1.0)
+        sqrt_T = np.sqrt(T_safe)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            d1 = (np.log(S / K) + (r - q + 0.5 * sigma ** 2) * T_safe) / (sigma * sqrt_T)
+        d2 = d1 - sigma * sqrt_T
+
+        disc_q = np.exp(-q * T_safe)
+        disc_r = np.exp(-r * T_safe)
+        n_d1 = np.exp(-0.5 * d1 ** 2) / np.sqrt(2 * np.pi)
+        sign = np.where(is_call, 1.0, -1.0)
+
+        delta = sign * disc_q * ndtr(sign * d1)
+        gamma = n_d1 * disc_q / (S * sigma * sqrt_T)
+        vega = S * n_d1 * disc_q * sqrt_T / 100
+        theta = (
+            -(S * n_d1 * sigma * disc_q) / (2 * sqrt_T)
+            - sign * r * K * disc_r * ndtr(sign * d2)
+            + sign * q * S * disc_q * ndtr(sign * d1)
+        ) / 365
+
+        return {
+            'delta': np.where(live, delta, 0.0),
+            'gamma': np.where(live, gamma, 0.0),
+            'theta': np.where(live, theta, 0.0),
+            'vega': np.where(live, vega, 0.0)
+        }
+
     def _expired_option_result(self, option_type: str) -> Dict[str, float]:
         """Return result for expired option"""
         if option_type.lower() == 'call':
@@ -7,6 +7,7 @@ import logging
 from typing import Dict, Optional, List, Tuple
 from datetime import datetime, timedelta
 from enum import Enum
+from core.live.cycle_tracer import traced
 
 logger = logging.getLogger(__name__)
 
@@ -78,6 +79,7 @@ class AdvancedRiskManager:
         self.uvar_calculator = None
         self.max_uvar_pct = 5.0  # Default 5% UVaR threshold
         self.use_uvar = False  # Will be enabled when Alpaca client is provided
+        self.options_var = None  # Full-revaluation VaR (optional, see enable_uvar)
         
         # Tracking
         self.daily_pnl = 0.0
@@ -89,13 +91,22 @@ class AdvancedRiskManager:
         # Trade history
         self.trade_history: List[Dict] = []
     
-    def enable_uvar(self, alpaca_client, max_uvar_pct: float = 5.0):
+    def enable_uvar(
+        self,
+        alpaca_client,
+        max_uvar_pct: float = 5.0,
+        full_revaluation: bool = False,
+        iv_spot_beta: float = 0.0
+    ):
         """
         Enable UVaR checking (requires Alpaca client)
         
         Args:
             alpaca_client: Alpaca API client
             max_uvar_pct: Maximum UVaR as percentage of portfolio (default: 5%)
+            full_revaluation: Reprice option positions per scenario (Black-Scholes)
+                instead of treating them as linear exposure
+            iv_spot_beta: IV shock per unit underlying return (full revaluation only)
         """
         try:
             from core.risk.uvar_calculator import UVaRCalculator
@@ -106,7 +117,18 @@ class AdvancedRiskManager:
         except Exception as e:
             logger.warning(f"Could not enable UVaR: {e}")
             self.use_uvar = False
+            return
         
+        if full_revaluation:
+            try:
+                from core.risk.options_var import OptionsVaRCalculator
+                self.options_var = OptionsVaRCalculator(self.uvar_calculator, iv_spot_beta=iv_spot_beta)
+                logger.info("UVaR full revaluation enabled (options repriced per scenario)")
+            except Exception as e:
+                logger.warning(f"Could not enable full-revaluation VaR: {e}")
+                self.options_var = None
+        
+    @traced('risk.check_trade_allowed')
     def check_trade_allowed(
         self,
         symbol: str,
@@ -195,25 +217,34 @@ class AdvancedRiskManager:
                 'current_price': price
             }
             
-            # Check incremental UVaR
-            incremental = self.uvar_calculator.calculate_incremental_uvar(
-                current_positions,
-                new_position,
-                horizon_days=1
-            )
+            # Check incremental UVaR (full revaluation of options if enabled)
+            if self.options_var:
+                incremental = self.options_var.calculate_incremental(
+                    current_positions,
+                    new_position,
+                    horizon_days=1
+                )
+                uvar_after_pct = incremental['var_after_pct']
+            else:
+                incremental = self.uvar_calculator.calculate_incremental_uvar(
+                    current_positions,
+                    new_position,
+                    horizon_days=1
+                )
+                uvar_after_pct = incremental['uvar_after_pct']
             
             # Check if adding this position would breach UVaR
-            if incremental['uvar_after_pct'] > self.max_uvar_pct:
+            if uvar_after_pct > self.max_uvar_pct:
                 return (
                     False,
-                    f"UVaR breach: {incremental['uvar_after_pct']:.2f}% > {self.max_uvar_pct}% threshold",
+                    f"UVaR breach: {uvar_after_pct:.2f}% > {self.max_uvar_pct}% threshold",
                     RiskLevel.BLOCKED
                 )
             
             # Soft breach warning (80% of threshold)
-            if incremental['uvar_after_pct'] > self.max_uvar_pct * 0.8:
+            if uvar_after_pct > self.max_uvar_pct * 0.8:
                 logger.warning(
-                    f"UVaR approaching limit: {incremental['uvar_after_pct']:.2f}% "
+                    f"UVaR approaching limit: {uvar_after_pct:.2f}% "
                     f"(threshold: {self.max_uvar_pct}%)"
                 )
         
@@ -407,6 +438,7 @@ class AdvancedRiskManager:
             'force_exit': False
         }
     
+    @traced('risk.get_risk_status')
     def get_risk_status(self, current_positions: Optional[List[Dict]] = None) -> Dict:
         """
         Get current risk status
@@ -451,6 +483,15 @@ class AdvancedRiskManager:
                 status['uvar'] = uvar_result['uvar']
                 status['uvar_pct'] = uvar_result['uvar_pct']
                 status['uvar_breach'] = uvar_result['uvar_pct'] > self.max_uvar_pct
+                
+                if self.options_var:
+                    var_result = self.options_var.calculate(current_positions, horizon_days=1)
+                    status['options_var'] = var_result['var']
+                    status['options_var_pct'] = var_result['var_pct']
+                    status['options_es'] = var_result['expected_shortfall']
+                    status['options_es_pct'] = var_result['es_pct']
+                    status['var_contributions'] = var_result['contributions']
+                    status['uvar_breach'] = var_result['var_pct'] > self.max_uvar_pct
             except Exception as e:
                 logger.warning(f"Could not calculate UVaR: {e}")
         
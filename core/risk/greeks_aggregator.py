@@ -0,0 +1,232 @@
+"""
+Portfolio Greeks Aggregator
+Running portfolio Greek totals over array-backed per-position rows
+
+Fills and exits adjust the totals by the position's own exposure (O(1)), so the
+portfolio aggregate never needs a loop over the book. Candidate contracts are
+scored against the limits in one vectorized call, and the stored per-contract
+Greeks can be repriced in bulk from fresh spot / IV each cycle.
+"""
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from config import Config
+from core.pricing.black_scholes import BlackScholes
+from core.risk.options_var import CONTRACT_MULTIPLIER, ET, parse_option_symbol, years_to_expiry
+
+logger = logging.getLogger(__name__)
+
+GREEKS = ('delta', 'gamma', 'theta', 'vega')
+
+class GreeksAggregator:
+    """Array-backed per-position Greeks with running portfolio totals"""
+
+    def __init__(self, capacity: int = 32, risk_free_rate: float = 0.05):
+        """
+        Initialize aggregator
+
+        Args:
+            capacity: Initial row capacity (grows as needed)
+            risk_free_rate: Rate used when repricing Greeks
+        """
+        self.bs = BlackScholes(risk_free_rate=risk_free_rate)
+
+        # Per-contract Greeks (rows x delta/gamma/theta/vega) and contract terms
+        self._greeks = np.zeros((capacity, len(GREEKS)))
+        self._qty = np.zeros(capacity)
+        self._strike = np.full(capacity, np.nan)
+        self._expiry = np.full(capacity, np.nan)  # Expiration as ordinal date
+        self._is_call = np.zeros(capacity, dtype=bool)
+        self._iv = np.zeros(capacity)
+        self._spot = np.zeros(capacity)
+        self._underlyings: List[Optional[str]] = [None] * capacity
+
+        self._symbols: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self.totals = np.zeros(len(GREEKS))
+
+    def __len__(self) -> int:
+        return len(self._symbols)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._rows
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self._symbols)
+
+    def upsert(self, position) -> None:
+        """
+        Add or replace a position (PositionGreeks-like: symbol, delta, gamma,
+        theta, vega, qty, iv, underlying_price)
+        """
+        symbol = position.symbol
+        row = self._rows.get(symbol)
+        if row is None:
+            row = self._allocate(symbol)
+        else:
+            self.totals -= self._exposure(row)
+
+        self._greeks[row] = [position.delta, position.gamma, position.theta, position.vega]
+        self._qty[row] = position.qty
+        self._iv[row] = position.iv or 0.0
+        self._spot[row] = position.underlying_price or 0.0
+
+        contract = parse_option_symbol(symbol)
+        if contract:
+            self._strike[row] = contract['strike']
+            self._expiry[row] = contract['expiration'].toordinal()
+            self._is_call[row] = contract['option_type'] == 'call'
+            self._underlyings[row] = contract['underlying']
+        else:
+            self._strike[row] = np.nan
+            self._expiry[row] = np.nan
+            self._underlyings[row] = None
+
+        self.totals += self._exposure(row)
+
+    def set_qty(self, symbol: str, qty: float) -> bool:
+        """Change a position's contract count (partial fill / exit)"""
+        row = self._rows.get(symbol)
+        if row is None:
+            return False
+        self.totals += self._greeks[row] * (qty - self._qty[row]) * CONTRACT_MULTIPLIER
+        self._qty[row] = qty
+        return True
+
+    def remove(self, symbol: str) -> bool:
+        """Remove a position (last row is moved into its slot)"""
+        row = self._rows.pop(symbol, None)
+        if row is None:
+            return False
+        self.totals -= self._exposure(row)
+
+        last = len(self._symbols) - 1
+        if row != last:
+            last_symbol = self._symbols[last]
+            for array in (self._greeks, self._qty, self._strike, self._expiry, self._is_call, self._iv, self._spot):
+                array[row] = array[last]
+            self._underlyings[row] = self._underlyings[last]
+            self._symbols[row] = last_symbol
+            self._rows[last_symbol] = row
+        self._symbols.pop()
+        self._qty[last] = 0.0
+        self._greeks[last] = 0.0
+        self._underlyings[last] = None
+
+        if not self._symbols:
+            self.totals[:] = 0.0  # No drift left behind by float arithmetic
+        return True
+
+    def get(self, symbol: str) -> Optional[Dict[str, float]]:
+        """Stored per-contract Greeks and terms for a position"""
+        row = self._rows.get(symbol)
+        if row is None:
+            return None
+        values = dict(zip(GREEKS, self._greeks[row].tolist()))
+        values.update(qty=float(self._qty[row]), iv=float(self._iv[row]), underlying_price=float(self._spot[row]))
+        return values
+
+    def what_if(self, greeks: np.ndarray, qty: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Score candidate contracts against the portfolio limits
+
+        Args:
+            greeks: (n, 4) per-contract delta, gamma, theta, vega
+            qty: (n,) contracts per candidate
+
+        Returns:
+            Dictionary with new_totals (n, 4), breaches (n, 4: delta, gamma,
+            theta, vega limit exceeded), position_gamma (n,) and allowed (n,)
+        """
+        greeks = np.atleast_2d(np.asarray(greeks, dtype=np.float64))
+        qty = np.asarray(qty, dtype=np.float64).reshape(-1)
+        exposure = greeks * (qty * CONTRACT_MULTIPLIER)[:, None]
+        new_totals = self.totals + exposure
+
+        breaches = self.limit_breaches(new_totals)
+        position_gamma = np.abs(exposure[:, 1])
+        allowed = ~breaches.any(axis=1) & (position_gamma <= Config.MAX_POSITION_GAMMA)
+        return {
+            'new_totals': new_totals,
+            'breaches': breaches,
+            'position_gamma': position_gamma,
+            'allowed': allowed
+        }
+
+    @staticmethod
+    def limit_breaches(totals: np.ndarray) -> np.ndarray:
+        """Boolean (n, 4) limit breaches for rows of delta, gamma, theta, vega totals"""
+        totals = np.atleast_2d(totals)
+        return np.column_stack([
+            np.abs(totals[:, 0]) > Config.MAX_PORTFOLIO_DELTA,
+            np.abs(totals[:, 1]) > Config.MAX_PORTFOLIO_GAMMA,
+            totals[:, 2] < Config.MAX_PORTFOLIO_THETA,
+            np.abs(totals[:, 3]) > Config.MAX_PORTFOLIO_VEGA
+        ])
+
+    def reprice(
+        self,
+        spot_prices: Dict[str, float],
+        ivs: Optional[Dict[str, float]] = None,
+        now: Optional[datetime] = None
+    ) -> int:
+        """
+        Recompute stored Greeks from fresh underlying prices (and optional IVs)
+
+        Args:
+            spot_prices: Underlying symbol -> price
+            ivs: Option symbol -> implied volatility (default: keep stored IV)
+            now: Valuation time (default: now, ET)
+
+        Returns:
+            Number of positions repriced
+        """
+        n = len(self._symbols)
+        if n == 0:
+            return 0
+
+        for row, symbol in enumerate(self._symbols):
+            underlying = self._underlyings[row]
+            if underlying and spot_prices.get(underlying):
+                self._spot[row] = spot_prices[underlying]
+            if ivs and ivs.get(symbol):
+                self._iv[row] = ivs[symbol]
+
+        rows = np.nonzero(~np.isnan(self._strike[:n]) & (self._spot[:n] > 0) & (self._iv[:n] > 0))[0]
+        if len(rows) > 0:
+            now = now or datetime.now(ET)
+            T = np.array([years_to_expiry(datetime.fromordinal(int(o)).date(), now) for o in self._expiry[rows]])
+            greeks = self.bs.greeks_vectorized(
+                self._spot[rows], self._strike[rows], T, self._iv[rows], self._is_call[rows]
+            )
+            self._greeks[rows] = np.column_stack([greeks[g] for g in GREEKS])
+
+        # Full re-sum once per cycle (also clears accumulated rounding drift)
+        self.totals = (self._greeks[:n] * (self._qty[:n] * CONTRACT_MULTIPLIER)[:, None]).sum(axis=0)
+        return len(rows)
+
+    def _exposure(self, row: int) -> np.ndarray:
+        return self._greeks[row] * self._qty[row] * CONTRACT_MULTIPLIER
+
+    def _allocate(self, symbol: str) -> int:
+        row = len(self._symbols)
+        if row == len(self._qty):
+            self._grow()
+        self._symbols.append(symbol)
+        self._rows[symbol] = row
+        return row
+
+    def _grow(self):
+        capacity = len(self._qty) * 2
+        self._greeks = np.vstack([self._greeks, np.zeros_like(self._greeks)])
+        self._qty = np.concatenate([self._qty, np.zeros(len(self._qty))])
+        self._strike = np.concatenate([self._strike, np.full(len(self._strike), np.nan)])
+        self._expiry = np.concatenate([self._expiry, np.full(len(self._expiry), np.nan)])
+        self._is_call = np.concatenate([self._is_call, np.zeros(len(self._is_call), dtype=bool)])
+        self._iv = np.concatenate([self._iv, np.zeros(len(self._iv))])
+        self._spot = np.concatenate([self._spot, np.zeros(len(self._spot))])
+        self._underlyings.extend([None] * (capacity - len(self._underlyings)))
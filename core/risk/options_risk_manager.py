@@ -6,9 +6,12 @@ import logging
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, time
 from dataclasses import dataclass
+import numpy as np
 import pytz
 
 from config import Config
+from core.risk.greeks_aggregator import GreeksAggregator, GREEKS
+from core.live.cycle_tracer import traced
 
 logger = logging.getLogger(__name__)
 
@@ -69,6 +72,7 @@ class OptionsRiskManager:
     def __init__(self):
         """Initialize options risk manager"""
         self.position_greeks: Dict[str, PositionGreeks] = {}
+        self.greeks_aggregator = GreeksAggregator()
         self.portfolio_greeks = PortfolioGreeks(0, 0, 0, 0, 0)
         self.daily_theta_burn = 0.0
         logger.info("OptionsRiskManager initialized with all phases enabled")
@@ -142,28 +146,49 @@ class OptionsRiskManager:
     def update_position_greeks(self, position: PositionGreeks):
         """Update Greeks for a single position"""
         self.position_greeks[position.symbol] = position
+        self.greeks_aggregator.upsert(position)
         self._recalculate_portfolio_greeks()
     
+    def update_position_qty(self, symbol: str, qty: int):
+        """Update contract count after a partial exit or add"""
+        if symbol in self.position_greeks and self.greeks_aggregator.set_qty(symbol, qty):
+            self.position_greeks[symbol].qty = qty
+            self._recalculate_portfolio_greeks()
+    
     def remove_position_greeks(self, symbol: str):
         """Remove position from Greeks tracking"""
         if symbol in self.position_greeks:
             del self.position_greeks[symbol]
+            self.greeks_aggregator.remove(symbol)
             self._recalculate_portfolio_greeks()
     
+    @traced('options_risk.reprice_greeks')
+    def reprice_greeks(self, spot_prices: Dict[str, float], ivs: Optional[Dict[str, float]] = None) -> int:
+        """
+        Reprice all tracked positions' Greeks from fresh spot / IV (once per cycle)
+        
+        Args:
+            spot_prices: Underlying symbol -> current price
+            ivs: Option symbol -> implied volatility (optional)
+            
+        Returns:
+            Number of positions repriced
+        """
+        repriced = self.greeks_aggregator.reprice(spot_prices, ivs)
+        for symbol, position in self.position_greeks.items():
+            values = self.greeks_aggregator.get(symbol)
+            position.delta = values['delta']
+            position.gamma = values['gamma']
+            position.theta = values['theta']
+            position.vega = values['vega']
+            position.iv = values['iv']
+            position.underlying_price = values['underlying_price']
+        self._recalculate_portfolio_greeks()
+        return repriced
+    
     def _recalculate_portfolio_greeks(self):
-        """Recalculate aggregate portfolio Greeks"""
-        total_delta = 0.0
-        total_gamma = 0.0
-        total_theta = 0.0
-        total_vega = 0.0
-        
-        for pos in self.position_greeks.values():
-            # Scale by quantity (each contract = 100 shares)
-            multiplier = pos.qty * 100
-            total_delta += pos.delta * multiplier
-            total_gamma += pos.gamma * multiplier
-            total_theta += pos.theta * multiplier
-            total_vega += pos.vega * multiplier
+        """Refresh aggregate portfolio Greeks from the running totals"""
+        total_delta, total_gamma, total_theta, total_vega = self.greeks_aggregator.totals.tolist()
         
         self.portfolio_greeks = PortfolioGreeks(
             total_delta=total_delta,
@@ -188,17 +213,57 @@ class OptionsRiskManager:
         """
         if new_position:
             # Simulate adding new position
-            temp_greeks = PortfolioGreeks(
-                total_delta=self.portfolio_greeks.total_delta + new_position.delta * new_position.qty * 100,
-                total_gamma=self.portfolio_greeks.total_gamma + new_position.gamma * new_position.qty * 100,
-                total_theta=self.portfolio_greeks.total_theta + new_position.theta * new_position.qty * 100,
-                total_vega=self.portfolio_greeks.total_vega + new_position.vega * new_position.qty * 100,
-                position_count=self.portfolio_greeks.position_count + 1
-            )
-            return temp_greeks.is_within_limits()
+            result = self.what_if([new_position], include_position_gamma=False)
+            return bool(result['allowed'][0]), result['violations'][0]
         
         return self.portfolio_greeks.is_within_limits()
     
+    def what_if(
+        self,
+        candidates: List[PositionGreeks],
+        include_position_gamma: bool = True
+    ) -> Dict:
+        """
+        Phase C: Score many candidate contracts against the portfolio limits at once
+        
+        Each candidate is evaluated independently as an addition to the current book.
+        
+        Args:
+            candidates: Candidate positions (Greeks per contract, qty in contracts)
+            include_position_gamma: Also apply the single-position gamma limit
+            
+        Returns:
+            Dictionary with allowed (bool array), new_totals ((n, 4) delta, gamma,
+            theta, vega after each candidate) and violations (list of messages per candidate)
+        """
+        if not candidates:
+            return {'allowed': np.zeros(0, dtype=bool), 'new_totals': np.zeros((0, len(GREEKS))), 'violations': []}
+        
+        greeks = np.array([[c.delta, c.gamma, c.theta, c.vega] for c in candidates], dtype=np.float64)
+        qty = np.array([c.qty for c in candidates], dtype=np.float64)
+        result = self.greeks_aggregator.what_if(greeks, qty)
+        
+        allowed = ~result['breaches'].any(axis=1)
+        if include_position_gamma:
+            allowed &= result['allowed']
+        
+        # Messages only for blocked candidates (same wording as PortfolioGreeks)
+        violations: List[List[str]] = [[] for _ in candidates]
+        for i in np.nonzero(~allowed)[0]:
+            delta, gamma, theta, vega = result['new_totals'][i].tolist()
+            _, violations[i] = PortfolioGreeks(
+                delta, gamma, theta, vega, self.portfolio_greeks.position_count + 1
+            ).is_within_limits()
+            if include_position_gamma and result['position_gamma'][i] > Config.MAX_POSITION_GAMMA:
+                violations[i].append(f"GAMMA LIMIT: Position gamma {result['position_gamma'][i]:.1f} "
+                                     f"exceeds limit {Config.MAX_POSITION_GAMMA}")
+        
+        return {
+            'allowed': allowed,
+            'new_totals': result['new_totals'],
+            'violations': violations
+        }
+    
     def check_position_gamma(self, gamma: float, qty: int) -> Tuple[bool, str]:
         """
         Phase C: Check if single position gamma is within limits
@@ -407,6 +472,7 @@ class OptionsRiskManager:
     
     # ========== COMPREHENSIVE CHECK ==========
     
+    @traced('options_risk.pre_trade_check')
     def pre_trade_check(
         self,
         symbol: str,
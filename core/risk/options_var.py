@@ -0,0 +1,368 @@
+"""
+Full-Revaluation Options VaR
+Historical-simulation VaR that reprices every option position under each scenario
+
+UVaRCalculator treats an option as linear exposure (price x qty), which misses
+gamma and vega of the short-dated long calls/puts we hold. Here each scenario
+shocks the underlying (and optionally IV), and all option positions are
+repriced at once on a (scenarios x positions) grid with vectorized
+Black-Scholes. Scenario returns come from the UVaRCalculator scenario matrix.
+"""
+import logging
+import re
+import time
+from datetime import datetime, date
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pytz
+
+from core.pricing.black_scholes import BlackScholes
+from core.risk.uvar_calculator import var_tail_size
+
+logger = logging.getLogger(__name__)
+
+OCC_SYMBOL_PATTERN = re.compile(r'^([A-Z]{1,6})(\d{6})([CP])(\d{8})$')
+CONTRACT_MULTIPLIER = 100
+ET = pytz.timezone('America/New_York')
+
+def parse_option_symbol(symbol: str) -> Optional[Dict]:
+    """
+    Parse an OCC option symbol (e.g. AAPL260117C00200000)
+
+    Returns:
+        Dict with underlying, expiration (date), option_type, strike or None
+    """
+    match = OCC_SYMBOL_PATTERN.match(symbol or '')
+    if not match:
+        return None
+    underlying, expiry, cp, strike = match.groups()
+    return {
+        'underlying': underlying,
+        'expiration': datetime.strptime(expiry, '%y%m%d').date(),
+        'option_type': 'call' if cp == 'C' else 'put',
+        'strike': int(strike) / 1000.0
+    }
+
+def years_to_expiry(expiration: date, now: Optional[datetime] = None) -> float:
+    """Calendar years until the 4:00 PM ET close on the expiration date"""
+    now = now or datetime.now(ET)
+    if now.tzinfo is None:
+        now = ET.localize(now)
+    expiry_close = ET.localize(datetime.combine(expiration, datetime.min.time()).replace(hour=16))
+    return max((expiry_close - now).total_seconds(), 0.0) / (365 * 24 * 3600)
+
+def horizon_years(horizon_days: int, now: Optional[datetime] = None) -> float:
+    """
+    Calendar years spanned by a horizon of `horizon_days` trading days
+
+    Same calendar basis as years_to_expiry, so a 1-day horizon over a weekend
+    decays three days of time value (exchange holidays are not skipped).
+    """
+    now = now or datetime.now(ET)
+    today = (now.astimezone(ET) if now.tzinfo else now).date()
+    end = np.busday_offset(np.datetime64(today, 'D'), horizon_days, roll='forward')
+    return float((end - np.datetime64(today, 'D')).astype(int)) / 365
+
+class OptionsVaRCalculator:
+    """
+    Full-revaluation VaR / expected shortfall for mixed stock and option books
+
+    Positions use the same dicts as UVaRCalculator (symbol, qty, entry_price,
+    current_price). Option symbols are OCC-formatted; current_price is the
+    option premium. Optional keys: underlying_price, implied_volatility.
+    """
+
+    def __init__(
+        self,
+        uvar_calculator,
+        confidence_level: Optional[float] = None,
+        iv_spot_beta: float = 0.0,
+        default_iv: float = 0.30,
+        cache_ttl_seconds: float = 60.0
+    ):
+        """
+        Initialize options VaR calculator
+
+        Args:
+            uvar_calculator: UVaRCalculator providing the scenario-returns matrix
+                (and the Alpaca client for underlying quotes)
+            confidence_level: VaR confidence (default: the UVaR calculator's)
+            iv_spot_beta: IV shock per unit underlying return, relative to current
+                IV (e.g. -2.0: a 5% drop raises IV by 10%); 0 disables IV shocks
+            default_iv: IV used when it cannot be implied from the premium
+            cache_ttl_seconds: Reuse underlying quotes / repriced books this long
+        """
+        self.uvar = uvar_calculator
+        self.confidence_level = confidence_level or uvar_calculator.confidence_level
+        self.iv_spot_beta = iv_spot_beta
+        self.default_iv = default_iv
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self.bs = BlackScholes()
+
+        self._spot_cache: Dict[str, Tuple[float, float]] = {}  # underlying -> (price, time)
+        self._iv_cache: Dict[Tuple[str, float], float] = {}  # (symbol, premium) -> IV
+        self._book_key = None
+        self._book_time = 0.0
+        self._book: Optional[Tuple[Dict, np.ndarray]] = None
+
+    def calculate(self, positions: List[Dict], horizon_days: int = 1) -> Dict:
+        """
+        Full-revaluation VaR for a portfolio
+
+        Args:
+            positions: Position dicts (stocks and OCC option symbols)
+            horizon_days: Horizon in trading days
+
+        Returns:
+            Dictionary with var, var_pct, expected_shortfall, es_pct,
+            portfolio_value, worst_case_loss, scenarios and contributions
+            (per position: symbol, var_contribution, es_contribution)
+        """
+        if not positions:
+            return self._empty_result(0.0, horizon_days)
+
+        book, pnl_grid = self._get_book_pnl(positions, horizon_days)
+        return self._summarize(book, pnl_grid, horizon_days)
+
+    def calculate_incremental(
+        self,
+        current_positions: List[Dict],
+        new_position: Dict,
+        horizon_days: int = 1
+    ) -> Dict:
+        """
+        VaR before/after adding a position (only the new position is repriced)
+
+        Returns:
+            Dictionary with var_before, var_after, var_before_pct, var_after_pct,
+            incremental_var, es_after, es_after_pct
+        """
+        before = self.calculate(current_positions, horizon_days)
+
+        new_book = self._build_book([new_position])
+        matrix, columns = self.uvar.get_scenario_matrix(new_book['underlyings'], horizon_days)
+
+        if current_positions:
+            # Repriced on the current grid if the new underlying extended the scenario dates
+            book, pnl_grid = self._get_book_pnl(current_positions, horizon_days)
+            book = self._concat_books(book, new_book)
+            pnl_grid = np.hstack([pnl_grid, self._reprice(new_book, matrix, columns, horizon_days)])
+        else:
+            book = new_book
+            pnl_grid = self._reprice(new_book, matrix, columns, horizon_days)
+
+        after = self._summarize(book, pnl_grid, horizon_days)
+
+        return {
+            'var_before': before['var'],
+            'var_after': after['var'],
+            'incremental_var': after['var'] - before['var'],
+            'var_before_pct': before['var_pct'],
+            'var_after_pct': after['var_pct'],
+            'incremental_var_pct': after['var_pct'] - before['var_pct'],
+            'es_after': after['expected_shortfall'],
+            'es_after_pct': after['es_pct']
+        }
+
+    def _get_book_pnl(self, positions: List[Dict], horizon_days: int) -> Tuple[Dict, np.ndarray]:
+        """Scenario P&L grid for a set of positions (cached briefly)"""
+        key = (horizon_days, tuple(
+            (p['symbol'], p.get('qty', 0), p.get('current_price'), p.get('underlying_price'))
+            for p in positions
+        ))
+        fresh = key == self._book_key and time.time() - self._book_time < self.cache_ttl_seconds
+        book = self._book[0] if fresh else self._build_book(positions)
+        matrix, columns = self.uvar.get_scenario_matrix(book['underlyings'], horizon_days)
+
+        if fresh and self._book[1].shape[0] == matrix.shape[0]:
+            return self._book
+
+        pnl_grid = self._reprice(book, matrix, columns, horizon_days)
+        self._book_key = key
+        self._book_time = time.time()
+        self._book = (book, pnl_grid)
+        return self._book
+
+    def _build_book(self, positions: List[Dict]) -> Dict:
+        """Position arrays: underlying, qty, spot, strike, expiry, IV, type, market value"""
+        now = datetime.now(ET)
+        n = len(positions)
+        book = {
+            'symbols': [p['symbol'] for p in positions],
+            'underlyings': [],
+            'qty': np.zeros(n),
+            'spot': np.zeros(n),
+            'strike': np.ones(n),
+            'expiry_years': np.zeros(n),
+            'iv': np.full(n, self.default_iv),
+            'is_call': np.zeros(n, dtype=bool),
+            'is_option': np.zeros(n, dtype=bool),
+            'market_value': np.zeros(n),
+        }
+
+        for i, position in enumerate(positions):
+            qty = float(position.get('qty', 0))
+            price = position.get('current_price') or position.get('entry_price', 0)
+            contract = parse_option_symbol(position['symbol'])
+            book['qty'][i] = qty
+
+            if contract is None:
+                book['underlyings'].append(position['symbol'])
+                book['spot'][i] = price
+                book['market_value'][i] = abs(price * qty)
+                continue
+
+            spot = position.get('underlying_price') or self._get_spot(contract['underlying'])
+            T = years_to_expiry(contract['expiration'], now)
+            book['underlyings'].append(contract['underlying'])
+            book['is_option'][i] = True
+            book['is_call'][i] = contract['option_type'] == 'call'
+            book['strike'][i] = contract['strike']
+            book['expiry_years'][i] = T
+            book['spot'][i] = spot or 0.0
+            book['iv'][i] = position.get('implied_volatility') or self._implied_vol(
+                position['symbol'], price, spot, contract, T
+            )
+            book['market_value'][i] = abs(price * qty * CONTRACT_MULTIPLIER)
+
+        return book
+
+    def _reprice(
+        self,
+        book: Dict,
+        matrix: np.ndarray,
+        columns: Dict[str, int],
+        horizon_days: int
+    ) -> np.ndarray:
+        """(scenarios x positions) P&L with full Black-Scholes revaluation of options"""
+        n_scenarios = matrix.shape[0]
+        returns = np.zeros((n_scenarios, len(book['symbols'])))
+        for i, underlying in enumerate(book['underlyings']):
+            col = columns.get(underlying)
+            if col is not None:
+                returns[:, i] = matrix[:, col]
+
+        # Stocks: linear
+        pnl = returns * (book['spot'] * book['qty'])
+
+        options = book['is_option'] & (book['spot'] > 0)
+        if options.any():
+            spot = book['spot'][options]
+            strike = book['strike'][options]
+            T = book['expiry_years'][options]
+            iv = book['iv'][options]
+            is_call = book['is_call'][options]
+            shocked_returns = returns[:, options]
+
+            base_value = self.bs.price_vectorized(spot, strike, T, iv, is_call)
+            scenario_iv = iv * (1 + self.iv_spot_beta * shocked_returns) if self.iv_spot_beta else iv
+            scenario_value = self.bs.price_vectorized(
+                spot * (1 + shocked_returns),
+                strike,
+                np.maximum(T - horizon_years(horizon_days), 0.0),
+                scenario_iv,
+                is_call
+            )
+            pnl[:, options] = (scenario_value - base_value) * book['qty'][options] * CONTRACT_MULTIPLIER
+
+        return pnl
+
+    def _summarize(self, book: Dict, pnl_grid: np.ndarray, horizon_days: int) -> Dict:
+        """VaR, expected shortfall and per-position contributions from a P&L grid"""
+        portfolio_value = float(book['market_value'].sum())
+        if portfolio_value == 0 or pnl_grid.shape[0] == 0:
+            return self._empty_result(portfolio_value, horizon_days)
+
+        losses = -pnl_grid.sum(axis=1)
+        n = len(losses)
+        tail_size = var_tail_size(n, self.confidence_level)
+        tail = np.argpartition(-losses, tail_size - 1)[:tail_size]
+        var_scenario = tail[np.argmin(losses[tail])]
+
+        var = float(losses[var_scenario])
+        expected_shortfall = float(losses[tail].mean())
+
+        # Scenario-attribution: contributions sum to VaR (at the VaR scenario) and ES (over the tail)
+        var_contrib = -pnl_grid[var_scenario]
+        es_contrib = -pnl_grid[tail].mean(axis=0)
+        contributions = [
+            {
+                'symbol': symbol,
+                'var_contribution': float(var_contrib[i]),
+                'es_contribution': float(es_contrib[i]),
+                'market_value': float(book['market_value'][i])
+            }
+            for i, symbol in enumerate(book['symbols'])
+        ]
+
+        return {
+            'var': var,
+            'var_pct': var / portfolio_value * 100,
+            'expected_shortfall': expected_shortfall,
+            'es_pct': expected_shortfall / portfolio_value * 100,
+            'portfolio_value': portfolio_value,
+            'worst_case_loss': float(losses.max()),
+            'horizon_days': horizon_days,
+            'confidence_level': self.confidence_level,
+            'scenarios': n,
+            'contributions': contributions
+        }
+
+    def _empty_result(self, portfolio_value: float, horizon_days: int) -> Dict:
+        return {
+            'var': 0.0,
+            'var_pct': 0.0,
+            'expected_shortfall': 0.0,
+            'es_pct': 0.0,
+            'portfolio_value': portfolio_value,
+            'worst_case_loss': 0.0,
+            'horizon_days': horizon_days,
+            'confidence_level': self.confidence_level,
+            'scenarios': 0,
+            'contributions': []
+        }
+
+    @staticmethod
+    def _concat_books(a: Dict, b: Dict) -> Dict:
+        combined = {}
+        for key in a:
+            if isinstance(a[key], list):
+                combined[key] = a[key] + b[key]
+            else:
+                combined[key] = np.concatenate([a[key], b[key]])
+        return combined
+
+    def _get_spot(self, underlying: str) -> Optional[float]:
+        """Underlying quote (cached for cache_ttl_seconds)"""
+        cached = self._spot_cache.get(underlying)
+        if cached and time.time() - cached[1] < self.cache_ttl_seconds:
+            return cached[0]
+
+        client = self.uvar.client
+        if not client:
+            logger.warning(f"No Alpaca client for {underlying} quote - option repriced as flat")
+            return None
+        try:
+            price = client.get_latest_price(underlying)
+        except Exception as e:
+            logger.warning(f"Could not get price for {underlying}: {e}")
+            return None
+        if price:
+            self._spot_cache[underlying] = (float(price), time.time())
+        return price
+
+    def _implied_vol(self, symbol: str, premium: float, spot: Optional[float], contract: Dict, T: float) -> float:
+        """IV implied from the option premium (cached per symbol and premium)"""
+        key = (symbol, round(float(premium or 0), 4))
+        if key in self._iv_cache:
+            return self._iv_cache[key]
+
+        iv = None
+        if spot and premium and T > 0:
+            iv = self.bs.calculate_implied_volatility(
+                premium, spot, contract['strike'], T, contract['option_type']
+            )
+        iv = iv or self.default_iv
+        self._iv_cache[key] = iv
+        return iv
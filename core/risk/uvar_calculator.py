@@ -4,7 +4,7 @@ Calculates portfolio tail risk using historical simulation for 1-3 day horizons
 """
 import logging
 from typing import List, Dict, Optional, Tuple
-from datetime import datetime, timedelta
+from datetime import datetime
 import pandas as pd
 import numpy as np
 from alpaca_client import AlpacaClient
@@ -12,6 +12,15 @@ from config import Config
 
 logger = logging.getLogger(__name__)
 
+def var_tail_size(n_scenarios: int, confidence_level: float) -> int:
+    """
+    Scenarios in the loss tail at a confidence level
+
+    VaR is the smallest loss among the `var_tail_size` largest losses (the
+    upper-tail loss quantile); expected shortfall is their mean.
+    """
+    return max(1, int(np.ceil((1 - confidence_level) * n_scenarios)))
+
 class UVaRCalculator:
     """
     Ultra-Short VaR Calculator
@@ -44,9 +53,16 @@ class UVaRCalculator:
         self.lookback_days = lookback_days
         self.confidence_level = confidence_level
         
-        # Cache for historical returns
-        self._returns_cache: Dict[str, pd.Series] = {}
-        self._cache_date = None
+        # Aligned scenario-returns matrices (dates x symbols) per horizon
+        self._scenario_frames: Dict[int, pd.DataFrame] = {}
+        self._scenario_matrices: Dict[int, Tuple[np.ndarray, Dict[str, int]]] = {}
+        self._unavailable_symbols: Dict[int, set] = {}
+        self._matrix_date = None
+        self._matrix_version = 0
+        
+        # Last baseline portfolio P&L vector (reused by incremental checks)
+        self._baseline_key = None
+        self._baseline: Optional[Tuple[np.ndarray, float]] = None
     
     def calculate_uvar(
         self,
@@ -64,7 +80,8 @@ class UVaRCalculator:
                 - entry_price: Entry price
                 - current_price: Current price (optional)
             horizon_days: VaR horizon in days (1, 2, or 3)
-            current_prices: Optional dict of current prices (if None, fetches)
+            current_prices: Optional dict of current prices, used for positions
+                without a current_price (fetched only if needed)
             
         Returns:
             Dictionary with:
@@ -73,23 +90,24 @@ class UVaRCalculator:
             - portfolio_value: Current portfolio value
             - worst_case_loss: Worst case loss from historical simulation
         """
+        return self._calculate_uvar(positions, horizon_days, current_prices)[0]
+    
+    def _calculate_uvar(
+        self,
+        positions: List[Dict],
+        horizon_days: int,
+        current_prices: Optional[Dict[str, float]] = None
+    ) -> Tuple[Dict[str, float], Optional[np.ndarray]]:
+        """calculate_uvar plus the scenario P&L vector it was computed from"""
         if not positions:
             return {
                 'uvar': 0.0,
                 'uvar_pct': 0.0,
                 'portfolio_value': 0.0,
                 'worst_case_loss': 0.0
-            }
+            }, None
         
-        # Get current prices if not provided
-        if current_prices is None:
-            current_prices = self._get_current_prices([p['symbol'] for p in positions])
-        
-        # Calculate portfolio value
-        portfolio_value = sum(
-            abs(p.get('current_price', p.get('entry_price', 0)) * p.get('qty', 0))
-            for p in positions
-        )
+        portfolio_pnls, portfolio_value = self._portfolio_pnl(positions, horizon_days, current_prices)
         
         if portfolio_value == 0:
             return {
@@ -97,66 +115,30 @@ class UVaRCalculator:
                 'uvar_pct': 0.0,
                 'portfolio_value': 0.0,
                 'worst_case_loss': 0.0
-            }
+            }, None
         
-        # Get historical returns for all symbols
-        symbols = list(set(p['symbol'] for p in positions))
-        returns_data = self._get_historical_returns(symbols, horizon_days)
-        
-        if not returns_data:
+        if portfolio_pnls is None:
             logger.warning("Insufficient historical data for UVaR calculation")
             return {
                 'uvar': 0.0,
                 'uvar_pct': 0.0,
                 'portfolio_value': portfolio_value,
                 'worst_case_loss': 0.0
-            }
-        
-        # Calculate portfolio P&L for each historical scenario
-        portfolio_pnls = []
+            }, None
         
-        for date_idx in range(len(returns_data[list(returns_data.keys())[0]])):
-            scenario_pnl = 0.0
-            
-            for position in positions:
-                symbol = position['symbol']
-                qty = position.get('qty', 0)
-                current_price = position.get('current_price', position.get('entry_price', 0))
-                
-                if symbol not in returns_data:
-                    continue
-                
-                # Get return for this scenario
-                if date_idx < len(returns_data[symbol]):
-                    return_pct = returns_data[symbol].iloc[date_idx]
-                    
-                    # Calculate P&L for this position in this scenario
-                    position_value = abs(current_price * qty)
-                    scenario_pnl += position_value * return_pct * (1 if qty > 0 else -1)
-            
-            portfolio_pnls.append(scenario_pnl)
-        
-        if not portfolio_pnls:
-            return {
-                'uvar': 0.0,
-                'uvar_pct': 0.0,
-                'portfolio_value': portfolio_value,
-                'worst_case_loss': 0.0
-            }
-        
-        # Calculate VaR at confidence level
-        portfolio_pnls = np.array(portfolio_pnls)
-        
-        # Sort losses (negative P&L)
-        losses = -portfolio_pnls  # Convert to losses (positive = loss)
-        losses = np.sort(losses)
+        return self._summarize(portfolio_pnls, portfolio_value, horizon_days), portfolio_pnls
+    
+    def _summarize(self, portfolio_pnls: np.ndarray, portfolio_value: float, horizon_days: int) -> Dict[str, float]:
+        """VaR statistics from a vector of scenario portfolio P&Ls"""
+        # Losses (positive = loss); only the upper-tail quantile and worst case are
+        # needed, so a partial sort is enough
+        losses = -portfolio_pnls
         
-        # Calculate percentile
-        percentile_idx = int((1 - self.confidence_level) * len(losses))
-        percentile_idx = max(0, min(percentile_idx, len(losses) - 1))
+        # VaR = smallest loss in the tail (same statistic as OptionsVaRCalculator)
+        quantile_idx = len(losses) - var_tail_size(len(losses), self.confidence_level)
         
-        uvar = losses[percentile_idx]
-        worst_case_loss = losses[-1] if len(losses) > 0 else 0.0
+        uvar = float(np.partition(losses, quantile_idx)[quantile_idx])
+        worst_case_loss = float(losses.max())
         
         uvar_pct = (uvar / portfolio_value) * 100 if portfolio_value > 0 else 0.0
         
@@ -170,6 +152,107 @@ class UVaRCalculator:
             'scenarios': len(portfolio_pnls)
         }
     
+    @staticmethod
+    def _position_price(position: Dict, current_prices: Optional[Dict[str, float]] = None) -> float:
+        """Price used for exposure: position current_price, then quoted price, then entry"""
+        price = position.get('current_price')
+        if price is None and current_prices:
+            price = current_prices.get(position['symbol'])
+        if price is None:
+            price = position.get('entry_price', 0)
+        return price
+    
+    def _portfolio_pnl(
+        self,
+        positions: List[Dict],
+        horizon_days: int,
+        current_prices: Optional[Dict[str, float]] = None
+    ) -> Tuple[Optional[np.ndarray], float]:
+        """
+        Scenario P&L vector as one (scenarios x symbols) @ (symbols,) product
+        
+        Returns:
+            (portfolio P&L per scenario or None if no history, portfolio value)
+        """
+        # Only positions without a current price need a quote
+        if current_prices is None and any(p.get('current_price') is None for p in positions):
+            current_prices = self._get_current_prices(
+                [p['symbol'] for p in positions if p.get('current_price') is None]
+            )
+        
+        prices = [self._position_price(p, current_prices) for p in positions]
+        portfolio_value = float(sum(abs(price * p.get('qty', 0)) for p, price in zip(positions, prices)))
+        if portfolio_value == 0:
+            return None, 0.0
+        
+        key = (
+            horizon_days,
+            tuple((p['symbol'], p.get('qty', 0), price) for p, price in zip(positions, prices))
+        )
+        
+        matrix, columns = self.get_scenario_matrix(list({p['symbol'] for p in positions}), horizon_days)
+        if self._baseline_key == (key, self._matrix_version) and self._baseline is not None:
+            return self._baseline
+        
+        if not columns:
+            return None, portfolio_value
+        
+        # Signed exposure per symbol column (positions in the same symbol net out)
+        exposures = np.zeros(len(columns))
+        for position, price in zip(positions, prices):
+            col = columns.get(position['symbol'])
+            if col is None:
+                continue
+            qty = position.get('qty', 0)
+            exposures[col] += abs(price * qty) * (1 if qty > 0 else -1)
+        
+        result = (matrix @ exposures, portfolio_value)
+        self._baseline_key = (key, self._matrix_version)
+        self._baseline = result
+        return result
+    
+    def get_scenario_matrix(self, symbols: List[str], horizon_days: int) -> Tuple[np.ndarray, Dict[str, int]]:
+        """
+        Aligned scenario-returns matrix (dates x symbols) for a horizon
+        
+        Columns are added on demand and kept for the day; symbols without
+        history are remembered so they are not re-fetched on every call.
+        
+        Returns:
+            (matrix, symbol -> column index)
+        """
+        today = datetime.now().date()
+        if self._matrix_date != today:
+            self._matrix_date = today
+            self._scenario_frames = {}
+            self._scenario_matrices = {}
+            self._unavailable_symbols = {}
+            self._matrix_version += 1
+        
+        frame = self._scenario_frames.get(horizon_days)
+        unavailable = self._unavailable_symbols.setdefault(horizon_days, set())
+        missing = [
+            s for s in symbols
+            if s not in unavailable and (frame is None or s not in frame.columns)
+        ]
+        
+        if missing:
+            returns_data = self._get_historical_returns(missing, horizon_days)
+            unavailable.update(s for s in missing if s not in returns_data)
+            if returns_data:
+                new_columns = pd.DataFrame(returns_data)
+                frame = new_columns if frame is None else pd.concat([frame, new_columns], axis=1)
+                # Dates missing for a symbol contribute no P&L in that scenario
+                frame = frame.sort_index().fillna(0.0)
+                self._scenario_frames[horizon_days] = frame
+                self._scenario_matrices[horizon_days] = (
+                    frame.to_numpy(dtype=np.float64),
+                    {symbol: i for i, symbol in enumerate(frame.columns)}
+                )
+                self._matrix_version += 1
+        
+        return self._scenario_matrices.get(horizon_days, (np.empty((0, 0)), {}))
+    
     def check_uvar_breach(
         self,
         positions: List[Dict],
@@ -232,68 +315,23 @@ class UVaRCalculator:
         Returns:
             Dictionary mapping symbol -> Series of returns
         """
-        returns_data = {}
-        
         if not self.client:
             logger.warning("No Alpaca client available for historical data")
-            return returns_data
+            return {}
         
-        # Check cache
-        today = datetime.now().date()
-        if self._cache_date != today:
-            self._returns_cache = {}
-            self._cache_date = today
+        # Shared panel: one daily-close fetch per symbol serves every horizon
+        from services.returns_panel import returns_panel
+        returns_panel.set_client(self.client)
+        
+        try:
+            returns_data = returns_panel.get_returns(symbols, horizon_days, self.lookback_days)
+        except Exception as e:
+            logger.error(f"Error getting historical returns: {e}")
+            return {}
         
         for symbol in symbols:
-            try:
-                # Check cache first
-                if symbol in self._returns_cache:
-                    returns = self._returns_cache[symbol]
-                else:
-                    # Fetch historical bars using get_historical_bars
-                    from alpaca_trade_api.rest import TimeFrame
-                    
-                    end_date = datetime.now()
-                    start_date = end_date - timedelta(days=self.lookback_days + horizon_days)
-                    
-                    df = self.client.get_historical_bars(
-                        symbol,
-                        TimeFrame.Day,
-                        start_date,
-                        end_date
-                    )
-                    
-                    if df.empty or len(df) < horizon_days + 1:
-                        logger.warning(f"Insufficient data for {symbol}: {len(df)} bars")
-                        continue
-                    
-                    # Ensure 'close' column exists (Alpaca returns different column names)
-                    if 'close' not in df.columns:
-                        if 'c' in df.columns:
-                            df['close'] = df['c']
-                        else:
-                            logger.warning(f"No close price column found for {symbol}")
-                            continue
-                    
-                    # Calculate returns over horizon
-                    if horizon_days == 1:
-                        returns = df['close'].pct_change(periods=1).dropna()
-                    elif horizon_days == 2:
-                        returns = df['close'].pct_change(periods=2).dropna()
-                    elif horizon_days == 3:
-                        returns = df['close'].pct_change(periods=3).dropna()
-                    else:
-                        # For other horizons, use forward-looking returns
-                        returns = df['close'].pct_change(periods=horizon_days).dropna()
-                    
-                    # Cache returns
-                    self._returns_cache[symbol] = returns
-                
-                returns_data[symbol] = returns
-                
-            except Exception as e:
-                logger.error(f"Error getting historical returns for {symbol}: {e}")
-                continue
+            if symbol not in returns_data:
+                logger.warning(f"Insufficient data for {symbol}")
         
         return returns_data
     
@@ -306,6 +344,9 @@ class UVaRCalculator:
         """
         Calculate incremental UVaR impact of adding a new position
         
+        The baseline scenario P&L is cached; the candidate adds a rank-one
+        term (its exposure times its symbol's return column).
+        
         Args:
             current_positions: Current portfolio positions
             new_position: New position to add
@@ -314,12 +355,34 @@ class UVaRCalculator:
         Returns:
             Dictionary with incremental UVaR impact
         """
-        # Calculate UVaR without new position
-        uvar_before = self.calculate_uvar(current_positions, horizon_days)
+        # Add the candidate's return column first so the baseline uses the final matrix
+        matrix, columns = self.get_scenario_matrix([new_position['symbol']], horizon_days)
+        
+        # Calculate UVaR without new position, keeping its scenario P&L vector
+        uvar_before, baseline_pnls = self._calculate_uvar(current_positions, horizon_days)
+        matrix, columns = self._scenario_matrices.get(horizon_days, (matrix, columns))
         
-        # Calculate UVaR with new position
-        positions_with_new = current_positions + [new_position]
-        uvar_after = self.calculate_uvar(positions_with_new, horizon_days)
+        qty = new_position.get('qty', 0)
+        new_value = abs(self._position_price(new_position) * qty)
+        col = columns.get(new_position['symbol'])
+        
+        portfolio_value_after = uvar_before['portfolio_value'] + new_value
+        if col is None and baseline_pnls is None:
+            pnls_after = None
+        else:
+            if baseline_pnls is None:
+                baseline_pnls = np.zeros(matrix.shape[0])
+            pnls_after = baseline_pnls
+            if col is not None:
+                pnls_after = baseline_pnls + matrix[:, col] * (new_value * (1 if qty > 0 else -1))
+        
+        if portfolio_value_after == 0:
+            uvar_after = {'uvar': 0.0, 'uvar_pct': 0.0}
+        elif pnls_after is None:
+            logger.warning("Insufficient historical data for UVaR calculation")
+            uvar_after = {'uvar': 0.0, 'uvar_pct': 0.0}
+        else:
+            uvar_after = self._summarize(pnls_after, portfolio_value_after, horizon_days)
         
         return {
             'uvar_before': uvar_before['uvar'],
@@ -329,4 +392,3 @@ class UVaRCalculator:
             'uvar_before_pct': uvar_before['uvar_pct'],
             'uvar_after_pct': uvar_after['uvar_pct']
         }
-
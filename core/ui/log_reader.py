@@ -0,0 +1,326 @@
+"""
+Log Reader
+Tail-following log access for the System Logs page
+
+Each file is read from the end on first use and then only as new bytes
+arrive; parsed entries are categorized once and kept in a bounded buffer.
+A per-file (byte offset, timestamp) index, sampled every `index_interval`
+bytes and persisted under data/log_index, lets time-range queries seek
+straight to the right part of a large log instead of reading it all.
+"""
+import bisect
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Pattern: 2025-12-17 09:30:15,123 - module - LEVEL - message
+LOG_PATTERN = re.compile(r'(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}(?:,\d+)?)\s+-\s+([\w.]+)\s+-\s+(\w+)\s+-\s+(.+)')
+TIMESTAMP_PATTERN = re.compile(rb'(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2})')
+
+CATEGORY_KEYWORDS = [
+    ('Signal Generation', ['signal', 'trade intent', 'analyze', 'agent', 'confidence', 'generated']),
+    ('Trade Execution', ['execute', 'executing trade', 'order', 'filled', 'trade executed']),
+    ('Trade Rejection', ['blocked', 'reject', 'not allowed', 'risk', 'confidence too low', 'trade blocked']),
+    ('Validation', ['validate', 'check', 'setup', 'config', 'initialized', 'warmup']),
+    ('Market Status', ['market open', 'market close', 'warmup', 'pre-market', 'after hours']),
+    ('Account Status', ['account', 'balance', 'equity', 'buying power', 'positions']),
+    ('Error', ['error', 'exception', 'failed', 'unauthorized']),
+    ('Trading Cycle', ['trading cycle', 'scan', 'monitor', 'cycle']),
+]
+
+def categorize_message(message: str) -> str:
+    """Categorize log message by activity type (first matching category wins)"""
+    message = message.lower()
+    for category, words in CATEGORY_KEYWORDS:
+        if any(word in message for word in words):
+            return category
+    return 'Other'
+
+def parse_log_line(line: str) -> Optional[Dict]:
+    """Parse a log line into structured data (None for non-matching lines)"""
+    match = LOG_PATTERN.match(line.strip())
+    if not match:
+        return None
+
+    timestamp_str, module, level, message = match.groups()
+    try:
+        timestamp = datetime.fromisoformat(timestamp_str.replace(',', '.'))
+    except ValueError:
+        timestamp = datetime.now()
+
+    return {
+        'timestamp': timestamp,
+        'module': module,
+        'level': level,
+        'message': message,
+        'category': categorize_message(message)
+    }
+
+class LogTailer:
+    """Incremental reader for one log file"""
+
+    def __init__(
+        self,
+        path: Path,
+        max_entries: int = 500,
+        index_dir: Optional[Path] = None,
+        index_interval: int = 1024 * 1024
+    ):
+        """
+        Initialize tailer
+
+        Args:
+            path: Log file
+            max_entries: Most recent parsed entries kept
+            index_dir: Directory for the persisted offset index (default: data/log_index)
+            index_interval: Bytes between index points
+        """
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.index_interval = index_interval
+        path_key = hashlib.md5(str(self.path.resolve()).encode()).hexdigest()[:8]
+        self.index_path = (index_dir or Path('data/log_index')) / f"{self.path.name}.{path_key}.json"
+
+        self.entries: deque = deque(maxlen=max_entries)
+        self.offset = 0
+        self._partial = b''
+        self._inode: Optional[int] = None
+        self._index: List[Tuple[int, str]] = []  # (offset, ISO timestamp), ascending
+        self._next_sample = 0   # Next offset to sample
+        self._indexed_size = 0  # File size when last indexed
+        self._lock = threading.Lock()
+        self._load_index()
+
+    # ========== TAIL ==========
+
+    def poll(self) -> int:
+        """
+        Parse bytes appended since the last poll
+
+        Returns:
+            Number of new entries
+        """
+        with self._lock:
+            try:
+                stat = self.path.stat()
+            except FileNotFoundError:
+                return 0
+
+            if self._inode != stat.st_ino or stat.st_size < self.offset:
+                # New, rotated or truncated file: start again from the tail
+                self._reset(stat)
+
+            if stat.st_size == self.offset:
+                return 0
+
+            with open(self.path, 'rb') as f:
+                f.seek(self.offset)
+                data = f.read(stat.st_size - self.offset)
+            self.offset += len(data)
+
+            data = self._partial + data
+            lines = data.split(b'\n')
+            self._partial = lines.pop()  # Incomplete last line (if any)
+
+            added = 0
+            for line in lines:
+                parsed = parse_log_line(line.decode('utf-8', errors='ignore'))
+                if parsed:
+                    self.entries.append(parsed)
+                    added += 1
+            return added
+
+    def _reset(self, stat: os.stat_result):
+        """Start from roughly the last `max_entries` lines"""
+        self.entries.clear()
+        self._partial = b''
+        if self._inode is not None and self._inode != stat.st_ino:
+            self._clear_index()
+        self._inode = stat.st_ino
+        self.offset = self._tail_offset(stat.st_size)
+
+    def _tail_offset(self, size: int) -> int:
+        """Offset of the start of the last `max_entries` lines (reads backwards in blocks)"""
+        block = 64 * 1024
+        position = size
+        newlines = 0
+        with open(self.path, 'rb') as f:
+            while position > 0:
+                read_size = min(block, position)
+                position -= read_size
+                f.seek(position)
+                chunk = f.read(read_size)
+                newlines += chunk.count(b'\n')
+                if newlines > self.max_entries:
+                    # Walk forward to the exact line boundary
+                    excess = newlines - self.max_entries - 1
+                    cut = -1
+                    for _ in range(excess + 1):
+                        cut = chunk.index(b'\n', cut + 1)
+                    return position + cut + 1
+        return 0
+
+    def recent(self) -> List[Dict]:
+        """Most recent entries (oldest first)"""
+        with self._lock:
+            return list(self.entries)
+
+    # ========== TIME-RANGE READS ==========
+
+    def read_range(self, start: datetime, end: Optional[datetime] = None, limit: int = 5000) -> List[Dict]:
+        """
+        Entries with start <= timestamp < end, oldest first (the newest `limit` if more match)
+
+        Seeks to the last index point before `start` and reads forward to `end`.
+        """
+        with self._lock:
+            try:
+                size = self.path.stat().st_size
+            except FileNotFoundError:
+                return []
+            self._extend_index(size)
+
+            start_iso = start.isoformat(sep=' ')
+            keys = [ts for _, ts in self._index]
+            i = bisect.bisect_left(keys, start_iso) - 1
+            offset = self._index[i][0] if i >= 0 else 0
+
+        entries: deque = deque(maxlen=limit)
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            for raw in f:
+                parsed = parse_log_line(raw.decode('utf-8', errors='ignore'))
+                if not parsed:
+                    continue
+                if parsed['timestamp'] < start:
+                    continue
+                if end and parsed['timestamp'] >= end:
+                    break
+                entries.append(parsed)
+        return list(entries)
+
+    def _clear_index(self):
+        self._index, self._next_sample, self._indexed_size = [], 0, 0
+
+    def _extend_index(self, size: int):
+        """Sample (offset, timestamp) points every index_interval bytes up to size"""
+        if size < self._indexed_size:
+            self._clear_index()  # Truncated
+        if self._next_sample >= size:
+            return
+
+        with open(self.path, 'rb') as f:
+            position = self._next_sample
+            while position < size:
+                f.seek(position)
+                if position > 0:
+                    f.readline()  # Skip to the next line boundary
+                line_start = f.tell()
+                # First timestamped line at or after this point
+                for _ in range(200):
+                    raw = f.readline()
+                    if not raw:
+                        break
+                    match = TIMESTAMP_PATTERN.match(raw)
+                    if match:
+                        ts = match.group(1).decode()
+                        if not self._index or (line_start > self._index[-1][0] and ts >= self._index[-1][1]):
+                            self._index.append((line_start, ts))
+                        break
+                    line_start = f.tell()
+                position += self.index_interval
+        self._next_sample = position
+        self._indexed_size = size
+        self._save_index()
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, 'r') as f:
+                data = json.load(f)
+            stat = self.path.stat()
+            if data.get('inode') == stat.st_ino and data.get('indexed_size', 0) <= stat.st_size:
+                self._index = [tuple(point) for point in data.get('points', [])]
+                self._next_sample = data.get('next_sample', 0)
+                self._indexed_size = data.get('indexed_size', 0)
+        except (FileNotFoundError, ValueError, KeyError):
+            pass
+        except Exception as e:
+            logger.debug(f"Could not load log index for {self.path}: {e}")
+
+    def _save_index(self):
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.index_path, 'w') as f:
+                json.dump({
+                    'path': str(self.path),
+                    'inode': self.path.stat().st_ino,
+                    'next_sample': self._next_sample,
+                    'indexed_size': self._indexed_size,
+                    'points': self._index
+                }, f)
+        except Exception as e:
+            logger.debug(f"Could not save log index for {self.path}: {e}")
+
+class LogReader:
+    """Tail-following reader over several log files"""
+
+    def __init__(self, paths: Iterable[Path], max_entries: int = 500):
+        self.paths = [Path(p) for p in paths]
+        self.max_entries = max_entries
+        self._tailers: Dict[Path, LogTailer] = {}
+
+    def _active_tailers(self) -> List[LogTailer]:
+        tailers = []
+        for path in self.paths:
+            if not path.exists():
+                continue
+            if path not in self._tailers:
+                self._tailers[path] = LogTailer(path, max_entries=self.max_entries)
+            tailers.append(self._tailers[path])
+        return tailers
+
+    @property
+    def found_files(self) -> List[str]:
+        return [str(p) for p in self.paths if p.exists()]
+
+    def latest(self) -> List[Dict]:
+        """Poll all files and return their recent entries, newest first"""
+        entries = []
+        for tailer in self._active_tailers():
+            try:
+                tailer.poll()
+            except Exception as e:
+                logger.debug(f"Could not read {tailer.path}: {e}")
+            for entry in tailer.recent():
+                entries.append(dict(entry, source_file=tailer.path.name))
+        entries.sort(key=lambda x: x['timestamp'], reverse=True)
+        return entries
+
+    def read_range(self, start: datetime, end: Optional[datetime] = None, limit: int = 5000) -> List[Dict]:
+        """Entries in [start, end) across files, newest first"""
+        entries = []
+        for tailer in self._active_tailers():
+            try:
+                entries.extend(dict(e, source_file=tailer.path.name) for e in tailer.read_range(start, end, limit))
+            except Exception as e:
+                logger.debug(f"Could not read {tailer.path}: {e}")
+        entries.sort(key=lambda x: x['timestamp'], reverse=True)
+        return entries[:limit]
+
+_readers: Dict[Tuple, LogReader] = {}
+
+def get_log_reader(paths: Iterable[Path], max_entries: int = 500) -> LogReader:
+    """Process-wide reader per path set (tail state survives page reruns)"""
+    key = (tuple(str(p) for p in paths), max_entries)
+    if key not in _readers:
+        _readers[key] = LogReader(paths, max_entries)
+    return _readers[key]
@@ -1,6 +1,6 @@
 """
 Trade Loader Utility
-Loads trades from both backtest results and live Alpaca orders
+Loads trades from backtest results, live Alpaca positions and the local trade ledger
 """
 import json
 from pathlib import Path
@@ -40,32 +40,62 @@ def load_backtest_trades() -> List[Dict]:
     
     return trades
 
-def load_live_trades_from_alpaca() -> List[Dict]:
-    """Load trades from live Alpaca orders and positions"""
-    trades = []
-    
-    try:
+_client = None
+_ledger = None
+
+def _get_alpaca_client():
+    """Shared AlpacaClient for the UI process (None if not configured)"""
+    global _client
+    if _client is None:
         from config import Config
         from alpaca_client import AlpacaClient
         
         # Validate config
         if not Config.ALPACA_API_KEY or not Config.ALPACA_SECRET_KEY:
             logger.debug("Alpaca credentials not configured")
-            return trades
+            return None
         
-        client = AlpacaClient(
+        _client = AlpacaClient(
             Config.ALPACA_API_KEY,
             Config.ALPACA_SECRET_KEY,
-            Config.ALPACA_BASE_URL
+            Config.ALPACA_BASE_URL,
+            verify_connection=False
         )
+        # Reads go through the market data daemon when one is running
+        from services.market_data_daemon import via_daemon
+        _client = via_daemon(_client, 'alpaca')
+    return _client
+
+def get_trade_ledger():
+    """Shared trade ledger, synced in the background (first call syncs inline)"""
+    global _ledger
+    if _ledger is None:
+        from services.trade_ledger import TradeLedger
+        client = _get_alpaca_client()
+        if client is None:
+            return None
+        _ledger = TradeLedger(client)
+        _ledger.sync()
+        _ledger.start_background_sync(interval_seconds=30)
+    return _ledger
+
+def load_live_trades_from_alpaca() -> List[Dict]:
+    """Load open positions from Alpaca and closed trades from the local ledger"""
+    trades = []
+    
+    try:
+        client = _get_alpaca_client()
+        ledger = get_trade_ledger()
+        if client is None or ledger is None:
+            return trades
+        
+        entry_times = ledger.get_open_lot_entry_times()
         
-        # First, get all current positions with real P&L
+        # Current positions with real (unrealized) P&L
         positions = client.get_positions()
-        position_symbols = set()
         
         for pos in positions:
             symbol = pos.get('symbol', '')
-            position_symbols.add(symbol)
             
             qty = abs(float(pos.get('qty', 0)))
             entry_price = float(pos.get('avg_entry_price', 0))
@@ -84,7 +114,7 @@ def load_live_trades_from_alpaca() -> List[Dict]:
             trade = {
                 'symbol': symbol,
                 'underlying': underlying,
-                'entry_time': datetime.now().isoformat(),  # Will be updated from orders
+                'entry_time': entry_times.get(symbol) or datetime.now().isoformat(),
                 'exit_time': None,  # Still open
                 'entry_price': entry_price,
                 'exit_price': current_price,  # Current price (unrealized)
@@ -102,91 +132,8 @@ def load_live_trades_from_alpaca() -> List[Dict]:
             }
             trades.append(trade)
         
-        # Next, get filled orders to find entry times and closed trades
-        orders = client.get_orders(status='all', limit=200)
-        
-        # Track orders by symbol
-        symbol_orders = {}
-        for order in orders:
-            if order.get('status') != 'filled':
-                continue
-            
-            symbol = order.get('symbol', '')
-            if symbol not in symbol_orders:
-                symbol_orders[symbol] = []
-            
-            symbol_orders[symbol].append({
-                'id': order.get('id', ''),
-                'side': order.get('side', ''),
-                'qty': float(order.get('filled_qty', order.get('qty', 0))),
-                'price': float(order.get('filled_avg_price', 0)),
-                'created_at': order.get('created_at', datetime.now().isoformat()),
-                'filled_at': order.get('filled_at', order.get('created_at', datetime.now().isoformat()))
-            })
-        
-        # Update entry times for open positions
-        for trade in trades:
-            symbol = trade['symbol']
-            if symbol in symbol_orders:
-                # Find the earliest buy order for this symbol
-                buy_orders = [o for o in symbol_orders[symbol] if o['side'] == 'buy']
-                if buy_orders:
-                    buy_orders.sort(key=lambda x: x['filled_at'])
-                    trade['entry_time'] = buy_orders[0]['filled_at']
-        
-        # Find closed trades (matched buy/sell pairs for symbols not in current positions)
-        for symbol, orders_list in symbol_orders.items():
-            if symbol in position_symbols:
-                continue  # Skip if we still have open position
-            
-            buys = sorted([o for o in orders_list if o['side'] == 'buy'], key=lambda x: x['filled_at'])
-            sells = sorted([o for o in orders_list if o['side'] == 'sell'], key=lambda x: x['filled_at'])
-            
-            # Match buys with sells
-            buy_idx = 0
-            sell_idx = 0
-            
-            while buy_idx < len(buys) and sell_idx < len(sells):
-                buy = buys[buy_idx]
-                sell = sells[sell_idx]
-                
-                qty = min(buy['qty'], sell['qty'])
-                entry_price = buy['price']
-                exit_price = sell['price']
-                
-                pnl = (exit_price - entry_price) * qty * (100 if len(symbol) > 10 else 1)  # Options = 100 shares
-                pnl_pct = ((exit_price - entry_price) / entry_price) * 100 if entry_price > 0 else 0
-                
-                is_option = len(symbol) > 10
-                underlying = symbol[:4].rstrip('0123456789') if is_option else symbol
-                
-                closed_trade = {
-                    'symbol': symbol,
-                    'underlying': underlying,
-                    'entry_time': buy['filled_at'],
-                    'exit_time': sell['filled_at'],
-                    'entry_price': entry_price,
-                    'exit_price': exit_price,
-                    'qty': qty,
-                    'side': 'long',
-                    'pnl': pnl,
-                    'pnl_pct': pnl_pct,
-                    'reason': 'closed_trade',
-                    'status': 'CLOSED',
-                    'agent': 'Live Trading',
-                    'source': 'Live Trading',
-                    'is_option': is_option,
-                    'order_id': f"{buy['id']}/{sell['id']}"
-                }
-                trades.append(closed_trade)
-                
-                buy['qty'] -= qty
-                sell['qty'] -= qty
-                
-                if buy['qty'] <= 0:
-                    buy_idx += 1
-                if sell['qty'] <= 0:
-                    sell_idx += 1
+        # Closed round trips (FIFO-matched by the ledger syncer)
+        trades.extend(ledger.get_closed_trades())
         
     except ImportError as e:
         logger.debug(f"Could not import Alpaca modules: {e}")
@@ -0,0 +1,229 @@
+"""
+Append-only JSONL Journal
+Buffered record journal with periodic fsync, size-based rotation and date-range reads
+
+Records are appended as one JSON object per line to `<name>.jsonl`. When the
+active file exceeds `max_bytes` it is renamed to `<name>.<first-timestamp>.jsonl`
+(segments sort chronologically by name), so readers can skip whole segments
+outside a requested date range.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+TimeBound = Optional[Union[datetime, str]]
+
+_registry: Dict[Path, 'Journal'] = {}
+_registry_lock = threading.Lock()
+
+def _as_iso(value: TimeBound) -> Optional[str]:
+    if value is None:
+        return None
+    return value.isoformat() if isinstance(value, datetime) else str(value)
+
+class Journal:
+    """Append-only JSONL journal (thread-safe)"""
+
+    def __init__(
+        self,
+        log_dir: Union[str, Path],
+        name: str,
+        time_field: str = 'timestamp',
+        buffer_size: int = 1,
+        fsync_interval_seconds: float = 5.0,
+        max_bytes: int = 10 * 1024 * 1024
+    ):
+        """
+        Initialize journal
+
+        Args:
+            log_dir: Directory for journal files
+            name: Journal name (file stem)
+            time_field: ISO timestamp field used for rotation names and range reads
+                (records must be appended in non-decreasing order of this field)
+            buffer_size: Records buffered in memory before writing (1 = write-through)
+            fsync_interval_seconds: Minimum seconds between fsyncs
+            max_bytes: Rotate the active file beyond this size
+        """
+        self.log_dir = Path(log_dir)
+        self.log_dir.mkdir(exist_ok=True, parents=True)
+        self.name = name
+        self.time_field = time_field
+        self.buffer_size = max(1, buffer_size)
+        self.fsync_interval_seconds = fsync_interval_seconds
+        self.max_bytes = max_bytes
+
+        self.path = self.log_dir / f"{name}.jsonl"
+        self._buffer: List[str] = []
+        self._file = None
+        self._first_timestamp: Optional[str] = None
+        self._last_fsync = time.monotonic()
+        self._lock = threading.Lock()
+
+    def append(self, record: Dict):
+        """Append a record (written once the buffer is full)"""
+        line = json.dumps(record, default=str)
+        with self._lock:
+            self._buffer.append(line)
+            if len(self._buffer) >= self.buffer_size:
+                self._write()
+
+    def flush(self, fsync: bool = False):
+        """Write buffered records (and fsync if requested)"""
+        with self._lock:
+            self._write(force_fsync=fsync)
+
+    def close(self):
+        """Flush, fsync and close the active file"""
+        with self._lock:
+            self._write(force_fsync=True)
+            if self._file:
+                self._file.close()
+                self._file = None
+
+    def read(self, start: TimeBound = None, end: TimeBound = None) -> Iterator[Dict]:
+        """
+        Stream records with start <= time_field < end, oldest first
+
+        Args:
+            start: Inclusive lower bound (datetime or ISO string)
+            end: Exclusive upper bound (datetime or ISO string)
+
+        Yields:
+            Records in append order
+        """
+        self.flush()
+        start_iso, end_iso = _as_iso(start), _as_iso(end)
+
+        segments = self._segments()
+        for i, (segment_start, path) in enumerate(segments):
+            # A segment ends where the next one begins
+            next_start = segments[i + 1][0] if i + 1 < len(segments) else None
+            if start_iso and next_start and next_start < start_iso:
+                continue
+            if end_iso and segment_start and segment_start >= end_iso:
+                break
+            yield from self._read_file(path, start_iso, end_iso)
+
+    def _read_file(self, path: Path, start_iso: Optional[str], end_iso: Optional[str]) -> Iterator[Dict]:
+        try:
+            with open(path, 'r') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        logger.warning(f"Skipping corrupt journal line in {path.name}")
+                        continue
+                    ts = str(record.get(self.time_field, ''))
+                    if start_iso and ts < start_iso:
+                        continue
+                    if end_iso and ts >= end_iso:
+                        continue
+                    yield record
+        except FileNotFoundError:
+            return
+
+    def _segments(self) -> List:
+        """(first timestamp, path) for rotated segments, then the active file"""
+        rotated = []
+        for path in self.log_dir.glob(f"{self.name}.*.jsonl"):
+            stamp = path.name[len(self.name) + 1:-len('.jsonl')]
+            rotated.append((stamp, path))
+        rotated.sort()
+        return [(self._from_stamp(stamp), path) for stamp, path in rotated] + [(None, self.path)]
+
+    @staticmethod
+    def _to_stamp(iso: str) -> str:
+        return iso.replace(':', '').replace('-', '')
+
+    @staticmethod
+    def _from_stamp(stamp: str) -> str:
+        # 20261018T153000.123456 -> 2026-10-18T15:30:00.123456
+        stamp = stamp.split('_')[0]
+        date_part, _, time_part = stamp.partition('T')
+        iso = f"{date_part[:4]}-{date_part[4:6]}-{date_part[6:8]}"
+        if time_part:
+            iso += f"T{time_part[:2]}:{time_part[2:4]}:{time_part[4:]}"
+        return iso
+
+    def _write(self, force_fsync: bool = False):
+        """Write the buffer to the active file (caller holds the lock)"""
+        if not self._buffer and not force_fsync:
+            return
+        try:
+            if self._buffer:
+                if self._file is None:
+                    self._open()
+                if self._first_timestamp is None:
+                    self._first_timestamp = str(json.loads(self._buffer[0]).get(self.time_field, ''))
+                self._file.write('\n'.join(self._buffer) + '\n')
+                self._file.flush()
+                self._buffer = []
+
+            if self._file and (force_fsync or time.monotonic() - self._last_fsync >= self.fsync_interval_seconds):
+                os.fsync(self._file.fileno())
+                self._last_fsync = time.monotonic()
+
+            if self._file and self._file.tell() >= self.max_bytes:
+                self._rotate()
+        except Exception as e:
+            logger.error(f"Error writing journal {self.name}: {e}")
+
+    def _open(self):
+        self._file = open(self.path, 'a')
+        if self._file.tell() > 0:
+            # Existing active file: its first record names the segment on rotation
+            with open(self.path, 'r') as f:
+                first = f.readline()
+            try:
+                self._first_timestamp = str(json.loads(first).get(self.time_field, ''))
+            except (json.JSONDecodeError, AttributeError):
+                self._first_timestamp = datetime.now().isoformat()
+
+    def _rotate(self):
+        """Rename the active file to a timestamped segment"""
+        os.fsync(self._file.fileno())
+        self._file.close()
+        self._file = None
+
+        stamp = self._to_stamp(self._first_timestamp or datetime.now().isoformat())
+        target = self.log_dir / f"{self.name}.{stamp}.jsonl"
+        suffix = 1
+        while target.exists():
+            target = self.log_dir / f"{self.name}.{stamp}_{suffix}.jsonl"
+            suffix += 1
+        self.path.rename(target)
+        self._first_timestamp = None
+        logger.info(f"Rotated journal {self.name} -> {target.name}")
+
+def shared_journal(log_dir: Union[str, Path], name: str, **kwargs) -> Journal:
+    """
+    Process-wide journal for `<log_dir>/<name>.jsonl`
+
+    Every writer of a file must go through one Journal: separate instances track
+    size and rotation independently, so one could rename a segment another is
+    still appending to. Options from the first call win.
+
+    Args:
+        log_dir: Directory for journal files
+        name: Journal name (file stem)
+        **kwargs: Journal options (time_field, buffer_size, ...)
+
+    Returns:
+        The shared Journal instance
+    """
+    path = (Path(log_dir) / f"{name}.jsonl").resolve()
+    with _registry_lock:
+        journal = _registry.get(path)
+        if journal is None:
+            journal = _registry[path] = Journal(log_dir, name, **kwargs)
+        return journal
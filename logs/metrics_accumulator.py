@@ -0,0 +1,154 @@
+"""
+Metrics Accumulator
+Streaming performance metrics: O(1) per recorded trade, O(days) per read
+
+Each trade is folded into a lifetime summary, a per-day bucket and per-agent
+counters. A summary keeps count, sums and sum of squares (mean / Sharpe),
+win/loss totals and the prefix statistics needed to combine max drawdown
+across buckets exactly, so a rolling window is just the combination of its
+day buckets.
+"""
+import math
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional
+
+@dataclass
+class PnLSummary:
+    """Combinable summary of an ordered sequence of trade P&Ls"""
+    count: int = 0
+    wins: int = 0
+    losses: int = 0
+    total: float = 0.0
+    sum_sq: float = 0.0
+    win_total: float = 0.0
+    loss_total: float = 0.0
+    max_prefix: float = -math.inf  # Highest cumulative P&L (over non-empty prefixes)
+    min_prefix: float = math.inf   # Lowest cumulative P&L (over non-empty prefixes)
+    max_drawdown: float = 0.0      # Largest peak-to-trough drop within the sequence
+
+    def add(self, pnl: float):
+        """Append one trade (O(1))"""
+        cumulative = self.total + pnl
+        if self.count > 0:
+            self.max_drawdown = max(self.max_drawdown, self.max_prefix - cumulative)
+        self.max_prefix = max(self.max_prefix, cumulative)
+        self.min_prefix = min(self.min_prefix, cumulative)
+
+        self.count += 1
+        self.total = cumulative
+        self.sum_sq += pnl * pnl
+        if pnl > 0:
+            self.wins += 1
+            self.win_total += pnl
+        elif pnl < 0:
+            self.losses += 1
+            self.loss_total += pnl
+
+    def combine(self, later: 'PnLSummary') -> 'PnLSummary':
+        """Summary of this sequence followed by `later`"""
+        if self.count == 0:
+            return PnLSummary(**vars(later))
+        if later.count == 0:
+            return PnLSummary(**vars(self))
+        return PnLSummary(
+            count=self.count + later.count,
+            wins=self.wins + later.wins,
+            losses=self.losses + later.losses,
+            total=self.total + later.total,
+            sum_sq=self.sum_sq + later.sum_sq,
+            win_total=self.win_total + later.win_total,
+            loss_total=self.loss_total + later.loss_total,
+            max_prefix=max(self.max_prefix, self.total + later.max_prefix),
+            min_prefix=min(self.min_prefix, self.total + later.min_prefix),
+            max_drawdown=max(self.max_drawdown, later.max_drawdown,
+                             self.max_prefix - (self.total + later.min_prefix))
+        )
+
+    def to_metrics(self) -> Dict:
+        """Metrics in MetricsTracker.calculate_metrics format"""
+        n = self.count
+        mean = self.total / n if n else 0.0
+
+        # Annualized per-trade Sharpe (population std, as np.std)
+        sharpe = 0.0
+        if n > 1:
+            variance = self.sum_sq / n - mean * mean
+            if variance > 1e-12 * max(1.0, mean * mean):
+                sharpe = mean / math.sqrt(variance) * math.sqrt(252)
+
+        avg_win = self.win_total / self.wins if self.wins else 0.0
+        avg_loss = self.loss_total / self.losses if self.losses else 0.0
+        return {
+            'total_trades': n,
+            'win_rate': self.wins / n if n else 0.0,
+            'total_pnl': self.total,
+            'sharpe_ratio': sharpe,
+            'max_drawdown': self.max_drawdown,
+            'avg_win': avg_win,
+            'avg_loss': avg_loss,
+            'profit_factor': abs(avg_win / avg_loss) if avg_loss != 0 else 0.0
+        }
+
+@dataclass
+class AgentStats:
+    """Running per-agent counters"""
+    trades: int = 0
+    wins: int = 0
+    total_pnl: float = 0.0
+
+class MetricsAccumulator:
+    """Lifetime, per-day and per-agent running trade metrics"""
+
+    def __init__(self):
+        """Initialize empty accumulator"""
+        self.lifetime = PnLSummary()
+        self.days: Dict[date, PnLSummary] = {}
+        self.agents: Dict[str, AgentStats] = {}
+
+    def add_trade(self, pnl: float, trade_date: date, agent_name: Optional[str] = None):
+        """
+        Fold a trade into the running metrics
+
+        Args:
+            pnl: Trade P&L
+            trade_date: Bucket date (entry date)
+            agent_name: Agent that opened the trade
+        """
+        self.lifetime.add(pnl)
+        self.days.setdefault(trade_date, PnLSummary()).add(pnl)
+
+        stats = self.agents.setdefault(agent_name or 'Unknown', AgentStats())
+        stats.trades += 1
+        stats.total_pnl += pnl
+        if pnl > 0:
+            stats.wins += 1
+
+    def add_record(self, trade: Dict):
+        """Fold a journaled trade record"""
+        try:
+            trade_date = datetime.fromisoformat(trade['entry_time']).date()
+        except (KeyError, TypeError, ValueError):
+            trade_date = datetime.now().date()
+        self.add_trade(float(trade.get('pnl', 0.0)), trade_date, trade.get('agent_name'))
+
+    def window(self, lookback_days: int, today: Optional[date] = None) -> PnLSummary:
+        """Summary of trades entered in the last `lookback_days` calendar days (O(days))"""
+        today = today or datetime.now().date()
+        cutoff = today - timedelta(days=lookback_days)
+        summary = PnLSummary()
+        for day in sorted(d for d in self.days if d >= cutoff):
+            summary = summary.combine(self.days[day])
+        return summary
+
+    def agent_performance(self) -> Dict[str, Dict]:
+        """Per-agent trades, wins, total P&L and win rate"""
+        return {
+            agent: {
+                'trades': stats.trades,
+                'wins': stats.wins,
+                'total_pnl': stats.total_pnl,
+                'win_rate': stats.wins / stats.trades if stats.trades > 0 else 0.0
+            }
+            for agent, stats in self.agents.items()
+        }
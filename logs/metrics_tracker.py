@@ -2,14 +2,19 @@
 Metrics Tracker
 Tracks P&L, win rate, Sharpe ratio, and other metrics
 """
+import atexit
 import logging
 import json
+from collections import deque
 from typing import Dict, List, Optional
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
 import pandas as pd
 import numpy as np
 
+from logs.journal import shared_journal
+from logs.metrics_accumulator import MetricsAccumulator
+
 logger = logging.getLogger(__name__)
 
 class MetricsTracker:
@@ -25,10 +30,23 @@ class MetricsTracker:
         self.log_dir = Path(log_dir)
         self.log_dir.mkdir(exist_ok=True, parents=True)
         
-        self.trades: List[Dict] = []
+        # Append-only journals (trades write-through; decisions/predictions buffered),
+        # shared by every tracker writing to this log_dir in the process
+        self.trade_journal = shared_journal(self.log_dir, 'trades', time_field='exit_time')
+        self.decision_journal = shared_journal(self.log_dir, 'agent_decisions', buffer_size=50)
+        self.prediction_journal = shared_journal(self.log_dir, 'rl_predictions', buffer_size=50)
+        self._migrate_legacy_trades()
+        atexit.register(self.close)
+        
+        # Running metrics, rebuilt once from the journal at startup
+        self.accumulator = MetricsAccumulator()
+        for trade in self.trade_journal.read():
+            self.accumulator.add_record(trade)
+        
+        self.trades: List[Dict] = []  # Trades recorded this session
         self.daily_pnl: Dict[str, float] = {}
-        self.agent_decisions: List[Dict] = []
-        self.rl_predictions: List[Dict] = []
+        self.agent_decisions = deque(maxlen=1000)
+        self.rl_predictions = deque(maxlen=1000)
         
     def record_trade(
         self,
@@ -56,6 +74,7 @@ class MetricsTracker:
         }
         
         self.trades.append(trade)
+        self.accumulator.add_trade(pnl, (entry_time or datetime.now()).date(), agent_name)
         
         # Update daily P&L
         date = datetime.now().date().isoformat()
@@ -63,8 +82,8 @@ class MetricsTracker:
             self.daily_pnl[date] = 0.0
         self.daily_pnl[date] += pnl
         
-        # Save to file
-        self._save_trades()
+        # Append to journal
+        self.trade_journal.append(trade)
         
         logger.info(f"Trade recorded: {symbol} P&L=${pnl:.2f}")
     
@@ -87,7 +106,7 @@ class MetricsTracker:
         }
         
         self.agent_decisions.append(decision)
-        self._save_agent_decisions()
+        self.decision_journal.append(decision)
     
     def record_rl_prediction(
         self,
@@ -105,110 +124,45 @@ class MetricsTracker:
         }
         
         self.rl_predictions.append(prediction)
-        self._save_rl_predictions()
+        self.prediction_journal.append(prediction)
     
     def calculate_metrics(self, lookback_days: int = 30) -> Dict:
-        """Calculate performance metrics"""
-        if not self.trades:
-            return {
-                'total_trades': 0,
-                'win_rate': 0.0,
-                'total_pnl': 0.0,
-                'sharpe_ratio': 0.0,
-                'max_drawdown': 0.0,
-                'avg_win': 0.0,
-                'avg_loss': 0.0
-            }
-        
-        # Filter recent trades
-        cutoff_date = datetime.now() - timedelta(days=lookback_days)
-        recent_trades = [
-            t for t in self.trades
-            if datetime.fromisoformat(t['entry_time']) >= cutoff_date
-        ]
-        
-        if not recent_trades:
-            recent_trades = self.trades
-        
-        # Calculate metrics
-        pnls = [t['pnl'] for t in recent_trades]
-        winning_trades = [p for p in pnls if p > 0]
-        losing_trades = [p for p in pnls if p < 0]
-        
-        total_trades = len(recent_trades)
-        win_rate = len(winning_trades) / total_trades if total_trades > 0 else 0.0
-        total_pnl = sum(pnls)
+        """Calculate performance metrics (from day buckets, O(days))"""
+        summary = self.accumulator.window(lookback_days)
         
-        # Sharpe ratio (annualized)
-        if len(pnls) > 1:
-            returns = np.array(pnls)
-            sharpe = np.mean(returns) / np.std(returns) * np.sqrt(252) if np.std(returns) > 0 else 0.0
-        else:
-            sharpe = 0.0
+        if summary.count == 0:
+            summary = self.accumulator.lifetime
         
-        # Max drawdown
-        cumulative = np.cumsum(pnls)
-        running_max = np.maximum.accumulate(cumulative)
-        drawdown = cumulative - running_max
-        max_drawdown = abs(np.min(drawdown)) if len(drawdown) > 0 else 0.0
-        
-        # Average win/loss
-        avg_win = np.mean(winning_trades) if winning_trades else 0.0
-        avg_loss = np.mean(losing_trades) if losing_trades else 0.0
-        
-        return {
-            'total_trades': total_trades,
-            'win_rate': win_rate,
-            'total_pnl': total_pnl,
-            'sharpe_ratio': sharpe,
-            'max_drawdown': max_drawdown,
-            'avg_win': avg_win,
-            'avg_loss': avg_loss,
-            'profit_factor': abs(avg_win / avg_loss) if avg_loss != 0 else 0.0
-        }
+        return summary.to_metrics()
     
     def get_agent_performance(self) -> Dict:
         """Get performance by agent"""
-        agent_stats = {}
-        
-        for trade in self.trades:
-            agent = trade.get('agent_name', 'Unknown')
-            if agent not in agent_stats:
-                agent_stats[agent] = {
-                    'trades': 0,
-                    'wins': 0,
-                    'total_pnl': 0.0
-                }
-            
-            agent_stats[agent]['trades'] += 1
-            agent_stats[agent]['total_pnl'] += trade['pnl']
-            if trade['pnl'] > 0:
-                agent_stats[agent]['wins'] += 1
-        
-        # Calculate win rates
-        for agent in agent_stats:
-            stats = agent_stats[agent]
-            stats['win_rate'] = stats['wins'] / stats['trades'] if stats['trades'] > 0 else 0.0
-        
-        return agent_stats
+        return self.accumulator.agent_performance()
     
-    def _save_trades(self):
-        """Save trades to file"""
-        file_path = self.log_dir / "trades.json"
-        with open(file_path, 'w') as f:
-            json.dump(self.trades, f, indent=2)
+    def read_trades(self, start: Optional[datetime] = None, end: Optional[datetime] = None):
+        """Stream journaled trades with start <= exit_time < end"""
+        return self.trade_journal.read(start, end)
     
-    def _save_agent_decisions(self):
-        """Save agent decisions to file"""
-        file_path = self.log_dir / "agent_decisions.json"
-        with open(file_path, 'w') as f:
-            json.dump(self.agent_decisions[-1000:], f, indent=2)  # Keep last 1000
+    def close(self):
+        """Flush and fsync all journals"""
+        for journal in (self.trade_journal, self.decision_journal, self.prediction_journal):
+            journal.close()
     
-    def _save_rl_predictions(self):
-        """Save RL predictions to file"""
-        file_path = self.log_dir / "rl_predictions.json"
-        with open(file_path, 'w') as f:
-            json.dump(self.rl_predictions[-1000:], f, indent=2)  # Keep last 1000
+    def _migrate_legacy_trades(self):
+        """Move trades from the old full-rewrite trades.json into the journal (once)"""
+        legacy_path = self.log_dir / "trades.json"
+        if not legacy_path.exists() or self.trade_journal.path.exists():
+            return
+        try:
+            with open(legacy_path, 'r') as f:
+                legacy_trades = json.load(f)
+            for trade in sorted(legacy_trades, key=lambda t: t.get('exit_time', '')):
+                self.trade_journal.append(trade)
+            self.trade_journal.flush(fsync=True)
+            legacy_path.rename(legacy_path.with_suffix('.json.migrated'))
+            logger.info(f"Migrated {len(legacy_trades)} trades from trades.json to journal")
+        except Exception as e:
+            logger.warning(f"Could not migrate legacy trades.json: {e}")
     
     def generate_daily_report(self) -> str:
         """Generate daily report"""
@@ -46,14 +46,12 @@ col1, col2, col3, col4 = st.columns(4)
 system_status = {}
 try:
     from config import Config
-    from alpaca_client import AlpacaClient
     from alpaca_trade_api.rest import TimeFrame
+    from core.ui.trade_loader import _get_alpaca_client
     
-    client = AlpacaClient(
-        Config.ALPACA_API_KEY,
-        Config.ALPACA_SECRET_KEY,
-        Config.ALPACA_BASE_URL
-    )
+    client = _get_alpaca_client()  # Shared per UI process; reads served by the market data daemon if running
+    if client is None:
+        raise ValueError("Alpaca credentials not configured")
     
     # Check market status
     is_open = client.is_market_open()
@@ -171,92 +169,29 @@ if not logs_dir.exists():
     except:
         pass
 
-def parse_log_line(line):
-    """Parse a log line into structured data"""
-    # Pattern: 2025-12-17 09:30:15,123 - module - LEVEL - message
-    pattern = r'(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}(?:,\d+)?)\s+-\s+([\w.]+)\s+-\s+(\w+)\s+-\s+(.+)'
-    match = re.match(pattern, line.strip())
-    
-    if match:
-        timestamp_str, module, level, message = match.groups()
-        try:
-            # Parse timestamp (handle both with and without microseconds)
-            if ',' in timestamp_str:
-                timestamp = datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S,%f')
-            else:
-                timestamp = datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S')
-        except:
-            timestamp = datetime.now()
-        
-        return {
-            'timestamp': timestamp,
-            'module': module,
-            'level': level,
-            'message': message
-        }
-    return None
-
 def load_logs(max_lines=500):
-    """Load and parse log files"""
-    all_logs = []
-    found_files = []
-    
-    for log_file in log_files:
-        if log_file.exists():
-            found_files.append(str(log_file))
-            try:
-                with open(log_file, 'r', encoding='utf-8', errors='ignore') as f:
-                    lines = f.readlines()
-                    # Get last N lines
-                    for line in lines[-max_lines:]:
-                        parsed = parse_log_line(line)
-                        if parsed:
-                            parsed['source_file'] = log_file.name
-                            all_logs.append(parsed)
-            except Exception as e:
-                logger.debug(f"Could not read {log_file}: {e}")
-                pass  # Silently skip files we can't read
-    
+    """Load parsed, categorized entries (tail-followed; only new bytes are read on refresh)"""
+    from core.ui.log_reader import get_log_reader
+    reader = get_log_reader(log_files, max_entries=max_lines)
+
     # Store found files in session state for display
-    if found_files:
-        st.session_state['log_files_found'] = found_files
-    else:
-        st.session_state['log_files_found'] = []
-    
-    # Sort by timestamp
-    all_logs.sort(key=lambda x: x['timestamp'], reverse=True)
-    return all_logs
+    st.session_state['log_files_found'] = reader.found_files
 
-def categorize_log(log):
-    """Categorize log entry by activity type"""
-    message = log['message'].lower()
-    
-    # Signal Generation
-    if any(word in message for word in ['signal', 'trade intent', 'analyze', 'agent', 'confidence', 'generated']):
-        return 'Signal Generation'
-    # Trade Execution
-    elif any(word in message for word in ['execute', 'executing trade', 'order', 'filled', 'trade executed']):
-        return 'Trade Execution'
-    # Trade Rejection
-    elif any(word in message for word in ['blocked', 'reject', 'not allowed', 'risk', 'confidence too low', 'trade blocked']):
-        return 'Trade Rejection'
-    # Validation
-    elif any(word in message for word in ['validate', 'check', 'setup', 'config', 'initialized', 'warmup']):
-        return 'Validation'
-    # Market Status
-    elif any(word in message for word in ['market open', 'market close', 'warmup', 'pre-market', 'after hours']):
-        return 'Market Status'
-    # Account Status
-    elif any(word in message for word in ['account', 'balance', 'equity', 'buying power', 'positions']):
-        return 'Account Status'
-    # Errors
-    elif any(word in message for word in ['error', 'exception', 'failed', 'unauthorized']):
-        return 'Error'
-    # Trading Cycle
-    elif any(word in message for word in ['trading cycle', 'scan', 'monitor', 'cycle']):
-        return 'Trading Cycle'
-    else:
-        return 'Other'
+    window = st.session_state.get('log_time_range', 'Latest')
+    now = datetime.now()
+    if window == 'Last hour':
+        return reader.read_range(now - timedelta(hours=1))
+    if window == 'Today':
+        return reader.read_range(now.replace(hour=0, minute=0, second=0, microsecond=0))
+    if window == 'Last 7 days':
+        return reader.read_range(now - timedelta(days=7))
+    return reader.latest()
+
+st.selectbox(
+    "Time Range",
+    options=['Latest', 'Last hour', 'Today', 'Last 7 days'],
+    key='log_time_range'
+)
 
 # Load logs
 logs = load_logs()
@@ -275,14 +210,9 @@ if not logs:
         
         # Check recent orders
         try:
-            from alpaca_client import AlpacaClient
-            from config import Config
+            from core.ui.trade_loader import _get_alpaca_client
             
-            client = AlpacaClient(
-                Config.ALPACA_API_KEY,
-                Config.ALPACA_SECRET_KEY,
-                Config.ALPACA_BASE_URL
-            )
+            client = _get_alpaca_client()
             orders = client.get_orders(status='all', limit=10)
             if orders:
                 st.markdown("#### 📋 Recent Orders from Alpaca")
@@ -319,7 +249,6 @@ if not logs:
 else:
     # Create DataFrame
     df = pd.DataFrame(logs)
-    df['category'] = df.apply(categorize_log, axis=1)
     
     # Filters
     col1, col2, col3 = st.columns(3)
@@ -1,13 +1,28 @@
 """
 RL Module
 """
-from rl.trading_environment import TradingEnvironment
-from rl.ppo_agent import PPOAgent
-from rl.grpo_agent import GRPOAgent
+from rl.observation import build_observation
+from rl.numpy_policy import NumpyPolicy, NumpyAgent
 
 __all__ = [
-    'TradingEnvironment',
-    'PPOAgent',
-    'GRPOAgent'
+    'build_observation',
+    'NumpyPolicy',
+    'NumpyAgent'
 ]
 
+# Training components require PyTorch / stable-baselines3 (not installed on Fly.io).
+# Imported on first attribute access so inference-only imports (rl.predict) stay light.
+_TRAINING_EXPORTS = {
+    'TradingEnvironment': 'rl.trading_environment',
+    'PPOAgent': 'rl.ppo_agent',
+    'GRPOAgent': 'rl.grpo_agent',
+    'VecTrainingConfig': 'rl.vec_env',
+    'make_vec_env': 'rl.vec_env',
+}
+
+def __getattr__(name):
+    module_name = _TRAINING_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module 'rl' has no attribute '{name}'")
+    import importlib
+    return getattr(importlib.import_module(module_name), name)
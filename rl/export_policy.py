@@ -0,0 +1,145 @@
+"""
+RL Policy Export
+Converts trained PPO/GRPO checkpoints into self-contained NumPy weight files
+for the lightweight inference runtime (rl/numpy_policy.py)
+
+Usage:
+    python rl/export_policy.py models/grpo_checkpoints/grpo_trading_100000_steps.zip
+    python rl/export_policy.py --all            # every checkpoint under models/*_checkpoints
+"""
+import argparse
+import json
+import logging
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from rl.numpy_policy import EXPORT_FORMAT_VERSION, NumpyPolicy
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+_TORCH_ACTIVATIONS = {
+    'Tanh': 'tanh',
+    'ReLU': 'relu',
+    'Identity': 'identity',
+}
+
+def export_policy(
+    checkpoint_path: str,
+    output_path: Optional[str] = None,
+    verify: bool = True
+) -> str:
+    """
+    Export an SB3 PPO checkpoint's actor network to a .npz file
+
+    Args:
+        checkpoint_path: Path to SB3 .zip checkpoint
+        output_path: Destination .npz (default: checkpoint path with .npz suffix)
+        verify: Check NumPy actions against PPO.predict on random observations
+
+    Returns:
+        Path to exported file
+    """
+    # Heavy imports only needed at export time (training host)
+    import torch
+    from stable_baselines3 import PPO
+    from stable_baselines3.common.torch_layers import FlattenExtractor
+
+    model = PPO.load(checkpoint_path, device='cpu')
+    policy = model.policy
+
+    if not isinstance(policy.features_extractor, FlattenExtractor):
+        raise ValueError(f"Unsupported features extractor: {type(policy.features_extractor).__name__}")
+    if policy.squash_output:
+        raise ValueError("Squashed (tanh) action outputs are not supported")
+
+    weights: List[np.ndarray] = []
+    biases: List[np.ndarray] = []
+    activations: List[str] = []
+    for module in policy.mlp_extractor.policy_net:
+        if isinstance(module, torch.nn.Linear):
+            weights.append(module.weight.detach().cpu().numpy())
+            biases.append(module.bias.detach().cpu().numpy())
+            activations.append('identity')
+        else:
+            name = _TORCH_ACTIVATIONS.get(type(module).__name__)
+            if name is None or not activations:
+                raise ValueError(f"Unsupported layer in policy network: {module}")
+            activations[-1] = name
+
+    metadata = {
+        'format_version': EXPORT_FORMAT_VERSION,
+        'source_checkpoint': str(checkpoint_path),
+        'exported_at': datetime.now().isoformat(),
+        'obs_dim': int(model.observation_space.shape[0]),
+        'action_dim': int(model.action_space.shape[0]),
+        'activations': activations,
+        'num_timesteps': int(model.num_timesteps),
+    }
+
+    arrays = {
+        'action_w': policy.action_net.weight.detach().cpu().numpy(),
+        'action_b': policy.action_net.bias.detach().cpu().numpy(),
+        'log_std': policy.log_std.detach().cpu().numpy(),
+        'action_low': model.action_space.low,
+        'action_high': model.action_space.high,
+        'metadata': np.array(json.dumps(metadata)),
+    }
+    for i, (w, b) in enumerate(zip(weights, biases)):
+        arrays[f'policy_w{i}'] = w
+        arrays[f'policy_b{i}'] = b
+
+    output_path = output_path or str(Path(checkpoint_path).with_suffix('.npz'))
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    np.savez(output_path, **arrays)
+
+    if verify:
+        exported = NumpyPolicy.load(output_path)
+        observations = np.random.default_rng(0).normal(size=(256, metadata['obs_dim'])).astype(np.float32)
+        expected, _ = model.predict(observations, deterministic=True)
+        actual, _ = exported.predict(observations, deterministic=True)
+        max_diff = float(np.max(np.abs(expected - actual)))
+        if max_diff > 1e-5:
+            raise ValueError(f"Exported policy mismatch for {checkpoint_path}: max |diff| = {max_diff:.2e}")
+        logger.info(f"Verified export against PPO.predict (max |diff| = {max_diff:.2e})")
+
+    logger.info(f"Exported {checkpoint_path} -> {output_path}")
+    return output_path
+
+def main():
+    parser = argparse.ArgumentParser(description='Export RL policies for NumPy inference')
+    parser.add_argument('checkpoints', nargs='*',
+                       help='SB3 checkpoint .zip files to export')
+    parser.add_argument('--all', action='store_true',
+                       help='Export every checkpoint under models/*_checkpoints')
+    parser.add_argument('--output', type=str, default=None,
+                       help='Output path (single checkpoint only)')
+    parser.add_argument('--no-verify', action='store_true',
+                       help='Skip action verification against stable-baselines3')
+
+    args = parser.parse_args()
+
+    checkpoints = list(args.checkpoints)
+    if args.all:
+        checkpoints.extend(str(p) for p in sorted(Path('models').glob('*_checkpoints/*.zip')))
+
+    if not checkpoints:
+        parser.error("No checkpoints given (pass paths or --all)")
+    if args.output and len(checkpoints) > 1:
+        parser.error("--output can only be used with a single checkpoint")
+
+    for checkpoint in checkpoints:
+        export_policy(checkpoint, args.output, verify=not args.no_verify)
+
+if __name__ == '__main__':
+    main()
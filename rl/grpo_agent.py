@@ -3,17 +3,18 @@ GRPO (Group Relative Policy Optimization) Agent
 Improved stability variant of PPO
 """
 import logging
-from typing import Optional
+from typing import Optional, Union
 import numpy as np
 import sys
 from pathlib import Path
 import os
+import time
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from stable_baselines3 import PPO
-from stable_baselines3.common.vec_env import DummyVecEnv
+from stable_baselines3.common.vec_env import DummyVecEnv, VecEnv
 from stable_baselines3.common.monitor import Monitor
 
 from rl.trading_environment import TradingEnvironment
@@ -32,7 +33,7 @@ class GRPOAgent:
     
     def __init__(
         self,
-        env: TradingEnvironment,
+        env: Union[TradingEnvironment, VecEnv],
         model_path: Optional[str] = None,
         learning_rate: float = 3e-4,
         n_steps: int = 2048,
@@ -50,7 +51,7 @@ class GRPOAgent:
         Initialize GRPO Agent
         
         Args:
-            env: Trading environment
+            env: Trading environment, or a VecEnv from rl.vec_env.make_vec_env
             model_path: Path to load existing model
             learning_rate: Learning rate (lower for stability)
             n_steps: Steps per update
@@ -67,9 +68,13 @@ class GRPOAgent:
         self.env = env
         self.normalize_advantage = normalize_advantage
         
-        # Wrap environment
-        self.monitored_env = Monitor(env)
-        self.vec_env = DummyVecEnv([lambda: self.monitored_env])
+        # Wrap environment (vectorized envs are already monitored per sub-env)
+        if isinstance(env, VecEnv):
+            self.monitored_env = None
+            self.vec_env = env
+        else:
+            self.monitored_env = Monitor(env)
+            self.vec_env = DummyVecEnv([lambda: self.monitored_env])
         
         # Create or load model
         if model_path and os.path.exists(model_path):
@@ -109,6 +114,9 @@ class GRPOAgent:
             total_timesteps: Total training timesteps
             checkpoint_freq: Frequency of checkpoints
             checkpoint_path: Path to save checkpoints
+            
+        Returns:
+            Training stats (timesteps, elapsed seconds, timesteps/sec, n_envs)
         """
         os.makedirs(checkpoint_path, exist_ok=True)
         
@@ -118,7 +126,7 @@ class GRPOAgent:
         callbacks = [
             TradingCallback(),
             CheckpointCallback(
-                save_freq=checkpoint_freq,
+                save_freq=max(checkpoint_freq // self.vec_env.num_envs, 1),  # Counted per env step
                 save_path=checkpoint_path,
                 name_prefix="grpo_trading"
             )
@@ -135,13 +143,28 @@ class GRPOAgent:
             use_progress_bar = False
             logger.warning("tqdm/rich not available, progress bar disabled")
         
+        start_timesteps = self.model.num_timesteps
+        start_time = time.perf_counter()
+        
         self.model.learn(
             total_timesteps=total_timesteps,
             callback=callbacks,
             progress_bar=use_progress_bar
         )
         
-        logger.info("GRPO training completed")
+        elapsed = time.perf_counter() - start_time
+        timesteps = self.model.num_timesteps - start_timesteps
+        stats = {
+            'timesteps': timesteps,
+            'elapsed_seconds': elapsed,
+            'timesteps_per_sec': timesteps / elapsed if elapsed > 0 else 0.0,
+            'n_envs': self.vec_env.num_envs
+        }
+        
+        logger.info(f"GRPO training completed: {timesteps} timesteps in {elapsed:.1f}s "
+                    f"({stats['timesteps_per_sec']:,.0f} timesteps/sec, {stats['n_envs']} envs)")
+        
+        return stats
     
     def predict(
         self,
@@ -173,6 +196,40 @@ class GRPOAgent:
         
         return action, state
     
+    def predict_batch(
+        self,
+        observations: np.ndarray,
+        deterministic: bool = False,
+        apply_smoothing: bool = True
+    ) -> np.ndarray:
+        """
+        Predict actions for a batch of observations in one forward pass
+        
+        EMA smoothing is applied row by row in batch order, so the result is
+        identical to calling predict() once per observation.
+        
+        Args:
+            observations: Stacked states, shape (n, state_dim)
+            deterministic: Use deterministic policy
+            apply_smoothing: Apply EMA smoothing to predictions
+            
+        Returns:
+            actions: Predicted actions (smoothed if enabled), shape (n, action_dim)
+        """
+        actions, _ = self.model.predict(observations, deterministic=deterministic)
+        actions = np.array(actions, dtype=np.float32).reshape(len(observations), -1)
+        
+        if apply_smoothing:
+            alpha = 0.3  # EMA smoothing factor
+            for i in range(len(actions)):
+                if not hasattr(self, 'action_ema'):
+                    self.action_ema = actions[i, 0]
+                else:
+                    self.action_ema = alpha * actions[i, 0] + (1 - alpha) * self.action_ema
+                    actions[i, 0] = self.action_ema
+        
+        return actions
+    
     def save(self, path: str):
         """Save model"""
         os.makedirs(os.path.dirname(path), exist_ok=True)
@@ -0,0 +1,182 @@
+"""
+NumPy Policy Runtime
+Pure-NumPy inference for exported PPO/GRPO policies (no PyTorch / stable-baselines3)
+
+Exported weight files are produced by rl/export_policy.py from the SB3 checkpoints
+under models/*_checkpoints. Deterministic actions match PPO.predict(deterministic=True).
+"""
+import json
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMAT_VERSION = 1
+
+_ACTIVATIONS = {
+    'tanh': np.tanh,
+    'relu': lambda x: np.maximum(x, 0.0),
+    'identity': lambda x: x,
+}
+
+class NumpyPolicy:
+    """MLP Gaussian policy (SB3 ActorCriticPolicy actor) evaluated with NumPy"""
+
+    def __init__(
+        self,
+        weights: List[np.ndarray],
+        biases: List[np.ndarray],
+        activations: List[str],
+        action_weight: np.ndarray,
+        action_bias: np.ndarray,
+        log_std: np.ndarray,
+        action_low: np.ndarray,
+        action_high: np.ndarray,
+        metadata: Optional[Dict] = None
+    ):
+        """
+        Initialize NumPy policy
+
+        Args:
+            weights: Hidden layer weight matrices, each (out_features, in_features)
+            biases: Hidden layer bias vectors
+            activations: Activation name after each hidden layer ('tanh', 'relu', 'identity')
+            action_weight: Action head weights (action_dim, latent_dim)
+            action_bias: Action head bias (action_dim,)
+            log_std: Gaussian log standard deviation (action_dim,)
+            action_low: Action space lower bound
+            action_high: Action space upper bound
+            metadata: Export metadata (source checkpoint, agent type, ...)
+        """
+        unknown = [a for a in activations if a not in _ACTIVATIONS]
+        if unknown:
+            raise ValueError(f"Unsupported activation(s) in exported policy: {unknown}")
+
+        # Stored transposed so a batch (n, in) @ (in, out) is a single matmul per layer
+        self.weights_t = [np.ascontiguousarray(w.T, dtype=np.float32) for w in weights]
+        self.biases = [np.asarray(b, dtype=np.float32) for b in biases]
+        self.activations = list(activations)
+        self.action_weight_t = np.ascontiguousarray(action_weight.T, dtype=np.float32)
+        self.action_bias = np.asarray(action_bias, dtype=np.float32)
+        self.log_std = np.asarray(log_std, dtype=np.float32)
+        self.action_low = np.asarray(action_low, dtype=np.float32)
+        self.action_high = np.asarray(action_high, dtype=np.float32)
+        self.metadata = metadata or {}
+        self.obs_dim = self.weights_t[0].shape[0] if self.weights_t else self.action_weight_t.shape[0]
+        self._rng = np.random.default_rng()
+
+    @classmethod
+    def load(cls, path: str) -> 'NumpyPolicy':
+        """Load an exported .npz policy file"""
+        with np.load(path, allow_pickle=False) as data:
+            metadata = json.loads(str(data['metadata']))
+            if metadata.get('format_version') != EXPORT_FORMAT_VERSION:
+                raise ValueError(f"Unsupported policy export format: {metadata.get('format_version')}")
+
+            n_layers = len(metadata['activations'])
+            policy = cls(
+                weights=[data[f'policy_w{i}'] for i in range(n_layers)],
+                biases=[data[f'policy_b{i}'] for i in range(n_layers)],
+                activations=metadata['activations'],
+                action_weight=data['action_w'],
+                action_bias=data['action_b'],
+                log_std=data['log_std'],
+                action_low=data['action_low'],
+                action_high=data['action_high'],
+                metadata=metadata
+            )
+
+        logger.info(f"Loaded NumPy policy from {path} ({n_layers} hidden layers, obs_dim={policy.obs_dim})")
+        return policy
+
+    def forward(self, observations: np.ndarray) -> np.ndarray:
+        """Compute mean actions (before clipping) for a batch of observations"""
+        x = np.asarray(observations, dtype=np.float32)
+        for w_t, b, activation in zip(self.weights_t, self.biases, self.activations):
+            x = _ACTIVATIONS[activation](x @ w_t + b)
+        return x @ self.action_weight_t + self.action_bias
+
+    def predict(
+        self,
+        observation: np.ndarray,
+        deterministic: bool = False
+    ) -> Tuple[np.ndarray, None]:
+        """
+        Predict action (same signature and shapes as SB3 PPO.predict)
+
+        Args:
+            observation: Single state (obs_dim,) or batch (n, obs_dim)
+            deterministic: Use the distribution mean instead of sampling
+
+        Returns:
+            action: (action_dim,) for a single state, (n, action_dim) for a batch
+            state: Always None (no recurrent state)
+        """
+        obs = np.asarray(observation, dtype=np.float32)
+        single = obs.ndim == 1
+        if single:
+            obs = obs.reshape(1, -1)
+
+        if obs.shape[1] != self.obs_dim:
+            raise ValueError(f"Observation has {obs.shape[1]} features, policy expects {self.obs_dim}")
+
+        actions = self.forward(obs)
+        if not deterministic:
+            actions = actions + np.exp(self.log_std) * self._rng.standard_normal(actions.shape).astype(np.float32)
+
+        actions = np.clip(actions, self.action_low, self.action_high)
+
+        return (actions[0] if single else actions), None
+
+class NumpyAgent:
+    """
+    Inference-only stand-in for PPOAgent/GRPOAgent backed by a NumpyPolicy
+
+    Provides predict()/predict_batch() with the same outputs as the SB3 agents,
+    including GRPO's EMA action smoothing.
+    """
+
+    def __init__(self, policy: NumpyPolicy, apply_smoothing: bool = False):
+        """
+        Initialize NumPy agent
+
+        Args:
+            policy: Loaded NumPy policy
+            apply_smoothing: Apply GRPO-style EMA smoothing (matches GRPOAgent.predict)
+        """
+        self.policy = policy
+        self.apply_smoothing = apply_smoothing
+        self.alpha = 0.3  # EMA smoothing factor (same as GRPOAgent)
+        self.action_ema: Optional[float] = None
+
+    def _smooth(self, value: float) -> Tuple[float, bool]:
+        """Update EMA; returns (value, smoothed?) mirroring GRPOAgent.predict"""
+        if self.action_ema is None:
+            self.action_ema = value
+            return value, False
+        self.action_ema = self.alpha * value + (1 - self.alpha) * self.action_ema
+        return self.action_ema, True
+
+    def predict(self, observation: np.ndarray, deterministic: bool = False) -> tuple:
+        """Predict action from observation (smoothed if enabled)"""
+        action, state = self.policy.predict(observation, deterministic=deterministic)
+
+        if self.apply_smoothing:
+            value, smoothed = self._smooth(float(action[0]))
+            if smoothed:
+                action = np.array([[value]], dtype=np.float32)
+
+        return action, state
+
+    def predict_batch(self, observations: np.ndarray, deterministic: bool = False) -> np.ndarray:
+        """Predict actions for a batch of observations in one forward pass"""
+        actions, _ = self.policy.predict(np.asarray(observations).reshape(len(observations), -1),
+                                         deterministic=deterministic)
+
+        if self.apply_smoothing:
+            for i in range(len(actions)):
+                actions[i, 0], _ = self._smooth(float(actions[i, 0]))
+
+        return actions
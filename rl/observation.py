@@ -0,0 +1,128 @@
+"""
+RL Observation Builder
+Builds the 48-feature policy observation from bars (no gymnasium / PyTorch needed)
+"""
+import numpy as np
+import pandas as pd
+from typing import List, Optional
+
+STATE_DIM = 48  # MUST MATCH TRAINED MODEL
+
+# Position state for a flat, untouched account (position, P&L, steps held, total P&L ratio, balance ratio)
+FLAT_POSITION_STATE = [0.0, 0.0, 0.0, 0.0, 1.0]
+
+def market_features(data: pd.DataFrame, step: int) -> List[float]:
+    """
+    Extract the market part of the observation (43 features) for bar `step`
+    
+    Shared by TradingEnvironment and batched inference (RLPredictor.predict_batch),
+    so observations can be built without constructing an environment.
+    """
+    row = data.iloc[step]
+    
+    features = []
+    
+    # === Price features (5) ===
+    close = row.get('close', 100.0)
+    open_price = row.get('open', close)
+    high = row.get('high', close)
+    low = row.get('low', close)
+    volume = row.get('volume', 0)
+    
+    features.append(close / 100.0)  # Normalized price
+    features.append(volume / 1e6)  # Normalized volume
+    features.append((high - close) / close if close > 0 else 0)  # High-close %
+    features.append((close - low) / close if close > 0 else 0)  # Close-low %
+    features.append((close - open_price) / open_price if open_price > 0 else 0)  # Return
+    
+    # === Technical indicators (15) ===
+    features.append(row.get('rsi', 50) / 100.0)  # RSI normalized
+    features.append(row.get('rsi_14', row.get('rsi', 50)) / 100.0)  # RSI 14
+    features.append(row.get('ema_9', close) / 100.0)  # EMA 9
+    features.append(row.get('ema_21', close) / 100.0)  # EMA 21
+    features.append(row.get('ema_50', close) / 100.0)  # EMA 50
+    features.append(row.get('sma_20', close) / 100.0)  # SMA 20
+    features.append(row.get('sma_50', close) / 100.0)  # SMA 50
+    features.append(row.get('atr_pct', 2.0) / 10.0)  # ATR % normalized
+    features.append(row.get('atr', close * 0.02) / close if close > 0 else 0)  # ATR ratio
+    features.append(row.get('adx', 20) / 100.0)  # ADX normalized
+    features.append(row.get('vwap_deviation', 0) / 10.0)  # VWAP deviation
+    features.append(row.get('hurst', 0.5))  # Hurst exponent
+    features.append(row.get('slope', 0) * 1000)  # Price slope
+    features.append(row.get('r_squared', 0.5))  # R-squared
+    features.append(row.get('macd_signal', 0) / close if close > 0 else 0)  # MACD signal ratio
+    
+    # === Regime features (4) ===
+    regime_type = row.get('regime_type', 'TREND')
+    if isinstance(regime_type, str):
+        regime_map = {'TREND': 0, 'MEAN_REVERSION': 1, 'EXPANSION': 2, 'COMPRESSION': 3}
+        regime_encoded = [0.0, 0.0, 0.0, 0.0]
+        regime_idx = regime_map.get(regime_type, 0)
+        regime_encoded[regime_idx] = 1.0
+        features.extend(regime_encoded)
+    else:
+        features.extend([1.0, 0.0, 0.0, 0.0])  # Default to TREND
+    
+    # === IV metrics (4) ===
+    features.append(row.get('iv_rank', 50) / 100.0)
+    features.append(row.get('iv_percentile', 50) / 100.0)
+    features.append(row.get('iv_current', 0.25))  # Current IV
+    features.append(row.get('iv_historical', 0.25))  # Historical IV
+    
+    # === Volume features (5) ===
+    features.append(row.get('volume_ratio', 1.0))  # Volume vs average
+    features.append(row.get('obv_slope', 0))  # OBV slope
+    features.append(row.get('volume_ma_ratio', 1.0))  # Volume MA ratio
+    features.append(row.get('volume_trend', 0))  # Volume trend
+    features.append(row.get('relative_volume', 1.0))  # Relative volume
+    
+    # === Momentum features (5) ===
+    features.append(row.get('roc_5', 0) / 10.0)  # Rate of change 5
+    features.append(row.get('roc_10', 0) / 10.0)  # Rate of change 10
+    features.append(row.get('momentum', 0) / close if close > 0 else 0)  # Momentum
+    features.append(row.get('cci', 0) / 200.0)  # CCI normalized
+    features.append(row.get('williams_r', -50) / 100.0)  # Williams %R
+    
+    # === Historical returns (5) ===
+    if step >= 5:
+        for i in range(1, 6):
+            if step - i >= 0:
+                past_close = data.iloc[step - i].get('close', close)
+                ret = (close - past_close) / past_close if past_close > 0 else 0
+                features.append(ret)
+            else:
+                features.append(0.0)
+    else:
+        features.extend([0.0] * 5)
+    
+    return features
+
+def build_observation(
+    data: pd.DataFrame,
+    step: Optional[int] = None,
+    lookback_window: int = 50
+) -> np.ndarray:
+    """
+    Build a 48-feature observation for a flat account without an environment
+    
+    Args:
+        data: DataFrame with OHLCV (and optional feature) columns
+        step: Bar index (default: last bar)
+        lookback_window: Minimum history; earlier steps return zeros (matches env padding)
+        
+    Returns:
+        float32 observation of shape (48,)
+    """
+    if step is None:
+        step = len(data) - 1
+    
+    if step < lookback_window:
+        return np.zeros(STATE_DIM, dtype=np.float32)
+    
+    features = market_features(data, step) + FLAT_POSITION_STATE
+    
+    # Ensure we have exactly STATE_DIM (48) features
+    while len(features) < STATE_DIM:
+        features.append(0.0)
+    
+    return np.array(features[:STATE_DIM], dtype=np.float32)
@@ -3,18 +3,19 @@ PPO (Proximal Policy Optimization) Agent for Trading
 Uses stable-baselines3 for PPO implementation
 """
 import logging
-from typing import Optional, Dict
+from typing import Optional, Dict, Union
 import numpy as np
 import sys
 from pathlib import Path
 import os
+import time
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from stable_baselines3 import PPO
 from stable_baselines3.common.callbacks import BaseCallback, CheckpointCallback
-from stable_baselines3.common.vec_env import DummyVecEnv
+from stable_baselines3.common.vec_env import DummyVecEnv, VecEnv
 from stable_baselines3.common.monitor import Monitor
 
 from rl.trading_environment import TradingEnvironment
@@ -49,7 +50,7 @@ class PPOAgent:
     
     def __init__(
         self,
-        env: TradingEnvironment,
+        env: Union[TradingEnvironment, VecEnv],
         model_path: Optional[str] = None,
         learning_rate: float = 3e-4,
         n_steps: int = 2048,
@@ -66,7 +67,7 @@ class PPOAgent:
         Initialize PPO Agent
         
         Args:
-            env: Trading environment
+            env: Trading environment, or a VecEnv from rl.vec_env.make_vec_env
             model_path: Path to load existing model
             learning_rate: Learning rate
             n_steps: Steps per update
@@ -81,9 +82,13 @@ class PPOAgent:
         """
         self.env = env
         
-        # Wrap environment
-        self.monitored_env = Monitor(env)
-        self.vec_env = DummyVecEnv([lambda: self.monitored_env])
+        # Wrap environment (vectorized envs are already monitored per sub-env)
+        if isinstance(env, VecEnv):
+            self.monitored_env = None
+            self.vec_env = env
+        else:
+            self.monitored_env = Monitor(env)
+            self.vec_env = DummyVecEnv([lambda: self.monitored_env])
         
         # Create or load model
         if model_path and os.path.exists(model_path):
@@ -121,6 +126,9 @@ class PPOAgent:
             total_timesteps: Total training timesteps
             checkpoint_freq: Frequency of checkpoints
             checkpoint_path: Path to save checkpoints
+            
+        Returns:
+            Training stats (timesteps, elapsed seconds, timesteps/sec, n_envs)
         """
         os.makedirs(checkpoint_path, exist_ok=True)
         
@@ -128,7 +136,7 @@ class PPOAgent:
         callbacks = [
             TradingCallback(),
             CheckpointCallback(
-                save_freq=checkpoint_freq,
+                save_freq=max(checkpoint_freq // self.vec_env.num_envs, 1),  # Counted per env step
                 save_path=checkpoint_path,
                 name_prefix="ppo_trading"
             )
@@ -145,13 +153,28 @@ class PPOAgent:
             use_progress_bar = False
             logger.warning("tqdm/rich not available, progress bar disabled")
         
+        start_timesteps = self.model.num_timesteps
+        start_time = time.perf_counter()
+        
         self.model.learn(
             total_timesteps=total_timesteps,
             callback=callbacks,
             progress_bar=use_progress_bar
         )
         
-        logger.info("Training completed")
+        elapsed = time.perf_counter() - start_time
+        timesteps = self.model.num_timesteps - start_timesteps
+        stats = {
+            'timesteps': timesteps,
+            'elapsed_seconds': elapsed,
+            'timesteps_per_sec': timesteps / elapsed if elapsed > 0 else 0.0,
+            'n_envs': self.vec_env.num_envs
+        }
+        
+        logger.info(f"Training completed: {timesteps} timesteps in {elapsed:.1f}s "
+                    f"({stats['timesteps_per_sec']:,.0f} timesteps/sec, {stats['n_envs']} envs)")
+        
+        return stats
     
     def predict(
         self,
@@ -172,6 +195,24 @@ class PPOAgent:
         action, state = self.model.predict(observation, deterministic=deterministic)
         return action, state
     
+    def predict_batch(
+        self,
+        observations: np.ndarray,
+        deterministic: bool = False
+    ) -> np.ndarray:
+        """
+        Predict actions for a batch of observations in one forward pass
+        
+        Args:
+            observations: Stacked states, shape (n, state_dim)
+            deterministic: Use deterministic policy
+            
+        Returns:
+            actions: Predicted actions, shape (n, action_dim)
+        """
+        actions, _ = self.model.predict(observations, deterministic=deterministic)
+        return np.asarray(actions).reshape(len(observations), -1)
+    
     def save(self, path: str):
         """Save model"""
         os.makedirs(os.path.dirname(path), exist_ok=True)
@@ -5,13 +5,12 @@ Loads trained models and generates trading predictions
 import logging
 import numpy as np
 import pandas as pd
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 import os
 
-from rl.trading_environment import TradingEnvironment
-from rl.ppo_agent import PPOAgent
-from rl.grpo_agent import GRPOAgent
+from rl.observation import build_observation
+from rl.numpy_policy import NumpyAgent, NumpyPolicy
 from core.features.indicators import FeatureEngine
 from core.regime.classifier import RegimeClassifier
 
@@ -25,21 +24,25 @@ class RLPredictor:
         model_path: str,
         agent_type: str = 'grpo',
         smoothing_alpha: float = 0.3,
-        min_confidence: float = 0.3
+        min_confidence: float = 0.3,
+        observe_latest_bar: bool = False
     ):
         """
         Initialize RL predictor
         
         Args:
-            model_path: Path to trained model
+            model_path: Path to trained model (SB3 .zip checkpoint or exported .npz policy)
             agent_type: 'ppo' or 'grpo'
             smoothing_alpha: EMA smoothing factor (0-1)
             min_confidence: Minimum confidence to generate signal
+            observe_latest_bar: Build observations from the latest bar. False keeps the
+                legacy observation of a freshly constructed environment (step 0, zero-padded)
         """
         self.model_path = model_path
         self.agent_type = agent_type
         self.smoothing_alpha = smoothing_alpha
         self.min_confidence = min_confidence
+        self.observe_latest_bar = observe_latest_bar
         
         # State for smoothing
         self.last_prediction = 0.0
@@ -50,11 +53,27 @@ class RLPredictor:
         self.feature_engine = FeatureEngine()
         self.regime_classifier = RegimeClassifier()
         
-    def load_model(self, env: Optional[TradingEnvironment] = None):
-        """Load trained model"""
+    def load_model(self, env: Optional['TradingEnvironment'] = None):
+        """
+        Load trained model
+        
+        Exported .npz policies (rl/export_policy.py) run on the pure-NumPy runtime
+        and do not need PyTorch, stable-baselines3 or gymnasium.
+        """
         if not os.path.exists(self.model_path):
             raise FileNotFoundError(f"Model not found: {self.model_path}")
         
+        if self.model_path.endswith('.npz'):
+            policy = NumpyPolicy.load(self.model_path)
+            self.agent = NumpyAgent(policy, apply_smoothing=self.agent_type == 'grpo')
+            logger.info(f"Loaded {self.agent_type.upper()} NumPy policy from {self.model_path}")
+            return
+        
+        # SB3 checkpoints require the full training stack
+        from rl.trading_environment import TradingEnvironment
+        from rl.ppo_agent import PPOAgent
+        from rl.grpo_agent import GRPOAgent
+        
         # Create dummy environment if not provided
         if env is None:
             dummy_data = pd.DataFrame({
@@ -94,79 +113,166 @@ class RLPredictor:
             raise ValueError("Model not loaded. Call load_model() first.")
         
         if bars.empty or len(bars) < 50:
-            return {
-                'action': 0.0,
-                'direction': 'FLAT',
-                'confidence': 0.0,
-                'reason': 'Insufficient data'
-            }
+            return self._flat_prediction('Insufficient data')
         
         try:
-            # Calculate features
-            features = self.feature_engine.calculate_all_features(bars)
-            if not features:
-                return {
-                    'action': 0.0,
-                    'direction': 'FLAT',
-                    'confidence': 0.0,
-                    'reason': 'Feature calculation failed'
-                }
-            
-            # Add current price
-            if current_price is None:
-                current_price = bars['close'].iloc[-1]
-            features['current_price'] = current_price
-            
-            # Classify regime
-            regime = self.regime_classifier.classify(features)
-            
-            # Get observation
-            env = TradingEnvironment(bars, initial_balance=10000.0)
-            observation = env._get_observation()
+            prepared = self._prepare_inputs(bars, current_price)
+            if 'reason' in prepared:
+                return self._flat_prediction(prepared['reason'])
             
             # Get prediction from model
-            action, _ = self.agent.predict(observation, deterministic=True)
-            raw_action = float(action[0])
-            
-            # Apply smoothing
-            smoothed_action = self._smooth_prediction(raw_action)
+            action, _ = self.agent.predict(prepared['observation'], deterministic=True)
+            raw_action = float(np.asarray(action).reshape(-1)[0])
             
-            # Determine direction and confidence
-            direction, confidence = self._interpret_action(smoothed_action)
+            return self._build_prediction(symbol, raw_action, prepared['regime'], prepared['features'])
             
-            # Apply confidence weighting based on regime
-            confidence = self._adjust_confidence(confidence, regime, features)
-            
-            # Generate prediction
-            prediction = {
-                'symbol': symbol,
-                'raw_action': raw_action,
-                'smoothed_action': smoothed_action,
-                'direction': direction,
-                'confidence': confidence,
-                'regime': regime.regime_type.value,
-                'regime_confidence': regime.confidence,
-                'action_value': smoothed_action,
-                'reason': f"RL {self.agent_type.upper()} prediction in {regime.regime_type.value} regime"
-            }
+        except Exception as e:
+            logger.error(f"Error generating prediction for {symbol}: {e}")
+            return self._flat_prediction(f'Prediction error: {str(e)}')
+    
+    def predict_batch(
+        self,
+        bars_by_symbol: Dict[str, pd.DataFrame],
+        current_prices: Optional[Dict[str, float]] = None
+    ) -> Dict[str, Dict]:
+        """
+        Generate predictions for many symbols with one batched forward pass
+        
+        Observations are built directly from the bars (no TradingEnvironment per
+        symbol) and stacked into a single policy call. Smoothing and regime
+        adjustment are applied per symbol in input order, so results match
+        calling predict() for each symbol in turn.
+        
+        Args:
+            bars_by_symbol: symbol -> historical bars (OHLCV)
+            current_prices: symbol -> current price (optional, defaults to last close)
             
-            # Only return signal if confidence is high enough
-            if confidence < self.min_confidence:
-                prediction['direction'] = 'FLAT'
-                prediction['reason'] += f" (confidence {confidence:.2%} below threshold {self.min_confidence:.2%})"
+        Returns:
+            symbol -> prediction dictionary (same shape as predict())
+        """
+        if self.agent is None:
+            raise ValueError("Model not loaded. Call load_model() first.")
+        
+        current_prices = current_prices or {}
+        predictions: Dict[str, Dict] = {}
+        batch_symbols: List[str] = []
+        batch_inputs: List[Dict] = []
+        
+        for symbol, bars in bars_by_symbol.items():
+            if bars is None or bars.empty or len(bars) < 50:
+                predictions[symbol] = self._flat_prediction('Insufficient data')
+                continue
             
-            self.prediction_history.append(prediction)
+            try:
+                prepared = self._prepare_inputs(bars, current_prices.get(symbol))
+            except Exception as e:
+                logger.error(f"Error preparing RL inputs for {symbol}: {e}")
+                predictions[symbol] = self._flat_prediction(f'Prediction error: {str(e)}')
+                continue
             
-            return prediction
+            if 'reason' in prepared:
+                predictions[symbol] = self._flat_prediction(prepared['reason'])
+                continue
             
+            batch_symbols.append(symbol)
+            batch_inputs.append(prepared)
+        
+        if not batch_symbols:
+            return predictions
+        
+        try:
+            observations = np.stack([inputs['observation'] for inputs in batch_inputs])
+            actions = self.agent.predict_batch(observations, deterministic=True)
         except Exception as e:
-            logger.error(f"Error generating prediction for {symbol}: {e}")
-            return {
-                'action': 0.0,
-                'direction': 'FLAT',
-                'confidence': 0.0,
-                'reason': f'Prediction error: {str(e)}'
-            }
+            logger.error(f"Error in batched RL prediction for {len(batch_symbols)} symbols: {e}")
+            for symbol in batch_symbols:
+                predictions[symbol] = self._flat_prediction(f'Prediction error: {str(e)}')
+            return predictions
+        
+        for symbol, inputs, action in zip(batch_symbols, batch_inputs, actions):
+            predictions[symbol] = self._build_prediction(
+                symbol, float(action[0]), inputs['regime'], inputs['features']
+            )
+        
+        logger.debug(f"Batched RL prediction: {len(batch_symbols)} symbols in one forward pass")
+        
+        # Preserve input order
+        return {symbol: predictions[symbol] for symbol in bars_by_symbol if symbol in predictions}
+    
+    def _prepare_inputs(
+        self,
+        bars: pd.DataFrame,
+        current_price: Optional[float] = None
+    ) -> Dict:
+        """
+        Compute features, regime and observation for one symbol
+        
+        Returns:
+            Dict with features/regime/observation, or {'reason': ...} if unusable
+        """
+        features = self.feature_engine.calculate_all_features(bars)
+        if not features:
+            return {'reason': 'Feature calculation failed'}
+        
+        # Add current price
+        if current_price is None:
+            current_price = bars['close'].iloc[-1]
+        features['current_price'] = current_price
+        
+        return {
+            'features': features,
+            'regime': self.regime_classifier.classify(features),
+            'observation': build_observation(bars, step=None if self.observe_latest_bar else 0)
+        }
+    
+    def _build_prediction(
+        self,
+        symbol: str,
+        raw_action: float,
+        regime: 'RegimeSignal',
+        features: Dict
+    ) -> Dict:
+        """Apply smoothing, interpretation and regime weighting to a raw action"""
+        # Apply smoothing
+        smoothed_action = self._smooth_prediction(raw_action)
+        
+        # Determine direction and confidence
+        direction, confidence = self._interpret_action(smoothed_action)
+        
+        # Apply confidence weighting based on regime
+        confidence = self._adjust_confidence(confidence, regime, features)
+        
+        # Generate prediction
+        prediction = {
+            'symbol': symbol,
+            'raw_action': raw_action,
+            'smoothed_action': smoothed_action,
+            'direction': direction,
+            'confidence': confidence,
+            'regime': regime.regime_type.value,
+            'regime_confidence': regime.confidence,
+            'action_value': smoothed_action,
+            'reason': f"RL {self.agent_type.upper()} prediction in {regime.regime_type.value} regime"
+        }
+        
+        # Only return signal if confidence is high enough
+        if confidence < self.min_confidence:
+            prediction['direction'] = 'FLAT'
+            prediction['reason'] += f" (confidence {confidence:.2%} below threshold {self.min_confidence:.2%})"
+        
+        self.prediction_history.append(prediction)
+        
+        return prediction
+    
+    @staticmethod
+    def _flat_prediction(reason: str) -> Dict:
+        """Neutral prediction returned when no model output is available"""
+        return {
+            'action': 0.0,
+            'direction': 'FLAT',
+            'confidence': 0.0,
+            'reason': reason
+        }
     
     def _smooth_prediction(self, action: float) -> float:
         """Apply EMA smoothing to predictions"""
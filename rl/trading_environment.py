@@ -9,6 +9,8 @@ import pandas as pd
 from typing import Dict, Tuple, Optional, List
 import logging
 
+from rl.observation import STATE_DIM, market_features
+
 logger = logging.getLogger(__name__)
 
 class TradingEnvironment(gym.Env):
@@ -48,7 +50,8 @@ class TradingEnvironment(gym.Env):
         initial_balance: float = 10000.0,
         commission: float = 1.0,
         max_position_size: float = 0.1,  # 10% of balance
-        lookback_window: int = 50
+        lookback_window: int = 50,
+        start_offset: Optional[int] = None
     ):
         """
         Initialize trading environment
@@ -59,6 +62,7 @@ class TradingEnvironment(gym.Env):
             commission: Commission per trade
             max_position_size: Maximum position size as fraction of balance
             lookback_window: Number of bars to look back
+            start_offset: Fixed episode start step (None = random start on each reset)
         """
         super().__init__()
         
@@ -67,9 +71,10 @@ class TradingEnvironment(gym.Env):
         self.commission = commission
         self.max_position_size = max_position_size
         self.lookback_window = lookback_window
+        self.start_offset = start_offset
         
         # State space dimensions - MUST MATCH TRAINED MODEL (48 features)
-        self.state_dim = 48
+        self.state_dim = STATE_DIM
         
         # Action space: continuous [-1, 1]
         self.action_space = spaces.Box(
@@ -107,14 +112,17 @@ class TradingEnvironment(gym.Env):
         super().reset(seed=seed)
         
         # Start at random point (but leave room for lookback)
+        # Uses the env's seeded RNG so vectorized envs get reproducible, distinct starts
         max_start = max(self.lookback_window, len(self.data) - 100)
-        if max_start <= self.lookback_window:
+        if self.start_offset is not None:
+            self.current_step = min(max(self.start_offset, self.lookback_window), max_start)
+        elif max_start <= self.lookback_window:
             self.current_step = self.lookback_window
         else:
-            self.current_step = np.random.randint(
+            self.current_step = int(self.np_random.integers(
                 self.lookback_window,
                 max_start
-            )
+            ))
         
         self.balance = self.initial_balance
         self.position = 0
@@ -320,81 +328,9 @@ class TradingEnvironment(gym.Env):
     def _get_current_features(self) -> List[float]:
         """Extract current features - 48 features to match trained model"""
         row = self.data.iloc[self.current_step]
-        
-        features = []
-        
-        # === Price features (5) ===
         close = row.get('close', 100.0)
-        open_price = row.get('open', close)
-        high = row.get('high', close)
-        low = row.get('low', close)
-        volume = row.get('volume', 0)
-        
-        features.append(close / 100.0)  # Normalized price
-        features.append(volume / 1e6)  # Normalized volume
-        features.append((high - close) / close if close > 0 else 0)  # High-close %
-        features.append((close - low) / close if close > 0 else 0)  # Close-low %
-        features.append((close - open_price) / open_price if open_price > 0 else 0)  # Return
-        
-        # === Technical indicators (15) ===
-        features.append(row.get('rsi', 50) / 100.0)  # RSI normalized
-        features.append(row.get('rsi_14', row.get('rsi', 50)) / 100.0)  # RSI 14
-        features.append(row.get('ema_9', close) / 100.0)  # EMA 9
-        features.append(row.get('ema_21', close) / 100.0)  # EMA 21
-        features.append(row.get('ema_50', close) / 100.0)  # EMA 50
-        features.append(row.get('sma_20', close) / 100.0)  # SMA 20
-        features.append(row.get('sma_50', close) / 100.0)  # SMA 50
-        features.append(row.get('atr_pct', 2.0) / 10.0)  # ATR % normalized
-        features.append(row.get('atr', close * 0.02) / close if close > 0 else 0)  # ATR ratio
-        features.append(row.get('adx', 20) / 100.0)  # ADX normalized
-        features.append(row.get('vwap_deviation', 0) / 10.0)  # VWAP deviation
-        features.append(row.get('hurst', 0.5))  # Hurst exponent
-        features.append(row.get('slope', 0) * 1000)  # Price slope
-        features.append(row.get('r_squared', 0.5))  # R-squared
-        features.append(row.get('macd_signal', 0) / close if close > 0 else 0)  # MACD signal ratio
-        
-        # === Regime features (4) ===
-        regime_type = row.get('regime_type', 'TREND')
-        if isinstance(regime_type, str):
-            regime_map = {'TREND': 0, 'MEAN_REVERSION': 1, 'EXPANSION': 2, 'COMPRESSION': 3}
-            regime_encoded = [0.0, 0.0, 0.0, 0.0]
-            regime_idx = regime_map.get(regime_type, 0)
-            regime_encoded[regime_idx] = 1.0
-            features.extend(regime_encoded)
-        else:
-            features.extend([1.0, 0.0, 0.0, 0.0])  # Default to TREND
-        
-        # === IV metrics (4) ===
-        features.append(row.get('iv_rank', 50) / 100.0)
-        features.append(row.get('iv_percentile', 50) / 100.0)
-        features.append(row.get('iv_current', 0.25))  # Current IV
-        features.append(row.get('iv_historical', 0.25))  # Historical IV
-        
-        # === Volume features (5) ===
-        features.append(row.get('volume_ratio', 1.0))  # Volume vs average
-        features.append(row.get('obv_slope', 0))  # OBV slope
-        features.append(row.get('volume_ma_ratio', 1.0))  # Volume MA ratio
-        features.append(row.get('volume_trend', 0))  # Volume trend
-        features.append(row.get('relative_volume', 1.0))  # Relative volume
-        
-        # === Momentum features (5) ===
-        features.append(row.get('roc_5', 0) / 10.0)  # Rate of change 5
-        features.append(row.get('roc_10', 0) / 10.0)  # Rate of change 10
-        features.append(row.get('momentum', 0) / close if close > 0 else 0)  # Momentum
-        features.append(row.get('cci', 0) / 200.0)  # CCI normalized
-        features.append(row.get('williams_r', -50) / 100.0)  # Williams %R
-        
-        # === Historical returns (5) ===
-        if self.current_step >= 5:
-            for i in range(1, 6):
-                if self.current_step - i >= 0:
-                    past_close = self.data.iloc[self.current_step - i].get('close', close)
-                    ret = (close - past_close) / past_close if past_close > 0 else 0
-                    features.append(ret)
-                else:
-                    features.append(0.0)
-        else:
-            features.extend([0.0] * 5)
+        
+        features = market_features(self.data, self.current_step)
         
         # === Position state (5) ===
         features.append(float(self.position))  # Current position (-1, 0, 1)
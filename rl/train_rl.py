@@ -17,6 +17,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from rl.trading_environment import TradingEnvironment
 from rl.ppo_agent import PPOAgent
 from rl.grpo_agent import GRPOAgent
+from rl.vec_env import VecTrainingConfig, make_vec_env
 from alpaca_client import AlpacaClient
 from config import Config
 from alpaca_trade_api.rest import TimeFrame
@@ -120,23 +121,59 @@ def main():
                        help='Path to load existing model')
     parser.add_argument('--days', type=int, default=365,
                        help='Days of historical data')
+    parser.add_argument('--n-envs', type=int, default=1,
+                       help='Number of parallel environments (>1 enables vectorized training)')
+    parser.add_argument('--tickers', type=str, default=None,
+                       help='Comma-separated ticker mix for vectorized training (default: --symbol)')
+    parser.add_argument('--seed', type=int, default=42,
+                       help='Base seed for vectorized environments (env i uses seed + i)')
+    parser.add_argument('--start-offsets', type=str, default=None,
+                       help='Comma-separated fixed start steps per env (default: seeded random starts)')
+    parser.add_argument('--no-subproc', action='store_true',
+                       help='Step vectorized envs in-process (DummyVecEnv) instead of subprocesses')
     
     args = parser.parse_args()
     
-    # Prepare data
-    data = prepare_training_data(args.symbol, args.days)
-    
-    if data.empty:
-        logger.error("No training data available")
-        return
-    
-    # Create environment
-    env = TradingEnvironment(
-        data=data,
-        initial_balance=10000.0,
-        commission=1.0,
-        max_position_size=0.1
-    )
+    if args.n_envs > 1:
+        # Vectorized mode: N environments over a ticker mix
+        tickers = [t.strip().upper() for t in (args.tickers or args.symbol).split(',') if t.strip()]
+        start_offsets = [int(o) for o in args.start_offsets.split(',')] if args.start_offsets else None
+        
+        datasets = {}
+        for ticker in tickers:
+            data = prepare_training_data(ticker, args.days)
+            if data.empty:
+                logger.warning(f"No training data for {ticker} - dropping from ticker mix")
+                continue
+            datasets[ticker] = data
+        
+        if not datasets:
+            logger.error("No training data available")
+            return
+        
+        vec_config = VecTrainingConfig(
+            n_envs=args.n_envs,
+            tickers=list(datasets.keys()),
+            seed=args.seed,
+            start_offsets=start_offsets,
+            use_subprocess=not args.no_subproc
+        )
+        env = make_vec_env(datasets, vec_config)
+    else:
+        # Prepare data
+        data = prepare_training_data(args.symbol, args.days)
+        
+        if data.empty:
+            logger.error("No training data available")
+            return
+        
+        # Create environment
+        env = TradingEnvironment(
+            data=data,
+            initial_balance=10000.0,
+            commission=1.0,
+            max_position_size=0.1
+        )
     
     # Create agent
     if args.agent == 'ppo':
@@ -148,7 +185,7 @@ def main():
     
     # Train
     logger.info(f"Starting {args.agent.upper()} training...")
-    agent.train(
+    stats = agent.train(
         total_timesteps=args.timesteps,
         checkpoint_freq=args.checkpoint_freq,
         checkpoint_path=checkpoint_path
@@ -157,8 +194,11 @@ def main():
     # Save final model
     final_model_path = f"./models/{args.agent}_final"
     agent.save(final_model_path)
+    agent.vec_env.close()
     
     logger.info(f"Training complete! Model saved to {final_model_path}")
+    logger.info(f"Throughput: {stats['timesteps_per_sec']:,.0f} timesteps/sec "
+                f"({stats['timesteps']} timesteps, {stats['n_envs']} envs, {stats['elapsed_seconds']:.1f}s)")
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,121 @@
+"""
+Vectorized Training Environments
+Runs N TradingEnvironment instances (different tickers / start offsets) in parallel
+"""
+import logging
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from stable_baselines3.common.monitor import Monitor
+from stable_baselines3.common.vec_env import DummyVecEnv, SubprocVecEnv, VecEnv
+
+from rl.trading_environment import TradingEnvironment
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class VecTrainingConfig:
+    """
+    Configuration for vectorized RL training
+
+    - n_envs: number of parallel environments
+    - tickers: ticker mix, assigned round-robin to environments
+    - seed: base seed (env i is seeded with seed + i)
+    - start_offsets: fixed episode start step per env (None = seeded random starts)
+    - use_subprocess: SubprocVecEnv (one process per env) vs in-process DummyVecEnv
+    """
+    n_envs: int = 4
+    tickers: List[str] = field(default_factory=lambda: ['SPY'])
+    seed: int = 42
+    start_offsets: Optional[List[int]] = None
+    use_subprocess: bool = True
+    start_method: Optional[str] = None  # 'fork', 'spawn' or 'forkserver' (None = platform default)
+    initial_balance: float = 10000.0
+    commission: float = 1.0
+    max_position_size: float = 0.1
+
+    def ticker_for_env(self, env_idx: int) -> str:
+        """Ticker assigned to environment env_idx (round-robin over the mix)"""
+        return self.tickers[env_idx % len(self.tickers)]
+
+    def start_offset_for_env(self, env_idx: int) -> Optional[int]:
+        """Start offset for environment env_idx (None = random)"""
+        if not self.start_offsets:
+            return None
+        return self.start_offsets[env_idx % len(self.start_offsets)]
+
+def _make_env_fn(
+    data: pd.DataFrame,
+    config: VecTrainingConfig,
+    env_idx: int
+) -> Callable[[], Monitor]:
+    """
+    Create the factory for one monitored environment
+
+    The factory is a closure, so plain pickle cannot serialize it; SubprocVecEnv
+    sends it to its workers through SB3's CloudpickleWrapper, which can.
+    """
+    start_offset = config.start_offset_for_env(env_idx)
+
+    def _init() -> Monitor:
+        env = TradingEnvironment(
+            data=data,
+            initial_balance=config.initial_balance,
+            commission=config.commission,
+            max_position_size=config.max_position_size,
+            start_offset=start_offset
+        )
+        env.reset(seed=config.seed + env_idx)
+        env.action_space.seed(config.seed + env_idx)
+        return Monitor(env)
+
+    return _init
+
+def make_vec_env(
+    datasets: Dict[str, pd.DataFrame],
+    config: VecTrainingConfig
+) -> VecEnv:
+    """
+    Build a vectorized environment over a ticker mix
+
+    Args:
+        datasets: Prepared training data per ticker (symbol -> DataFrame)
+        config: Vectorized training configuration
+
+    Returns:
+        SubprocVecEnv or DummyVecEnv with config.n_envs environments
+    """
+    if config.n_envs < 1:
+        raise ValueError(f"n_envs must be >= 1 (got {config.n_envs})")
+
+    missing = [t for t in config.tickers if t not in datasets or datasets[t].empty]
+    if missing:
+        raise ValueError(f"No training data for tickers: {', '.join(missing)}")
+
+    env_fns = []
+    for env_idx in range(config.n_envs):
+        ticker = config.ticker_for_env(env_idx)
+        env_fns.append(_make_env_fn(datasets[ticker], config, env_idx))
+        logger.debug(f"Env {env_idx}: {ticker} (seed={config.seed + env_idx}, "
+                     f"start_offset={config.start_offset_for_env(env_idx)})")
+
+    if config.use_subprocess and config.n_envs > 1:
+        vec_env = SubprocVecEnv(env_fns, start_method=config.start_method)
+        backend = "SubprocVecEnv"
+    else:
+        vec_env = DummyVecEnv(env_fns)
+        backend = "DummyVecEnv"
+
+    # Seed each sub-env with seed + idx on the first reset
+    vec_env.seed(config.seed)
+
+    logger.info(f"Created {backend} with {config.n_envs} envs over {len(config.tickers)} tickers: "
+                f"{', '.join(config.tickers)}")
+    return vec_env
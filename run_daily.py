@@ -18,11 +18,8 @@ load_dotenv()
 sys.path.insert(0, str(Path(__file__).parent))
 
 from typing import Optional
-from core.live.integrated_trader import IntegratedTrader
-from core.live.trading_scheduler import TradingScheduler
-from core.live.signal_capture import SignalCapture
 from config import Config
-from logs.metrics_tracker import MetricsTracker
+from core.live.startup_profiler import startup_profiler
 
 from logging.handlers import TimedRotatingFileHandler
 
@@ -59,7 +56,8 @@ class DailyTradingRunner:
         dry_run: bool = False,
         paper_trading: bool = False,
         shadow: bool = False,
-        save_signals_path: Optional[str] = None
+        save_signals_path: Optional[str] = None,
+        fast_start: bool = False
     ):
         """
         Initialize daily runner
@@ -68,31 +66,42 @@ class DailyTradingRunner:
             rl_model_path: Path to RL model (optional)
             dry_run: If True, simulate trading without executing orders
             paper_trading: If True, use paper trading account
+            fast_start: Defer network warmups and RL model load until first needed
         """
+        # Heavy imports (pandas, alpaca_trade_api, agents) deferred until the runner is built
+        with startup_profiler.phase("imports: trader modules"):
+            from core.live.integrated_trader import IntegratedTrader
+            from core.live.trading_scheduler import TradingScheduler
+            from logs.metrics_tracker import MetricsTracker
+        
         self.dry_run = dry_run
         self.paper_trading = paper_trading
         # Find latest model if not specified
+        # (exported NumPy policies first - no PyTorch needed, faster startup)
         if rl_model_path is None:
-            grpo_model = Path("./models/grpo_final.zip")
-            ppo_model = Path("./models/ppo_final.zip")
-            
-            if grpo_model.exists():
-                rl_model_path = str(grpo_model)
-            elif ppo_model.exists():
-                rl_model_path = str(ppo_model)
+            for candidate in ("./models/grpo_final.npz", "./models/grpo_final.zip",
+                              "./models/ppo_final.npz", "./models/ppo_final.zip"):
+                if Path(candidate).exists():
+                    rl_model_path = candidate
+                    break
         
-        self.trader = IntegratedTrader(
-            rl_model_path=rl_model_path,
-            use_rl=rl_model_path is not None,
-            dry_run=dry_run or shadow,  # Shadow mode is also dry-run
-            paper_trading=paper_trading
-        )
+        with startup_profiler.phase("IntegratedTrader.__init__"):
+            self.trader = IntegratedTrader(
+                rl_model_path=rl_model_path,
+                use_rl=rl_model_path is not None,
+                dry_run=dry_run or shadow,  # Shadow mode is also dry-run
+                paper_trading=paper_trading,
+                lazy_init=fast_start
+            )
         self.scheduler = TradingScheduler()
         self.metrics_tracker = MetricsTracker()
         
         # Signal capture (if shadow mode)
         self.shadow_mode = shadow
-        self.signal_capture = SignalCapture() if shadow else None
+        self.signal_capture = None
+        if shadow:
+            from core.live.signal_capture import SignalCapture
+            self.signal_capture = SignalCapture()
         self.save_signals_path = save_signals_path
         
         # Setup scheduled tasks
@@ -149,6 +158,11 @@ class DailyTradingRunner:
             # Reset daily tracking if needed
             self.trader.risk_manager._reset_daily_if_needed()
             
+            # Extend the shared daily-returns panel before the open (UVaR scenarios)
+            from services.returns_panel import returns_panel
+            returns_panel.set_client(self.trader.client)
+            returns_panel.refresh()
+            
             logger.info("Pre-market warmup complete")
             
         except Exception as e:
@@ -305,9 +319,16 @@ def main():
                        help='Shadow mode - capture all signals without trading')
     parser.add_argument('--save-signals', type=str, default=None,
                        help='Path to save captured signals (requires --shadow)')
+    parser.add_argument('--fast-start', action='store_true',
+                       help='Defer network warmups and RL model load (default: FAST_START env)')
+    parser.add_argument('--profile-startup', action='store_true',
+                       help='Print startup timing breakdown with per-package import times')
     
     args = parser.parse_args()
     
+    if args.profile_startup:
+        startup_profiler.start_import_tracking()
+    
     rl_model_path = None if args.no_rl else args.rl_model
     
     runner = DailyTradingRunner(
@@ -315,8 +336,14 @@ def main():
         dry_run=args.dry_run,
         paper_trading=args.paper,
         shadow=args.shadow,
-        save_signals_path=args.save_signals
+        save_signals_path=args.save_signals,
+        fast_start=args.fast_start or Config.FAST_START
     )
+    
+    if args.profile_startup:
+        startup_profiler.stop_import_tracking()
+        logger.info("\n" + startup_profiler.report())
+    
     runner.run()
 
 if __name__ == '__main__':
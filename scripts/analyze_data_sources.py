@@ -40,8 +40,8 @@ def main():
     print(f"  Mode: {'PAPER' if 'paper' in Config.ALPACA_BASE_URL else 'LIVE'}")
     
     subsection("1.2 Alpaca Client Methods")
-    from alpaca_client import AlpacaClient
-    client = AlpacaClient()
+    from services.market_data_daemon import shared_alpaca_client
+    client = shared_alpaca_client()
     
     # Test account data
     print("\n  --- Account Data (REAL-TIME) ---")
@@ -179,8 +179,8 @@ def main():
     
     print("\n  --- Historical Bars via Massive ---")
     try:
-        from services.massive_price_feed import MassivePriceFeed
-        massive = MassivePriceFeed()
+        from services.market_data_daemon import shared_massive_price_feed
+        massive = shared_massive_price_feed()
         
         bars = massive.get_historical_bars('NVDA', days=5)
         if bars is not None and len(bars) > 0:
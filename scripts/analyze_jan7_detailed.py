@@ -7,7 +7,7 @@ import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from alpaca_client import AlpacaClient
+from services.market_data_daemon import shared_alpaca_client
 from config import Config
 from datetime import datetime
 import pytz
@@ -161,7 +161,7 @@ def main():
     print("="*80)
     
     # Initialize
-    client = AlpacaClient(paper=True)
+    client = shared_alpaca_client(paper=True)
     et = pytz.timezone('America/New_York')
     
     # Parse logs
@@ -6,7 +6,7 @@ import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from alpaca_client import AlpacaClient
+from services.market_data_daemon import shared_alpaca_client
 from config import Config
 
 def main():
@@ -14,7 +14,7 @@ def main():
     print("DETAILED PROFIT MANAGEMENT ANALYSIS")
     print("="*80)
     
-    client = AlpacaClient(paper=True)
+    client = shared_alpaca_client(paper=True)
     positions = client.get_positions()
     
     # Current Profit Target Configuration
@@ -9,8 +9,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import logging
 from datetime import datetime, timedelta
-from alpaca_client import AlpacaClient
-from services.massive_price_feed import MassivePriceFeed
+from services.market_data_daemon import shared_alpaca_client
+from services.market_data_daemon import shared_massive_price_feed
 from services.options_data_feed import OptionsDataFeed
 from core.multi_agent_orchestrator import MultiAgentOrchestrator
 from core.live.integrated_trader import IntegratedTrader
@@ -29,8 +29,8 @@ def analyze_setups_and_rejections():
     print()
     
     # Initialize components
-    massive_feed = MassivePriceFeed()
-    alpaca_client = AlpacaClient(
+    massive_feed = shared_massive_price_feed()
+    alpaca_client = shared_alpaca_client(
         Config.ALPACA_API_KEY,
         Config.ALPACA_SECRET_KEY,
         Config.ALPACA_BASE_URL
@@ -12,8 +12,7 @@ from pathlib import Path
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from alpaca_client import AlpacaClient
-
+from services.market_data_daemon import shared_alpaca_client
 def main():
     print("\n" + "="*100)
     print("📚 DETAILED SIGNAL ANALYSIS FOR MODEL TRAINING")
@@ -79,7 +78,7 @@ def main():
                         })
 
     # Now get current market data for each symbol
-    client = AlpacaClient(paper=True)
+    client = shared_alpaca_client(paper=True)
     positions = {p['symbol']: p for p in client.get_positions()}
 
     print("\n" + "="*100)
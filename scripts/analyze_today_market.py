@@ -13,7 +13,7 @@ import pandas as pd
 import numpy as np
 
 from config import Config
-from alpaca_client import AlpacaClient
+from services.market_data_daemon import shared_alpaca_client
 from alpaca_trade_api.rest import TimeFrame
 from core.multi_agent_orchestrator import MultiAgentOrchestrator
 from core.risk.advanced_risk_manager import AdvancedRiskManager
@@ -30,7 +30,7 @@ def analyze_today_market():
     print("="*90)
     
     # Initialize
-    client = AlpacaClient(
+    client = shared_alpaca_client(
         Config.ALPACA_API_KEY,
         Config.ALPACA_SECRET_KEY,
         Config.ALPACA_BASE_URL
@@ -7,13 +7,13 @@ import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from alpaca_client import AlpacaClient
+from services.market_data_daemon import shared_alpaca_client
 from config import Config
 from datetime import datetime, timedelta
 import pytz
 
 def main():
-    client = AlpacaClient(paper=True)
+    client = shared_alpaca_client(paper=True)
     et = pytz.timezone('America/New_York')
     today = datetime.now(et).strftime('%Y-%m-%d')
 
@@ -11,7 +11,7 @@ from datetime import datetime, timedelta
 import pandas as pd
 
 from config import Config
-from alpaca_client import AlpacaClient
+from services.market_data_daemon import shared_alpaca_client
 from alpaca_trade_api.rest import TimeFrame
 from core.multi_agent_orchestrator import MultiAgentOrchestrator
 
@@ -35,7 +35,7 @@ def main():
     data_start = backtest_start - timedelta(days=60)
     
     # Initialize
-    client = AlpacaClient(
+    client = shared_alpaca_client(
         Config.ALPACA_API_KEY,
         Config.ALPACA_SECRET_KEY,
         Config.ALPACA_BASE_URL
@@ -13,7 +13,7 @@ import pandas as pd
 from collections import defaultdict
 
 from config import Config
-from alpaca_client import AlpacaClient
+from services.market_data_daemon import shared_alpaca_client
 from alpaca_trade_api.rest import TimeFrame
 from core.multi_agent_orchestrator import MultiAgentOrchestrator
 
@@ -45,7 +45,7 @@ def main():
     print("="*70)
     
     # Initialize
-    client = AlpacaClient(
+    client = shared_alpaca_client(
         Config.ALPACA_API_KEY,
         Config.ALPACA_SECRET_KEY,
         Config.ALPACA_BASE_URL
@@ -9,7 +9,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import logging
 from datetime import datetime, date, timedelta
-from alpaca_client import AlpacaClient
+from services.market_data_daemon import shared_alpaca_client
 from core.live.integrated_trader import IntegratedTrader
 from core.risk.advanced_risk_manager import AdvancedRiskManager
 from core.multi_agent_orchestrator import MultiAgentOrchestrator
@@ -29,7 +29,7 @@ def check_today_trades():
     print(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
     
     # Initialize
-    client = AlpacaClient(
+    client = shared_alpaca_client(
         Config.ALPACA_API_KEY,
         Config.ALPACA_SECRET_KEY,
         Config.ALPACA_BASE_URL
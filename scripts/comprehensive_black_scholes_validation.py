@@ -9,7 +9,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import numpy as np
 from core.pricing.black_scholes import BlackScholes
-from services.polygon_options_feed import MassiveOptionsFeed
+from services.market_data_daemon import shared_massive_options_feed
 from config import Config
 from datetime import datetime
 
@@ -245,7 +245,7 @@ def test_market_data_comparison():
     print("TEST 5: MARKET DATA COMPARISON")
     print("="*80)
     
-    feed = MassiveOptionsFeed()
+    feed = shared_massive_options_feed()
     
     if not feed.is_available():
         print("⚠️  Massive API not available, skipping market data comparison")
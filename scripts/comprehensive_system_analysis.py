@@ -8,7 +8,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from config import Config
-from alpaca_client import AlpacaClient
+from services.market_data_daemon import shared_alpaca_client
 from datetime import datetime
 import pytz
 import os
@@ -73,7 +73,7 @@ def analyze_system():
     print("3. CURRENT CONFIGURATION")
     print("="*80)
     
-    client = AlpacaClient(paper=True)
+    client = shared_alpaca_client(paper=True)
     account = client.get_account()
     equity = float(account['equity'])
     
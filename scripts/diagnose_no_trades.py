@@ -10,7 +10,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 import logging
 from datetime import datetime, timedelta
 from config import Config
-from alpaca_client import AlpacaClient
+from services.market_data_daemon import shared_alpaca_client
 from alpaca_trade_api.rest import TimeFrame
 from core.multi_agent_orchestrator import MultiAgentOrchestrator
 # Risk management imports (check what exists)
@@ -41,7 +41,7 @@ def main():
     print("="*80)
     
     try:
-        client = AlpacaClient(
+        client = shared_alpaca_client(
             Config.ALPACA_API_KEY,
             Config.ALPACA_SECRET_KEY,
             Config.ALPACA_BASE_URL
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Record / Replay Trading Sessions
+Record broker and feed traffic from live trading cycles, then replay it offline
+to profile cycle latency and memory
+
+Usage:
+    python scripts/replay_session.py record --cycles 3 --out data/sessions/today.pkl.gz
+    python scripts/replay_session.py replay data/sessions/today.pkl.gz --cycles 3 --speed 0
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+import json
+import logging
+import time
+
+from core.live.session_replay import SessionRecorder, SessionReplayer, profile_cycles
+
+def build_trader():
+    from core.live.integrated_trader import IntegratedTrader
+    return IntegratedTrader(dry_run=True, paper_trading=True)
+
+def record(args):
+    with SessionRecorder(args.out) as recorder:
+        trader = build_trader()
+        for i in range(args.cycles):
+            trader.run_trading_cycle()
+            if i < args.cycles - 1:
+                time.sleep(args.interval)
+    print(f"Recorded {len(recorder.archive.calls)} calls to {args.out}")
+
+def replay(args):
+    with SessionReplayer(args.archive, speed=args.speed) as replayer:
+        trader = build_trader()
+        report = profile_cycles(trader, args.cycles)
+    report['served_calls'] = replayer.served
+    report['misses'] = replayer.misses
+    print(json.dumps(report, indent=2))
+
+def main():
+    parser = argparse.ArgumentParser(description="Record or replay trading sessions")
+    parser.add_argument('--log-level', default='WARNING')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    rec = sub.add_parser('record', help='Run live (dry-run) cycles and record all service traffic')
+    rec.add_argument('--out', type=Path, default=Path('data/sessions/session.pkl.gz'))
+    rec.add_argument('--cycles', type=int, default=1)
+    rec.add_argument('--interval', type=float, default=60.0, help='Seconds between recorded cycles')
+    rec.set_defaults(func=record)
+
+    rep = sub.add_parser('replay', help='Replay a recorded session offline and profile it')
+    rep.add_argument('archive', type=Path)
+    rep.add_argument('--cycles', type=int, default=1)
+    rep.add_argument('--speed', type=float, default=0.0,
+                     help='Latency replay rate (0 = instant, 1 = recorded timing)')
+    rep.set_defaults(func=replay)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=getattr(logging, args.log_level.upper(), logging.WARNING))
+    args.func(args)
+
+if __name__ == '__main__':
+    main()
@@ -7,7 +7,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from core.pricing.black_scholes import BlackScholes
-from services.polygon_options_feed import MassiveOptionsFeed
+from services.market_data_daemon import shared_massive_options_feed
 from config import Config
 
 def validate_black_scholes():
@@ -45,7 +45,7 @@ def validate_black_scholes():
     print("2. Comparing with Massive API Data (NVDA $170 Call):")
     print("-" * 80)
     
-    feed = MassiveOptionsFeed()
+    feed = shared_massive_options_feed()
     if feed.is_available():
         contract = feed.get_option_by_strike('NVDA', 170, '2025-12-19', 'call')
         
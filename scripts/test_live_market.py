@@ -9,8 +9,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import logging
 from datetime import datetime, timedelta
-from alpaca_client import AlpacaClient
-from services.massive_price_feed import MassivePriceFeed
+from services.market_data_daemon import shared_alpaca_client
+from services.market_data_daemon import shared_massive_price_feed
 from core.live.integrated_trader import IntegratedTrader
 from config import Config
 
@@ -30,7 +30,7 @@ def test_live_market():
     print("1. MARKET STATUS:")
     print("-" * 80)
     try:
-        client = AlpacaClient(
+        client = shared_alpaca_client(
             Config.ALPACA_API_KEY,
             Config.ALPACA_SECRET_KEY,
             Config.ALPACA_BASE_URL
@@ -49,7 +49,7 @@ def test_live_market():
     # 2. Check Massive availability
     print("2. DATA SOURCE:")
     print("-" * 80)
-    massive_feed = MassivePriceFeed()
+    massive_feed = shared_massive_price_feed()
     if massive_feed.is_available():
         print("✅ Massive Price Feed: Available")
         print(f"   API Key: {'✅ Configured' if massive_feed.api_key else '❌ Missing'}")
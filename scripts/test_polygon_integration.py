@@ -9,7 +9,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import logging
 from datetime import datetime, timedelta
-from services.polygon_options_feed import PolygonOptionsFeed
+from services.market_data_daemon import shared_massive_options_feed
 from config import Config
 
 logging.basicConfig(level=logging.INFO)
@@ -23,7 +23,7 @@ def test_polygon_feed():
     print()
     
     # Initialize feed
-    feed = PolygonOptionsFeed()
+    feed = shared_massive_options_feed()
     
     if not feed.is_available():
         print("❌ Polygon API key not configured")
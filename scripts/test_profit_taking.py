@@ -4,7 +4,7 @@ import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from alpaca_client import AlpacaClient
+from services.market_data_daemon import shared_alpaca_client
 from core.live.options_broker_client import OptionsBrokerClient
 from config import Config
 import logging
@@ -12,7 +12,7 @@ import logging
 logging.basicConfig(level=logging.INFO, format='%(message)s')
 
 def main():
-    client = AlpacaClient(paper=True)
+    client = shared_alpaca_client(paper=True)
     positions = client.get_positions()
 
     # Profit target levels
@@ -10,7 +10,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 import logging
 from core.risk.uvar_calculator import UVaRCalculator
 from core.risk.advanced_risk_manager import AdvancedRiskManager
-from alpaca_client import AlpacaClient
+from services.market_data_daemon import shared_alpaca_client
 from config import Config
 
 logging.basicConfig(level=logging.INFO)
@@ -26,7 +26,7 @@ def test_uvar_integration():
     
     # Initialize Alpaca client
     try:
-        client = AlpacaClient(
+        client = shared_alpaca_client(
             Config.ALPACA_API_KEY,
             Config.ALPACA_SECRET_KEY,
             Config.ALPACA_BASE_URL
@@ -25,7 +25,8 @@ def main():
         from core.live.options_broker_client import OptionsBrokerClient
         from alpaca_client import AlpacaClient
         
-        client = AlpacaClient()
+        from services.market_data_daemon import shared_alpaca_client
+        client = shared_alpaca_client()
         options_client = OptionsBrokerClient(client)
         print("  ✅ OptionsBrokerClient initializes with AlpacaClient")
     except Exception as e:
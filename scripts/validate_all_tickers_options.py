@@ -10,7 +10,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 import json
 import logging
 from datetime import datetime
-from services.polygon_options_feed import MassiveOptionsFeed
+from services.market_data_daemon import shared_massive_options_feed
 from config import Config
 
 logging.basicConfig(level=logging.WARNING)  # Reduce noise
@@ -19,7 +19,7 @@ logger = logging.getLogger(__name__)
 def validate_all_tickers():
     """Get one option contract per ticker and display in JSON format"""
     
-    feed = MassiveOptionsFeed()
+    feed = shared_massive_options_feed()
     
     if not feed.is_available():
         print("❌ Massive API key not configured")
@@ -8,7 +8,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import logging
 from datetime import datetime, timedelta
-from alpaca_client import AlpacaClient
+from services.market_data_daemon import shared_alpaca_client
 from config import Config
 
 logging.basicConfig(
@@ -26,7 +26,7 @@ def validate_alpaca_orders():
     
     try:
         # Initialize client
-        client = AlpacaClient(
+        client = shared_alpaca_client(
             Config.ALPACA_API_KEY,
             Config.ALPACA_SECRET_KEY,
             Config.ALPACA_BASE_URL
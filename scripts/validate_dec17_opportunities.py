@@ -11,8 +11,8 @@ import logging
 from datetime import datetime, timedelta
 import pandas as pd
 
-from services.massive_price_feed import MassivePriceFeed
-from alpaca_client import AlpacaClient
+from services.market_data_daemon import shared_massive_price_feed
+from services.market_data_daemon import shared_alpaca_client
 from config import Config
 from core.multi_agent_orchestrator import MultiAgentOrchestrator
 from core.live.integrated_trader import IntegratedTrader
@@ -38,8 +38,8 @@ def validate_dec17_opportunities():
     print()
     
     # Initialize data sources
-    massive_feed = MassivePriceFeed()
-    alpaca_client = AlpacaClient(
+    massive_feed = shared_massive_price_feed()
+    alpaca_client = shared_alpaca_client(
         Config.ALPACA_API_KEY,
         Config.ALPACA_SECRET_KEY,
         Config.ALPACA_BASE_URL
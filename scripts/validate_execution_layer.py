@@ -307,10 +307,10 @@ def run_live_validation():
     print_section("8. LIVE API VALIDATION (Paper Account)")
     
     try:
-        from alpaca_client import AlpacaClient
+        from services.market_data_daemon import shared_alpaca_client
         from config import Config
         
-        client = AlpacaClient(
+        client = shared_alpaca_client(
             api_key=Config.ALPACA_API_KEY,
             secret_key=Config.ALPACA_SECRET_KEY,
             base_url=Config.ALPACA_BASE_URL
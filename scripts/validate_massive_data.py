@@ -9,7 +9,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import logging
 from datetime import datetime, timedelta
-from services.polygon_options_feed import MassiveOptionsFeed
+from services.market_data_daemon import shared_massive_options_feed
 from config import Config
 import pandas as pd
 
@@ -24,7 +24,7 @@ def validate_massive_data():
     print(f"Test Time: {datetime.now()}\n")
     
     # Initialize feed
-    feed = MassiveOptionsFeed()
+    feed = shared_massive_options_feed()
     
     if not feed.is_available():
         print("❌ Massive API key not configured")
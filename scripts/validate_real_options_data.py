@@ -7,15 +7,14 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import logging
-from services.polygon_options_feed import MassiveOptionsFeed
-
+from services.market_data_daemon import shared_massive_options_feed
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 def validate_real_data():
     """Validate that we're getting REAL options data"""
     
-    feed = MassiveOptionsFeed()
+    feed = shared_massive_options_feed()
     
     if not feed.is_available():
         print("❌ Massive API key not configured")
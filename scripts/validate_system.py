@@ -5,7 +5,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from config import Config
-from alpaca_client import AlpacaClient
+from services.market_data_daemon import shared_alpaca_client
 from core.live.trading_scheduler import TradingScheduler
 
 def main():
@@ -25,7 +25,7 @@ def main():
 
     # 2. Alpaca connection
     print("\n🔌 ALPACA CONNECTION:")
-    client = AlpacaClient(paper=True)
+    client = shared_alpaca_client(paper=True)
     account = client.get_account()
     clock = client.api.get_clock()
     print("   ✅ Connected")
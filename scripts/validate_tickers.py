@@ -5,8 +5,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from config import Config
-from alpaca_client import AlpacaClient
-
+from services.market_data_daemon import shared_alpaca_client
 def main():
     print("="*60)
     print("TICKER CONFIGURATION UPDATED")
@@ -20,7 +19,7 @@ def main():
     print("VALIDATING OPTIONS AVAILABILITY")
     print("="*60)
 
-    client = AlpacaClient(paper=True)
+    client = shared_alpaca_client(paper=True)
 
     # Check if each ticker has options available
     valid_tickers = []
@@ -12,7 +12,7 @@ import pandas as pd
 from pathlib import Path
 
 from config import Config
-from alpaca_client import AlpacaClient
+from services.market_data_daemon import shared_alpaca_client
 from alpaca_trade_api.rest import TimeFrame
 from core.multi_agent_orchestrator import MultiAgentOrchestrator
 
@@ -26,7 +26,7 @@ logger = logging.getLogger(__name__)
 def check_market_status():
     """Check if market is open"""
     try:
-        client = AlpacaClient(
+        client = shared_alpaca_client(
             Config.ALPACA_API_KEY,
             Config.ALPACA_SECRET_KEY,
             Config.ALPACA_BASE_URL
@@ -75,7 +75,7 @@ def analyze_signals_for_today():
     
     # Initialize orchestrator
     try:
-        client = AlpacaClient(
+        client = shared_alpaca_client(
             Config.ALPACA_API_KEY,
             Config.ALPACA_SECRET_KEY,
             Config.ALPACA_BASE_URL
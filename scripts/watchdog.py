@@ -11,7 +11,9 @@ import sys
 import json
 import logging
 import subprocess
+import time
 import smtplib
+from collections import deque
 from datetime import datetime, timedelta
 from pathlib import Path
 from email.mime.text import MIMEText
@@ -173,6 +175,7 @@ class TradingWatchdog:
     def __init__(self):
         self.alert_manager = AlertManager()
         self.et_tz = pytz.timezone('US/Eastern')
+        self._api_error_samples: deque = deque()  # (time, cumulative api_errors) from heartbeats
     
     def is_market_hours(self) -> bool:
         """Check if we're in market hours (9:30 AM - 4:00 PM ET)"""
@@ -242,6 +245,61 @@ class TradingWatchdog:
         
         return result
     
+    def check_heartbeat(self, max_age_seconds: float = 60.0) -> Dict:
+        """Read the trader's shared-memory heartbeat (no ps / log parsing)"""
+        result = {
+            'available': False,
+            'pid': None,
+            'age_seconds': None,
+            'last_cycle_age_minutes': None,
+            'open_positions': None,
+            'api_errors': None
+        }
+        
+        try:
+            from config import Config
+            from core.live.metrics_registry import read_heartbeat
+            beat = read_heartbeat(Config.HEARTBEAT_PATH or None)
+            if beat and beat['age_seconds'] <= max_age_seconds:
+                result['available'] = True
+                result['pid'] = beat.get('pid')
+                result['age_seconds'] = round(beat['age_seconds'], 1)
+                if beat.get('last_cycle_at'):
+                    result['last_cycle_age_minutes'] = round((time.time() - beat['last_cycle_at']) / 60, 1)
+                result['open_positions'] = beat.get('open_positions')
+                result['api_errors'] = beat.get('api_errors')
+                result['cache_hit_ratios'] = beat.get('cache_hit_ratios')
+        except Exception as e:
+            logger.error(f"Error reading heartbeat: {e}")
+        
+        return result
+    
+    def heartbeat_activity(self, heartbeat: Dict, max_age_minutes: int = 10) -> Dict:
+        """
+        Activity from the heartbeat, in the shape of check_recent_log_activity
+        
+        errors_in_last_hour is the growth of the trader's API error counter over the
+        heartbeats seen in the last hour (0 until a second check in the same process).
+        """
+        cycle_age = heartbeat['last_cycle_age_minutes']
+        now = time.time()
+        errors = 0
+        if heartbeat.get('api_errors') is not None:
+            samples = self._api_error_samples
+            if samples and heartbeat['api_errors'] < samples[-1][1]:
+                samples.clear()  # Trader restarted: counter reset
+            samples.append((now, heartbeat['api_errors']))
+            while samples[0][0] < now - 3600:
+                samples.popleft()
+            errors = samples[-1][1] - samples[0][1]
+        return {
+            'has_recent_activity': cycle_age is not None and cycle_age < max_age_minutes,
+            'last_log_time': None,
+            'last_log_age_minutes': cycle_age,
+            'errors_in_last_hour': errors,
+            'source': 'heartbeat'
+        }
+    
     def check_recent_log_activity(self, max_age_minutes: int = 10) -> Dict:
         """Check for recent log activity"""
         result = {
@@ -334,8 +392,8 @@ class TradingWatchdog:
             from dotenv import load_dotenv
             load_dotenv(PROJECT_ROOT / '.env')
             
-            from alpaca_client import AlpacaClient
-            client = AlpacaClient(paper=True)
+            from services.market_data_daemon import shared_alpaca_client
+            client = shared_alpaca_client(paper=True)
             account = client.get_account()
             
             if account:
@@ -353,16 +411,25 @@ class TradingWatchdog:
         """Run full health check"""
         logger.info("Running health check...")
         
+        heartbeat = self.check_heartbeat()
         health = {
             'timestamp': datetime.now().isoformat(),
             'is_trading_hours': self.is_trading_hours(),
             'is_market_hours': self.is_market_hours(),
-            'process': self.check_process_running(),
-            'logs': self.check_recent_log_activity(),
+            'heartbeat': heartbeat,
             'launchd': self.check_launchd_status(),
             'overall_status': 'healthy'
         }
         
+        if heartbeat['available']:
+            # Fresh heartbeat: process is alive; activity is the last completed cycle
+            health['process'] = {'running': True, 'pid': heartbeat['pid'], 'source': 'heartbeat'}
+            health['logs'] = self.heartbeat_activity(heartbeat)
+        else:
+            # No heartbeat (older trader build or metrics disabled): fall back to ps / log parsing
+            health['process'] = self.check_process_running()
+            health['logs'] = self.check_recent_log_activity()
+        
         issues = []
         
         # Check process status during trading hours
@@ -1,121 +1,273 @@
 """
 GEX (Gamma Exposure) Proxy Calculator
 Calculates proxy for Gamma Exposure based on options chain
+
+The chain is converted to columns once; per-strike call/put GEX, the gamma flip
+level and max pain (payout minimization across candidate settlement prices)
+are then computed with array operations over all contracts and expirations.
 """
 import logging
-from typing import Dict, List, Optional
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
 import numpy as np
+import pandas as pd
 
 logger = logging.getLogger(__name__)
 
+CONTRACT_MULTIPLIER = 100
+
+# Spot grid (fraction of spot) for the gamma-flip profile
+FLIP_GRID = np.linspace(0.8, 1.2, 81)
+
+def _contract_fields(contract: Dict) -> Tuple:
+    """(strike, type, open_interest, gamma, iv, expiration) from flat or snapshot-style contracts"""
+    details = contract.get('details') or {}
+    greeks = contract.get('greeks') or {}
+    return (
+        contract.get('strike_price', details.get('strike_price')),
+        contract.get('type') or contract.get('option_type') or details.get('contract_type') or '',
+        contract.get('open_interest'),
+        contract.get('gamma', greeks.get('gamma')),
+        contract.get('implied_volatility'),
+        contract.get('expiration_date') or details.get('expiration_date')
+    )
+
 class GEXCalculator:
     """Calculate GEX Proxy"""
-    
-    def __init__(self):
-        """Initialize GEX calculator"""
-        pass
-    
+
+    def __init__(self, cache_ttl_seconds: int = 60, max_cache_entries: int = 64):
+        """
+        Initialize GEX calculator
+
+        Args:
+            cache_ttl_seconds: Snapshot bucket used when no snapshot time is given
+            max_cache_entries: Cached (underlying, snapshot, spot, chain) results kept
+        """
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self.max_cache_entries = max_cache_entries
+        self._cache: Dict[Tuple, Dict] = {}
+
     def calculate_gex_proxy(
         self,
         options_chain: List[Dict],
-        spot_price: float
+        spot_price: float,
+        symbol: Optional[str] = None,
+        snapshot_time: Optional[datetime] = None
     ) -> Dict:
         """
         Calculate GEX Proxy
-        
+
         GEX Proxy = Sum of (Open Interest * Gamma * Spot Price * 100)
         for all options in chain
-        
+
         Positive GEX = Market makers are long gamma (supports price)
         Negative GEX = Market makers are short gamma (volatility expansion)
-        
+
         Args:
             options_chain: List of option contracts with OI and Greeks
             spot_price: Current spot price
-            
+            symbol: Underlying symbol (enables caching per snapshot, spot and chain contents)
+            snapshot_time: Time of the chain snapshot (default: current
+                cache_ttl_seconds bucket)
+
         Returns:
-            Dictionary with total GEX, call GEX, put GEX, and levels
+            Dictionary with total GEX, call GEX, put GEX, per-strike levels,
+            gamma flip and max pain
         """
-        if not options_chain:
-            return {
-                'total_gex': 0.0,
-                'call_gex': 0.0,
-                'put_gex': 0.0,
-                'gex_levels': {},
-                'max_pain': 0.0
-            }
-        
-        total_gex = 0.0
-        call_gex = 0.0
-        put_gex = 0.0
-        gex_levels = {}  # strike -> gex
-        max_pain_data = {}  # strike -> total OI
-        
-        for contract in options_chain:
-            try:
-                strike = float(contract.get('strike_price', 0))
-                open_interest = float(contract.get('open_interest', 0))
-                option_type = contract.get('type', '').lower()
-                gamma = float(contract.get('gamma', 0))
-                
-                if strike == 0 or open_interest == 0:
-                    continue
-                
-                # Calculate GEX contribution
-                # GEX = OI * Gamma * Spot * 100 * multiplier
-                # For calls: positive contribution
-                # For puts: negative contribution
-                gex_contribution = open_interest * gamma * spot_price * 100
-                
-                if option_type == 'call':
-                    call_gex += gex_contribution
-                    total_gex += gex_contribution
-                elif option_type == 'put':
-                    put_gex -= gex_contribution  # Puts have negative GEX
-                    total_gex -= gex_contribution
-                
-                # Track GEX by strike
-                if strike not in gex_levels:
-                    gex_levels[strike] = 0.0
-                
-                if option_type == 'call':
-                    gex_levels[strike] += gex_contribution
-                else:
-                    gex_levels[strike] -= gex_contribution
-                
-                # Track for max pain calculation
-                if strike not in max_pain_data:
-                    max_pain_data[strike] = 0
-                max_pain_data[strike] += open_interest
-                
-            except Exception as e:
-                logger.debug(f"Error processing contract for GEX: {e}")
-                continue
-        
-        # Calculate max pain (strike with highest total OI)
-        max_pain = max(max_pain_data.items(), key=lambda x: x[1])[0] if max_pain_data else spot_price
-        
+        cache_key = None
+        if symbol:
+            snapshot = snapshot_time or int(time.time() // self.cache_ttl_seconds)
+            fingerprint = self._chain_fingerprint(options_chain)
+            if fingerprint is not None:
+                # Spot and chain contents are part of the key: a different day / quote never hits
+                cache_key = (symbol, snapshot, round(float(spot_price), 4), fingerprint)
+                cached = self._cache.get(cache_key)
+                if cached is not None:
+                    return cached
+
+        result = self._calculate(options_chain, spot_price)
+
+        if cache_key is not None:
+            if len(self._cache) >= self.max_cache_entries:
+                self._cache.pop(next(iter(self._cache)))
+            self._cache[cache_key] = result
+        return result
+
+    @staticmethod
+    def _chain_fingerprint(options_chain: List[Dict]) -> Optional[int]:
+        """Hash of the fields GEX depends on (None if the chain has unhashable values)"""
+        try:
+            return hash(tuple(_contract_fields(contract) for contract in options_chain or ()))
+        except TypeError:
+            return None
+
+    def _calculate(self, options_chain: List[Dict], spot_price: float) -> Dict:
+        """Columnar GEX / flip / max pain over the whole chain"""
+        chain = self._to_frame(options_chain) if options_chain else None
+        if chain is None or chain.empty:
+            return self._empty_result()
+
+        strike = chain['strike'].to_numpy()
+        oi = chain['open_interest'].to_numpy()
+        is_call = chain['is_call'].to_numpy()
+        gamma = chain['gamma'].to_numpy()
+
+        # Fill missing gamma from Black-Scholes where IV and expiry are known
+        T = self._years_to_expiry(chain['expiration'])
+        iv = chain['iv'].to_numpy()
+        missing = (gamma == 0) & (iv > 0) & (T > 0)
+        if missing.any():
+            from core.pricing.black_scholes import BlackScholes
+            gamma = gamma.copy()
+            gamma[missing] = BlackScholes().greeks_vectorized(
+                spot_price, strike[missing], T[missing], iv[missing], is_call[missing]
+            )['gamma']
+
+        # Signed GEX per contract (calls positive, puts negative)
+        sign = np.where(is_call, 1.0, -1.0)
+        gex = oi * gamma * spot_price * CONTRACT_MULTIPLIER
+
+        strikes, strike_idx = np.unique(strike, return_inverse=True)
+        call_levels = np.bincount(strike_idx, weights=np.where(is_call, gex, 0.0), minlength=len(strikes))
+        put_levels = -np.bincount(strike_idx, weights=np.where(is_call, 0.0, gex), minlength=len(strikes))
+        net_levels = call_levels + put_levels
+
+        call_gex = float(call_levels.sum())
+        put_gex = float(put_levels.sum())
+
+        call_oi = np.bincount(strike_idx, weights=np.where(is_call, oi, 0.0), minlength=len(strikes))
+        put_oi = np.bincount(strike_idx, weights=np.where(is_call, 0.0, oi), minlength=len(strikes))
+
+        max_pain_by_expiration = {}
+        expirations = chain['expiration'].to_numpy()
+        for expiration in pd.unique(expirations[pd.notna(expirations)]):
+            mask = expirations == expiration
+            idx = strike_idx[mask]
+            max_pain_by_expiration[str(expiration)] = self._max_pain(
+                strikes,
+                np.bincount(idx, weights=np.where(is_call[mask], oi[mask], 0.0), minlength=len(strikes)),
+                np.bincount(idx, weights=np.where(is_call[mask], 0.0, oi[mask]), minlength=len(strikes))
+            )
+
         return {
-            'total_gex': total_gex,
+            'total_gex': call_gex + put_gex,
             'call_gex': call_gex,
             'put_gex': put_gex,
-            'gex_levels': gex_levels,
-            'max_pain': max_pain,
+            'gex_levels': dict(zip(strikes.tolist(), net_levels.tolist())),
+            'call_gex_levels': dict(zip(strikes.tolist(), call_levels.tolist())),
+            'put_gex_levels': dict(zip(strikes.tolist(), put_levels.tolist())),
+            'gamma_flip': self._gamma_flip(strike, oi, sign, gamma, iv, T, spot_price, strikes, net_levels),
+            'max_pain': self._max_pain(strikes, call_oi, put_oi),
+            'max_pain_by_expiration': max_pain_by_expiration,
             'net_gex': call_gex + put_gex  # Net GEX
         }
-    
+
+    @staticmethod
+    def _to_frame(options_chain: List[Dict]) -> pd.DataFrame:
+        """Columns for contracts with a strike and open interest"""
+        frame = pd.DataFrame(
+            [_contract_fields(c) for c in options_chain if isinstance(c, dict)],
+            columns=['strike', 'type', 'open_interest', 'gamma', 'iv', 'expiration']
+        )
+        for column in ('strike', 'open_interest', 'gamma', 'iv'):
+            frame[column] = pd.to_numeric(frame[column], errors='coerce').fillna(0.0)
+        frame['type'] = frame['type'].astype(str).str.lower()
+        frame['is_call'] = frame['type'] == 'call'
+        keep = (frame['strike'] > 0) & (frame['open_interest'] > 0) & frame['type'].isin(['call', 'put'])
+        return frame.loc[keep].reset_index(drop=True)
+
+    @staticmethod
+    def _years_to_expiry(expirations: pd.Series) -> np.ndarray:
+        """Years to expiry per contract (0 where unknown)"""
+        if expirations.isna().all():
+            return np.zeros(len(expirations))
+        from core.risk.options_var import years_to_expiry
+        dates = pd.to_datetime(expirations, errors='coerce')
+        by_date = {d: years_to_expiry(d.date()) for d in dates.dropna().unique()}
+        return dates.map(by_date).fillna(0.0).to_numpy(dtype=np.float64)
+
+    @staticmethod
+    def _max_pain(strikes: np.ndarray, call_oi: np.ndarray, put_oi: np.ndarray) -> float:
+        """
+        Settlement price (among strikes) minimizing total option holder payout
+
+        payout[p] = sum_k call_oi[k] * max(p - k, 0) + put_oi[k] * max(k - p, 0)
+        """
+        if call_oi.sum() + put_oi.sum() <= 0:
+            return 0.0
+        diff = strikes[:, None] - strikes[None, :]  # settlement x strike
+        payout = np.maximum(diff, 0.0) @ call_oi + np.maximum(-diff, 0.0) @ put_oi
+        return float(strikes[np.argmin(payout)])
+
+    def _gamma_flip(
+        self,
+        strike: np.ndarray,
+        oi: np.ndarray,
+        sign: np.ndarray,
+        gamma: np.ndarray,
+        iv: np.ndarray,
+        T: np.ndarray,
+        spot_price: float,
+        strikes: np.ndarray,
+        net_levels: np.ndarray
+    ) -> Optional[float]:
+        """
+        Spot level where net GEX changes sign (closest to spot)
+
+        With IV and expiry for the chain, net GEX is re-evaluated on a spot grid
+        (Black-Scholes gamma at each level). Otherwise the cumulative per-strike
+        net GEX crossing is used.
+        """
+        priced = (iv > 0) & (T > 0)
+        if priced.sum() >= max(1, len(iv) // 2):
+            from core.pricing.black_scholes import BlackScholes
+            levels = spot_price * FLIP_GRID
+            grid_gamma = BlackScholes().greeks_vectorized(
+                levels[:, None], strike[priced], T[priced], iv[priced], sign[priced] > 0
+            )['gamma']
+            profile = (grid_gamma * (oi * sign)[priced]).sum(axis=1) * levels * CONTRACT_MULTIPLIER
+        else:
+            levels = strikes
+            profile = np.cumsum(net_levels)
+
+        crossings = np.nonzero(np.sign(profile[:-1]) * np.sign(profile[1:]) < 0)[0]
+        if len(crossings) == 0:
+            return None
+
+        # Linear interpolation between grid points around each crossing
+        x0, x1 = levels[crossings], levels[crossings + 1]
+        y0, y1 = profile[crossings], profile[crossings + 1]
+        flips = x0 - y0 * (x1 - x0) / (y1 - y0)
+        return float(flips[np.argmin(np.abs(flips - spot_price))])
+
+    @staticmethod
+    def _empty_result() -> Dict:
+        return {
+            'total_gex': 0.0,
+            'call_gex': 0.0,
+            'put_gex': 0.0,
+            'gex_levels': {},
+            'call_gex_levels': {},
+            'put_gex_levels': {},
+            'gamma_flip': None,
+            'max_pain': 0.0,
+            'max_pain_by_expiration': {},
+            'net_gex': 0.0
+        }
+
     def interpret_gex(self, gex_data: Dict) -> str:
         """
         Interpret GEX data
-        
+
         Args:
             gex_data: GEX calculation results
-            
+
         Returns:
             Interpretation string
         """
         total_gex = gex_data.get('total_gex', 0)
-        
+
         if total_gex > 1_000_000_000:  # > 1B
             return "EXTREMELY_POSITIVE"  # Very supportive
         elif total_gex > 100_000_000:  # > 100M
@@ -126,4 +278,3 @@ class GEXCalculator:
             return "NEGATIVE"  # Volatility expansion likely
         else:  # < -1B
             return "EXTREMELY_NEGATIVE"  # Very negative, high volatility risk
-
@@ -11,6 +11,8 @@ import pandas as pd
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_DB_PATH = Path('data/iv_history.db')
+
 class IVHistoryDB:
     """
     Database for storing historical IV data
@@ -33,7 +35,7 @@ class IVHistoryDB:
             db_path: Path to SQLite database file (defaults to data/iv_history.db)
         """
         if db_path is None:
-            db_path = Path('data/iv_history.db')
+            db_path = DEFAULT_DB_PATH
         
         self.db_path = db_path
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
@@ -37,7 +37,10 @@ class IVRankService:
             db_path: Path to IV history database
             lookback_days: Days to look back for IV Rank (default: 365 for 52-week)
         """
-        self.options_feed = options_feed or MassiveOptionsFeed()
+        if options_feed is None:
+            from services.market_data_daemon import shared_massive_options_feed
+            options_feed = shared_massive_options_feed()
+        self.options_feed = options_feed
         self.iv_db = IVHistoryDB(db_path)
         self.iv_calculator = IVCalculator(lookback_days=lookback_days)
         self.lookback_days = lookback_days
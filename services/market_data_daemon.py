@@ -0,0 +1,454 @@
+"""
+Market Data Daemon
+One local process owns the upstream Alpaca / Massive connections, caches and
+rate limit; the trader, dashboard pages and scripts call it over a Unix socket
+
+Market data reads (get_*, list_*, is_*) on AlpacaClient, AlpacaClient.api,
+MassivePriceFeed and MassiveOptionsFeed are forwarded to the daemon, which:
+- serves repeated calls from a short-TTL cache (per method)
+- coalesces identical in-flight calls, so N consumers asking at once cost one
+  upstream request
+- applies a shared requests-per-minute budget per upstream
+- runs the quote streams (if enabled), so get_latest_price is served from the
+  streamed cache
+
+Everything else (orders, cancels, attributes) runs on a local client in the
+caller's process, and so do reads whenever the daemon is unreachable. Account
+reads (ACCOUNT_METHODS: account, positions, orders, activities) always run
+locally: the daemon holds one Alpaca account from Config, which need not be the
+caller's (a paper trader next to a live-configured daemon).
+Scripts and services build their clients with shared_alpaca_client() /
+shared_massive_price_feed() / shared_massive_options_feed() to get this routing.
+Only one daemon serves a socket: start() refuses while another one answers on it.
+
+Wire format: 4-byte big-endian length + pickle, over a user-only (0600) Unix
+socket.
+
+Run:
+    python -m services.market_data_daemon
+"""
+import logging
+import os
+import pickle
+import socket
+import socketserver
+import struct
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+READ_PREFIXES = ('get_', 'list_', 'is_')
+
+# Account-scoped reads: answered by the caller's own client, never the daemon's
+ACCOUNT_METHODS = frozenset({
+    'get_account', 'get_account_configurations', 'get_activities', 'get_portfolio_history',
+    'get_positions', 'get_position', 'list_positions',
+    'get_orders', 'get_order', 'get_order_by_client_order_id', 'list_orders',
+    'get_watchlist', 'get_watchlist_by_name', 'get_watchlists',
+})
+
+def is_market_data_read(method: str) -> bool:
+    return method.startswith(READ_PREFIXES) and method not in ACCOUNT_METHODS
+
+# Cache TTL per method (seconds); anything else uses DEFAULT_TTL
+CACHE_TTLS = {
+    'get_latest_price': 1.0,
+    'get_latest_bar': 1.0,
+    'get_latest_trade': 1.0,
+    'is_market_open': 30.0,
+    'get_clock': 30.0,
+    'get_historical_bars': 300.0,
+    'get_daily_bars': 300.0,
+    'get_1minute_bars': 30.0,
+    'get_options_chain': 15.0,
+    'get_expiration_dates': 3600.0,
+    'get_iv_history': 3600.0,
+}
+DEFAULT_TTL = 1.0
+
+_LENGTH = struct.Struct('>I')
+
+def default_socket_path() -> str:
+    return os.path.join(tempfile.gettempdir(), 'tradenova_market_data.sock')
+
+def _send(sock: socket.socket, payload: Any):
+    data = pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+    sock.sendall(_LENGTH.pack(len(data)) + data)
+
+def _recv_exact(sock: socket.socket, n: int) -> bytes:
+    chunks = []
+    while n:
+        chunk = sock.recv(min(n, 1 << 20))
+        if not chunk:
+            raise ConnectionError("Market data daemon closed the connection")
+        chunks.append(chunk)
+        n -= len(chunk)
+    return b''.join(chunks)
+
+def _recv(sock: socket.socket) -> Any:
+    (length,) = _LENGTH.unpack(_recv_exact(sock, _LENGTH.size))
+    return pickle.loads(_recv_exact(sock, length))
+
+def cache_key(service: str, method: str, args: tuple, kwargs: dict) -> str:
+    """Cache key (datetimes truncated to the minute so 'now'-based ranges share entries)"""
+    def canon(value):
+        if isinstance(value, datetime):
+            return value.strftime('%Y-%m-%dT%H:%M')
+        if isinstance(value, date):
+            return value.isoformat()
+        if isinstance(value, (list, tuple)):
+            return '[' + ','.join(canon(v) for v in value) + ']'
+        text = repr(value)
+        if ' object at 0x' in text:  # e.g. TimeFrame: default repr differs per unpickled copy
+            return f"{type(value).__name__}:{value}"
+        return text
+    parts = [canon(a) for a in args] + [f"{k}={canon(v)}" for k, v in sorted(kwargs.items())]
+    return f"{service}.{method}({','.join(parts)})"
+
+class RateLimiter:
+    """Token bucket: rate_per_minute requests, bursts up to `burst`"""
+
+    def __init__(self, rate_per_minute: float, burst: Optional[int] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(burst or max(1, int(rate_per_minute / 6)))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+class MarketDataDaemon:
+    """Unix-socket server multiplexing read calls onto one set of upstream clients"""
+
+    def __init__(
+        self,
+        services: Optional[Dict[str, Any]] = None,
+        socket_path: Optional[str] = None,
+        rate_limits: Optional[Dict[str, float]] = None,
+        ttls: Optional[Dict[str, float]] = None
+    ):
+        """
+        Initialize daemon
+
+        Args:
+            services: service name -> client object (default: built from Config)
+            socket_path: Unix socket path (default: Config.MARKET_DATA_SOCKET or temp dir)
+            rate_limits: upstream ('alpaca' / 'massive') -> requests per minute
+            ttls: Per-method cache TTL overrides
+        """
+        from config import Config
+        self.socket_path = socket_path or Config.MARKET_DATA_SOCKET or default_socket_path()
+        self.services = services if services is not None else self._build_services()
+        rate_limits = rate_limits or {'alpaca': Config.MARKET_DATA_DAEMON_ALPACA_RPM,
+                                      'massive': Config.MARKET_DATA_DAEMON_MASSIVE_RPM}
+        self.limiters = {name: RateLimiter(rpm) for name, rpm in rate_limits.items() if rpm}
+        self.ttls = dict(CACHE_TTLS, **(ttls or {}))
+
+        self._cache: Dict[str, Tuple[float, Any]] = {}
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._server: Optional[socketserver.ThreadingUnixStreamServer] = None
+        self.stats = {'requests': 0, 'cache_hits': 0, 'coalesced': 0, 'upstream': 0, 'errors': 0}
+
+    @staticmethod
+    def _build_services() -> Dict[str, Any]:
+        from config import Config
+        from alpaca_client import AlpacaClient
+        services = {}
+        if Config.ALPACA_API_KEY and Config.ALPACA_SECRET_KEY:
+            client = AlpacaClient(Config.ALPACA_API_KEY, Config.ALPACA_SECRET_KEY, Config.ALPACA_BASE_URL,
+                                  verify_connection=False)
+            services['alpaca'] = client
+            services['alpaca.api'] = client.api
+        if Config.MASSIVE_API_KEY:
+            from services.massive_price_feed import MassivePriceFeed
+            from services.polygon_options_feed import MassiveOptionsFeed
+            services['massive_price'] = MassivePriceFeed()
+            services['massive_options'] = MassiveOptionsFeed()
+        return services
+
+    # ========== DISPATCH ==========
+
+    def call(self, service: str, method: str, args: tuple = (), kwargs: Optional[dict] = None) -> Any:
+        """Serve one read call (cache, coalescing, rate limit, upstream)"""
+        kwargs = kwargs or {}
+        target = self.services.get(service)
+        if target is None:
+            raise LookupError(f"Unknown market data service: {service}")
+        if not is_market_data_read(method) or not callable(getattr(target, method, None)):
+            raise PermissionError(f"{service}.{method} is not a daemon market data method")
+
+        key = cache_key(service, method, args, kwargs)
+        ttl = self.ttls.get(method, DEFAULT_TTL)
+        with self._lock:
+            self.stats['requests'] += 1
+            cached = self._cache.get(key)
+            if cached and time.monotonic() - cached[0] < ttl:
+                self.stats['cache_hits'] += 1
+                return cached[1]
+            pending = self._inflight.get(key)
+            if pending is None:
+                pending = self._inflight[key] = Future()
+                owner = True
+            else:
+                self.stats['coalesced'] += 1
+                owner = False
+
+        if not owner:
+            return pending.result()
+
+        try:
+            limiter = self.limiters.get(service.split('.')[0].split('_')[0])
+            if limiter:
+                limiter.acquire()
+            with self._lock:
+                self.stats['upstream'] += 1
+            result = getattr(target, method)(*args, **kwargs)
+        except Exception as e:
+            with self._lock:
+                self.stats['errors'] += 1
+                self._inflight.pop(key, None)
+            pending.set_exception(e)
+            raise
+        with self._lock:
+            self._cache[key] = (time.monotonic(), result)
+            self._inflight.pop(key, None)
+            if len(self._cache) > 5000:
+                self._evict_expired()
+        pending.set_result(result)
+        return result
+
+    def _evict_expired(self):
+        now = time.monotonic()
+        longest = max(self.ttls.values(), default=DEFAULT_TTL)
+        for key, (stored, _) in list(self._cache.items()):
+            if now - stored > longest:
+                del self._cache[key]
+
+    def _handle(self, request: Dict) -> Dict:
+        if request.get('op') == 'ping':
+            return {'ok': True, 'result': dict(self.stats, services=sorted(self.services))}
+        try:
+            result = self.call(request['service'], request['method'], request.get('args', ()), request.get('kwargs'))
+            return {'ok': True, 'result': result}
+        except Exception as e:
+            return {'ok': False, 'error': e if self._picklable(e) else RuntimeError(f"{type(e).__name__}: {e}")}
+
+    @staticmethod
+    def _picklable(value: Any) -> bool:
+        try:
+            pickle.dumps(value)
+            return True
+        except Exception:
+            return False
+
+    # ========== SERVER ==========
+
+    def start(self, background: bool = True):
+        """Bind the socket and serve (in a daemon thread if background)"""
+        daemon = self
+
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(self):
+                while True:
+                    try:
+                        request = _recv(self.request)
+                    except (ConnectionError, struct.error, EOFError):
+                        return
+                    response = daemon._handle(request)
+                    try:
+                        _send(self.request, response)
+                    except (pickle.PicklingError, TypeError, AttributeError) as e:
+                        _send(self.request, {'ok': False, 'error': RuntimeError(f"Unpicklable result: {e}")})
+                    except OSError:
+                        return
+
+        if daemon_available(self.socket_path):
+            raise RuntimeError(f"Market data daemon already running on {self.socket_path}")
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)  # Stale socket from a previous run (nothing answers on it)
+        old_umask = os.umask(0o077)
+        try:
+            self._server = socketserver.ThreadingUnixStreamServer(self.socket_path, Handler)
+        finally:
+            os.umask(old_umask)
+        self._server.daemon_threads = True
+        logger.info(f"Market data daemon listening on {self.socket_path} ({', '.join(sorted(self.services))})")
+        if background:
+            threading.Thread(target=self._server.serve_forever, name="md-daemon", daemon=True).start()
+        else:
+            self._server.serve_forever()
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+# ========== CLIENT ==========
+
+class DaemonConnection:
+    """Thread-safe client connection (one socket per thread)"""
+
+    def __init__(self, socket_path: Optional[str] = None, timeout: float = 30.0):
+        from config import Config
+        self.socket_path = socket_path or Config.MARKET_DATA_SOCKET or default_socket_path()
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _socket(self) -> socket.socket:
+        sock = getattr(self._local, 'sock', None)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+            self._local.sock = sock
+        return sock
+
+    def request(self, payload: Dict) -> Dict:
+        try:
+            sock = self._socket()
+            _send(sock, payload)
+            return _recv(sock)
+        except Exception:
+            self.close()
+            raise
+
+    def call(self, service: str, method: str, args: tuple, kwargs: dict) -> Any:
+        response = self.request({'service': service, 'method': method, 'args': args, 'kwargs': kwargs})
+        if not response['ok']:
+            raise response['error']
+        return response['result']
+
+    def ping(self) -> Optional[Dict]:
+        """Daemon stats, or None if it is not reachable"""
+        try:
+            return self.request({'op': 'ping'})['result']
+        except (OSError, ConnectionError, EOFError):
+            return None
+
+    def close(self):
+        sock = getattr(self._local, 'sock', None)
+        if sock is not None:
+            try:
+                sock.close()
+            except OSError:
+                pass
+            self._local.sock = None
+
+class RemoteService:
+    """
+    Proxy for a local client: market data reads go to the daemon (falling back to
+    the local client if it is unreachable), everything else runs locally
+    """
+
+    def __init__(self, connection: DaemonConnection, service: str, local: Any,
+                 nested: Tuple[str, ...] = ()):
+        object.__setattr__(self, '_connection', connection)
+        object.__setattr__(self, '_service', service)
+        object.__setattr__(self, '_local', local)
+        object.__setattr__(self, '_nested', {name: None for name in nested})
+
+    def __getattr__(self, name: str):
+        local = self._local
+        if name in self._nested:
+            if self._nested[name] is None:
+                self._nested[name] = RemoteService(self._connection, f"{self._service}.{name}", getattr(local, name))
+            return self._nested[name]
+
+        value = getattr(local, name)
+        if not is_market_data_read(name) or not callable(value):
+            return value
+
+        connection, service = self._connection, self._service
+
+        def remote(*args, **kwargs):
+            try:
+                return connection.call(service, name, args, kwargs)
+            except (OSError, ConnectionError, EOFError) as e:
+                logger.warning(f"Market data daemon unavailable for {service}.{name} ({e}); calling upstream directly")
+                return value(*args, **kwargs)
+        return remote
+
+    def __setattr__(self, name: str, value: Any):
+        setattr(self._local, name, value)
+
+def daemon_available(socket_path: Optional[str] = None) -> bool:
+    from config import Config
+    path = socket_path or Config.MARKET_DATA_SOCKET or default_socket_path()
+    return os.path.exists(path) and DaemonConnection(path, timeout=2.0).ping() is not None
+
+def via_daemon(local: Any, service: str, socket_path: Optional[str] = None) -> Any:
+    """
+    Route a client's market data reads through the daemon if it is running
+
+    Args:
+        local: AlpacaClient / MassivePriceFeed / MassiveOptionsFeed instance
+        service: 'alpaca', 'massive_price' or 'massive_options'
+
+    Returns:
+        RemoteService proxy, or `local` unchanged when no daemon is reachable
+    """
+    if local is None or not daemon_available(socket_path):
+        return local
+    nested = ('api',) if service == 'alpaca' else ()
+    return RemoteService(DaemonConnection(socket_path), service, local, nested)
+
+def shared_alpaca_client(*args, **kwargs) -> Any:
+    """AlpacaClient (same arguments) whose market data reads go through the daemon if it is running"""
+    from alpaca_client import AlpacaClient
+    return via_daemon(AlpacaClient(*args, **kwargs), 'alpaca')
+
+def shared_massive_price_feed(*args, **kwargs) -> Any:
+    """MassivePriceFeed whose reads go through the daemon if it is running"""
+    from services.massive_price_feed import MassivePriceFeed
+    return via_daemon(MassivePriceFeed(*args, **kwargs), 'massive_price')
+
+def shared_massive_options_feed(*args, **kwargs) -> Any:
+    """MassiveOptionsFeed whose reads go through the daemon if it is running"""
+    from services.polygon_options_feed import MassiveOptionsFeed
+    return via_daemon(MassiveOptionsFeed(*args, **kwargs), 'massive_options')
+
+def main():
+    import argparse
+    from config import Config
+
+    parser = argparse.ArgumentParser(description="TradeNova market data daemon")
+    parser.add_argument('--socket', default=None, help='Unix socket path')
+    parser.add_argument('--no-stream', action='store_true', help='Do not start websocket quote streams')
+    args = parser.parse_args()
+    logging.basicConfig(level=getattr(logging, Config.LOG_LEVEL, logging.INFO),
+                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    daemon = MarketDataDaemon(socket_path=args.socket)
+    if Config.MARKET_DATA_STREAMING and not args.no_stream and 'alpaca' in daemon.services:
+        from services.market_data_stream import market_data
+        market_data.start_alpaca(Config.TICKERS, Config.ALPACA_API_KEY, Config.ALPACA_SECRET_KEY)
+
+    try:
+        daemon.start(background=False)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.stop()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,378 @@
+"""
+Market Data Stream
+Streaming quotes into a per-symbol last-value cache
+
+Sources push ticks into a shared QuoteCache; readers (AlpacaClient.get_latest_price,
+MassiveOptionsFeed, the trader) take prices from the cache when they are fresh
+and fall back to REST otherwise.
+
+Sources:
+- AlpacaQuoteStream: stock quotes and trades over Alpaca's data websocket
+- MassiveOptionsStream: option quotes over the Massive (Polygon) options websocket
+- ReplaySource: recorded ticks from a JSONL file at a configurable speed (offline / load tests)
+
+TickRecorder writes every cache update to JSONL in the format ReplaySource reads.
+"""
+import json
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class Quote:
+    """Last known quote for a symbol"""
+    symbol: str
+    bid: Optional[float] = None
+    ask: Optional[float] = None
+    last: Optional[float] = None
+    timestamp: Optional[float] = None  # Exchange epoch seconds
+    received_at: float = 0.0           # Local epoch seconds
+
+    @property
+    def price(self) -> Optional[float]:
+        """Mid if both sides are quoted, else last trade"""
+        if self.bid and self.ask and self.ask >= self.bid:
+            return (self.bid + self.ask) / 2
+        return self.last or self.bid or self.ask
+
+class QuoteCache:
+    """Thread-safe last-value cache with age and throughput metrics"""
+
+    def __init__(self, rate_window_seconds: int = 10):
+        """
+        Initialize cache
+
+        Args:
+            rate_window_seconds: Window for the messages/sec rate
+        """
+        self._quotes: Dict[str, Quote] = {}
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[Dict], None]] = []
+
+        self.rate_window_seconds = rate_window_seconds
+        self._counts: deque = deque()  # (epoch second, messages)
+        self.total_messages = 0
+
+    def update(
+        self,
+        symbol: str,
+        bid: Optional[float] = None,
+        ask: Optional[float] = None,
+        price: Optional[float] = None,
+        timestamp: Optional[float] = None
+    ):
+        """Apply a tick (fields left as None keep their previous value)"""
+        now = time.time()
+        with self._lock:
+            quote = self._quotes.get(symbol)
+            if quote is None:
+                quote = self._quotes[symbol] = Quote(symbol)
+            if bid is not None:
+                quote.bid = bid
+            if ask is not None:
+                quote.ask = ask
+            if price is not None:
+                quote.last = price
+            quote.timestamp = timestamp or now
+            quote.received_at = now
+
+            second = int(now)
+            if self._counts and self._counts[-1][0] == second:
+                self._counts[-1][1] += 1
+            else:
+                self._counts.append([second, 1])
+            while self._counts and self._counts[0][0] <= second - self.rate_window_seconds:
+                self._counts.popleft()
+            self.total_messages += 1
+
+        if self._listeners:
+            tick = {'t': quote.timestamp, 'symbol': symbol, 'bid': bid, 'ask': ask, 'price': price}
+            for listener in self._listeners:
+                try:
+                    listener(tick)
+                except Exception as e:
+                    logger.debug(f"Quote listener failed: {e}")
+
+    def add_listener(self, listener: Callable[[Dict], None]):
+        self._listeners.append(listener)
+
+    def get(self, symbol: str) -> Optional[Quote]:
+        with self._lock:
+            return self._quotes.get(symbol)
+
+    def get_price(self, symbol: str, max_age_seconds: Optional[float] = None) -> Optional[float]:
+        """
+        Cached price (None if missing or older than max_age_seconds)
+        """
+        quote = self.get(symbol)
+        if quote is None:
+            return None
+        if max_age_seconds is not None and time.time() - quote.received_at > max_age_seconds:
+            return None
+        return quote.price
+
+    def quote_age(self, symbol: str) -> Optional[float]:
+        """Seconds since the last tick for symbol"""
+        quote = self.get(symbol)
+        return time.time() - quote.received_at if quote else None
+
+    def messages_per_second(self) -> float:
+        """Average message rate over the last full seconds of the window"""
+        with self._lock:
+            current = int(time.time())
+            counted = sum(n for second, n in self._counts if current - self.rate_window_seconds < second < current)
+        return counted / max(1, self.rate_window_seconds - 1)
+
+    def stats(self) -> Dict:
+        """Cache size, message rate and quote ages"""
+        now = time.time()
+        with self._lock:
+            ages = [now - q.received_at for q in self._quotes.values()]
+        return {
+            'symbols': len(ages),
+            'total_messages': self.total_messages,
+            'messages_per_second': self.messages_per_second(),
+            'max_quote_age': max(ages) if ages else None,
+            'median_quote_age': sorted(ages)[len(ages) // 2] if ages else None
+        }
+
+class _ThreadedSource:
+    """Source running on a daemon thread"""
+    name = 'source'
+
+    def __init__(self, cache: QuoteCache):
+        self.cache = cache
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run_safely, name=f"md-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def join(self, timeout: Optional[float] = None):
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _run_safely(self):
+        try:
+            self.run()
+        except Exception as e:
+            logger.error(f"Market data source {self.name} stopped: {e}")
+
+    def run(self):
+        raise NotImplementedError
+
+class AlpacaQuoteStream(_ThreadedSource):
+    """Stock quotes and trades from Alpaca's market data websocket"""
+    name = 'alpaca'
+
+    def __init__(self, cache: QuoteCache, symbols: Iterable[str], api_key: str, secret_key: str, feed: str = 'iex'):
+        super().__init__(cache)
+        self.symbols = list(symbols)
+        self.api_key = api_key
+        self.secret_key = secret_key
+        self.feed = feed
+        self._stream = None
+
+    def run(self):
+        from alpaca_trade_api.stream import Stream
+
+        async def on_quote(q):
+            self.cache.update(q.symbol, bid=float(q.bid_price), ask=float(q.ask_price),
+                              timestamp=q.timestamp.timestamp() if hasattr(q.timestamp, 'timestamp') else None)
+
+        async def on_trade(t):
+            self.cache.update(t.symbol, price=float(t.price),
+                              timestamp=t.timestamp.timestamp() if hasattr(t.timestamp, 'timestamp') else None)
+
+        self._stream = Stream(self.api_key, self.secret_key, data_feed=self.feed)
+        self._stream.subscribe_quotes(on_quote, *self.symbols)
+        self._stream.subscribe_trades(on_trade, *self.symbols)
+        logger.info(f"Alpaca quote stream: {len(self.symbols)} symbols ({self.feed})")
+        self._stream.run()  # Reconnects internally; returns when stopped
+
+    def stop(self):
+        super().stop()
+        if self._stream:
+            try:
+                self._stream.stop()
+            except Exception as e:
+                logger.debug(f"Error stopping Alpaca stream: {e}")
+
+class MassiveOptionsStream(_ThreadedSource):
+    """Option quotes from the Massive (Polygon) options websocket"""
+    name = 'massive-options'
+    URL = 'wss://socket.polygon.io/options'
+
+    def __init__(self, cache: QuoteCache, option_symbols: Iterable[str], api_key: str, reconnect_seconds: float = 5.0):
+        super().__init__(cache)
+        self.option_symbols = list(option_symbols)
+        self.api_key = api_key
+        self.reconnect_seconds = reconnect_seconds
+        self._ws = None
+
+    def subscribe(self, option_symbols: Iterable[str]):
+        """Add contracts (sent immediately if connected)"""
+        new = [s for s in option_symbols if s not in self.option_symbols]
+        self.option_symbols.extend(new)
+        if new and self._ws:
+            self._send_subscribe(new)
+
+    def _send_subscribe(self, symbols: List[str]):
+        params = ','.join(f"Q.O:{s}" for s in symbols)
+        self._ws.send(json.dumps({'action': 'subscribe', 'params': params}))
+
+    def handle_message(self, raw: str):
+        """Apply a websocket payload (list of events)"""
+        for event in json.loads(raw):
+            if event.get('ev') != 'Q':
+                continue
+            symbol = str(event.get('sym', ''))
+            if symbol.startswith('O:'):
+                symbol = symbol[2:]
+            ts = event.get('t')
+            self.cache.update(symbol, bid=event.get('bp'), ask=event.get('ap'),
+                              timestamp=ts / 1000.0 if ts else None)
+
+    def run(self):
+        import websocket  # websocket-client
+
+        while not self._stop.is_set():
+            try:
+                self._ws = websocket.create_connection(self.URL, timeout=10)
+                self._ws.recv()  # Connected status
+                self._ws.send(json.dumps({'action': 'auth', 'params': self.api_key}))
+                self._ws.recv()
+                if self.option_symbols:
+                    self._send_subscribe(self.option_symbols)
+                logger.info(f"Massive options stream: {len(self.option_symbols)} contracts")
+                while not self._stop.is_set():
+                    self.handle_message(self._ws.recv())
+            except Exception as e:
+                if not self._stop.is_set():
+                    logger.warning(f"Massive options stream disconnected: {e}")
+                    self._stop.wait(self.reconnect_seconds)
+            finally:
+                if self._ws:
+                    try:
+                        self._ws.close()
+                    except Exception:
+                        pass
+                    self._ws = None
+
+class ReplaySource(_ThreadedSource):
+    """
+    Recorded ticks from a JSONL file (one {"t", "symbol", "bid", "ask", "price"} per line)
+
+    Args:
+        speed: Playback rate relative to recorded time (0 = as fast as possible)
+        loop: Restart from the beginning when the file ends
+    """
+    name = 'replay'
+
+    def __init__(self, cache: QuoteCache, path: Path, speed: float = 1.0, loop: bool = False):
+        super().__init__(cache)
+        self.path = Path(path)
+        self.speed = speed
+        self.loop = loop
+        self.emitted = 0
+
+    def run(self):
+        while not self._stop.is_set():
+            self._play_once()
+            if not self.loop:
+                break
+
+    def _play_once(self):
+        first_tick = None
+        started = time.monotonic()
+        with open(self.path) as f:
+            for line in f:
+                if self._stop.is_set():
+                    return
+                if not line.strip():
+                    continue
+                tick = json.loads(line)
+                t = float(tick.get('t') or 0)
+                if self.speed > 0:
+                    if first_tick is None:
+                        first_tick = t
+                    delay = (t - first_tick) / self.speed - (time.monotonic() - started)
+                    if delay > 0:
+                        self._stop.wait(delay)
+                self.cache.update(tick['symbol'], bid=tick.get('bid'), ask=tick.get('ask'), price=tick.get('price'))
+                self.emitted += 1
+
+class TickRecorder:
+    """Append cache updates to a JSONL file (ReplaySource format)"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'a')
+        self._lock = threading.Lock()
+
+    def __call__(self, tick: Dict):
+        line = json.dumps({k: v for k, v in tick.items() if v is not None})
+        with self._lock:
+            self._file.write(line + '\n')
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+class MarketDataStream:
+    """Shared quote cache plus its running sources"""
+
+    def __init__(self):
+        self.cache = QuoteCache()
+        self.sources: List[_ThreadedSource] = []
+
+    def add_source(self, source: _ThreadedSource) -> _ThreadedSource:
+        self.sources.append(source)
+        source.start()
+        return source
+
+    def start_alpaca(self, symbols: Iterable[str], api_key: str, secret_key: str, feed: str = 'iex'):
+        return self.add_source(AlpacaQuoteStream(self.cache, symbols, api_key, secret_key, feed))
+
+    def start_massive_options(self, option_symbols: Iterable[str], api_key: str):
+        return self.add_source(MassiveOptionsStream(self.cache, option_symbols, api_key))
+
+    def start_replay(self, path: Path, speed: float = 1.0, loop: bool = False):
+        return self.add_source(ReplaySource(self.cache, path, speed, loop))
+
+    def subscribe_options(self, option_symbols: Iterable[str]):
+        for source in self.sources:
+            if isinstance(source, MassiveOptionsStream):
+                source.subscribe(option_symbols)
+
+    def stop(self):
+        for source in self.sources:
+            source.stop()
+        self.sources = []
+
+    def get_price(self, symbol: str, max_age_seconds: Optional[float] = None) -> Optional[float]:
+        return self.cache.get_price(symbol, max_age_seconds)
+
+    @property
+    def is_streaming(self) -> bool:
+        return bool(self.sources)
+
+    def stats(self) -> Dict:
+        return dict(self.cache.stats(), sources=[s.name for s in self.sources])
+
+# Global instance
+market_data = MarketDataStream()
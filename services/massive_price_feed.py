@@ -12,6 +12,7 @@ import pandas as pd
 import time
 from pathlib import Path
 import json
+from core.live.metrics_registry import instrument_api, record_cache
 
 logger = logging.getLogger(__name__)
 
@@ -118,12 +119,14 @@ class MassivePriceFeed:
             logger.error(f"Error making request to Massive API: {e}")
             return None
     
+    @instrument_api('massive.get_1minute_bars')
     def get_1minute_bars(
         self,
         symbol: str,
         start_date: datetime,
         end_date: datetime,
-        limit: int = 50000
+        limit: int = 50000,
+        use_cache: bool = True
     ) -> pd.DataFrame:
         """
         Get 1-minute bars from Massive API
@@ -133,6 +136,8 @@ class MassivePriceFeed:
             start_date: Start date
             end_date: End date
             limit: Maximum number of bars to return
+            use_cache: Read/write the on-disk cache (disable for intraday polling,
+                where the cache key would pin a partial session)
             
         Returns:
             DataFrame with OHLCV data
@@ -143,10 +148,11 @@ class MassivePriceFeed:
         
         # Check cache first
         cache_key = f"{symbol}_1min_{start_date.date()}_{end_date.date()}"
-        cached = self._load_cache(cache_key)
-        if cached is not None:
-            logger.debug(f"Loaded cached 1-minute bars for {symbol}")
-            return cached
+        if use_cache:
+            cached = self._load_cache(cache_key)
+            if cached is not None:
+                logger.debug(f"Loaded cached 1-minute bars for {symbol}")
+                return cached
         
         all_bars = []
         current_start = start_date
@@ -202,7 +208,8 @@ class MassivePriceFeed:
             df = df.sort_values('timestamp').reset_index(drop=True)
             
             # Cache the result
-            self._save_cache(cache_key, df)
+            if use_cache:
+                self._save_cache(cache_key, df)
             
             logger.info(f"Retrieved {len(df)} 1-minute bars for {symbol} from Massive")
             return df
@@ -213,6 +220,7 @@ class MassivePriceFeed:
             logger.debug(traceback.format_exc())
             return pd.DataFrame()
     
+    @instrument_api('massive.get_daily_bars')
     def get_daily_bars(
         self,
         symbol: str,
@@ -319,9 +327,11 @@ class MassivePriceFeed:
             try:
                 df = pd.read_parquet(cache_file)
                 logger.debug(f"Loaded cached data from {cache_file}")
+                record_cache('price_bars', True)
                 return df
             except Exception as e:
                 logger.debug(f"Error loading cache: {e}")
+        record_cache('price_bars', False)
         return None
     
     def _save_cache(self, cache_key: str, df: pd.DataFrame):
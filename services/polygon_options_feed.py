@@ -12,6 +12,7 @@ import pandas as pd
 import time
 from pathlib import Path
 import json
+from core.live.metrics_registry import instrument_api
 
 logger = logging.getLogger(__name__)
 
@@ -124,6 +125,7 @@ class MassiveOptionsFeed:
             logger.error(f"Massive API request failed: {e}")
             return None
     
+    @instrument_api('massive.get_options_chain')
     def get_options_chain(
         self,
         symbol: str,
@@ -230,7 +232,17 @@ class MassiveOptionsFeed:
             return []
     
     def _get_current_stock_price(self, symbol: str) -> Optional[float]:
-        """Get current stock price from snapshot endpoint"""
+        """Get current stock price (streamed quote if fresh, else snapshot endpoint)"""
+        try:
+            from services.market_data_stream import market_data
+            if market_data.is_streaming:
+                from config import Config
+                cached = market_data.get_price(symbol.upper(), Config.STREAM_QUOTE_MAX_AGE_SECONDS)
+                if cached:
+                    return cached
+        except ImportError:
+            pass
+        
         try:
             endpoint = f"/v3/snapshot/options/{symbol.upper()}"
             data = self._make_request(endpoint, {'limit': 1})
@@ -358,6 +370,7 @@ class MassiveOptionsFeed:
             'timestamp': result.get('t')
         }
     
+    @instrument_api('massive.get_expiration_dates')
     def get_expiration_dates(self, symbol: str) -> List[str]:
         """
         Get available expiration dates for a symbol
@@ -398,6 +411,7 @@ class MassiveOptionsFeed:
         
         return []
     
+    @instrument_api('massive.get_atm_options')
     def get_atm_options(
         self,
         symbol: str,
@@ -0,0 +1,204 @@
+"""
+Daily Returns Panel
+Process-wide panel of aligned daily closes (dates x symbols) for risk components
+
+History for the whole universe is loaded once, persisted to disk for warm
+restarts and extended incrementally each morning. Returns for any horizon are
+served from the same closes with a vectorized shift, so components asking for
+1-, 2- or 3-day returns share one fetch.
+"""
+import logging
+import threading
+from datetime import datetime, timedelta, date
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+class ReturnsPanel:
+    """Shared daily close / returns panel"""
+
+    def __init__(
+        self,
+        alpaca_client=None,
+        history_days: int = 180,
+        cache_path: Optional[Path] = None,
+        refresh_overlap_days: int = 5
+    ):
+        """
+        Initialize returns panel
+
+        Args:
+            alpaca_client: AlpacaClient used to fetch daily bars (can be set later)
+            history_days: Calendar days of history loaded per symbol
+            cache_path: CSV file for persisted closes (default: data/returns_panel/daily_closes.csv)
+            refresh_overlap_days: Days re-fetched on refresh (picks up late corrections)
+        """
+        self.client = alpaca_client
+        self.history_days = history_days
+        self.cache_path = cache_path or Path('data/returns_panel/daily_closes.csv')
+        self.refresh_overlap_days = refresh_overlap_days
+
+        self.closes = pd.DataFrame()
+        self._unavailable: set = set()
+        self._refreshed_on: Optional[date] = None
+        self._lock = threading.RLock()
+        self._loaded_from_disk = False
+
+    def set_client(self, alpaca_client):
+        """Set the client used for fetching (first caller wins)"""
+        if self.client is None:
+            self.client = alpaca_client
+
+    def get_returns(
+        self,
+        symbols: Iterable[str],
+        horizon_days: int = 1,
+        lookback_days: int = 90
+    ) -> Dict[str, pd.Series]:
+        """
+        Horizon returns per symbol over the lookback window
+
+        Args:
+            symbols: Symbols needed (loaded on demand)
+            horizon_days: Return horizon in trading days
+            lookback_days: Calendar days of history (before the horizon shift)
+
+        Returns:
+            Dictionary mapping symbol -> Series of returns (date index)
+        """
+        symbols = list(dict.fromkeys(symbols))
+        closes = self.get_closes(symbols)
+        if closes.empty:
+            return {}
+
+        start = pd.Timestamp(datetime.now().date() - timedelta(days=lookback_days + horizon_days))
+        window = closes.loc[closes.index >= start]
+        returns = window.pct_change(periods=horizon_days, fill_method=None)
+
+        result = {}
+        for symbol in returns.columns:
+            series = returns[symbol].dropna()
+            if len(series) > 0:
+                result[symbol] = series
+        return result
+
+    def get_closes(self, symbols: Iterable[str]) -> pd.DataFrame:
+        """Aligned daily closes for symbols (refreshing / loading as needed)"""
+        symbols = list(dict.fromkeys(symbols))
+        with self._lock:
+            self._load_from_disk()
+            self.refresh()
+            missing = [s for s in symbols if s not in self.closes.columns and s not in self._unavailable]
+            if missing:
+                self._load_symbols(missing)
+            available = [s for s in symbols if s in self.closes.columns]
+            return self.closes[available].copy()
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Extend all loaded symbols to today (once per day unless forced)
+
+        Returns:
+            True if a refresh was performed
+        """
+        today = datetime.now().date()
+        with self._lock:
+            self._load_from_disk()
+            if not force and self._refreshed_on == today:
+                return False
+            self._refreshed_on = today
+            self._unavailable.clear()
+
+            if self.closes.empty:
+                return False
+
+            last_date = self.closes.index.max().date()
+            start = datetime.combine(last_date - timedelta(days=self.refresh_overlap_days), datetime.min.time())
+            updated = self._fetch(list(self.closes.columns), start, datetime.now())
+            if updated:
+                self._merge(updated)
+                self._trim()
+                self._save()
+                logger.info(f"Returns panel refreshed: {len(self.closes.columns)} symbols through {self.closes.index.max().date()}")
+            return True
+
+    def _load_symbols(self, symbols: List[str]):
+        """Fetch full history for symbols not yet in the panel"""
+        end = datetime.now()
+        start = end - timedelta(days=self.history_days)
+        fetched = self._fetch(symbols, start, end)
+        self._unavailable.update(s for s in symbols if s not in fetched)
+        if fetched:
+            self._merge(fetched)
+            self._save()
+            logger.info(f"Returns panel loaded {len(fetched)} symbols ({len(self.closes.columns)} total)")
+
+    def _fetch(self, symbols: List[str], start: datetime, end: datetime) -> Dict[str, pd.Series]:
+        """Daily closes from Alpaca per symbol"""
+        if not self.client:
+            logger.warning("No Alpaca client available for historical data")
+            return {}
+
+        from alpaca_trade_api.rest import TimeFrame
+
+        closes = {}
+        for symbol in symbols:
+            try:
+                df = self.client.get_historical_bars(symbol, TimeFrame.Day, start, end)
+                if df is None or df.empty:
+                    continue
+                column = 'close' if 'close' in df.columns else ('c' if 'c' in df.columns else None)
+                if column is None:
+                    logger.warning(f"No close price column found for {symbol}")
+                    continue
+                index = pd.to_datetime(df.index)
+                if index.tz is not None:
+                    index = index.tz_convert('America/New_York').tz_localize(None)
+                closes[symbol] = pd.Series(df[column].values, index=index.normalize(), dtype=float)
+            except Exception as e:
+                logger.error(f"Error getting daily bars for {symbol}: {e}")
+        return closes
+
+    def _merge(self, closes: Dict[str, pd.Series]):
+        """Merge fetched closes (new values win on overlapping dates)"""
+        update = pd.DataFrame(closes)
+        update = update[~update.index.duplicated(keep='last')]
+        if self.closes.empty:
+            self.closes = update.sort_index()
+        else:
+            self.closes = update.combine_first(self.closes).sort_index()
+
+    def _trim(self):
+        """Drop rows older than the history window"""
+        cutoff = pd.Timestamp(datetime.now().date() - timedelta(days=self.history_days))
+        self.closes = self.closes.loc[self.closes.index >= cutoff]
+
+    def _load_from_disk(self):
+        """Load persisted closes once (warm restart)"""
+        if self._loaded_from_disk:
+            return
+        self._loaded_from_disk = True
+        if not self.cache_path.exists():
+            return
+        try:
+            self.closes = pd.read_csv(self.cache_path, index_col=0, parse_dates=True).sort_index()
+            logger.info(f"Loaded returns panel from {self.cache_path} ({len(self.closes.columns)} symbols)")
+        except Exception as e:
+            logger.warning(f"Could not load returns panel cache: {e}")
+            self.closes = pd.DataFrame()
+
+    def _save(self):
+        """Persist closes"""
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix('.tmp')
+            self.closes.to_csv(tmp_path)
+            tmp_path.replace(self.cache_path)
+        except Exception as e:
+            logger.warning(f"Could not save returns panel cache: {e}")
+
+# Global instance (shared by UVaR, options VaR and other risk components)
+returns_panel = ReturnsPanel()
@@ -0,0 +1,392 @@
+"""
+Trade Ledger
+Local SQLite ledger of Alpaca fills, synced incrementally, with FIFO lot matching
+
+The syncer fetches only orders submitted after a persisted cursor (paginated
+with `after`, oldest first, all timestamps in UTC). Orders still working when
+seen (e.g. GTC limits) are kept in an open_orders table and re-checked on each
+sync, so a fill that arrives long after submission is not missed even though
+the cursor has moved past it. New fills from a sync are applied in filled_at
+order to the symbol's FIFO lots and closed round trips go to an indexed table.
+Dashboards read closed trades and open lots from the ledger instead of
+re-pulling and re-matching the order history.
+"""
+import logging
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PAGE_SIZE = 500  # Alpaca max orders per request
+FILLED_TERMINAL_STATUSES = ('filled', 'canceled', 'cancelled', 'expired')  # May carry (partial) fills
+TERMINAL_STATUSES = FILLED_TERMINAL_STATUSES + ('rejected', 'replaced', 'done_for_day')
+
+def _parse_utc(value: str) -> datetime:
+    """Alpaca ISO timestamp as an aware UTC datetime (naive values are taken as UTC)"""
+    parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    return parsed.replace(tzinfo=timezone.utc) if parsed.tzinfo is None else parsed.astimezone(timezone.utc)
+
+def _status(order: Dict) -> str:
+    return str(order.get('status') or '').lower().replace('orderstatus.', '')
+
+def _is_option(symbol: str) -> bool:
+    return len(symbol) > 10  # Options symbols are longer
+
+def _underlying(symbol: str) -> str:
+    if not _is_option(symbol):
+        return symbol
+    # OCC symbol: root followed by YYMMDD
+    for i, ch in enumerate(symbol):
+        if ch.isdigit():
+            return symbol[:i]
+    return symbol
+
+class TradeLedger:
+    """
+    Incrementally synced fill ledger
+
+    Schema:
+    - fills: one row per filled order (id primary key)
+    - open_lots: FIFO lots per symbol (signed qty: >0 long, <0 short)
+    - closed_trades: matched round trips (indexed by exit_time and symbol)
+    - sync_state: persisted cursor
+    """
+
+    def __init__(
+        self,
+        alpaca_client=None,
+        db_path: Optional[Path] = None,
+        initial_history_days: int = 365,
+        cursor_overlap_minutes: int = 5
+    ):
+        """
+        Initialize trade ledger
+
+        Args:
+            alpaca_client: AlpacaClient used for syncing (can be set later)
+            db_path: SQLite file (defaults to data/trade_ledger.db)
+            initial_history_days: History fetched on the first sync
+            cursor_overlap_minutes: Re-scan window behind the cursor (orders that
+                become visible late); duplicates are skipped by id. Orders that
+                fill later are tracked in open_orders, not by this window
+        """
+        self.client = alpaca_client
+        self.db_path = db_path or Path('data/trade_ledger.db')
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.initial_history_days = initial_history_days
+        self.cursor_overlap = timedelta(minutes=cursor_overlap_minutes)
+
+        self._sync_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.last_sync: Optional[datetime] = None
+
+        self._init_database()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_database(self):
+        """Initialize database schema"""
+        conn = self._connect()
+        conn.executescript('''
+            PRAGMA journal_mode=WAL;
+
+            CREATE TABLE IF NOT EXISTS fills (
+                id TEXT PRIMARY KEY,
+                symbol TEXT NOT NULL,
+                side TEXT NOT NULL,
+                qty REAL NOT NULL,
+                price REAL NOT NULL,
+                submitted_at TEXT,
+                filled_at TEXT
+            );
+
+            CREATE TABLE IF NOT EXISTS open_lots (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                symbol TEXT NOT NULL,
+                order_id TEXT NOT NULL,
+                qty REAL NOT NULL,
+                price REAL NOT NULL,
+                filled_at TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_open_lots_symbol ON open_lots(symbol, id);
+
+            CREATE TABLE IF NOT EXISTS closed_trades (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                symbol TEXT NOT NULL,
+                underlying TEXT,
+                side TEXT NOT NULL,
+                qty REAL NOT NULL,
+                entry_price REAL NOT NULL,
+                exit_price REAL NOT NULL,
+                entry_time TEXT,
+                exit_time TEXT,
+                pnl REAL NOT NULL,
+                pnl_pct REAL NOT NULL,
+                is_option INTEGER NOT NULL,
+                entry_order_id TEXT,
+                exit_order_id TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_closed_exit_time ON closed_trades(exit_time);
+            CREATE INDEX IF NOT EXISTS idx_closed_symbol ON closed_trades(symbol, exit_time);
+
+            CREATE TABLE IF NOT EXISTS open_orders (
+                id TEXT PRIMARY KEY,
+                submitted_at TEXT
+            );
+
+            CREATE TABLE IF NOT EXISTS sync_state (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+        ''')
+        conn.commit()
+        conn.close()
+
+    # ========== SYNC ==========
+
+    def sync(self) -> int:
+        """
+        Fetch orders newer than the cursor and apply new fills
+
+        Returns:
+            Number of new fills applied
+        """
+        if not self.client:
+            logger.debug("No Alpaca client available for trade ledger sync")
+            return 0
+
+        with self._sync_lock:
+            conn = self._connect()
+            try:
+                cursor = self._get_state(conn, 'cursor')
+                if cursor:
+                    after = _parse_utc(cursor) - self.cursor_overlap
+                else:
+                    after = datetime.now(timezone.utc) - timedelta(days=self.initial_history_days)
+
+                fills: Dict[str, Dict] = {}
+                newest = _parse_utc(cursor) if cursor else None
+                while True:
+                    orders = self.client.get_orders(status='all', limit=PAGE_SIZE, after=after.isoformat(),
+                                                    direction='asc')
+                    if not orders:
+                        break
+                    for order in orders:
+                        self._track(conn, order, fills)
+
+                    submitted = [_parse_utc(o['submitted_at']) for o in orders if o.get('submitted_at')]
+                    if submitted:
+                        newest = max(newest, max(submitted)) if newest else max(submitted)
+                    if len(orders) < PAGE_SIZE or not submitted or max(submitted) <= after:
+                        break
+                    after = max(submitted)
+
+                self._resolve_open_orders(conn, fills)
+
+                # One FIFO pass over every new fill, oldest fill first
+                applied = 0
+                for order in sorted(fills.values(), key=lambda o: _parse_utc(o.get('filled_at') or o['submitted_at'])):
+                    if self._apply_fill(conn, order):
+                        applied += 1
+
+                if newest and newest.isoformat() != cursor:
+                    self._set_state(conn, 'cursor', newest.isoformat())
+                conn.commit()
+                self.last_sync = datetime.now()
+                if applied:
+                    logger.info(f"Trade ledger synced {applied} new fills")
+                return applied
+            except Exception as e:
+                conn.rollback()
+                logger.error(f"Error syncing trade ledger: {e}")
+                return 0
+            finally:
+                conn.close()
+
+    def _track(self, conn: sqlite3.Connection, order: Dict, fills: Dict[str, Dict]):
+        """Collect a terminal order's fill, or remember a working order for later syncs"""
+        status = _status(order)
+        if status in TERMINAL_STATUSES:
+            conn.execute('DELETE FROM open_orders WHERE id = ?', (order.get('id'),))
+            if status in FILLED_TERMINAL_STATUSES and order.get('id') and float(order.get('filled_qty') or 0) > 0:
+                fills[order['id']] = order
+        elif order.get('id'):
+            conn.execute('INSERT OR IGNORE INTO open_orders (id, submitted_at) VALUES (?, ?)',
+                         (order['id'], order.get('submitted_at')))
+
+    def _resolve_open_orders(self, conn: sqlite3.Connection, fills: Dict[str, Dict]):
+        """Re-check orders that were still working on an earlier sync"""
+        pending = [row['id'] for row in conn.execute('SELECT id FROM open_orders').fetchall()]
+        if not pending:
+            return
+        still_open = {o.get('id') for o in self.client.get_orders(status='open', limit=PAGE_SIZE)}
+        for order_id in pending:
+            if order_id in still_open or order_id in fills:
+                continue
+            order = self.client.get_order(order_id)
+            if order:
+                self._track(conn, order, fills)
+
+    def _apply_fill(self, conn: sqlite3.Connection, order: Dict) -> bool:
+        """Record a fill once and match it FIFO against the symbol's open lots"""
+        order_id = order.get('id')
+        symbol = order.get('symbol', '')
+        side = order.get('side', '')
+        qty = float(order.get('filled_qty') or 0)
+        price = float(order.get('filled_avg_price') or 0)
+        filled_at = order.get('filled_at') or order.get('submitted_at')
+        if not order_id or qty <= 0 or side not in ('buy', 'sell'):
+            return False
+
+        inserted = conn.execute(
+            'INSERT OR IGNORE INTO fills (id, symbol, side, qty, price, submitted_at, filled_at) VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (order_id, symbol, side, qty, price, order.get('submitted_at'), filled_at)
+        ).rowcount
+        if not inserted:
+            return False  # Already applied (cursor overlap)
+
+        signed = qty if side == 'buy' else -qty
+        multiplier = 100 if _is_option(symbol) else 1  # Options = 100 shares
+
+        # Close opposite-signed lots oldest first
+        lots = conn.execute(
+            'SELECT id, order_id, qty, price, filled_at FROM open_lots WHERE symbol = ? ORDER BY id',
+            (symbol,)
+        ).fetchall()
+        for lot in lots:
+            if abs(signed) < 1e-9 or lot['qty'] * signed > 0:
+                break
+            matched = min(abs(lot['qty']), abs(signed))
+            is_long = lot['qty'] > 0
+            entry_price, exit_price = lot['price'], price
+            pnl = (exit_price - entry_price) * matched * multiplier * (1 if is_long else -1)
+            pnl_pct = ((exit_price - entry_price) / entry_price * 100 * (1 if is_long else -1)) if entry_price > 0 else 0
+
+            conn.execute('''
+                INSERT INTO closed_trades
+                (symbol, underlying, side, qty, entry_price, exit_price, entry_time, exit_time,
+                 pnl, pnl_pct, is_option, entry_order_id, exit_order_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (symbol, _underlying(symbol), 'long' if is_long else 'short', matched, entry_price, exit_price,
+                  lot['filled_at'], filled_at, pnl, pnl_pct, int(_is_option(symbol)), lot['order_id'], order_id))
+
+            remaining = lot['qty'] - matched if is_long else lot['qty'] + matched
+            if abs(remaining) < 1e-9:
+                conn.execute('DELETE FROM open_lots WHERE id = ?', (lot['id'],))
+            else:
+                conn.execute('UPDATE open_lots SET qty = ? WHERE id = ?', (remaining, lot['id']))
+            signed = signed + matched if signed < 0 else signed - matched
+
+        # Remainder opens a new lot
+        if abs(signed) > 1e-9:
+            conn.execute(
+                'INSERT INTO open_lots (symbol, order_id, qty, price, filled_at) VALUES (?, ?, ?, ?, ?)',
+                (symbol, order_id, signed, price, filled_at)
+            )
+        return True
+
+    def start_background_sync(self, interval_seconds: float = 30.0):
+        """Sync on a daemon thread every `interval_seconds` (idempotent)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+
+        def _loop():
+            while not self._stop.is_set():
+                self.sync()
+                self._stop.wait(interval_seconds)
+
+        self._thread = threading.Thread(target=_loop, name="trade-ledger-sync", daemon=True)
+        self._thread.start()
+
+    def stop_background_sync(self):
+        self._stop.set()
+
+    # ========== READS ==========
+
+    def get_closed_trades(
+        self,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        symbol: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Closed round trips, newest exit first
+
+        Args:
+            start: Inclusive ISO lower bound on exit_time
+            end: Exclusive ISO upper bound on exit_time
+            symbol: Filter by symbol
+            limit: Max rows
+        """
+        query = 'SELECT * FROM closed_trades WHERE 1=1'
+        params: List = []
+        if start:
+            query += ' AND exit_time >= ?'
+            params.append(start)
+        if end:
+            query += ' AND exit_time < ?'
+            params.append(end)
+        if symbol:
+            query += ' AND symbol = ?'
+            params.append(symbol)
+        query += ' ORDER BY exit_time DESC, id DESC'
+        if limit:
+            query += ' LIMIT ?'
+            params.append(int(limit))
+
+        conn = self._connect()
+        try:
+            rows = conn.execute(query, params).fetchall()
+        finally:
+            conn.close()
+
+        return [
+            {
+                'symbol': row['symbol'],
+                'underlying': row['underlying'],
+                'entry_time': row['entry_time'],
+                'exit_time': row['exit_time'],
+                'entry_price': row['entry_price'],
+                'exit_price': row['exit_price'],
+                'qty': row['qty'],
+                'side': row['side'],
+                'pnl': row['pnl'],
+                'pnl_pct': row['pnl_pct'],
+                'reason': 'closed_trade',
+                'status': 'CLOSED',
+                'agent': 'Live Trading',
+                'source': 'Live Trading',
+                'is_option': bool(row['is_option']),
+                'order_id': f"{row['entry_order_id']}/{row['exit_order_id']}"
+            }
+            for row in rows
+        ]
+
+    def get_open_lot_entry_times(self) -> Dict[str, str]:
+        """Earliest open-lot fill time per symbol"""
+        conn = self._connect()
+        try:
+            rows = conn.execute('SELECT symbol, MIN(filled_at) AS entry_time FROM open_lots GROUP BY symbol').fetchall()
+        finally:
+            conn.close()
+        return {row['symbol']: row['entry_time'] for row in rows}
+
+    # ========== STATE ==========
+
+    @staticmethod
+    def _get_state(conn: sqlite3.Connection, key: str) -> Optional[str]:
+        row = conn.execute('SELECT value FROM sync_state WHERE key = ?', (key,)).fetchone()
+        return row['value'] if row else None
+
+    @staticmethod
+    def _set_state(conn: sqlite3.Connection, key: str, value: str):
+        conn.execute('INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)', (key, value))
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+Performance Benchmarks - Trading Hot Paths
+Times pricing, features, regime, agents, liquidity filter, UVaR, GEX and one
+full replayed trading cycle on synthetic data of realistic size, writes the
+results to JSON and compares them with a stored baseline.
+
+Usage:
+    python tests/run_benchmarks.py                     # run and compare with baseline
+    python tests/run_benchmarks.py --save-baseline     # run and store as the new baseline
+    python tests/run_benchmarks.py --only gex --repeat 50
+
+Exit code is 1 when any benchmark errors, a baseline benchmark is missing from
+the run, or a median is slower than baseline * (1 + threshold).
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+import json
+import logging
+import platform
+import shutil
+import statistics
+import tempfile
+import time
+from contextlib import ExitStack, contextmanager
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+BASELINE_PATH = Path('data/benchmarks/baseline.json')
+RESULTS_PATH = Path('data/benchmarks/latest.json')
+DEFAULT_THRESHOLD = 0.25  # 25% slower than baseline fails
+
+# Synthetic data sizes (roughly a liquid single-name chain and a year of daily bars)
+N_BARS = 250
+N_EXPIRATIONS = 12
+N_STRIKES = 60
+N_POSITIONS = 25
+N_SCENARIOS = 90
+
+# ========== SYNTHETIC DATA ==========
+
+def make_bars(n: int = N_BARS, seed: int = 1, end: Optional[datetime] = None) -> pd.DataFrame:
+    """Daily OHLCV bars (random walk) ending at `end` (default: now, UTC)"""
+    rng = np.random.default_rng(seed)
+    end = end or datetime.now(timezone.utc).replace(tzinfo=None)
+    index = pd.date_range(end=end, periods=n, freq='D')
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0005, 0.015, n)))
+    spread = close * rng.uniform(0.002, 0.02, n)
+    return pd.DataFrame({
+        'open': close * (1 + rng.normal(0, 0.003, n)),
+        'high': close + spread,
+        'low': close - spread,
+        'close': close,
+        'volume': rng.integers(1_000_000, 50_000_000, n).astype(float),
+    }, index=index)
+
+def make_chain(spot: float = 100.0, seed: int = 2) -> List[Dict]:
+    """Options chain with quotes, OI and Greeks (N_EXPIRATIONS x N_STRIKES x call/put)"""
+    rng = np.random.default_rng(seed)
+    now = datetime.now()
+    quote_time = now.isoformat()
+    chain = []
+    strikes = np.round(np.linspace(spot * 0.7, spot * 1.3, N_STRIKES), 1)
+    for e in range(N_EXPIRATIONS):
+        expiration = (now.date() + timedelta(days=7 * (e + 1))).isoformat()
+        for strike in strikes:
+            for option_type in ('call', 'put'):
+                mid = max(0.05, abs(spot - strike) * 0.1 + rng.uniform(0.1, 5.0))
+                half_spread = mid * rng.uniform(0.01, 0.3)
+                chain.append({
+                    'symbol': f"XYZ{expiration.replace('-', '')[2:]}{option_type[0].upper()}{int(strike * 1000):08d}",
+                    'strike_price': float(strike),
+                    'type': option_type,
+                    'expiration_date': expiration,
+                    'bid': mid - half_spread,
+                    'ask': mid + half_spread,
+                    'bid_size': int(rng.integers(0, 100)),
+                    'ask_size': int(rng.integers(0, 100)),
+                    'quote_time': quote_time,
+                    'open_interest': int(rng.integers(0, 20000)),
+                    'gamma': float(rng.uniform(0.001, 0.08)),
+                    'volume': int(rng.integers(0, 5000)),
+                })
+    return chain
+
+# ========== BENCHMARKS ==========
+# Each setup function builds its inputs once and returns the callable to time
+# (or a context manager yielding it, which is closed once timing is done).
+
+def bench_black_scholes() -> Callable:
+    from core.pricing.black_scholes import BlackScholes
+    bs = BlackScholes()
+    rng = np.random.default_rng(3)
+    cases = [(100.0, float(k), float(t), float(v), 'call' if i % 2 else 'put')
+             for i, (k, t, v) in enumerate(zip(rng.uniform(70, 130, 500), rng.uniform(0.01, 1.0, 500),
+                                                rng.uniform(0.1, 0.8, 500)))]
+    return lambda: [bs.calculate(*case) for case in cases]
+
+def bench_implied_volatility() -> Callable:
+    from core.pricing.black_scholes import BlackScholes
+    bs = BlackScholes()
+    rng = np.random.default_rng(4)
+    cases = []
+    for k, t, v in zip(rng.uniform(80, 120, 200), rng.uniform(0.02, 1.0, 200), rng.uniform(0.15, 0.6, 200)):
+        price = bs.calculate(100.0, float(k), float(t), float(v), 'call')['price']
+        cases.append((price, 100.0, float(k), float(t), 'call'))
+    return lambda: [bs.calculate_implied_volatility(*case) for case in cases]
+
+def bench_features() -> Callable:
+    from core.features.indicators import FeatureEngine
+    engine, bars = FeatureEngine(), make_bars()
+    return lambda: engine.calculate_all_features(bars)
+
+def bench_regime() -> Callable:
+    from core.features.indicators import FeatureEngine
+    from core.regime.classifier import RegimeClassifier
+    features = FeatureEngine().calculate_all_features(make_bars())
+    classifier = RegimeClassifier()
+    return lambda: classifier.classify(features)
+
+def bench_orchestrator() -> Callable:
+    from config import Config
+    from core.multi_agent_orchestrator import MultiAgentOrchestrator
+    orchestrator = MultiAgentOrchestrator(SimpleNamespace(api=None, ALPACA_BASE_URL=''))
+    symbol = next(s for s in Config.TICKERS if s != 'SPY')
+    bars = make_bars()
+    return lambda: orchestrator.analyze_symbol(symbol, bars)
+
+def bench_universe_filter() -> Callable:
+    from core.live.option_universe_filter import OptionUniverseFilter
+    universe_filter, chain = OptionUniverseFilter(), make_chain()
+    now = datetime.now()
+    return lambda: universe_filter.filter_options_chain(chain, current_time=now)
+
+def bench_uvar() -> Callable:
+    from core.risk.uvar_calculator import UVaRCalculator
+    rng = np.random.default_rng(5)
+    dates = pd.bdate_range(end=datetime.now().date(), periods=N_SCENARIOS)
+    symbols = [f"S{i:02d}" for i in range(N_POSITIONS)]
+    returns = {s: pd.Series(rng.normal(0, 0.02, N_SCENARIOS), index=dates) for s in symbols}
+
+    class SyntheticUVaR(UVaRCalculator):
+        def _get_historical_returns(self, symbols, horizon_days):
+            return {s: returns[s] for s in symbols if s in returns}
+
+    calc = SyntheticUVaR(alpaca_client=None)
+    positions = [{'symbol': s, 'qty': int(rng.integers(-50, 50)) or 1, 'entry_price': 100.0,
+                  'current_price': float(rng.uniform(50, 150))} for s in symbols]
+
+    def run():
+        calc._baseline = calc._baseline_key = None  # Time the full calculation, not the cache hit
+        calc._scenario_frames.clear()
+        calc._scenario_matrices.clear()
+        return calc.calculate_uvar(positions)
+    return run
+
+def bench_gex() -> Callable:
+    from services.gex_calculator import GEXCalculator
+    calc, chain = GEXCalculator(), make_chain()
+    return lambda: calc.calculate_gex_proxy(chain, 100.0)  # No symbol: bypasses the snapshot cache
+
+@contextmanager
+def bench_trading_cycle():
+    """One dry-run IntegratedTrader cycle replayed from a synthetic session archive"""
+    from config import Config
+    from core.live.session_replay import SessionArchive, SessionReplayer, call_key
+
+    archive = SessionArchive()
+    archive.attributes[('alpaca', 'ALPACA_BASE_URL')] = 'https://paper-api.alpaca.markets'
+    archive.record('alpaca', 'get_account', call_key((), {}),
+                   result={'equity': '100000', 'cash': '100000', 'buying_power': '200000'})
+    archive.record('alpaca', 'get_positions', call_key((), {}), result=[])
+    archive.record('alpaca', 'is_market_open', call_key((), {}), result=True)
+    archive.record('massive_price', 'is_available', call_key((), {}), result=True)
+    for i, symbol in enumerate(Config.TICKERS):
+        bars = make_bars(60, seed=10 + i)
+        archive.record('massive_price', 'get_daily_bars',
+                       call_key((symbol, datetime.now(), datetime.now()), {'use_1min_aggregation': True}),
+                       result=bars)
+        archive.record('alpaca', 'get_latest_price', call_key((symbol,), {}), result=float(bars['close'].iloc[-1]))
+    path = Path(tempfile.mkdtemp()) / 'bench_session.pkl.gz'
+    archive.save(path)
+
+    try:
+        with SessionReplayer(path, speed=0):
+            from core.live.integrated_trader import IntegratedTrader
+            trader = IntegratedTrader(use_rl=False, dry_run=True, paper_trading=True)
+            yield trader.run_trading_cycle
+    finally:
+        shutil.rmtree(path.parent, ignore_errors=True)
+
+BENCHMARKS: Dict[str, Callable] = {
+    'black_scholes_calculate_x500': bench_black_scholes,
+    'black_scholes_iv_solve_x200': bench_implied_volatility,
+    'feature_engine_250_bars': bench_features,
+    'regime_classify': bench_regime,
+    'orchestrator_analyze_symbol': bench_orchestrator,
+    'option_universe_filter_chain': bench_universe_filter,
+    'uvar_25_positions': bench_uvar,
+    'gex_chain': bench_gex,
+    'trading_cycle_replayed': bench_trading_cycle,
+}
+
+# ========== RUNNER ==========
+
+def time_benchmark(fn: Callable, repeat: int, warmup: int = 1) -> Dict:
+    """Run fn warmup + repeat times; return timing statistics in milliseconds"""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        'median_ms': statistics.median(samples),
+        'p95_ms': samples[min(len(samples) - 1, int(0.95 * len(samples)))],
+        'min_ms': samples[0],
+        'runs': repeat,
+    }
+
+def run_benchmarks(names: List[str], repeat: int) -> Dict:
+    results = {}
+    for name in names:
+        try:
+            with ExitStack() as stack:
+                fn = BENCHMARKS[name]()
+                if hasattr(fn, '__enter__'):
+                    fn = stack.enter_context(fn)
+                results[name] = time_benchmark(fn, repeat)
+            print(f"  {name:<34} median {results[name]['median_ms']:9.3f} ms   p95 {results[name]['p95_ms']:9.3f} ms")
+        except Exception as e:
+            print(f"  {name:<34} ERROR: {e}")
+            results[name] = {'error': str(e)}
+    return {
+        'created_at': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'repeat': repeat,
+        'results': results,
+    }
+
+def compare_to_baseline(
+    results: Dict,
+    baseline: Dict,
+    threshold: float = DEFAULT_THRESHOLD,
+    expected: Optional[List[str]] = None
+) -> List[Dict]:
+    """
+    Compare median timings with a baseline
+
+    Args:
+        results: Output of run_benchmarks
+        baseline: Stored run_benchmarks output; may carry per-benchmark
+            'thresholds' overriding the default
+        threshold: Allowed fractional slowdown
+        expected: Benchmarks this run was meant to cover (default: all in the baseline)
+
+    Returns:
+        One row per benchmark: name, baseline_ms, current_ms, change (fraction)
+        and status ('ok', 'faster', 'REGRESSION', 'ERROR' if it failed to run,
+        or 'MISSING' if a baseline benchmark produced no result)
+    """
+    overrides = baseline.get('thresholds', {})
+    previous_results = baseline.get('results', {})
+    rows = []
+    for name, current in results['results'].items():
+        previous = previous_results.get(name)
+        if 'median_ms' not in current:
+            rows.append({'name': name, 'baseline_ms': previous.get('median_ms') if previous else None,
+                         'current_ms': None, 'change': None, 'status': 'ERROR'})
+            continue
+        if not previous or 'median_ms' not in previous:
+            continue
+        change = current['median_ms'] / previous['median_ms'] - 1 if previous['median_ms'] > 0 else 0.0
+        limit = overrides.get(name, threshold)
+        status = 'REGRESSION' if change > limit else 'faster' if change < -limit else 'ok'
+        rows.append({'name': name, 'baseline_ms': previous['median_ms'], 'current_ms': current['median_ms'],
+                     'change': change, 'status': status})
+    for name in (expected if expected is not None else previous_results):
+        if name in previous_results and name not in results['results']:
+            rows.append({'name': name, 'baseline_ms': previous_results[name].get('median_ms'),
+                         'current_ms': None, 'change': None, 'status': 'MISSING'})
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark trading hot paths")
+    parser.add_argument('--only', nargs='*', help='Benchmark names (substring match)')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH)
+    parser.add_argument('--output', type=Path, default=RESULTS_PATH)
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument('--save-baseline', action='store_true', help='Store this run as the baseline')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)  # Benchmarked code logs heavily
+
+    names = [n for n in BENCHMARKS if not args.only or any(o in n for o in args.only)]
+    print("=" * 80)
+    print(f"TRADENOVA BENCHMARKS ({len(names)} benchmarks, {args.repeat} runs each)")
+    print("=" * 80)
+    results = run_benchmarks(names, args.repeat)
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(results, indent=2))
+    print(f"\nResults written to {args.output}")
+
+    if args.save_baseline:
+        if args.baseline.exists():
+            results['thresholds'] = json.loads(args.baseline.read_text()).get('thresholds', {})
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(results, indent=2))
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline} (run with --save-baseline)")
+        errors = [n for n, r in results['results'].items() if 'error' in r]
+        if errors:
+            print(f"\n❌ {len(errors)} benchmark(s) failed: {', '.join(errors)}")
+            return 1
+        return 0
+
+    rows = compare_to_baseline(results, json.loads(args.baseline.read_text()), args.threshold, expected=names)
+    print(f"\n{'Benchmark':<34} {'Baseline':>11} {'Current':>11} {'Change':>8}")
+    fmt_ms = lambda v: f"{v:9.3f}ms" if v is not None else f"{'-':>11}"
+    for row in rows:
+        change = f"{row['change']:+7.1%}" if row['change'] is not None else f"{'-':>7}"
+        print(f"{row['name']:<34} {fmt_ms(row['baseline_ms'])} {fmt_ms(row['current_ms'])} {change}  {row['status']}")
+    failures = [r for r in rows if r['status'] in ('REGRESSION', 'ERROR', 'MISSING')]
+    if failures:
+        print(f"\n❌ {len(failures)} failure(s): regressions beyond threshold, errors or missing benchmarks")
+        return 1
+    print("\n✅ No regressions")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
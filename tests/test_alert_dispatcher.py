@@ -0,0 +1,73 @@
+"""
+Tests for non-blocking alert dispatch
+"""
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.alerts import AlertConfig, AlertDispatcher, AlertLevel, AlertManager, StubChannel
+from core.alerts.dispatcher import Alert
+
+class TestAlertDispatcher(unittest.TestCase):
+    """Test queueing, digests and retry with stub channels"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.patches = [
+            patch('core.alerts.alert_manager.STATE_DIR', self.dir),
+            patch('core.alerts.alert_manager.ALERT_STATE_FILE', self.dir / 'alert_state.json'),
+            patch('core.alerts.alert_manager.ALERT_LOG_FILE', self.dir / 'alerts.log'),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        for p in self.patches:
+            p.stop()
+        self.tmp.cleanup()
+
+    def test_send_returns_before_slow_channel_and_coalesces(self):
+        slow, fast = StubChannel(delay_seconds=0.3), StubChannel()
+        config = AlertConfig(alert_cooldown_minutes=0, alert_digest_window_seconds=0.2)
+        manager = AlertManager(config, channels={'slow': slow, 'fast': fast})
+
+        start = time.perf_counter()
+        for i in range(5):
+            self.assertTrue(manager.send_alert('high_errors', 'High error rate', f'burst {i}', force=True))
+        manager.send_alert('daily_loss', 'Daily loss', 'down 5%', AlertLevel.CRITICAL)
+        self.assertLess(time.perf_counter() - start, 0.1)
+
+        self.assertTrue(manager.flush(timeout=5))
+        manager.close()
+        self.assertEqual([a.alert_type for a in fast.sent], ['high_errors', 'daily_loss'])
+        self.assertEqual(fast.sent[0].count, 5)
+        self.assertIn('burst 4', fast.sent[0].message)
+        self.assertEqual(len(slow.sent), 2)
+        self.assertTrue((self.dir / 'alert_state.json').exists())
+
+    def test_failed_delivery_is_persisted_and_retried(self):
+        retry_file = self.dir / 'retries.json'
+        flaky = StubChannel(fail_times=1)
+        dispatcher = AlertDispatcher({'flaky': flaky}, digest_window_seconds=0.0,
+                                     retry_base_seconds=0.05, retry_file=retry_file)
+        dispatcher.start()
+        dispatcher.submit(Alert('broker_down', 'Broker down', 'no heartbeat'))
+        dispatcher.flush(timeout=5)
+        self.assertTrue(retry_file.exists())
+
+        deadline = time.time() + 5
+        while not flaky.sent and time.time() < deadline:
+            time.sleep(0.05)
+        dispatcher.stop()
+        self.assertEqual(len(flaky.sent), 1)
+        self.assertEqual(flaky.attempts, 2)
+        self.assertEqual(dispatcher.pending_retries(), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+"""
+Tests for the platform backtest job queue (workers, progress, cancellation)
+"""
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tradenova_platform.database.models import Backtest, BacktestJob, Base
+
+# backtest_trading opens logs/backtest.log at import: send it to a temp dir instead
+LOG_DIR = tempfile.mkdtemp()
+
+class TempDirFileHandler(logging.FileHandler):
+    def __init__(self, filename, *args, **kwargs):
+        super().__init__(os.path.join(LOG_DIR, os.path.basename(filename)), *args, **kwargs)
+
+with patch.object(logging, 'FileHandler', TempDirFileHandler):
+    from tradenova_platform import backtest_engine as platform_backtest
+    from tradenova_platform.backtest_engine import BacktestEngine
+
+def tearDownModule():
+    shutil.rmtree(LOG_DIR, ignore_errors=True)
+
+class FakeCoreEngine:
+    steps = 5
+    step_seconds = 0.0
+    fetch_seconds = 0.0  # Data fetch before the loop (no progress callbacks)
+    runs = 0
+
+    def __init__(self, tickers, start_date, end_date, initial_balance):
+        self.initial_balance = initial_balance
+        self.current_balance = initial_balance
+        self.trades = []
+        self.equity_curve = []
+
+    def run_backtest(self, progress_callback=None):
+        FakeCoreEngine.runs += 1
+        time.sleep(self.fetch_seconds)
+        for i in range(self.steps):
+            time.sleep(self.step_seconds)
+            self.current_balance += 10
+            self.equity_curve.append({'timestamp': datetime(2025, 1, i + 1), 'equity': self.current_balance,
+                                      'balance': self.current_balance, 'positions': 0})
+            if progress_callback:
+                progress_callback(i + 1, self.steps)
+        self.trades.append({'symbol': 'SPY', 'pnl': 50.0, 'exit_time': datetime(2025, 1, 5)})
+
+class TestBacktestJobs(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.engine = BacktestEngine(f"sqlite:///{os.path.join(self.tmpdir, 'platform.db')}",
+                                     poll_interval=0.05, progress_interval=0.0)
+        Base.metadata.create_all(self.engine.engine)
+        patcher = patch.object(platform_backtest, 'CoreBacktestEngine', FakeCoreEngine)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        FakeCoreEngine.step_seconds = 0.0
+        FakeCoreEngine.fetch_seconds = 0.0
+        FakeCoreEngine.runs = 0
+
+    def tearDown(self):
+        self.engine.stop_workers()
+        self.engine.engine.dispose()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def wait_for(self, job_id, statuses, timeout=5.0):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            job = self.engine.get_job(job_id)
+            if job['status'] in statuses:
+                return job
+            time.sleep(0.02)
+        self.fail(f"Job {job_id} stuck in {job['status']}")
+
+    def submit(self, user_id=1):
+        return self.engine.submit_backtest(user_id, ['SPY'], datetime(2025, 1, 1), datetime(2025, 2, 1), 1000.0)
+
+    def test_job_runs_in_background_and_stores_results(self):
+        job = self.submit()
+        self.assertEqual(job['status'], 'queued')
+
+        self.engine.start_workers(2)
+        done = self.wait_for(job['job_id'], ('completed', 'failed'))
+
+        self.assertEqual(done['status'], 'completed')
+        self.assertEqual(done['progress'], 1.0)
+        self.assertEqual(done['equity_points'], 5)
+        self.assertEqual(self.engine.get_job(job['job_id'], since=3)['equity_curve'][0]['equity'], 1040.0)
+        self.assertIsNone(self.engine.get_job(job['job_id'], user_id=2))
+
+        db = self.engine.SessionLocal()
+        backtest = db.get(Backtest, done['backtest_id'])
+        self.assertAlmostEqual(backtest.final_balance, 1050.0)
+        self.assertEqual(backtest.win_rate, 100.0)
+        db.close()
+        self.assertEqual(len(self.engine.get_backtest_history(1)), 1)
+
+    def test_cancel_queued_and_running_jobs(self):
+        queued = self.submit()
+        self.assertEqual(self.engine.cancel_job(queued['job_id'], user_id=1)['status'], 'cancelled')
+
+        FakeCoreEngine.step_seconds = 0.2
+        running = self.submit()
+        self.engine.start_workers(1)
+        self.wait_for(running['job_id'], ('running',))
+        self.engine.cancel_job(running['job_id'], user_id=1)
+
+        job = self.wait_for(running['job_id'], ('cancelled', 'completed'))
+        self.assertEqual(job['status'], 'cancelled')
+        self.assertIsNone(job['backtest_id'])
+        self.assertEqual(self.engine.get_job(queued['job_id'])['status'], 'cancelled')
+
+    def test_only_jobs_with_expired_lease_are_requeued(self):
+        stale, live = self.submit(), self.submit()
+        now = datetime.utcnow()
+        self.engine._update_job(stale['job_id'], status='running', worker=f"host:{stale['job_id']}")
+        self.assertEqual(self.engine._record_progress(stale['job_id'], f"host:{stale['job_id']}", 0.5, 0,
+                                                      [{'timestamp': now, 'equity': 1.0, 'balance': 1.0,
+                                                        'positions': 0}]), 1)
+        db = self.engine.SessionLocal()
+        for job_id, heartbeat in ((stale['job_id'], now - timedelta(hours=1)), (live['job_id'], now)):
+            db.query(BacktestJob).filter(BacktestJob.id == job_id).update(
+                {'status': 'running', 'worker': f"host:{job_id}", 'updated_at': heartbeat})
+        db.commit()
+        db.close()
+
+        self.assertEqual(self.engine._requeue_stale(), 1)
+        requeued = self.engine.get_job(stale['job_id'])
+        self.assertEqual(requeued['status'], 'queued')
+        self.assertEqual(requeued['equity_points'], 0)
+        self.assertEqual(self.engine.get_job(live['job_id'])['status'], 'running')
+        # The old worker lost its lease: its late writes are refused
+        self.assertIsNone(self.engine._record_progress(stale['job_id'], f"host:{stale['job_id']}", 0.9, 1, []))
+
+    def test_lease_renewed_during_long_fetch(self):
+        """A fetch longer than the lease keeps the job on its first worker"""
+        self.engine.lease_seconds = 0.3
+        FakeCoreEngine.fetch_seconds = 1.0
+        job = self.submit()
+        self.engine.start_workers(2)
+        done = self.wait_for(job['job_id'], ('completed', 'failed'))
+
+        self.assertEqual(done['status'], 'completed')
+        self.assertEqual(FakeCoreEngine.runs, 1)
+        self.assertEqual(len(self.engine.get_backtest_history(1)), 1)
+
+    def test_results_not_saved_after_lease_lost(self):
+        job = self.submit()
+        self.engine._update_job(job['job_id'], status='running', worker='host:new')
+        core = FakeCoreEngine(['SPY'], None, None, 1000.0)
+        core.run_backtest()
+
+        with self.assertRaises(platform_backtest.LeaseLost):
+            self.engine._save_results(1, ['SPY'], datetime(2025, 1, 1), datetime(2025, 2, 1), 1000.0, core,
+                                      job_id=job['job_id'], worker_id='host:old')
+        self.assertEqual(self.engine.get_backtest_history(1), [])
+        self.assertEqual(self.engine.get_job(job['job_id'])['status'], 'running')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+"""
+Tests for benchmark baseline comparison
+"""
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tests.run_benchmarks import compare_to_baseline, time_benchmark
+
+class TestBenchmarkBaseline(unittest.TestCase):
+    def test_compare_flags_regressions_with_thresholds(self):
+        baseline = {
+            'results': {'a': {'median_ms': 10.0}, 'b': {'median_ms': 10.0}, 'c': {'median_ms': 10.0},
+                        'gone': {'median_ms': 10.0}},
+            'thresholds': {'b': 1.0},
+        }
+        results = {'results': {
+            'a': {'median_ms': 13.0},   # +30% > 25% default
+            'b': {'median_ms': 19.0},   # +90% within its 100% override
+            'c': {'median_ms': 5.0},
+            'new': {'median_ms': 1.0},  # Not in baseline
+            'broken': {'error': 'boom'},
+        }}
+        rows = {r['name']: r['status'] for r in compare_to_baseline(results, baseline)}
+        self.assertEqual(rows, {'a': 'REGRESSION', 'b': 'ok', 'c': 'faster', 'broken': 'ERROR', 'gone': 'MISSING'})
+
+        # Benchmarks left out of a filtered run (--only) are not missing
+        rows = {r['name']: r['status'] for r in compare_to_baseline(results, baseline, expected=['a', 'b', 'c'])}
+        self.assertNotIn('gone', rows)
+
+    def test_time_benchmark_counts_runs(self):
+        calls = []
+        stats = time_benchmark(lambda: calls.append(1), repeat=5, warmup=2)
+        self.assertEqual(len(calls), 7)
+        self.assertEqual(stats['runs'], 5)
+        self.assertLessEqual(stats['min_ms'], stats['median_ms'])
+        self.assertLessEqual(stats['median_ms'], stats['p95_ms'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -140,6 +140,35 @@ class TestBlackScholes(unittest.TestCase):
         rhs = S - K * np.exp(-r * T)
         
         self.assertAlmostEqual(lhs, rhs, delta=0.01)
+    
+    def test_vectorized_price_matches_scalar(self):
+        """Test broadcast pricing against calculate()"""
+        spots = np.array([[90.0], [100.0], [110.0]])
+        strikes = np.array([95.0, 105.0])
+        is_call = np.array([True, False])
+        
+        prices = self.bs.price_vectorized(spots, strikes, 0.05, 0.35, is_call)
+        self.assertEqual(prices.shape, (3, 2))
+        
+        for i, S in enumerate(spots[:, 0]):
+            for j, K in enumerate(strikes):
+                expected = self.bs.calculate(S, K, 0.05, 0.35, 'call' if is_call[j] else 'put')['price']
+                self.assertAlmostEqual(prices[i, j], expected, places=8)
+        
+        # Expired options are worth intrinsic value
+        expired = self.bs.price_vectorized(110.0, 100.0, 0.0, 0.35, np.array([True, False]))
+        np.testing.assert_allclose(expired, [10.0, 0.0])
+    
+    def test_vectorized_greeks_match_scalar(self):
+        """Test broadcast Greeks against calculate()"""
+        strikes = np.array([95.0, 100.0, 105.0])
+        is_call = np.array([True, False, True])
+        greeks = self.bs.greeks_vectorized(100.0, strikes, 0.1, 0.3, is_call, dividend_yield=0.01)
+        
+        for j, K in enumerate(strikes):
+            expected = self.bs.calculate(100.0, K, 0.1, 0.3, 'call' if is_call[j] else 'put', dividend_yield=0.01)
+            for name in ('delta', 'gamma', 'theta', 'vega'):
+                self.assertAlmostEqual(greeks[name][j], expected[name], places=10)
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,66 @@
+"""
+Tests for per-cycle span tracing
+"""
+import json
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.live.cycle_tracer import CycleTracer
+
+class TestCycleTracer(unittest.TestCase):
+    def setUp(self):
+        self.dir = Path(tempfile.mkdtemp())
+        self.tracer = CycleTracer(trace_file=self.dir / 'trace.jsonl', profile_dir=self.dir / 'profiles',
+                                  profile_trigger=self.dir / 'profile_next')
+
+    def test_cycle_tree_and_percentiles(self):
+        @self.tracer.traced('fetch')
+        def fetch():
+            time.sleep(0.002)
+
+        fetch()  # Outside a cycle: not recorded
+        for _ in range(3):
+            with self.tracer.cycle():
+                with self.tracer.span('scan'):
+                    fetch()
+                    fetch()
+                fetch()
+
+        lines = (self.dir / 'trace.jsonl').read_text().splitlines()
+        self.assertEqual(len(lines), 3)
+        tree = json.loads(lines[-1])
+        self.assertEqual(tree['name'], 'cycle')
+        self.assertEqual([c['name'] for c in tree['children']], ['scan', 'fetch'])
+        self.assertEqual(len(tree['children'][0]['children']), 2)
+        self.assertGreaterEqual(tree['ms'], tree['children'][0]['ms'])
+
+        stats = self.tracer.percentiles()
+        self.assertEqual(set(stats), {'cycle', 'cycle/scan', 'cycle/scan/fetch', 'cycle/fetch'})
+        self.assertEqual(stats['cycle/scan/fetch']['count'], 6)
+        self.assertGreaterEqual(stats['cycle/fetch']['p50_ms'], 2.0)
+        self.assertLessEqual(stats['cycle']['p50_ms'], stats['cycle']['p99_ms'])
+
+    def test_profile_on_demand_and_trigger_file(self):
+        with self.tracer.cycle():
+            pass
+        self.assertIsNone(self.tracer.last_profile)
+
+        self.tracer.profile_next_cycle()
+        with self.tracer.cycle():
+            sum(range(1000))
+        self.assertTrue(self.tracer.last_profile.exists())
+
+        first = self.tracer.last_profile
+        (self.dir / 'profile_next').touch()
+        with self.tracer.cycle():
+            pass
+        self.assertNotEqual(self.tracer.last_profile, first)
+        self.assertFalse((self.dir / 'profile_next').exists())
+
+if __name__ == '__main__':
+    unittest.main()
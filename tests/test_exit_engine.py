@@ -0,0 +1,73 @@
+"""
+Tests for the single-pass exit engine
+"""
+import sys
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytz
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.live.exit_engine import ExitEngine
+
+ET = pytz.timezone('America/New_York')
+
+def occ(underlying: str, expiration, strike: float = 100.0, cp: str = 'C') -> str:
+    return f"{underlying}{expiration.strftime('%y%m%d')}{cp}{int(strike * 1000):08d}"
+
+def position(symbol: str, pnl_pct: float, qty: int = 10) -> dict:
+    return {'symbol': symbol, 'qty': qty, 'unrealized_plpc': pnl_pct, 'current_price': 1.0}
+
+class TestExitEngine(unittest.TestCase):
+    """Test rule priority and one order per position"""
+
+    def setUp(self):
+        self.engine = ExitEngine(
+            stop_loss_pct=0.20,
+            tp_levels=[(0.40, 0.50), (0.60, 0.20), (1.00, 0.10)],
+            trailing_tiers=[(1.00, 0.10), (0.80, 0.12), (0.60, 0.15), (0.40, 0.18)],
+            trailing_activation_pct=0.40,
+            dte_exit_rules=[(1, 0.50), (3, 0.20), (5, 0.10)]
+        )
+        self.now = ET.localize(datetime(2026, 10, 14, 14, 30))  # 90 min to close
+        self.today = self.now.date()
+
+    def test_rules_in_one_pass(self):
+        far = self.today + timedelta(days=14)
+        positions = [
+            position(occ('NVDA', self.today), 0.05),                  # 0DTE near close
+            position(occ('AAPL', self.today + timedelta(days=2)), 0.15),  # DTE rule (need 20%)
+            position(occ('TSLA', far), -0.25),                        # Stop-loss
+            position(occ('AMD', far), 0.65),                          # TP2 partial
+            position(occ('MU', far), 0.10),                           # Hold
+            position('SPY', 0.0, qty=-5),                             # Short: ignored
+        ]
+        orders = {o.symbol[:4].rstrip('0123456789'): o for o in self.engine.evaluate(positions, now=self.now)}
+
+        self.assertEqual(orders['NVDA'].rule, '0dte_time')
+        self.assertEqual(orders['AAPL'].rule, 'dte')
+        self.assertEqual(orders['TSLA'].rule, 'stop_loss')
+        self.assertTrue(orders['TSLA'].full_exit)
+        self.assertEqual((orders['AMD'].rule, orders['AMD'].qty, orders['AMD'].full_exit), ('tp2', 2, False))
+        self.assertNotIn('MU', orders)
+        self.assertEqual(len(orders), 4)
+
+    def test_trailing_stop_uses_tracked_peak(self):
+        symbol = occ('META', self.today + timedelta(days=14))
+        self.assertEqual(self.engine.evaluate([position(symbol, 0.90)], now=self.now)[0].rule, 'tp2')
+        self.assertAlmostEqual(self.engine.peak_pnl[symbol], 0.90)
+
+        # Peak 90% allows a 12% pullback (trail at 78%)
+        self.assertEqual(self.engine.evaluate([position(symbol, 0.79)], now=self.now)[0].rule, 'tp2')
+        order = self.engine.evaluate([position(symbol, 0.75)], now=self.now)[0]
+        self.assertEqual((order.rule, order.qty, order.full_exit), ('trailing_stop', 10, True))
+
+        # Peak survives until the exit is actually submitted (a failed sell keeps trailing)
+        self.assertAlmostEqual(self.engine.peak_pnl[symbol], 0.90)
+        self.engine.position_closed(symbol)
+        self.assertNotIn(symbol, self.engine.peak_pnl)
+
+if __name__ == '__main__':
+    unittest.main()
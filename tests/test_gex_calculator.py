@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Tests for the columnar GEX calculator
+"""
+import sys
+import unittest
+from datetime import date, timedelta
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+from services.gex_calculator import GEXCalculator
+
+def make_chain(seed: int = 5) -> list:
+    """Flat-format chain over two expirations"""
+    rng = np.random.default_rng(seed)
+    chain = []
+    for expiration in ('2030-01-18', '2030-02-15'):
+        for strike in np.arange(80.0, 121.0, 5.0):
+            for option_type in ('call', 'put'):
+                chain.append({
+                    'strike_price': strike,
+                    'type': option_type,
+                    'open_interest': int(rng.integers(0, 5000)),
+                    'gamma': float(rng.uniform(0.001, 0.05)),
+                    'expiration_date': expiration
+                })
+    return chain
+
+def brute_force_max_pain(chain: list) -> float:
+    """Reference: total payout at each strike, by loop"""
+    strikes = sorted({c['strike_price'] for c in chain if c['open_interest'] > 0})
+    def payout(price):
+        total = 0.0
+        for c in chain:
+            if c['type'] == 'call':
+                total += max(price - c['strike_price'], 0) * c['open_interest']
+            else:
+                total += max(c['strike_price'] - price, 0) * c['open_interest']
+        return total
+    return min(strikes, key=payout)
+
+class TestGEXCalculator(unittest.TestCase):
+    """Test GEX levels, max pain, gamma flip and caching"""
+
+    def setUp(self):
+        self.calc = GEXCalculator()
+        self.chain = make_chain()
+
+    def test_gex_matches_contract_sum(self):
+        """Per-strike and total GEX equal the per-contract sum"""
+        result = self.calc.calculate_gex_proxy(self.chain, 100.0)
+        expected_call = sum(c['open_interest'] * c['gamma'] * 100.0 * 100 for c in self.chain if c['type'] == 'call')
+        expected_put = -sum(c['open_interest'] * c['gamma'] * 100.0 * 100 for c in self.chain if c['type'] == 'put')
+        self.assertAlmostEqual(result['call_gex'], expected_call, places=4)
+        self.assertAlmostEqual(result['put_gex'], expected_put, places=4)
+        self.assertAlmostEqual(sum(result['gex_levels'].values()), result['total_gex'], places=4)
+
+    def test_max_pain_minimizes_payout(self):
+        """Max pain equals the brute-force payout minimizer (overall and per expiration)"""
+        result = self.calc.calculate_gex_proxy(self.chain, 100.0)
+        self.assertEqual(result['max_pain'], brute_force_max_pain(self.chain))
+        for expiration, max_pain in result['max_pain_by_expiration'].items():
+            subset = [c for c in self.chain if c['expiration_date'] == expiration]
+            self.assertEqual(max_pain, brute_force_max_pain(subset))
+
+    def test_gamma_flip_between_put_and_call_walls(self):
+        """Puts below and calls above spot put the flip between the two walls"""
+        expiration = (date.today() + timedelta(days=30)).isoformat()
+        chain = [
+            {'strike_price': 90.0, 'type': 'put', 'open_interest': 5000, 'implied_volatility': 0.3,
+             'expiration_date': expiration},
+            {'strike_price': 110.0, 'type': 'call', 'open_interest': 5000, 'implied_volatility': 0.3,
+             'expiration_date': expiration},
+        ]
+        result = self.calc.calculate_gex_proxy(chain, 100.0)
+        self.assertLess(result['put_gex'], 0)
+        self.assertGreater(result['call_gex'], 0)
+        self.assertIsNotNone(result['gamma_flip'])
+        self.assertTrue(90.0 < result['gamma_flip'] < 110.0)
+
+    def test_cached_per_snapshot(self):
+        """Same (underlying, snapshot, spot, chain) returns the cached result"""
+        first = self.calc.calculate_gex_proxy(self.chain, 100.0, symbol='SPY', snapshot_time='t0')
+        self.assertIs(self.calc.calculate_gex_proxy(list(self.chain), 100.0, symbol='SPY', snapshot_time='t0'), first)
+        self.assertEqual(self.calc.calculate_gex_proxy(self.chain, 100.0, symbol='SPY', snapshot_time='t1'), first)
+
+    def test_cache_misses_on_new_spot_or_chain(self):
+        """Within one snapshot bucket a different spot or chain is recomputed (e.g. backtest days)"""
+        first = self.calc.calculate_gex_proxy(self.chain, 100.0, symbol='SPY')
+        self.assertIsNot(self.calc.calculate_gex_proxy(self.chain, 101.0, symbol='SPY'), first)
+        self.assertEqual(self.calc.calculate_gex_proxy([], 100.0, symbol='SPY')['total_gex'], 0.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Tests for the intraday minute bar buffer and streaming feature engine
+"""
+import sys
+import unittest
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import pandas as pd
+from core.data.intraday_bar_buffer import MinuteBarBuffer
+from core.features.streaming import StreamingFeatureEngine
+
+def make_bars(n: int, start: str = '2026-01-05 14:30', seed: int = 0) -> pd.DataFrame:
+    """Random-walk 1-minute OHLCV bars"""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.1, n))
+    return pd.DataFrame({
+        'timestamp': pd.date_range(start, periods=n, freq='1min', tz='UTC'),
+        'open': close - 0.02,
+        'high': close + 0.05,
+        'low': close - 0.05,
+        'close': close,
+        'volume': rng.integers(100, 1000, n).astype(float)
+    })
+
+class TestMinuteBarBuffer(unittest.TestCase):
+    """Test ring buffer semantics"""
+
+    def test_wraparound_keeps_latest_bars_in_order(self):
+        """Buffer keeps the newest `capacity` bars in chronological order"""
+        bars = make_bars(25)
+        buffer = MinuteBarBuffer(capacity=10)
+        buffer.append(bars.iloc[:12])
+        buffer.append(bars.iloc[12:])
+
+        frame = buffer.to_frame()
+        self.assertEqual(len(frame), 10)
+        np.testing.assert_allclose(frame['close'].values, bars['close'].values[-10:])
+        self.assertEqual(buffer.last_timestamp, bars['timestamp'].iloc[-1])
+
+    def test_only_new_bars_appended_and_last_bar_revised(self):
+        """Overlapping fetches append nothing old; the forming bar is replaced"""
+        bars = make_bars(5)
+        buffer = MinuteBarBuffer(capacity=10)
+        self.assertEqual(buffer.append(bars), 5)
+
+        revised = bars.iloc[-1:].copy()
+        revised['close'] = 123.0
+        self.assertEqual(buffer.append(pd.concat([bars.iloc[:3], revised])), 0)
+        self.assertEqual(len(buffer), 5)
+        self.assertEqual(buffer.to_frame()['close'].iloc[-1], 123.0)
+
+class TestStreamingFeatureEngine(unittest.TestCase):
+    """Test incremental features"""
+
+    def test_incremental_ema_matches_full_recompute(self):
+        """EMAs carried across appends equal pandas ewm over the whole series"""
+        bars = make_bars(120)
+        buffer = MinuteBarBuffer(capacity=60)
+        engine = StreamingFeatureEngine()
+
+        for end in range(40, 121, 7):
+            buffer.append(bars.iloc[:end])
+            features = engine.update('AAPL', buffer)
+        buffer.append(bars)
+        features = engine.update('AAPL', buffer)
+
+        expected_9 = bars['close'].ewm(span=9, adjust=False).mean().iloc[-1]
+        expected_21 = bars['close'].ewm(span=21, adjust=False).mean().iloc[-1]
+        self.assertAlmostEqual(features['ema_9'], expected_9, places=9)
+        self.assertAlmostEqual(features['ema_21'], expected_21, places=9)
+        self.assertEqual(features['current_price'], bars['close'].iloc[-1])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+"""
+Tests for the tail-following log reader
+"""
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.ui.log_reader import LogTailer, parse_log_line
+
+BASE = datetime(2026, 10, 16, 9, 30, 0)
+
+def log_line(i: int, message: str = None) -> str:
+    ts = (BASE + timedelta(minutes=i)).strftime('%Y-%m-%d %H:%M:%S')
+    return f"{ts},000 - core.live - INFO - {message or f'Trading cycle {i}'}\n"
+
+class TestLogReader(unittest.TestCase):
+    """Test tail, incremental and range reads"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.path = self.dir / 'trading.log'
+        with open(self.path, 'w') as f:
+            for i in range(2000):
+                f.write(log_line(i))
+                if i % 100 == 0:
+                    f.write("Traceback (most recent call last):\n")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_parse_categorizes(self):
+        entry = parse_log_line("2026-10-16 09:30:00,123 - broker - ERROR - Order failed: rejected")
+        self.assertEqual(entry['level'], 'ERROR')
+        self.assertEqual(entry['category'], 'Trade Execution')
+        self.assertEqual(entry['timestamp'].microsecond, 123000)
+        self.assertIsNone(parse_log_line("not a log line"))
+
+    def test_tail_then_incremental(self):
+        tailer = LogTailer(self.path, max_entries=50, index_dir=self.dir / 'index')
+        tailer.poll()
+        entries = tailer.recent()
+        self.assertEqual(entries[-1]['message'], 'Trading cycle 1999')
+        self.assertGreaterEqual(len(entries), 48)
+
+        # Partial line is held until its newline arrives
+        with open(self.path, 'a') as f:
+            f.write(log_line(2000, 'Trade executed: SPY')[:30])
+        self.assertEqual(tailer.poll(), 0)
+        with open(self.path, 'a') as f:
+            f.write(log_line(2000, 'Trade executed: SPY')[30:])
+        self.assertEqual(tailer.poll(), 1)
+        self.assertEqual(tailer.recent()[-1]['category'], 'Trade Execution')
+
+        # Truncation restarts from the tail
+        with open(self.path, 'w') as f:
+            f.write(log_line(0, 'Restarted'))
+        tailer.poll()
+        self.assertEqual([e['message'] for e in tailer.recent()], ['Restarted'])
+
+    def test_range_uses_persisted_index(self):
+        tailer = LogTailer(self.path, index_dir=self.dir / 'index', index_interval=4096)
+        entries = tailer.read_range(BASE + timedelta(minutes=1500), BASE + timedelta(minutes=1510))
+        self.assertEqual([e['message'] for e in entries], [f'Trading cycle {i}' for i in range(1500, 1510)])
+        self.assertGreater(len(tailer._index), 10)
+
+        reloaded = LogTailer(self.path, index_dir=self.dir / 'index', index_interval=4096)
+        self.assertEqual(reloaded._index, tailer._index)
+        self.assertEqual(len(reloaded.read_range(BASE + timedelta(minutes=1998))), 2)
+
+    def test_range_limit_keeps_newest(self):
+        tailer = LogTailer(self.path, index_dir=self.dir / 'index', index_interval=4096)
+        entries = tailer.read_range(BASE + timedelta(minutes=1000), limit=5)
+        self.assertEqual([e['message'] for e in entries], [f'Trading cycle {i}' for i in range(1995, 2000)])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+"""
+Tests for the shared market data daemon (Unix-socket RPC, cache, coalescing)
+"""
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.market_data_daemon import MarketDataDaemon, via_daemon
+
+class FakeFeed:
+    def __init__(self, base_url='https://paper-api.alpaca.markets'):
+        self.base_url = base_url
+        self.calls = 0
+        self.orders = []
+        self.api = self
+
+    def get_latest_price(self, symbol):
+        self.calls += 1
+        time.sleep(0.05)
+        return 100.0 + self.calls
+
+    def list_orders(self, status='open'):
+        return [status]
+
+    def get_account(self):
+        return {'base_url': self.base_url}
+
+    def submit_order(self, symbol, qty):
+        self.orders.append((symbol, qty))
+        return 'local'
+
+class TestMarketDataDaemon(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.socket_path = str(Path(self.tmpdir) / 'md.sock')
+        self.upstream = FakeFeed(base_url='https://api.alpaca.markets')
+        self.daemon = MarketDataDaemon(
+            services={'alpaca': self.upstream, 'alpaca.api': self.upstream.api},
+            socket_path=self.socket_path,
+            rate_limits={}
+        )
+        self.daemon.start()
+
+    def tearDown(self):
+        self.daemon.stop()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_reads_are_cached_and_coalesced(self):
+        local = FakeFeed()
+        clients = [via_daemon(local, 'alpaca', socket_path=self.socket_path) for _ in range(4)]
+        self.assertIsNot(clients[0], local)
+
+        results = []
+        threads = [threading.Thread(target=lambda c=c: results.append(c.get_latest_price('SPY'))) for c in clients]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(results, [101.0] * 4)
+        self.assertEqual(clients[0].get_latest_price('SPY'), 101.0)  # Within TTL
+        self.assertEqual(self.upstream.calls, 1)
+        self.assertEqual(local.calls, 0)
+        self.assertEqual(clients[0].api.list_orders(status='all'), ['all'])
+
+    def test_writes_stay_local_and_are_refused_by_daemon(self):
+        client = via_daemon(FakeFeed(), 'alpaca', socket_path=self.socket_path)
+        self.assertEqual(client.submit_order('SPY', 1), 'local')
+        self.assertEqual(self.upstream.orders, [])
+        with self.assertRaises(PermissionError):
+            self.daemon.call('alpaca', 'submit_order', ('SPY', 1))
+
+    def test_account_reads_use_callers_account(self):
+        """A paper caller next to a live-configured daemon reads its own account"""
+        client = via_daemon(FakeFeed(), 'alpaca', socket_path=self.socket_path)
+        self.assertEqual(client.get_account(), {'base_url': 'https://paper-api.alpaca.markets'})
+        self.assertEqual(client.api.get_account(), {'base_url': 'https://paper-api.alpaca.markets'})
+        self.assertEqual(client.get_latest_price('SPY'), 101.0)  # Market data still shared
+        with self.assertRaises(PermissionError):
+            self.daemon.call('alpaca', 'get_account')
+
+    def test_second_daemon_refuses_live_socket(self):
+        other = MarketDataDaemon(services={}, socket_path=self.socket_path, rate_limits={})
+        with self.assertRaises(RuntimeError):
+            other.start()
+        client = via_daemon(FakeFeed(), 'alpaca', socket_path=self.socket_path)
+        self.assertEqual(client.get_latest_price('SPY'), 101.0)  # First daemon still serving
+
+    def test_falls_back_to_local_without_daemon(self):
+        self.daemon.stop()
+        local = FakeFeed()
+        self.assertIs(via_daemon(local, 'alpaca', socket_path=self.socket_path), local)
+
+if __name__ == '__main__':
+    unittest.main()
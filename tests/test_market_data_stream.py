@@ -0,0 +1,61 @@
+"""
+Tests for the streaming quote cache and replay source
+"""
+import json
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.market_data_stream import MassiveOptionsStream, QuoteCache, ReplaySource, TickRecorder
+
+class TestMarketDataStream(unittest.TestCase):
+    """Test cache semantics, replay timing and recording"""
+
+    def test_cache_prices_and_age(self):
+        cache = QuoteCache()
+        cache.update('AAPL', price=200.0)
+        self.assertEqual(cache.get_price('AAPL'), 200.0)
+        cache.update('AAPL', bid=199.9, ask=200.1)
+        self.assertAlmostEqual(cache.get_price('AAPL'), 200.0)
+        self.assertIsNone(cache.get_price('MSFT'))
+
+        cache.get('AAPL').received_at -= 10
+        self.assertIsNone(cache.get_price('AAPL', max_age_seconds=5))
+        self.assertGreater(cache.quote_age('AAPL'), 9)
+
+        # Massive option quote payloads
+        stream = MassiveOptionsStream(cache, [], api_key='')
+        stream.handle_message(json.dumps([{'ev': 'Q', 'sym': 'O:SPY261120C00600000', 'bp': 1.1, 'ap': 1.3, 't': 1_790_000_000_000},
+                                          {'ev': 'status', 'message': 'ok'}]))
+        self.assertAlmostEqual(cache.get_price('SPY261120C00600000'), 1.2)
+        self.assertEqual(cache.stats()['symbols'], 2)
+
+    def test_replay_speed_and_recording(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            recorded = Path(tmp) / 'ticks.jsonl'
+            source_cache = QuoteCache()
+            recorder = TickRecorder(recorded)
+            source_cache.add_listener(recorder)
+            for i in range(50):
+                source_cache.update('NVDA', price=100.0 + i, timestamp=1_000.0 + i * 0.1)  # 5s of ticks
+            recorder.close()
+
+            cache = QuoteCache()
+            replay = ReplaySource(cache, recorded, speed=50.0)  # ~0.1s
+            start = time.perf_counter()
+            replay.start()
+            replay.join(timeout=5)
+            elapsed = time.perf_counter() - start
+
+            self.assertEqual(replay.emitted, 50)
+            self.assertEqual(cache.get_price('NVDA'), 149.0)
+            self.assertGreater(elapsed, 0.05)
+            self.assertLess(elapsed, 2.0)
+            self.assertEqual(cache.total_messages, 50)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming metrics accumulator
+"""
+import sys
+import unittest
+from datetime import date, timedelta
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+from logs.metrics_accumulator import MetricsAccumulator
+
+def batch_metrics(pnls: list) -> dict:
+    """Reference: the original full recompute in calculate_metrics"""
+    wins = [p for p in pnls if p > 0]
+    losses = [p for p in pnls if p < 0]
+    returns = np.array(pnls)
+    sharpe = np.mean(returns) / np.std(returns) * np.sqrt(252) if len(pnls) > 1 and np.std(returns) > 0 else 0.0
+    cumulative = np.cumsum(pnls)
+    return {
+        'total_trades': len(pnls),
+        'win_rate': len(wins) / len(pnls),
+        'total_pnl': sum(pnls),
+        'sharpe_ratio': sharpe,
+        'max_drawdown': abs(np.min(cumulative - np.maximum.accumulate(cumulative))),
+        'avg_win': np.mean(wins) if wins else 0.0,
+        'avg_loss': np.mean(losses) if losses else 0.0
+    }
+
+class TestMetricsAccumulator(unittest.TestCase):
+    """Test day-bucketed metrics against a batch recompute"""
+
+    def setUp(self):
+        rng = np.random.default_rng(21)
+        self.today = date(2026, 3, 31)
+        self.trades = []
+        for offset in range(40, -1, -1):
+            for pnl in rng.normal(5, 60, rng.integers(0, 6)):
+                self.trades.append((self.today - timedelta(days=offset), float(pnl), f"Agent{rng.integers(3)}"))
+        self.acc = MetricsAccumulator()
+        for trade_date, pnl, agent in self.trades:
+            self.acc.add_trade(pnl, trade_date, agent)
+
+    def test_windows_match_batch(self):
+        """1/7/30-day windows and lifetime equal the batch formulas"""
+        for lookback in (1, 7, 30):
+            cutoff = self.today - timedelta(days=lookback)
+            pnls = [p for d, p, _ in self.trades if d >= cutoff]
+            metrics = self.acc.window(lookback, today=self.today).to_metrics()
+            for key, expected in batch_metrics(pnls).items():
+                self.assertAlmostEqual(metrics[key], expected, places=6, msg=f"{key} ({lookback}d)")
+
+        lifetime = self.acc.lifetime.to_metrics()
+        self.assertAlmostEqual(lifetime['max_drawdown'], batch_metrics([p for _, p, _ in self.trades])['max_drawdown'])
+
+    def test_agent_stats(self):
+        """Per-agent counters equal a grouped recount"""
+        performance = self.acc.agent_performance()
+        for agent, stats in performance.items():
+            pnls = [p for _, p, a in self.trades if a == agent]
+            self.assertEqual(stats['trades'], len(pnls))
+            self.assertEqual(stats['wins'], sum(p > 0 for p in pnls))
+            self.assertAlmostEqual(stats['total_pnl'], sum(pnls))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+"""
+Tests for the metrics registry, HTTP endpoint and heartbeat
+"""
+import json
+import sys
+import tempfile
+import unittest
+import urllib.request
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.live.metrics_registry import (
+    API_CALLS, API_ERRORS, Heartbeat, MetricsRegistry, MetricsServer, instrument_api, read_heartbeat
+)
+
+class TestMetricsRegistry(unittest.TestCase):
+    def test_text_exposition(self):
+        registry = MetricsRegistry(prefix='t_')
+        registry.counter('calls_total', 'Calls').inc(endpoint='a')
+        registry.counter('calls_total').inc(2, endpoint='a')
+        registry.gauge('positions', 'Open').set(3)
+        latency = registry.histogram('latency_seconds', 'Latency', buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 5.0):
+            latency.observe(value)
+
+        text = registry.render_text()
+        self.assertIn('t_calls_total{endpoint="a"} 3', text)
+        self.assertIn('t_positions 3', text)
+        self.assertIn('t_latency_seconds_bucket{le="0.1"} 2', text)
+        self.assertIn('t_latency_seconds_bucket{le="1"} 3', text)
+        self.assertIn('t_latency_seconds_bucket{le="+Inf"} 4', text)
+        self.assertIn('t_latency_seconds_count 4', text)
+        with self.assertRaises(ValueError):
+            registry.gauge('calls_total')
+
+    def test_instrument_api_counts_calls_and_errors(self):
+        @instrument_api('test.endpoint')
+        def call(fail=False):
+            if fail:
+                raise ConnectionError('down')
+            return 1
+
+        calls, errors = API_CALLS.value(endpoint='test.endpoint'), API_ERRORS.value(endpoint='test.endpoint')
+        call()
+        with self.assertRaises(ConnectionError):
+            call(fail=True)
+        self.assertEqual(API_CALLS.value(endpoint='test.endpoint'), calls + 2)
+        self.assertEqual(API_ERRORS.value(endpoint='test.endpoint'), errors + 1)
+
+    def test_heartbeat_and_http_endpoint(self):
+        path = Path(tempfile.mkdtemp()) / 'heartbeat'
+        self.assertIsNone(read_heartbeat(path))
+        heartbeat = Heartbeat(path, snapshot=lambda: {'pid': 42, 'last_cycle_at': 1.5})
+        heartbeat.beat()
+        heartbeat.beat({'pid': 42, 'last_cycle_at': 2.5})
+        beat = read_heartbeat(path)
+        self.assertEqual(beat['pid'], 42)
+        self.assertEqual(beat['last_cycle_at'], 2.5)
+        self.assertLess(beat['age_seconds'], 5)
+
+        registry = MetricsRegistry(prefix='h_')
+        registry.counter('hits_total').inc()
+        server = MetricsServer(registry, port=0)
+        self.assertTrue(server.start())
+        try:
+            base = f"http://127.0.0.1:{server.port}"
+            text = urllib.request.urlopen(f"{base}/metrics", timeout=5).read().decode()
+            self.assertIn('h_hits_total 1', text)
+            health = json.loads(urllib.request.urlopen(f"{base}/health", timeout=5).read())
+            self.assertIn('pid', health)
+        finally:
+            server.stop()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Tests for the exported NumPy RL policy runtime
+"""
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+from rl.numpy_policy import NumpyAgent, NumpyPolicy
+
+try:
+    import stable_baselines3  # noqa: F401
+    SB3_AVAILABLE = True
+except ImportError:
+    SB3_AVAILABLE = False
+
+CHECKPOINT = Path(__file__).parent.parent / 'models' / 'grpo_checkpoints' / 'grpo_trading_100000_steps.zip'
+
+def make_policy(seed: int = 0) -> NumpyPolicy:
+    """Random 48 -> 8 -> 8 -> 1 tanh policy"""
+    rng = np.random.default_rng(seed)
+    return NumpyPolicy(
+        weights=[rng.normal(size=(8, 48)), rng.normal(size=(8, 8))],
+        biases=[rng.normal(size=8), rng.normal(size=8)],
+        activations=['tanh', 'tanh'],
+        action_weight=rng.normal(size=(1, 8)),
+        action_bias=rng.normal(size=1),
+        log_std=np.zeros(1),
+        action_low=np.array([-1.0]),
+        action_high=np.array([1.0])
+    )
+
+class TestNumpyPolicy(unittest.TestCase):
+    """Test NumPy policy runtime"""
+
+    def test_single_and_batch_shapes(self):
+        """Single observations return (action_dim,), batches (n, action_dim)"""
+        policy = make_policy()
+        obs = np.random.default_rng(1).normal(size=(5, 48)).astype(np.float32)
+
+        single, state = policy.predict(obs[0], deterministic=True)
+        batch, _ = policy.predict(obs, deterministic=True)
+
+        self.assertIsNone(state)
+        self.assertEqual(single.shape, (1,))
+        self.assertEqual(batch.shape, (5, 1))
+        np.testing.assert_allclose(single, batch[0], atol=1e-6)
+        self.assertTrue(np.all(np.abs(batch) <= 1.0))
+
+    def test_batch_smoothing_matches_sequential(self):
+        """GRPO EMA smoothing over a batch equals one predict() per row"""
+        obs = np.random.default_rng(2).normal(size=(6, 48)).astype(np.float32) * 0.1
+        sequential = NumpyAgent(make_policy(), apply_smoothing=True)
+        batched = NumpyAgent(make_policy(), apply_smoothing=True)
+
+        expected = [float(np.asarray(sequential.predict(o, deterministic=True)[0]).reshape(-1)[0]) for o in obs]
+        actual = batched.predict_batch(obs, deterministic=True)[:, 0]
+
+        np.testing.assert_allclose(actual, expected, atol=1e-5)
+
+    @unittest.skipUnless(SB3_AVAILABLE and CHECKPOINT.exists(), "stable-baselines3 or checkpoint not available")
+    def test_export_matches_sb3(self):
+        """Exported policy gives the same deterministic actions as PPO.predict"""
+        from stable_baselines3 import PPO
+        from rl.export_policy import export_policy
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = export_policy(str(CHECKPOINT), str(Path(tmp) / 'policy.npz'), verify=False)
+            policy = NumpyPolicy.load(path)
+
+        model = PPO.load(str(CHECKPOINT), device='cpu')
+        obs = np.random.default_rng(3).normal(size=(64, 48)).astype(np.float32) * 0.2
+        expected, _ = model.predict(obs, deterministic=True)
+        actual, _ = policy.predict(obs, deterministic=True)
+
+        np.testing.assert_allclose(actual, expected, atol=1e-5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Tests for incremental portfolio Greeks tracking in OptionsRiskManager
+"""
+import sys
+import unittest
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+from config import Config
+from core.risk.options_risk_manager import OptionsRiskManager, PortfolioGreeks, PositionGreeks
+
+def make_position(symbol: str, delta: float, qty: int, **kwargs) -> PositionGreeks:
+    values = dict(gamma=0.02, theta=-0.05, vega=0.10, dte=30, iv=0.35, underlying_price=150.0)
+    values.update(kwargs)
+    return PositionGreeks(symbol=symbol, delta=delta, qty=qty, **values)
+
+def loop_totals(positions) -> np.ndarray:
+    """Reference: loop over positions"""
+    return np.array([sum(getattr(p, g) * p.qty * 100 for p in positions)
+                     for g in ('delta', 'gamma', 'theta', 'vega')])
+
+class TestPortfolioGreeks(unittest.TestCase):
+    """Test running Greek totals and what-if scoring"""
+
+    def setUp(self):
+        self.orm = OptionsRiskManager()
+        self.positions = [
+            make_position('NVDA271217C00150000', 0.55, 2),
+            make_position('AAPL271217P00190000', -0.40, 1, underlying_price=200.0),
+            make_position('TSLA271217C00300000', 0.30, 1, underlying_price=280.0),
+        ]
+        for position in self.positions:
+            self.orm.update_position_greeks(position)
+
+    def _totals(self) -> np.ndarray:
+        g = self.orm.portfolio_greeks
+        return np.array([g.total_delta, g.total_gamma, g.total_theta, g.total_vega])
+
+    def test_incremental_updates_match_loop(self):
+        """Fills, resizes and exits keep totals equal to a full re-sum"""
+        np.testing.assert_allclose(self._totals(), loop_totals(self.positions))
+
+        self.orm.update_position_greeks(make_position('NVDA271217C00150000', 0.60, 3))
+        self.orm.update_position_qty('AAPL271217P00190000', 4)
+        self.orm.remove_position_greeks('TSLA271217C00300000')
+
+        np.testing.assert_allclose(self._totals(), loop_totals(self.orm.position_greeks.values()))
+        self.assertEqual(self.orm.portfolio_greeks.position_count, 2)
+
+    def test_what_if_matches_single_checks(self):
+        """Vectorized what-if agrees with per-candidate PortfolioGreeks checks"""
+        candidates = [make_position(f'C{i}', delta, qty) for i, (delta, qty) in
+                      enumerate([(0.5, 1), (0.9, 5), (-0.9, 8), (0.1, 20)])]
+        result = self.orm.what_if(candidates, include_position_gamma=False)
+
+        base = self._totals()
+        for i, candidate in enumerate(candidates):
+            new = base + loop_totals([candidate])
+            allowed, violations = PortfolioGreeks(*new.tolist(), 4).is_within_limits()
+            self.assertEqual(bool(result['allowed'][i]), allowed)
+            self.assertEqual(result['violations'][i], violations)
+        self.assertTrue(result['allowed'][0])
+        self.assertFalse(result['allowed'][1])
+
+        allowed, _ = self.orm.check_greeks_limits(candidates[1])
+        self.assertFalse(allowed)
+
+    def test_bulk_reprice_moves_delta_with_spot(self):
+        """Repricing from a higher underlying raises call delta"""
+        before = self.orm.position_greeks['NVDA271217C00150000'].delta
+        repriced = self.orm.reprice_greeks({'NVDA': 170.0, 'AAPL': 200.0, 'TSLA': 280.0})
+        self.assertEqual(repriced, 3)
+        self.assertGreater(self.orm.position_greeks['NVDA271217C00150000'].delta, before)
+        np.testing.assert_allclose(self._totals(), loop_totals(self.orm.position_greeks.values()))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,203 @@
+"""
+Tests for asynchronous order submission and fill tracking
+"""
+import sys
+import threading
+import time
+import unittest
+from collections import deque
+from datetime import date, timedelta
+from pathlib import Path
+from unittest.mock import MagicMock
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.live.order_manager import OrderManager
+
+class FakeClient:
+    """Broker order states keyed by id"""
+
+    api = None
+
+    def __init__(self):
+        self.orders = {}
+        self.requests = 0
+
+    def get_orders(self, status='all', limit=50, after=None, direction=None):
+        self.requests += 1
+        return [dict(order) for order in self.orders.values()]
+
+class FakeExecutor:
+    """Accepts orders after an optional delay"""
+
+    def __init__(self, delay_seconds: float = 0.0):
+        self.client = FakeClient()
+        self.delay_seconds = delay_seconds
+        self.cancelled = []
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def _execute_with_retry(self, order_type, symbol, qty, side, is_option, **kwargs):
+        time.sleep(self.delay_seconds)
+        with self._lock:
+            self._next += 1
+            order = {'id': f"b{self._next}", 'symbol': symbol, 'qty': qty, 'side': side,
+                     'status': 'accepted', 'filled_qty': 0, 'filled_avg_price': None}
+            self.client.orders[order['id']] = order
+        return dict(order)
+
+    def cancel_order(self, order_id):
+        self.cancelled.append(order_id)
+        return True
+
+class TestOrderManager(unittest.TestCase):
+    """Test non-blocking submission, fill events and the bounded book"""
+
+    def test_submit_poll_and_events(self):
+        executor = FakeExecutor(delay_seconds=0.2)
+        manager = OrderManager(executor, poll_interval_seconds=60)
+        events = []
+
+        start = time.perf_counter()
+        handle = manager.submit('market', 'AAPL', 10, 'buy',
+                                on_partial_fill=lambda h: events.append(('partial', h.filled_qty)),
+                                on_fill=lambda h: events.append(('fill', h.filled_qty)))
+        other = manager.submit('market', 'MSFT', 5, 'sell', on_cancel=lambda h: events.append(('cancel', h.symbol)))
+        self.assertLess(time.perf_counter() - start, 0.1)
+
+        self.assertEqual(handle.submitted.result(timeout=2)['id'], handle.broker_id)
+        other.submitted.result(timeout=2)
+
+        executor.client.orders[handle.broker_id].update(status='partially_filled', filled_qty=4)
+        self.assertEqual(manager.poll(), 2)
+        executor.client.orders[handle.broker_id].update(status='filled', filled_qty=10, filled_avg_price=1.25)
+        manager.poll()
+        self.assertEqual(executor.client.requests, 2)  # One request per poll for all open orders
+
+        manager.on_trade_update({'event': 'canceled', 'order': {'id': other.broker_id}})
+        self.assertEqual(events, [('partial', 4.0), ('fill', 10.0), ('cancel', 'MSFT')])
+        self.assertEqual(handle.done.result(timeout=1)['filled_avg_price'], 1.25)
+        self.assertEqual(manager.open_orders(), [])
+        self.assertEqual(manager.poll(), 0)
+
+    def test_book_is_bounded_and_indexed(self):
+        executor = FakeExecutor()
+        manager = OrderManager(executor, poll_interval_seconds=60, max_orders=5)
+        handles = [manager.submit('market', 'SPY' if i % 2 else 'QQQ', 1, 'buy') for i in range(8)]
+        for h in handles:
+            h.submitted.result(timeout=2)
+        for h in handles[:6]:
+            manager.on_trade_update({'event': 'fill', 'order': {'id': h.broker_id, 'filled_qty': 1}})
+
+        self.assertLessEqual(len(manager), 5)
+        self.assertIs(manager.get_by_broker_id(handles[-1].broker_id), handles[-1])
+        self.assertEqual([h.id for h in manager.orders_for('QQQ', open_only=True)], [handles[6].id])
+        self.assertTrue(manager.cancel(handles[7].id))
+        self.assertEqual(executor.cancelled, [handles[7].broker_id])
+
+class TestExecutorRetry(unittest.TestCase):
+    """Non-idempotent orders (exits) are sent once"""
+
+    def test_retry_false_makes_single_attempt(self):
+        from core.live.broker_executor import BrokerExecutor
+
+        class Client:
+            api = None
+
+        executor = BrokerExecutor(Client())
+        executor.base_retry_delay = 0.0
+        attempts = []
+        executor._place_market_order = lambda *args: attempts.append(args)  # Returns None (e.g. timeout)
+
+        handle = executor.submit_market_order('SPY250117C00500000', 1, 'sell', is_option=True, retry=False)
+        self.assertIsNone(handle.submitted.result(timeout=5))
+        self.assertEqual(len(attempts), 1)
+
+        self.assertIsNone(executor._execute_with_retry('market', 'SPY', 1, 'sell', False))
+        self.assertEqual(len(attempts), 1 + executor.max_retries + 1)
+
+def wait_for(condition, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+class TestTraderOrderFlow(unittest.TestCase):
+    """IntegratedTrader entries and exits through the order manager"""
+
+    def setUp(self):
+        from core.live.broker_executor import BrokerExecutor
+        from core.live.exit_engine import ExitEngine
+        from core.live.integrated_trader import IntegratedTrader
+
+        fake = FakeExecutor()
+        self.broker = fake.client
+        self.executor = BrokerExecutor(fake.client)
+        self.executor._execute_with_retry = fake._execute_with_retry
+        self.executor.cancel_order = fake.cancel_order
+        self.executor.order_manager.poll_interval_seconds = 60
+        self.cancelled = fake.cancelled
+
+        trader = IntegratedTrader.__new__(IntegratedTrader)
+        trader.executor = self.executor
+        trader.exit_engine = ExitEngine(stop_loss_pct=0.20)
+        trader.profit_manager = MagicMock()
+        trader.options_risk_manager = MagicMock()
+        trader.positions = {}
+        trader._exit_results = deque()
+        trader._pending_entries = {}
+        trader._entry_results = deque()
+        self.trader = trader
+
+    def tearDown(self):
+        self.executor.order_manager.stop()
+
+    def test_exit_in_flight_is_not_sent_again(self):
+        """An accepted but unfilled exit is skipped while the snapshot still shows the position"""
+        expiration = date.today() + timedelta(days=21)
+        symbol = f"SPY{expiration.strftime('%y%m%d')}C00500000"
+        snapshot = [{'symbol': symbol, 'qty': 2, 'unrealized_plpc': -0.30, 'current_price': 1.0}]
+
+        self.trader._check_exits(snapshot)
+        self.trader._check_exits(snapshot)
+
+        self.assertEqual([(o['symbol'], o['side']) for o in self.broker.orders.values()], [(symbol, 'sell')])
+
+    def test_limit_entry_falls_back_to_market_after_cancel(self):
+        """Unfilled limit entry is cancelled, the rest bought at market, and fills tracked on apply"""
+        manager = self.executor.order_manager
+        option_symbol = 'SPY261120C00500000'
+        entry = {
+            'option_symbol': option_symbol, 'underlying': 'SPY', 'expiration': date(2026, 11, 20),
+            'option_type': 'call', 'greeks': None, 'dte': 33,
+            'signal': {'agent': 'Test', 'direction': 'LONG', 'source': 'test', 'confidence': 0.8}
+        }
+
+        start = time.perf_counter()
+        self.trader._submit_entry(entry, 3, limit_price=1.10)
+        self.assertLess(time.perf_counter() - start, 0.1)
+        self.assertTrue(self.trader._has_position('SPY'))  # Entry in flight blocks a second one
+
+        self.assertTrue(wait_for(lambda: self.cancelled == ['b1']))
+        self.broker.orders['b1'].update(status='canceled', filled_qty=1, filled_avg_price=1.10)
+        manager.poll()
+        self.assertTrue(wait_for(lambda: manager.get_by_broker_id('b2') is not None))
+        self.assertEqual(self.broker.orders['b2']['qty'], 2)
+
+        self.trader._apply_entry_results()  # Partial fill tracked, market remainder still open
+        self.assertEqual(self.trader.positions[option_symbol]['qty'], 1)
+        self.assertIn(option_symbol, self.trader._pending_entries)
+
+        self.broker.orders['b2'].update(status='filled', filled_qty=2, filled_avg_price=1.30)
+        manager.poll()
+        self.trader._apply_entry_results()
+
+        position = self.trader.positions[option_symbol]
+        self.assertEqual(position['qty'], 3)
+        self.assertAlmostEqual(position['entry_price'], (1.10 + 2 * 1.30) / 3)
+        self.assertEqual(self.trader._pending_entries, {})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+"""
+Tests for session record / replay
+"""
+import sys
+import tempfile
+import tracemalloc
+import types
+import unittest
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.live import session_replay
+from core.live.session_replay import SessionRecorder, SessionReplayer, profile_cycles
+
+class FakeAPI:
+    def get_clock(self):
+        return {'is_open': True}
+
+class FakeClient:
+    """Stands in for a live client; counts network calls"""
+    calls = 0
+
+    def __init__(self):
+        self.api = FakeAPI()
+        self.base_url = 'https://paper-api.example'
+
+    def get_latest_price(self, symbol, as_of=None):
+        type(self).calls += 1
+        return {'SPY': 500.0, 'QQQ': 430.0}[symbol] + type(self).calls
+
+    def get_account(self):
+        raise ConnectionError('offline')
+
+class TestSessionReplay(unittest.TestCase):
+    def setUp(self):
+        FakeClient.calls = 0
+        self.feeds = types.ModuleType('fake_feeds')
+        self.feeds.FakeClient = FakeClient
+        self.consumer = types.ModuleType('fake_consumer')
+        self.consumer.FakeClient = FakeClient
+        modules = {'fake_feeds': self.feeds, 'fake_consumer': self.consumer}
+        services = {'alpaca': ('fake_feeds', 'FakeClient')}
+        for p in (patch.dict(sys.modules, modules), patch.dict(session_replay.SERVICES, services, clear=True)):
+            p.start()
+            self.addCleanup(p.stop)
+        self.path = Path(tempfile.mkdtemp()) / 'session.pkl.gz'
+
+    def _record(self):
+        with SessionRecorder(self.path):
+            client = self.consumer.FakeClient()
+            prices = [client.get_latest_price('SPY', as_of=datetime(2025, 1, 2, 10, 0)),
+                      client.get_latest_price('QQQ'),
+                      client.get_latest_price('SPY', as_of=datetime(2025, 1, 2, 10, 1))]
+            self.assertEqual(client.base_url, 'https://paper-api.example')
+            self.assertEqual(client.api.get_clock(), {'is_open': True})
+            with self.assertRaises(ConnectionError):
+                client.get_account()
+        self.assertIs(self.consumer.FakeClient, FakeClient)
+        return prices
+
+    def test_replay_serves_recorded_responses_in_order(self):
+        recorded = self._record()
+        self.assertEqual(FakeClient.calls, 3)
+
+        with SessionReplayer(self.path, speed=0) as replayer:
+            client = self.consumer.FakeClient()
+            replayed = [client.get_latest_price('SPY', as_of=datetime(2026, 3, 3, 9, 30)),
+                        client.get_latest_price('QQQ'),
+                        client.get_latest_price('SPY', as_of=datetime(2026, 3, 3, 9, 31))]
+            self.assertEqual(client.get_latest_price('SPY', as_of=datetime.now()), recorded[2])  # Last repeats
+            self.assertEqual(client.base_url, 'https://paper-api.example')
+            self.assertEqual(client.api.get_clock(), {'is_open': True})
+            with self.assertRaises(ConnectionError):
+                client.get_account()
+            self.assertIsNone(client.get_positions())
+
+        self.assertEqual(replayed, recorded)
+        self.assertEqual(FakeClient.calls, 3)  # No live calls during replay
+        self.assertEqual(replayer.misses, {'alpaca.get_positions': 1})
+        self.assertIs(self.consumer.FakeClient, FakeClient)
+
+    def test_profile_times_cycles_without_tracing(self):
+        traced = []
+        trader = types.SimpleNamespace(run_trading_cycle=lambda: traced.append(tracemalloc.is_tracing()))
+
+        report = profile_cycles(trader, cycles=3, memory_cycles=1)
+        self.assertEqual(traced, [False, False, False, True])
+        self.assertEqual(len(report['cycle_seconds']), 3)
+        self.assertGreater(report['peak_memory_mb'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
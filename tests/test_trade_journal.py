@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Tests for the append-only journal behind MetricsTracker
+"""
+import json
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from logs.journal import Journal, shared_journal
+from logs.metrics_tracker import MetricsTracker
+
+class TestJournal(unittest.TestCase):
+    """Test journal rotation and range reads"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.log_dir = Path(self.tmpdir.name)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_rotation_and_date_range_read(self):
+        """Rotated segments are read back in order and filtered by range"""
+        journal = Journal(self.log_dir, 'events', buffer_size=3, max_bytes=400)
+        start = datetime(2026, 1, 5, 9, 30)
+        records = [{'timestamp': (start + timedelta(minutes=i)).isoformat(), 'seq': i} for i in range(40)]
+        for record in records:
+            journal.append(record)
+        journal.close()
+
+        self.assertGreater(len(list(self.log_dir.glob('events.*.jsonl'))), 1)
+        self.assertEqual([r['seq'] for r in journal.read()], list(range(40)))
+
+        window = list(journal.read(start + timedelta(minutes=10), start + timedelta(minutes=25)))
+        self.assertEqual([r['seq'] for r in window], list(range(10, 25)))
+
+    def test_metrics_from_journal_survive_restart(self):
+        """A new tracker over the same directory sees earlier trades"""
+        tracker = MetricsTracker(log_dir=str(self.log_dir))
+        for pnl in (50.0, -20.0, 30.0):
+            tracker.record_trade('AAPL', 100.0, 100.0 + pnl / 10, 10, 'long', pnl, 'TrendAgent')
+        tracker.close()
+
+        restarted = MetricsTracker(log_dir=str(self.log_dir))
+        metrics = restarted.calculate_metrics(lookback_days=1)
+        self.assertEqual(metrics['total_trades'], 3)
+        self.assertAlmostEqual(metrics['total_pnl'], 60.0)
+        self.assertAlmostEqual(metrics['max_drawdown'], 20.0)
+
+    def test_legacy_trades_json_migrated(self):
+        """Trades from the old trades.json are moved into the journal once"""
+        now = datetime.now().isoformat()
+        legacy = [{'symbol': 'NVDA', 'pnl': 12.5, 'entry_time': now, 'exit_time': now, 'agent_name': 'EMAAgent'}]
+        (self.log_dir / 'trades.json').write_text(json.dumps(legacy))
+
+        tracker = MetricsTracker(log_dir=str(self.log_dir))
+        self.assertEqual([t['symbol'] for t in tracker.read_trades()], ['NVDA'])
+        self.assertFalse((self.log_dir / 'trades.json').exists())
+
+    def test_trackers_share_one_journal_per_file(self):
+        """Trackers over the same directory write through one journal (one rotation owner)"""
+        first = MetricsTracker(log_dir=str(self.log_dir))
+        second = MetricsTracker(log_dir=str(self.log_dir / '..' / self.log_dir.name))
+        self.assertIs(first.trade_journal, second.trade_journal)
+        self.assertIs(first.decision_journal, second.decision_journal)
+        self.assertIsNot(shared_journal(self.log_dir / 'tenant', 'trades'), first.trade_journal)
+
+        first.record_trade('AAPL', 100.0, 101.0, 10, 'long', 10.0)
+        second.record_trade('MSFT', 100.0, 99.0, 10, 'long', -10.0)
+        self.assertEqual([t['symbol'] for t in first.read_trades()], ['AAPL', 'MSFT'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Tests for the incremental trade ledger
+"""
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services import trade_ledger
+from services.trade_ledger import TradeLedger
+
+def make_order(i: int, symbol: str, side: str, qty: float, price: float) -> dict:
+    ts = f"2026-01-05T{14 + i // 60:02d}:{i % 60:02d}:00+00:00"
+    return {'id': f"o{i}", 'symbol': symbol, 'side': side, 'status': 'filled',
+            'filled_qty': qty, 'filled_avg_price': price, 'submitted_at': ts, 'filled_at': ts}
+
+class FakeOrdersClient:
+    """Serves orders after a cursor, oldest first"""
+
+    def __init__(self, orders: list):
+        self.orders = orders
+        self.calls = []
+
+    def get_orders(self, status='all', limit=50, after=None, direction=None):
+        self.calls.append(after)
+        newer = [o for o in self.orders if not after or o['submitted_at'] > after]
+        if status == 'open':
+            newer = [o for o in newer if o['status'] not in ('filled', 'canceled', 'expired', 'rejected')]
+        return newer[:limit]
+
+    def get_order(self, order_id):
+        return next((o for o in self.orders if o['id'] == order_id), None)
+
+class TestTradeLedger(unittest.TestCase):
+    """Test cursor paging and FIFO matching"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.tmpdir.name) / 'ledger.db'
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_fifo_matching_across_syncs(self):
+        """Partial sells close the oldest lots first, across incremental syncs"""
+        orders = [
+            make_order(0, 'AAPL', 'buy', 10, 100.0),
+            make_order(1, 'AAPL', 'buy', 10, 110.0),
+            make_order(2, 'AAPL', 'sell', 15, 120.0),
+        ]
+        client = FakeOrdersClient(orders)
+        ledger = TradeLedger(client, db_path=self.db_path)
+        self.assertEqual(ledger.sync(), 3)
+
+        client.orders.append(make_order(3, 'AAPL', 'sell', 5, 105.0))
+        self.assertEqual(ledger.sync(), 1)
+        self.assertEqual(ledger.sync(), 0)  # Overlap re-scan skips applied fills
+
+        closed = sorted(ledger.get_closed_trades(), key=lambda t: (t['exit_time'], t['entry_price']))
+        self.assertEqual([(t['qty'], t['entry_price'], t['exit_price']) for t in closed],
+                         [(10, 100.0, 120.0), (5, 110.0, 120.0), (5, 110.0, 105.0)])
+        self.assertAlmostEqual(sum(t['pnl'] for t in closed), 200 + 50 - 25)
+        self.assertEqual(ledger.get_open_lot_entry_times(), {})
+
+    def test_long_open_order_filled_later_keeps_fifo(self):
+        """A GTC order that fills after the cursor moved past it is still applied, in fill order"""
+        gtc = dict(make_order(0, 'AAPL', 'buy', 10, 100.0), status='new', filled_qty=0, filled_at=None)
+        later = make_order(1, 'MSFT', 'buy', 1, 50.0)
+        later.update(submitted_at='2026-01-06T20:00:00+00:00', filled_at='2026-01-06T20:00:00+00:00')
+        client = FakeOrdersClient([gtc, later])  # Cursor ends > 1 day past the GTC submission
+        ledger = TradeLedger(client, db_path=self.db_path)
+        self.assertEqual(ledger.sync(), 1)
+        self.assertTrue(client.calls[0].endswith('+00:00'))  # UTC cursor from the first sync on
+
+        # Two days later the GTC buy fills, then a sell closes it
+        gtc.update(status='filled', filled_qty=10, filled_at='2026-01-07T15:00:00+00:00')
+        sell = make_order(2, 'AAPL', 'sell', 10, 110.0)
+        sell.update(submitted_at='2026-01-07T15:05:00+00:00', filled_at='2026-01-07T15:05:00+00:00')
+        client.orders.append(sell)
+        self.assertEqual(ledger.sync(), 2)
+
+        closed = ledger.get_closed_trades(symbol='AAPL')
+        self.assertEqual([(t['qty'], t['entry_price'], t['exit_price'], t['side']) for t in closed],
+                         [(10, 100.0, 110.0, 'long')])
+        self.assertEqual(ledger.sync(), 0)
+
+    def test_paginates_past_page_size(self):
+        """History longer than one page is fully applied"""
+        orders = [make_order(i, 'NVDA271217C00150000', 'buy' if i % 2 == 0 else 'sell', 1, 2.0 + i % 2)
+                  for i in range(25)]
+        original_page = trade_ledger.PAGE_SIZE
+        trade_ledger.PAGE_SIZE = 10
+        try:
+            client = FakeOrdersClient(orders)
+            ledger = TradeLedger(client, db_path=self.db_path)
+            self.assertEqual(ledger.sync(), 25)
+        finally:
+            trade_ledger.PAGE_SIZE = original_page
+
+        closed = ledger.get_closed_trades()
+        self.assertEqual(len(closed), 12)
+        self.assertTrue(all(t['pnl'] == 100.0 for t in closed))
+        self.assertEqual(list(ledger.get_open_lot_entry_times()), ['NVDA271217C00150000'])
+
+if __name__ == '__main__':
+    unittest.main()
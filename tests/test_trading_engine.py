@@ -0,0 +1,110 @@
+"""
+Tests for the multi-tenant trading engine (shared signals, concurrent user cycles)
+"""
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.live.cycle_tracer import CycleTracer, tracer
+from services import iv_history_db
+from tradenova_platform.database.models import Base, Portfolio
+from tradenova_platform import trading_engine
+from tradenova_platform.trading_engine import TradingEngine
+
+class FakeTrader:
+    created = []
+
+    def __init__(self, market=None, **kwargs):
+        self.market = market
+        self.positions = {}
+        self.scans = 0
+        self.received = []
+        self.fail = False
+        self.thread_names = set()
+        type(self).created.append(self)
+
+    def scan_market(self):
+        self.scans += 1
+        return {'SPY': {'signal': {'direction': 'LONG', 'confidence': 0.8}}}
+
+    def run_trading_cycle(self, signals=None):
+        self.thread_names.add(threading.current_thread().name)
+        if self.fail:
+            raise RuntimeError("broker down")
+        self.received.append(signals)
+
+class TestTradingEngine(unittest.TestCase):
+    def setUp(self):
+        FakeTrader.created = []
+        self.tmpdir = tempfile.mkdtemp()
+        self.engine = TradingEngine(database_url=f"sqlite:///{os.path.join(self.tmpdir, 'platform.db')}", max_workers=4)
+        Base.metadata.create_all(self.engine.engine)
+        db = self.engine.SessionLocal()
+        for user_id in (1, 2, 3):
+            db.add(Portfolio(user_id=user_id, initial_balance=10000.0))
+        db.commit()
+        db.close()
+
+        # Keep the IV history DB (per-user risk managers) and cycle traces out of the repo
+        trace_logger = CycleTracer._make_trace_logger(Path(self.tmpdir) / 'cycle_trace.jsonl', 1 << 20, 1)
+        for patcher in (patch.object(trading_engine, 'IntegratedTrader', FakeTrader),
+                        patch.object(iv_history_db, 'DEFAULT_DB_PATH', Path(self.tmpdir) / 'iv_history.db'),
+                        patch.object(tracer, '_trace_logger', trace_logger)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        for user_id in (1, 2, 3):
+            self.engine.start_trading(user_id)
+
+    def tearDown(self):
+        self.engine.engine.dispose()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_signals_computed_once_and_shared(self):
+        market = self.engine.market_trader
+        users = [self.engine.active_traders[uid] for uid in (1, 2, 3)]
+        self.assertTrue(all(trader.market is market for trader in users))
+
+        results = self.engine.run_cycle()
+
+        self.assertEqual(market.scans, 1)
+        self.assertEqual({uid: r['status'] for uid, r in results.items()}, {1: 'ok', 2: 'ok', 3: 'ok'})
+        self.assertTrue(all(len(trader.received) == 1 for trader in users))
+        self.assertTrue(all(trader.received[0] is users[0].received[0] for trader in users))
+        self.assertIn('SPY', users[0].received[0])
+        self.assertTrue(all(name.startswith('user-cycle') for trader in users for name in trader.thread_names))
+        self.assertEqual(self.engine.get_trading_status(1)['latency']['cycles'], 1)
+
+    def test_shared_signals_skip_per_user_market_gates(self):
+        from core.live.integrated_trader import IntegratedTrader
+        trader = IntegratedTrader.__new__(IntegratedTrader)  # Only the scan path is exercised
+        trader._market_gates_open = lambda: self.fail("market gates re-checked per user")
+        trader.risk_manager = MagicMock(**{'get_risk_status.return_value': {'risk_level': 'normal'}})
+        trader._has_position = lambda symbol: False
+        traded = []
+        trader._trade_signals = lambda signals: traded.append(signals) or len(signals)
+
+        trader._scan_and_trade(signals={'SPY': {'signal': {}}})
+        trader._scan_and_trade(signals={})  # Market closed for everyone: nothing to do
+
+        self.assertEqual(traded, [{'SPY': {'signal': {}}}])
+
+    def test_user_failure_is_isolated(self):
+        self.engine.active_traders[2].fail = True
+
+        results = self.engine.run_cycle()
+
+        self.assertEqual(results[2]['status'], 'error')
+        self.assertEqual(results[1]['status'], 'ok')
+        self.assertEqual(results[3]['status'], 'ok')
+        self.assertEqual(self.engine.last_cycle['errors'], 1)
+        self.assertEqual(self.engine.run_trading_cycle(1)['status'], 'ok')
+
+if __name__ == '__main__':
+    unittest.main()
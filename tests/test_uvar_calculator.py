@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Tests for the matrix historical-simulation UVaR engine
+"""
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import pandas as pd
+from core.risk.options_var import OptionsVaRCalculator, horizon_years, parse_option_symbol
+from core.risk.uvar_calculator import UVaRCalculator
+from services.returns_panel import ReturnsPanel
+
+DATES = pd.bdate_range('2025-06-02', periods=90)
+
+class FixedReturnsUVaR(UVaRCalculator):
+    """UVaR calculator with synthetic returns (no Alpaca)"""
+
+    def __init__(self, returns: dict):
+        super().__init__(alpaca_client=None)
+        self.returns = returns
+        self.fetches = []
+
+    def _get_historical_returns(self, symbols, horizon_days):
+        self.fetches.append(list(symbols))
+        return {s: self.returns[s] for s in symbols if s in self.returns}
+
+def loop_uvar(returns: dict, positions: list, confidence: float = 0.99) -> float:
+    """Reference: per-scenario, per-position loop"""
+    portfolio_value = sum(abs(p['current_price'] * p['qty']) for p in positions)
+    pnls = []
+    for date in DATES:
+        pnl = 0.0
+        for p in positions:
+            if p['symbol'] in returns:
+                pnl += abs(p['current_price'] * p['qty']) * returns[p['symbol']][date] * (1 if p['qty'] > 0 else -1)
+        pnls.append(pnl)
+    losses = np.sort(-np.array(pnls))[::-1]  # Largest loss first
+    tail_size = max(1, int(np.ceil((1 - confidence) * len(losses))))
+    return losses[tail_size - 1] / portfolio_value * 100
+
+class TestUVaRCalculator(unittest.TestCase):
+    """Test matrix UVaR against the scenario loop"""
+
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.returns = {s: pd.Series(rng.normal(0, 0.02, len(DATES)), index=DATES)
+                        for s in ('AAPL', 'NVDA', 'TSLA')}
+        self.positions = [
+            {'symbol': 'AAPL', 'qty': 20, 'entry_price': 180.0, 'current_price': 185.0},
+            {'symbol': 'NVDA', 'qty': -10, 'entry_price': 150.0, 'current_price': 148.0},
+            {'symbol': 'OPTION_NO_HISTORY', 'qty': 2, 'entry_price': 3.0, 'current_price': 3.5},
+        ]
+
+    def test_matches_loop(self):
+        """Exposure-vector x matrix product equals the scenario loop"""
+        calc = FixedReturnsUVaR(self.returns)
+        result = calc.calculate_uvar(self.positions)
+        self.assertAlmostEqual(result['uvar_pct'], loop_uvar(self.returns, self.positions), places=9)
+        self.assertEqual(result['scenarios'], len(DATES))
+
+    def test_incremental_matches_full_recompute(self):
+        """Rank-one incremental UVaR equals recomputing with the new position"""
+        calc = FixedReturnsUVaR(self.returns)
+        new_position = {'symbol': 'TSLA', 'qty': 5, 'entry_price': 250.0, 'current_price': 250.0}
+
+        with patch.object(calc, '_portfolio_pnl', wraps=calc._portfolio_pnl) as portfolio_pnl:
+            incremental = calc.calculate_incremental_uvar(self.positions, new_position)
+        self.assertEqual(portfolio_pnl.call_count, 1)  # Baseline P&L computed once and reused
+
+        self.assertAlmostEqual(incremental['uvar_before_pct'], loop_uvar(self.returns, self.positions), places=9)
+        self.assertAlmostEqual(incremental['uvar_after_pct'],
+                               loop_uvar(self.returns, self.positions + [new_position]), places=9)
+
+    def test_missing_history_not_refetched(self):
+        """Symbols without history are fetched once per day"""
+        calc = FixedReturnsUVaR(self.returns)
+        calc.calculate_uvar(self.positions)
+        calc.calculate_uvar(self.positions)
+        fetched = [s for batch in calc.fetches for s in batch]
+        self.assertEqual(fetched.count('OPTION_NO_HISTORY'), 1)
+
+class TestOptionsVaR(unittest.TestCase):
+    """Test full-revaluation options VaR"""
+
+    def setUp(self):
+        rng = np.random.default_rng(11)
+        self.returns = {s: pd.Series(rng.normal(0, 0.03, len(DATES)), index=DATES) for s in ('AAPL', 'NVDA')}
+        self.positions = [
+            {'symbol': 'AAPL', 'qty': 10, 'current_price': 200.0},
+            {'symbol': 'NVDA271217C00150000', 'qty': 3, 'current_price': 6.0,
+             'underlying_price': 150.0, 'implied_volatility': 0.45},
+            {'symbol': 'AAPL271217P00190000', 'qty': 2, 'current_price': 4.0,
+             'underlying_price': 200.0, 'implied_volatility': 0.30},
+        ]
+
+    def test_parse_option_symbol(self):
+        """OCC symbols parse to underlying, expiry, type and strike"""
+        contract = parse_option_symbol('NVDA271217C00150000')
+        self.assertEqual(contract['underlying'], 'NVDA')
+        self.assertEqual(contract['option_type'], 'call')
+        self.assertEqual(contract['strike'], 150.0)
+        self.assertIsNone(parse_option_symbol('NVDA'))
+
+    def test_contributions_sum_to_var_and_es(self):
+        """Per-position contributions add up to portfolio VaR and ES"""
+        var = OptionsVaRCalculator(FixedReturnsUVaR(self.returns), confidence_level=0.95)
+        result = var.calculate(self.positions)
+
+        self.assertGreater(result['var'], 0)
+        self.assertGreaterEqual(result['expected_shortfall'], result['var'])
+        self.assertAlmostEqual(sum(c['var_contribution'] for c in result['contributions']), result['var'], places=6)
+        self.assertAlmostEqual(sum(c['es_contribution'] for c in result['contributions']), result['expected_shortfall'], places=6)
+
+    def test_stock_book_matches_linear_uvar(self):
+        """Both calculators use the same upper-tail loss quantile"""
+        stocks = [{'symbol': 'AAPL', 'qty': 10, 'entry_price': 190.0, 'current_price': 200.0},
+                  {'symbol': 'NVDA', 'qty': -5, 'entry_price': 150.0, 'current_price': 150.0}]
+        for confidence in (0.95, 0.99):
+            uvar = FixedReturnsUVaR(self.returns)
+            uvar.confidence_level = confidence
+            linear = uvar.calculate_uvar(stocks)
+            full = OptionsVaRCalculator(FixedReturnsUVaR(self.returns), confidence_level=confidence).calculate(stocks)
+            self.assertAlmostEqual(full['var'], linear['uvar'], places=6)
+
+    def test_horizon_uses_calendar_days(self):
+        """Time decay over the horizon is on the same calendar basis as time to expiry"""
+        friday = pd.Timestamp('2026-10-16 12:00').to_pydatetime()
+        self.assertAlmostEqual(horizon_years(1, friday), 3 / 365)  # Over the weekend
+        self.assertAlmostEqual(horizon_years(2, friday - pd.Timedelta(days=3)), 2 / 365)
+
+    def test_long_option_loss_bounded_by_premium(self):
+        """Full revaluation never loses more than the premium on a long option"""
+        var = OptionsVaRCalculator(FixedReturnsUVaR(self.returns))
+        # IV implied from the premium, so the model value matches the market price
+        position = {'symbol': 'NVDA271217C00150000', 'qty': 3, 'current_price': 20.0, 'underlying_price': 150.0}
+        result = var.calculate([position])
+        self.assertGreater(result['worst_case_loss'], 0)
+        self.assertLessEqual(result['worst_case_loss'], 20.0 * 3 * 100 + 1e-6)
+
+    def test_incremental_matches_full(self):
+        """Incremental VaR equals a full calculation on the combined book"""
+        var = OptionsVaRCalculator(FixedReturnsUVaR(self.returns), confidence_level=0.95)
+        incremental = var.calculate_incremental(self.positions[:2], self.positions[2])
+        full = OptionsVaRCalculator(FixedReturnsUVaR(self.returns), confidence_level=0.95).calculate(self.positions)
+        self.assertAlmostEqual(incremental['var_after'], full['var'], places=4)
+
+class FakeBarsClient:
+    """Daily bars client counting fetches"""
+
+    def __init__(self, closes: pd.DataFrame):
+        self.closes = closes
+        self.calls = []
+
+    def get_historical_bars(self, symbol, timeframe, start, end):
+        self.calls.append(symbol)
+        if symbol not in self.closes.columns:
+            return pd.DataFrame()
+        window = self.closes.loc[(self.closes.index >= pd.Timestamp(start).normalize()) &
+                                 (self.closes.index <= pd.Timestamp(end))]
+        return pd.DataFrame({'close': window[symbol].values},
+                            index=window.index.tz_localize('America/New_York').tz_convert('UTC'))
+
+class TestReturnsPanel(unittest.TestCase):
+    """Test the shared daily-returns panel"""
+
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        dates = pd.bdate_range(end=pd.Timestamp.now().normalize(), periods=100)
+        self.closes = pd.DataFrame({s: 100 * np.exp(np.cumsum(rng.normal(0, 0.02, len(dates))))
+                                    for s in ('AAPL', 'NVDA')}, index=dates)
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache_path = Path(self.tmpdir.name) / 'closes.csv'
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_horizons_share_one_fetch(self):
+        """Every horizon is served from one fetch per symbol"""
+        client = FakeBarsClient(self.closes)
+        panel = ReturnsPanel(client, cache_path=self.cache_path)
+        for horizon in (1, 2, 3):
+            returns = panel.get_returns(['AAPL', 'NVDA', 'MISSING'], horizon, lookback_days=60)
+            expected = self.closes['AAPL'].pct_change(horizon)
+            pd.testing.assert_series_equal(returns['AAPL'], expected.loc[returns['AAPL'].index],
+                                           check_names=False, check_freq=False)
+            self.assertNotIn('MISSING', returns)
+        self.assertEqual(sorted(client.calls), ['AAPL', 'MISSING', 'NVDA'])
+
+    def test_warm_restart_refreshes_incrementally(self):
+        """A restarted panel loads closes from disk and only fetches the overlap"""
+        ReturnsPanel(FakeBarsClient(self.closes.iloc[:-3]), cache_path=self.cache_path).get_returns(['AAPL'])
+
+        client = FakeBarsClient(self.closes)
+        panel = ReturnsPanel(client, cache_path=self.cache_path)
+        closes = panel.get_closes(['AAPL'])
+        self.assertEqual(client.calls, ['AAPL'])
+        self.assertEqual(closes.index.max(), self.closes.index.max())
+        np.testing.assert_allclose(closes['AAPL'].values[-60:], self.closes['AAPL'].values[-60:])
+
+if __name__ == '__main__':
+    unittest.main()
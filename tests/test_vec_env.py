@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Tests for vectorized RL training environments
+"""
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import pandas as pd
+
+try:
+    from rl.vec_env import VecTrainingConfig, make_vec_env
+    from rl.trading_environment import TradingEnvironment
+    SB3_AVAILABLE = True
+except ImportError:
+    SB3_AVAILABLE = False
+
+def make_bars(n: int = 300, seed: int = 0) -> pd.DataFrame:
+    """Random-walk OHLCV bars"""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.5, n))
+    return pd.DataFrame({
+        'open': close, 'high': close + 0.5, 'low': close - 0.5, 'close': close,
+        'volume': rng.integers(1000, 5000, n)
+    })
+
+@unittest.skipUnless(SB3_AVAILABLE, "stable-baselines3 not installed")
+class TestMakeVecEnv(unittest.TestCase):
+    """Test make_vec_env with the in-process DummyVecEnv backend"""
+
+    def setUp(self):
+        self.datasets = {'SPY': make_bars(seed=1), 'QQQ': make_bars(seed=2)}
+
+    def _config(self, **overrides) -> 'VecTrainingConfig':
+        values = dict(n_envs=3, tickers=['SPY', 'QQQ'], seed=7, use_subprocess=False)
+        values.update(overrides)
+        return VecTrainingConfig(**values)
+
+    def test_envs_seeded_with_base_seed_plus_index(self):
+        """Env i gets ticker i mod len(tickers) and the start a seed + i reset gives"""
+        config = self._config()
+        vec_env = make_vec_env(self.datasets, config)
+        try:
+            vec_env.reset()
+            steps = vec_env.get_attr('current_step')
+            for env_idx in range(config.n_envs):
+                reference = TradingEnvironment(data=self.datasets[config.ticker_for_env(env_idx)])
+                reference.reset(seed=config.seed + env_idx)
+                self.assertEqual(steps[env_idx], reference.current_step)
+                self.assertTrue(vec_env.envs[env_idx].unwrapped.data['close'].equals(
+                    self.datasets[config.ticker_for_env(env_idx)]['close']))
+            self.assertEqual(len(set(steps)), config.n_envs)
+        finally:
+            vec_env.close()
+
+    def test_start_offsets_cycle_over_envs(self):
+        """Fixed start offsets are assigned round-robin"""
+        vec_env = make_vec_env(self.datasets, self._config(start_offsets=[60, 120]))
+        try:
+            vec_env.reset()
+            self.assertEqual(vec_env.get_attr('current_step'), [60, 120, 60])
+        finally:
+            vec_env.close()
+
+    def test_missing_ticker_data_rejected(self):
+        with self.assertRaises(ValueError):
+            make_vec_env({'SPY': self.datasets['SPY']}, self._config())
+
+    def test_checkpoint_freq_counts_total_timesteps(self):
+        """save_freq is divided by num_envs so checkpoints land every checkpoint_freq timesteps"""
+        from rl.ppo_agent import PPOAgent
+
+        vec_env = make_vec_env(self.datasets, self._config(n_envs=2))
+        agent = PPOAgent(vec_env, n_steps=16, batch_size=16, n_epochs=1)
+        agent.model.tensorboard_log = None
+        agent.model.verbose = 0
+        with tempfile.TemporaryDirectory() as tmp:
+            stats = agent.train(total_timesteps=64, checkpoint_freq=32, checkpoint_path=tmp)
+            saved = sorted(p.name for p in Path(tmp).glob('*.zip'))
+        vec_env.close()
+
+        self.assertEqual(stats['n_envs'], 2)
+        self.assertEqual(saved, ['ppo_trading_32_steps.zip', 'ppo_trading_64_steps.zip'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,16 +3,21 @@ FastAPI Routes for TradeNova Platform
 RESTful API for user management, trading, and backtesting
 """
 from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, EmailStr
 from typing import Optional, List
 from datetime import datetime
+import asyncio
+import json
+
+from config import Config
 
 from tradenova_platform.user_manager import UserManager
 from tradenova_platform.portfolio_manager import PortfolioManager
 from tradenova_platform.trading_engine import TradingEngine
-from tradenova_platform.backtest_engine import BacktestEngine
+from tradenova_platform.backtest_engine import BacktestEngine, TERMINAL_STATUSES
 
 app = FastAPI(title="TradeNova Platform API", version="1.0.0")
 
@@ -63,6 +68,14 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
         )
     return user_id
 
+@app.on_event("startup")
+async def start_backtest_workers():
+    backtest_engine.start_workers(Config.BACKTEST_WORKERS)
+
+@app.on_event("shutdown")
+async def stop_backtest_workers():
+    backtest_engine.stop_workers()
+
 # Routes
 @app.get("/")
 async def root():
@@ -155,27 +168,68 @@ async def get_trading_status(user_id: int = Depends(get_current_user)):
     status = trading_engine.get_trading_status(user_id)
     return status
 
-@app.post("/api/backtest/run")
+@app.post("/api/backtest/run", status_code=status.HTTP_202_ACCEPTED)
 async def run_backtest(
     request: BacktestRequest,
     user_id: int = Depends(get_current_user)
 ):
-    """Run backtest for user"""
+    """Queue a backtest for user (poll /api/backtest/jobs/{job_id} for progress)"""
     try:
         start_date = datetime.strptime(request.start_date, '%Y-%m-%d')
         end_date = datetime.strptime(request.end_date, '%Y-%m-%d')
         
-        result = backtest_engine.run_backtest(
+        job = backtest_engine.submit_backtest(
             user_id=user_id,
             tickers=request.tickers,
             start_date=start_date,
             end_date=end_date,
             initial_balance=request.initial_balance
         )
-        return result
+        return job
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@app.get("/api/backtest/jobs")
+async def list_backtest_jobs(user_id: int = Depends(get_current_user)):
+    """List recent backtest jobs"""
+    return {"jobs": backtest_engine.list_jobs(user_id)}
+
+@app.get("/api/backtest/jobs/{job_id}")
+async def get_backtest_job(job_id: int, since: int = 0, user_id: int = Depends(get_current_user)):
+    """Backtest job status, progress and equity curve points after `since`"""
+    job = backtest_engine.get_job(job_id, user_id=user_id, since=since)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Backtest job not found")
+    return job
+
+@app.get("/api/backtest/jobs/{job_id}/stream")
+async def stream_backtest_job(job_id: int, user_id: int = Depends(get_current_user)):
+    """Stream job progress and new equity curve points as NDJSON until the job finishes"""
+    if backtest_engine.get_job(job_id, user_id=user_id, since=0) is None:
+        raise HTTPException(status_code=404, detail="Backtest job not found")
+    
+    async def events():
+        sent = 0
+        while True:
+            job = await asyncio.to_thread(backtest_engine.get_job, job_id, user_id, sent)
+            if job is None:
+                return
+            sent = job['equity_points']
+            yield json.dumps(job) + "\n"
+            if job['status'] in TERMINAL_STATUSES:
+                return
+            await asyncio.sleep(1.0)
+    
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+@app.post("/api/backtest/jobs/{job_id}/cancel")
+async def cancel_backtest_job(job_id: int, user_id: int = Depends(get_current_user)):
+    """Cancel a queued or running backtest job"""
+    job = backtest_engine.cancel_job(job_id, user_id=user_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Backtest job not found")
+    return {"message": "Cancellation requested", "job": job}
+
 @app.get("/api/backtest/history")
 async def get_backtest_history(user_id: int = Depends(get_current_user)):
     """Get backtest history"""
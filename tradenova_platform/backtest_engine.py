@@ -1,27 +1,79 @@
 """
 Backtest Engine - Per-User Backtesting
 Handles backtesting requests for users
+
+Backtests run as background jobs: submit_backtest() adds a row to the persistent
+backtest_jobs table and returns at once; a pool of worker threads claims queued
+jobs, reports progress on the job row and appends equity curve points to
+backtest_equity_points, honours cancellation requests, and stores the finished
+results in the Backtest model. While a job runs, a timer thread keeps renewing
+its updated_at lease (also through long data fetches that report no progress);
+running jobs whose lease has gone stale (worker process died) are re-queued by
+any worker.
 """
 import logging
-from typing import List, Dict
-from datetime import datetime
+import socket
+import threading
+import time
+from typing import List, Dict, Optional
+from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 import json
 
-from tradenova_platform.database.models import Backtest
+from tradenova_platform.database.models import Backtest, BacktestEquityPoint, BacktestJob
 from backtest_trading import BacktestEngine as CoreBacktestEngine
 
 logger = logging.getLogger(__name__)
 
+TERMINAL_STATUSES = ('completed', 'failed', 'cancelled')
+
+class BacktestCancelled(Exception):
+    """Raised inside a running backtest when its job has been cancelled"""
+
+class LeaseLost(Exception):
+    """Raised inside a running backtest when its job was re-queued to another worker"""
+
+def _serialize_equity_curve(points: List[Dict]) -> List[Dict]:
+    return [
+        {
+            'timestamp': p['timestamp'].isoformat() if hasattr(p['timestamp'], 'isoformat') else str(p['timestamp']),
+            'equity': p['equity'],
+            'balance': p['balance'],
+            'positions': p['positions']
+        }
+        for p in points
+    ]
+
 class BacktestEngine:
     """Manages backtesting for users"""
     
-    def __init__(self, database_url: str = "sqlite:///platform.db"):
-        """Initialize backtest engine"""
+    def __init__(
+        self,
+        database_url: str = "sqlite:///platform.db",
+        poll_interval: float = 1.0,
+        progress_interval: float = 2.0,
+        lease_seconds: float = 300.0
+    ):
+        """
+        Initialize backtest engine
+        
+        Args:
+            database_url: Platform database
+            poll_interval: Seconds an idle worker waits before looking for queued jobs
+            progress_interval: Minimum seconds between progress writes (and cancel checks) per job
+            lease_seconds: A running job whose lease was not renewed for this long is re-queued
+                (renewed every lease_seconds / 3 while the job runs)
+        """
         self.engine = create_engine(database_url, echo=False)
         self.SessionLocal = sessionmaker(bind=self.engine)
+        self.poll_interval = poll_interval
+        self.progress_interval = progress_interval
+        self.lease_seconds = lease_seconds
+        self._workers: List[threading.Thread] = []
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()
     
     def run_backtest(
         self,
@@ -32,7 +84,7 @@ class BacktestEngine:
         initial_balance: float = 100000.0
     ) -> Dict:
         """
-        Run backtest for user
+        Run backtest for user (synchronously; the API uses submit_backtest)
         
         Args:
             user_id: User ID
@@ -40,7 +92,7 @@ class BacktestEngine:
             start_date: Start date
             end_date: End date
             initial_balance: Initial balance
-            
+        
         Returns:
             Backtest results
         """
@@ -56,62 +108,450 @@ class BacktestEngine:
             # Run backtest
             engine.run_backtest()
             
-            # Get results (from generate_report)
-            # We need to extract results from the engine
-            # For now, return basic structure
+            return self._save_results(user_id, tickers, start_date, end_date, initial_balance, engine)
+        
+        except Exception as e:
+            logger.error(f"Error running backtest: {e}")
+            raise
+    
+    def _save_results(
+        self,
+        user_id: int,
+        tickers: List[str],
+        start_date: datetime,
+        end_date: datetime,
+        initial_balance: float,
+        engine: CoreBacktestEngine,
+        job_id: Optional[int] = None,
+        worker_id: Optional[str] = None
+    ) -> Dict:
+        """
+        Store a finished core backtest in the Backtest model
+        
+        With job_id, the job is marked completed in the same transaction, and only
+        if worker_id still holds it (raises LeaseLost otherwise, storing nothing).
+        """
+        total_return_pct = ((engine.current_balance - initial_balance) / initial_balance) * 100
+        win_rate = len([t for t in engine.trades if t['pnl'] > 0]) / len(engine.trades) * 100 if engine.trades else 0.0
+        
+        db = self.SessionLocal()
+        try:
+            backtest = Backtest(
+                user_id=user_id,
+                name=f"Backtest {datetime.now().strftime('%Y-%m-%d %H:%M')}",
+                tickers=tickers,
+                start_date=start_date,
+                end_date=end_date,
+                initial_balance=initial_balance,
+                final_balance=engine.current_balance,
+                total_return_pct=total_return_pct,
+                total_trades=len(engine.trades),
+                win_rate=win_rate,
+                results_json=json.dumps({
+                    'trades': engine.trades,
+                    'equity_curve': _serialize_equity_curve(engine.equity_curve)
+                }, default=str)
+            )
+            db.add(backtest)
+            if job_id is not None:
+                db.flush()  # Assigns backtest.id
+                held = db.query(BacktestJob).filter(
+                    BacktestJob.id == job_id, BacktestJob.status == 'running', BacktestJob.worker == worker_id
+                ).update({'status': 'completed', 'progress': 1.0, 'backtest_id': backtest.id,
+                          'finished_at': datetime.utcnow(), 'updated_at': datetime.utcnow()},
+                         synchronize_session=False)
+                if not held:
+                    raise LeaseLost()
+            db.commit()
             
-            # Save to database
-            db = self.SessionLocal()
-            try:
-                backtest = Backtest(
-                    user_id=user_id,
-                    name=f"Backtest {datetime.now().strftime('%Y-%m-%d %H:%M')}",
-                    tickers=tickers,
-                    start_date=start_date,
-                    end_date=end_date,
-                    initial_balance=initial_balance,
-                    final_balance=engine.current_balance,
-                    total_return_pct=((engine.current_balance - initial_balance) / initial_balance) * 100,
-                    total_trades=len(engine.trades),
-                    win_rate=len([t for t in engine.trades if t['pnl'] > 0]) / len(engine.trades) * 100 if engine.trades else 0.0,
-                    results_json=json.dumps({
-                        'trades': engine.trades,
-                        'equity_curve': [
-                            {
-                                'timestamp': p['timestamp'].isoformat() if hasattr(p['timestamp'], 'isoformat') else str(p['timestamp']),
-                                'equity': p['equity'],
-                                'balance': p['balance'],
-                                'positions': p['positions']
-                            }
-                            for p in engine.equity_curve
-                        ]
-                    })
-                )
-                db.add(backtest)
+            return {
+                "backtest_id": backtest.id,
+                "user_id": user_id,
+                "tickers": tickers,
+                "start_date": start_date.isoformat(),
+                "end_date": end_date.isoformat(),
+                "initial_balance": initial_balance,
+                "final_balance": engine.current_balance,
+                "total_return_pct": total_return_pct,
+                "total_trades": len(engine.trades),
+                "win_rate": win_rate
+            }
+        except LeaseLost:
+            db.rollback()
+            raise
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error saving backtest: {e}")
+            raise
+        finally:
+            db.close()
+    
+    # ========== JOB QUEUE ==========
+    
+    def submit_backtest(
+        self,
+        user_id: int,
+        tickers: List[str],
+        start_date: datetime,
+        end_date: datetime,
+        initial_balance: float = 100000.0
+    ) -> Dict:
+        """
+        Queue a backtest for the worker pool
+        
+        Returns:
+            Job status (see get_job)
+        """
+        if not tickers:
+            raise ValueError("At least one ticker is required")
+        if end_date <= start_date:
+            raise ValueError("end_date must be after start_date")
+        
+        db = self.SessionLocal()
+        try:
+            job = BacktestJob(
+                user_id=user_id,
+                tickers=tickers,
+                start_date=start_date,
+                end_date=end_date,
+                initial_balance=initial_balance,
+                status='queued',
+                progress=0.0
+            )
+            db.add(job)
+            db.commit()
+            logger.info(f"Queued backtest job {job.id} for user {user_id}: {', '.join(tickers)}")
+            result = self._job_dict(db, job)
+        finally:
+            db.close()
+        
+        self._wakeup.set()
+        return result
+    
+    def get_job(self, job_id: int, user_id: Optional[int] = None, since: int = 0) -> Optional[Dict]:
+        """
+        Job status, progress and the equity curve recorded so far
+        
+        Args:
+            job_id: Job ID
+            user_id: Only return the job if it belongs to this user
+            since: Skip the first N equity points (for incremental polling)
+        
+        Returns:
+            Job dictionary or None if not found
+        """
+        db = self.SessionLocal()
+        try:
+            job = self._query_job(db, job_id, user_id)
+            return self._job_dict(db, job, since=since) if job else None
+        finally:
+            db.close()
+    
+    def list_jobs(self, user_id: int, limit: int = 50) -> List[Dict]:
+        """Recent jobs for user (without equity curves)"""
+        db = self.SessionLocal()
+        try:
+            jobs = db.query(BacktestJob).filter(
+                BacktestJob.user_id == user_id
+            ).order_by(BacktestJob.created_at.desc()).limit(limit).all()
+            return [self._job_dict(db, job, include_curve=False) for job in jobs]
+        finally:
+            db.close()
+    
+    def cancel_job(self, job_id: int, user_id: Optional[int] = None) -> Optional[Dict]:
+        """
+        Cancel a job (queued jobs stop at once; running jobs at their next progress check)
+        
+        Returns:
+            Job dictionary or None if not found
+        """
+        db = self.SessionLocal()
+        try:
+            job = self._query_job(db, job_id, user_id)
+            if job is None:
+                return None
+            if job.status == 'queued':
+                job.status = 'cancelled'
+                job.finished_at = datetime.utcnow()
+            elif job.status == 'running':
+                job.cancel_requested = True
+            db.commit()
+            logger.info(f"Cancel requested for backtest job {job_id} (status: {job.status})")
+            return self._job_dict(db, job, include_curve=False)
+        finally:
+            db.close()
+    
+    @staticmethod
+    def _query_job(db: Session, job_id: int, user_id: Optional[int]) -> Optional[BacktestJob]:
+        query = db.query(BacktestJob).filter(BacktestJob.id == job_id)
+        if user_id is not None:
+            query = query.filter(BacktestJob.user_id == user_id)
+        return query.first()
+    
+    @staticmethod
+    def _job_dict(db: Session, job: BacktestJob, since: int = 0, include_curve: bool = True) -> Dict:
+        result = {
+            'job_id': job.id,
+            'user_id': job.user_id,
+            'status': job.status,
+            'progress': job.progress or 0.0,
+            'tickers': job.tickers,
+            'start_date': job.start_date.isoformat(),
+            'end_date': job.end_date.isoformat(),
+            'initial_balance': job.initial_balance,
+            'cancel_requested': bool(job.cancel_requested),
+            'error': job.error,
+            'backtest_id': job.backtest_id,
+            'created_at': job.created_at.isoformat() if job.created_at else None,
+            'started_at': job.started_at.isoformat() if job.started_at else None,
+            'finished_at': job.finished_at.isoformat() if job.finished_at else None,
+        }
+        if include_curve:
+            points = db.query(BacktestEquityPoint).filter(
+                BacktestEquityPoint.job_id == job.id, BacktestEquityPoint.seq >= since
+            ).order_by(BacktestEquityPoint.seq).all()
+            result['equity_points'] = db.query(BacktestEquityPoint).filter(
+                BacktestEquityPoint.job_id == job.id).count()
+            result['equity_curve'] = [
+                {'timestamp': p.timestamp, 'equity': p.equity, 'balance': p.balance, 'positions': p.positions}
+                for p in points
+            ]
+        return result
+    
+    # ========== WORKERS ==========
+    
+    def start_workers(self, count: int = 2):
+        """
+        Start the worker pool
+        
+        Running jobs whose lease is stale (not renewed for lease_seconds) are
+        re-queued here and whenever a worker is idle, so several processes can run
+        workers against one database.
+        """
+        if self._workers:
+            return
+        self._requeue_stale()
+        self._stop.clear()
+        for n in range(count):
+            name = f"backtest-worker-{n}"
+            worker = threading.Thread(target=self._worker_loop, args=(name,), name=name, daemon=True)
+            worker.start()
+            self._workers.append(worker)
+        logger.info(f"Started {count} backtest workers")
+    
+    def stop_workers(self, timeout: float = 5.0):
+        """Stop the worker pool (unfinished running jobs are re-queued once their lease expires)"""
+        self._stop.set()
+        self._wakeup.set()
+        for worker in self._workers:
+            worker.join(timeout)
+        self._workers = []
+    
+    def _requeue_stale(self) -> int:
+        """Re-queue running jobs whose lease expired (guarded UPDATE, so a live worker keeps its job)"""
+        db = self.SessionLocal()
+        try:
+            cutoff = datetime.utcnow() - timedelta(seconds=self.lease_seconds)
+            stale = [job_id for (job_id,) in db.query(BacktestJob.id).filter(
+                BacktestJob.status == 'running', BacktestJob.updated_at < cutoff
+            ).all()]
+            count = 0
+            for job_id in stale:
+                requeued = db.query(BacktestJob).filter(
+                    BacktestJob.id == job_id, BacktestJob.status == 'running', BacktestJob.updated_at < cutoff
+                ).update({'status': 'queued', 'worker': None, 'progress': 0.0}, synchronize_session=False)
+                if requeued:
+                    db.query(BacktestEquityPoint).filter(
+                        BacktestEquityPoint.job_id == job_id).delete(synchronize_session=False)
+                    count += 1
                 db.commit()
-                
-                return {
-                    "backtest_id": backtest.id,
-                    "user_id": user_id,
-                    "tickers": tickers,
-                    "start_date": start_date.isoformat(),
-                    "end_date": end_date.isoformat(),
-                    "initial_balance": initial_balance,
-                    "final_balance": engine.current_balance,
-                    "total_return_pct": ((engine.current_balance - initial_balance) / initial_balance) * 100,
-                    "total_trades": len(engine.trades),
-                    "win_rate": len([t for t in engine.trades if t['pnl'] > 0]) / len(engine.trades) * 100 if engine.trades else 0.0
-                }
+            if count:
+                logger.warning(f"Re-queued {count} backtest jobs with expired leases")
+            return count
+        finally:
+            db.close()
+    
+    def _worker_loop(self, name: str):
+        worker_id = f"{socket.gethostname()}:{name}"
+        while not self._stop.is_set():
+            try:
+                job_id = self._claim_next(worker_id)
             except Exception as e:
+                logger.error(f"{name}: error claiming backtest job: {e}")
+                job_id = None
+            if job_id is None:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+                try:
+                    self._requeue_stale()
+                except Exception as e:
+                    logger.error(f"{name}: error re-queueing stale backtest jobs: {e}")
+                continue
+            self._run_job(job_id, worker_id)
+    
+    def _claim_next(self, worker_id: str) -> Optional[int]:
+        """Atomically move the oldest queued job to 'running' (safe across threads / processes)"""
+        db = self.SessionLocal()
+        try:
+            candidates = db.query(BacktestJob.id).filter(
+                BacktestJob.status == 'queued'
+            ).order_by(BacktestJob.created_at, BacktestJob.id).limit(5).all()
+            for (job_id,) in candidates:
+                now = datetime.utcnow()
+                claimed = db.query(BacktestJob).filter(
+                    BacktestJob.id == job_id, BacktestJob.status == 'queued'
+                ).update({'status': 'running', 'worker': worker_id, 'started_at': now, 'updated_at': now},
+                         synchronize_session=False)
+                db.commit()
+                if claimed:
+                    return job_id
+            return None
+        finally:
+            db.close()
+    
+    def _run_job(self, job_id: int, worker_id: str):
+        db = self.SessionLocal()
+        try:
+            job = db.query(BacktestJob).filter(BacktestJob.id == job_id).first()
+            params = (job.user_id, list(job.tickers), job.start_date, job.end_date, job.initial_balance)
+        finally:
+            db.close()
+        user_id, tickers, start_date, end_date, initial_balance = params
+        
+        logger.info(f"Running backtest job {job_id} for user {user_id}")
+        lease_lost = threading.Event()
+        stop_renewal = threading.Event()
+        renewal = threading.Thread(target=self._renew_lease_loop, args=(job_id, worker_id, stop_renewal, lease_lost),
+                                   name=f"backtest-lease-{job_id}", daemon=True)
+        renewal.start()
+        try:
+            engine = CoreBacktestEngine(
+                tickers=tickers,
+                start_date=start_date,
+                end_date=end_date,
+                initial_balance=initial_balance
+            )
+            last_write = [0.0]
+            written = [0]  # Equity points already stored
+            
+            def write_progress(progress: float):
+                stored = self._record_progress(job_id, worker_id, progress, written[0],
+                                               engine.equity_curve[written[0]:])
+                if stored is None:
+                    raise LeaseLost()
+                written[0] += stored
+            
+            def on_progress(done: int, total: int):
+                if lease_lost.is_set():
+                    raise LeaseLost()
+                now = time.monotonic()
+                if now - last_write[0] < self.progress_interval and done < total:
+                    return
+                last_write[0] = now
+                write_progress(done / total if total else 0.0)
+                if self._cancel_requested(job_id):
+                    raise BacktestCancelled()
+            
+            engine.run_backtest(progress_callback=on_progress)
+            if self._cancel_requested(job_id):
+                raise BacktestCancelled()
+            
+            write_progress(1.0)
+            result = self._save_results(user_id, tickers, start_date, end_date, initial_balance, engine,
+                                        job_id=job_id, worker_id=worker_id)
+            logger.info(f"Backtest job {job_id} completed (backtest {result['backtest_id']})")
+        except LeaseLost:
+            logger.warning(f"Backtest job {job_id} was re-queued after its lease expired; abandoning this run")
+        except BacktestCancelled:
+            self._update_job(job_id, worker_id, status='cancelled', finished_at=datetime.utcnow())
+            logger.info(f"Backtest job {job_id} cancelled")
+        except Exception as e:
+            logger.error(f"Backtest job {job_id} failed: {e}", exc_info=True)
+            self._update_job(job_id, worker_id, status='failed', error=str(e), finished_at=datetime.utcnow())
+        finally:
+            stop_renewal.set()
+            renewal.join()
+    
+    def _renew_lease_loop(self, job_id: int, worker_id: str, stop: threading.Event, lost: threading.Event):
+        """Renew the job's lease every lease_seconds / 3 until stopped (sets `lost` if it was taken)"""
+        while not stop.wait(self.lease_seconds / 3):
+            if self._renew_lease(job_id, worker_id) is False:
+                lost.set()
+                return
+    
+    def _renew_lease(self, job_id: int, worker_id: str) -> Optional[bool]:
+        """
+        Refresh updated_at while this worker holds the running job
+        
+        Returns:
+            True if renewed, False if the job is no longer held, None if the write failed
+        """
+        db = self.SessionLocal()
+        try:
+            held = db.query(BacktestJob).filter(
+                BacktestJob.id == job_id, BacktestJob.status == 'running', BacktestJob.worker == worker_id
+            ).update({'updated_at': datetime.utcnow()}, synchronize_session=False)
+            db.commit()
+            return bool(held)
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Could not renew lease for backtest job {job_id}: {e}")
+            return None
+        finally:
+            db.close()
+    
+    def _record_progress(self, job_id: int, worker_id: str, progress: float, first_seq: int,
+                         points: List[Dict]) -> Optional[int]:
+        """
+        Update progress (also renewing the lease) and append new equity points in one transaction
+        
+        Returns:
+            Number of points stored (0 if the write failed), or None if this worker no longer holds the job
+        """
+        db = self.SessionLocal()
+        try:
+            held = db.query(BacktestJob).filter(
+                BacktestJob.id == job_id, BacktestJob.status == 'running', BacktestJob.worker == worker_id
+            ).update({'progress': progress, 'updated_at': datetime.utcnow()}, synchronize_session=False)
+            if not held:
                 db.rollback()
-                logger.error(f"Error saving backtest: {e}")
-                raise
-            finally:
-                db.close()
-                
+                return None
+            db.add_all([
+                BacktestEquityPoint(job_id=job_id, seq=first_seq + i, timestamp=p['timestamp'],
+                                    equity=p['equity'], balance=p['balance'], positions=p['positions'])
+                for i, p in enumerate(_serialize_equity_curve(points))
+            ])
+            db.commit()
+            return len(points)
         except Exception as e:
-            logger.error(f"Error running backtest: {e}")
-            raise
+            db.rollback()
+            logger.warning(f"Could not record progress for backtest job {job_id}: {e}")
+            return 0
+        finally:
+            db.close()
+    
+    def _update_job(self, job_id: int, worker_id: Optional[str] = None, **values):
+        values['updated_at'] = datetime.utcnow()
+        db = self.SessionLocal()
+        try:
+            query = db.query(BacktestJob).filter(BacktestJob.id == job_id)
+            if worker_id is not None:
+                query = query.filter(BacktestJob.worker == worker_id)  # Only while this worker holds the job
+            query.update(values, synchronize_session=False)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Could not update backtest job {job_id}: {e}")
+        finally:
+            db.close()
+    
+    def _cancel_requested(self, job_id: int) -> bool:
+        db = self.SessionLocal()
+        try:
+            row = db.query(BacktestJob.cancel_requested).filter(BacktestJob.id == job_id).first()
+            return bool(row and row[0])
+        finally:
+            db.close()
     
     def get_backtest_history(self, user_id: int) -> List[Dict]:
         """Get backtest history for user"""
@@ -139,4 +579,3 @@ class BacktestEngine:
             ]
         finally:
             db.close()
-
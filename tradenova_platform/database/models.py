@@ -135,6 +135,39 @@ class Backtest(Base):
     # Relationships
     user = relationship("User", back_populates="backtests")
 
+class BacktestJob(Base):
+    """Queued / running backtest (persistent job queue; results land in Backtest)"""
+    __tablename__ = 'backtest_jobs'
+    
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
+    tickers = Column(JSON, nullable=False)
+    start_date = Column(DateTime, nullable=False)
+    end_date = Column(DateTime, nullable=False)
+    initial_balance = Column(Float, nullable=False)
+    status = Column(String(20), default='queued', index=True)  # queued, running, completed, failed, cancelled
+    progress = Column(Float, default=0.0)  # 0-1
+    cancel_requested = Column(Boolean, default=False)
+    error = Column(Text)
+    worker = Column(String(100))
+    backtest_id = Column(Integer, ForeignKey('backtests.id'))
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime)
+    updated_at = Column(DateTime)  # Lease heartbeat: refreshed by every progress write
+    finished_at = Column(DateTime)
+
+class BacktestEquityPoint(Base):
+    """Equity curve point of a backtest job (appended as the job runs)"""
+    __tablename__ = 'backtest_equity_points'
+    
+    id = Column(Integer, primary_key=True)
+    job_id = Column(Integer, ForeignKey('backtest_jobs.id'), nullable=False, index=True)
+    seq = Column(Integer, nullable=False)  # 0-based position in the curve
+    timestamp = Column(String(40))
+    equity = Column(Float)
+    balance = Column(Float)
+    positions = Column(Integer)
+
 class PerformanceMetrics(Base):
     """Daily performance metrics"""
     __tablename__ = 'performance_metrics'
@@ -1,16 +1,30 @@
 """
 Trading Engine - Per-User Trading Execution
 Handles live trading for each user with isolated risk management
+
+Multi-tenant: one shared market trader owns the price feeds, feature/agent stack
+and RL model and computes signals once per cycle; each user's trader reuses those
+components and only runs its own risk checks, sizing and execution. User cycles
+run concurrently, each isolated (one user's failure never affects another) and
+timed separately.
 """
 import logging
-from typing import Dict, Optional
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional
 from datetime import datetime
 from sqlalchemy.orm import Session
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
+import numpy as np
+
 from tradenova_platform.database.models import Portfolio, Position, Trade
 from core.live.integrated_trader import IntegratedTrader
+from core.live.cycle_tracer import tracer
+from core.live.metrics_registry import record_cycle
 from core.risk.advanced_risk_manager import AdvancedRiskManager
 from config import Config
 
@@ -19,11 +33,39 @@ logger = logging.getLogger(__name__)
 class TradingEngine:
     """Manages trading execution for users"""
     
-    def __init__(self, database_url: str = "sqlite:///platform.db"):
-        """Initialize trading engine"""
+    def __init__(self, database_url: str = "sqlite:///platform.db", max_workers: int = 8, rl_model_path: Optional[str] = None):
+        """
+        Initialize trading engine
+        
+        Args:
+            database_url: Platform database
+            max_workers: User cycles run concurrently on this many threads
+            rl_model_path: RL model for the shared market trader (loaded once for all users)
+        """
         self.engine = create_engine(database_url, echo=False)
         self.SessionLocal = sessionmaker(bind=self.engine)
         self.active_traders: Dict[int, IntegratedTrader] = {}
+        self.rl_model_path = rl_model_path
+        self.market_trader: Optional[IntegratedTrader] = None
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="user-cycle")
+        self._lock = threading.Lock()
+        self._cycle_lock = threading.Lock()
+        self._latency: Dict[int, deque] = {}
+        self.last_cycle: Dict = {}
+    
+    def _get_market_trader(self) -> IntegratedTrader:
+        """Shared market trader (created on first use; never places orders)"""
+        with self._lock:
+            if self.market_trader is None:
+                self.market_trader = IntegratedTrader(
+                    rl_model_path=self.rl_model_path,
+                    use_rl=bool(self.rl_model_path),
+                    dry_run=True,
+                    paper_trading=True,
+                    lazy_init=True
+                )
+                logger.info("Shared market trader initialized (feeds, agents, RL model shared by all users)")
+            return self.market_trader
     
     def start_trading(self, user_id: int) -> Dict:
         """
@@ -31,7 +73,7 @@ class TradingEngine:
         
         Args:
             user_id: User ID
-            
+        
         Returns:
             Status dictionary
         """
@@ -54,19 +96,23 @@ class TradingEngine:
                 max_loss_streak=3
             )
             
-            # Create integrated trader
+            # Create integrated trader (market data, agents and RL model come from the shared market trader)
             trader = IntegratedTrader(
-                rl_model_path=None,  # Can be configured per user
-                use_rl=False,  # Can be enabled per user
+                rl_model_path=None,
+                use_rl=False,  # RL signals are computed once by the market trader
                 dry_run=False,
-                paper_trading=True  # Paper trading for safety
+                paper_trading=True,  # Paper trading for safety
+                market=self._get_market_trader()
             )
             
             # Override risk manager
             trader.risk_manager = risk_manager
+            trader.metrics_labels = {'user': str(user_id)}
             
             # Store trader
-            self.active_traders[user_id] = trader
+            with self._lock:
+                self.active_traders[user_id] = trader
+                self._latency[user_id] = deque(maxlen=500)
             
             logger.info(f"Started trading for user {user_id}")
             
@@ -80,7 +126,7 @@ class TradingEngine:
                     "max_positions": portfolio.max_positions
                 }
             }
-            
+        
         except Exception as e:
             logger.error(f"Error starting trading for user {user_id}: {e}")
             raise
@@ -89,11 +135,13 @@ class TradingEngine:
     
     def stop_trading(self, user_id: int) -> Dict:
         """Stop automated trading for a user"""
-        if user_id not in self.active_traders:
-            return {"status": "not_running", "user_id": user_id}
-        
-        # Remove trader
-        del self.active_traders[user_id]
+        with self._lock:
+            if user_id not in self.active_traders:
+                return {"status": "not_running", "user_id": user_id}
+            
+            # Remove trader
+            del self.active_traders[user_id]
+            self._latency.pop(user_id, None)
         
         logger.info(f"Stopped trading for user {user_id}")
         
@@ -103,27 +151,95 @@ class TradingEngine:
         """Get trading status for user"""
         is_running = user_id in self.active_traders
         
-        return {
+        status = {
             "user_id": user_id,
             "is_running": is_running,
             "status": "active" if is_running else "stopped"
         }
+        if is_running:
+            status["latency"] = self.get_latency_stats(user_id)
+        return status
     
-    def run_trading_cycle(self, user_id: int):
-        """Run one trading cycle for a user"""
-        if user_id not in self.active_traders:
-            return
+    def run_cycle(self, user_ids: Optional[Iterable[int]] = None) -> Dict[int, Dict]:
+        """
+        Run one trading cycle: signals once, then every user's cycle concurrently
         
-        trader = self.active_traders[user_id]
+        Args:
+            user_ids: Users to run (default: all active)
         
+        Returns:
+            {user_id: {'status': 'ok' | 'error', 'seconds', 'error'?}}
+        """
+        with self._lock:
+            selected = set(user_ids) if user_ids is not None else set(self.active_traders)
+            traders = {uid: t for uid, t in self.active_traders.items() if uid in selected}
+        if not traders:
+            return {}
+        
+        with self._cycle_lock:  # One engine cycle at a time (shared signals, market trader state)
+            start = time.perf_counter()
+            
+            # Market-wide work once: bars, features, agents, RL batch
+            signals: Dict[str, Dict] = {}
+            try:
+                with tracer.cycle('market_scan'):
+                    signals = self._get_market_trader().scan_market()
+            except Exception as e:
+                logger.error(f"Error computing shared market signals: {e}", exc_info=True)
+            signal_seconds = time.perf_counter() - start
+            
+            # Per-user risk, sizing and execution in parallel
+            futures = {uid: self._pool.submit(self._run_user_cycle, uid, trader, signals)
+                       for uid, trader in traders.items()}
+            results = {uid: future.result() for uid, future in futures.items()}
+            
+            total = time.perf_counter() - start
+            record_cycle(total, sum(len(t.positions) for t in traders.values()))
+            self.last_cycle = {
+                'at': datetime.now().isoformat(timespec='seconds'),
+                'users': len(traders),
+                'signals': len(signals),
+                'signal_seconds': signal_seconds,
+                'total_seconds': total,
+                'errors': sum(1 for r in results.values() if r['status'] == 'error'),
+            }
+            logger.info(f"Engine cycle: {len(traders)} users, {len(signals)} signals in {signal_seconds:.2f}s, "
+                        f"total {total:.2f}s ({self.last_cycle['errors']} errors)")
+            return results
+    
+    def _run_user_cycle(self, user_id: int, trader: IntegratedTrader, signals: Dict[str, Dict]) -> Dict:
+        start = time.perf_counter()
         try:
             # Run trading cycle
-            trader.run_trading_cycle()
+            trader.run_trading_cycle(signals=signals)
             
             # Update portfolio in database
             # This would sync positions and P&L
             # Implementation depends on how IntegratedTrader exposes data
             
+            result = {'status': 'ok'}
         except Exception as e:
             logger.error(f"Error in trading cycle for user {user_id}: {e}")
-
+            result = {'status': 'error', 'error': str(e)}
+        
+        result['seconds'] = time.perf_counter() - start
+        samples = self._latency.get(user_id)
+        if samples is not None:
+            samples.append(result['seconds'])
+        return result
+    
+    def run_trading_cycle(self, user_id: int):
+        """Run one trading cycle for a user"""
+        if user_id not in self.active_traders:
+            return
+        
+        return self.run_cycle([user_id]).get(user_id)
+    
+    def get_latency_stats(self, user_id: int) -> Dict:
+        """Per-user cycle latency (p50/p95/max over recent cycles, seconds)"""
+        samples = self._latency.get(user_id)
+        if not samples:
+            return {'cycles': 0}
+        values = np.fromiter(samples, dtype=float)
+        p50, p95 = np.percentile(values, [50, 95])
+        return {'cycles': len(values), 'p50': float(p50), 'p95': float(p95), 'max': float(values.max())}